@@ -0,0 +1,69 @@
+"""add run queue claim indexes
+
+Revision ID: 56fa7be77d36
+Revises: 5d3d18277ec7
+Create Date: 2026-02-02 10:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "56fa7be77d36"
+down_revision: Union[str, Sequence[str], None] = "5d3d18277ec7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Older claim paths could leave more than one active run per session. Keep the newest
+    # one active so the unique index below can be created.
+    op.execute(
+        """
+        WITH ranked AS (
+            SELECT id,
+                   status,
+                   row_number() OVER (
+                       PARTITION BY session_id ORDER BY created_at DESC
+                   ) AS rn
+            FROM agent_runs
+            WHERE status IN ('claimed', 'running')
+        )
+        UPDATE agent_runs AS r
+        SET status = CASE WHEN ranked.status = 'claimed' THEN 'queued' ELSE 'failed' END,
+            claimed_by = CASE WHEN ranked.status = 'claimed' THEN NULL ELSE r.claimed_by END,
+            lease_expires_at = NULL,
+            finished_at = CASE WHEN ranked.status = 'running' THEN now() ELSE r.finished_at END,
+            last_error = CASE
+                WHEN ranked.status = 'running' THEN 'Superseded by a newer active run'
+                ELSE r.last_error
+            END
+        FROM ranked
+        WHERE r.id = ranked.id AND ranked.rn > 1
+        """
+    )
+    op.create_index(
+        "ix_agent_runs_queued_claim_order",
+        "agent_runs",
+        ["schedule_mode", "scheduled_at", "created_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'queued'"),
+    )
+    op.create_index(
+        "uq_agent_runs_active_session",
+        "agent_runs",
+        ["session_id"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('claimed', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_agent_runs_active_session", table_name="agent_runs")
+    op.drop_index("ix_agent_runs_queued_claim_order", table_name="agent_runs")
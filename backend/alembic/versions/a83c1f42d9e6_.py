@@ -0,0 +1,33 @@
+"""index run start and finish times
+
+Revision ID: a83c1f42d9e6
+Revises: 56fa7be77d36
+Create Date: 2026-02-03 09:21:07.552310
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a83c1f42d9e6"
+down_revision: Union[str, Sequence[str], None] = "56fa7be77d36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        op.f("ix_agent_runs_started_at"), "agent_runs", ["started_at"], unique=False
+    )
+    op.create_index(
+        op.f("ix_agent_runs_finished_at"), "agent_runs", ["finished_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_agent_runs_finished_at"), table_name="agent_runs")
+    op.drop_index(op.f("ix_agent_runs_started_at"), table_name="agent_runs")
@@ -0,0 +1,72 @@
+"""add transcript search indexes
+
+Revision ID: a9d4e2c7f318
+Revises: f1a6c3d8b925
+Create Date: 2026-02-07 15:21:09.648173
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a9d4e2c7f318"
+down_revision: Union[str, Sequence[str], None] = "f1a6c3d8b925"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column(
+        "agent_messages",
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
+    )
+    # Backfill from the text blocks of existing messages (see extract_message_text).
+    op.execute(
+        """
+        UPDATE agent_messages m
+        SET search_vector = to_tsvector('simple', LEFT(t.text, 32000))
+        FROM (
+            SELECT a.id, string_agg(b ->> 'text', E'\\n' ORDER BY e.ord) AS text
+            FROM agent_messages a,
+                 json_array_elements(
+                     CASE WHEN json_typeof(a.content -> 'content') = 'array'
+                          THEN a.content -> 'content' ELSE '[]'::json END
+                 ) WITH ORDINALITY AS e(b, ord)
+            WHERE json_typeof(b) = 'object'
+              AND b ->> '_type' LIKE '%TextBlock%'
+              AND json_typeof(b -> 'text') = 'string'
+            GROUP BY a.id
+        ) t
+        WHERE t.id = m.id AND t.text <> ''
+        """
+    )
+    op.create_index(
+        "ix_agent_messages_search_vector",
+        "agent_messages",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_agent_sessions_title_trgm",
+        "agent_sessions",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_agent_sessions_title_trgm", table_name="agent_sessions")
+    op.drop_index("ix_agent_messages_search_vector", table_name="agent_messages")
+    op.drop_column("agent_messages", "search_vector")
@@ -0,0 +1,237 @@
+"""partition transcript tables by month and add session archive columns
+
+Revision ID: b7e5f2a19c64
+Revises: a9d4e2c7f318
+Create Date: 2026-02-08 10:14:37.204518
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e5f2a19c64"
+down_revision: Union[str, Sequence[str], None] = "a9d4e2c7f318"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONED_TABLES = ("agent_messages", "tool_executions", "usage_logs")
+# Matches PARTITION_MONTHS_AHEAD; the manager's maintenance job keeps it rolling.
+MONTHS_AHEAD = 2
+
+
+def _partition_table(table: str) -> None:
+    """Rebuilds table as a monthly range-partitioned copy of itself."""
+    old = f"{table}_unpartitioned"
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey")
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        " PARTITION BY RANGE (created_at)"
+    )
+    # One partition per month from the oldest row through MONTHS_AHEAD, named like
+    # partition_repository.month_partition_name, plus a default partition so an
+    # insert never fails if the maintenance job falls behind.
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            m timestamptz;
+        BEGIN
+            FOR m IN
+                SELECT generate_series(
+                    date_trunc(
+                        'month',
+                        COALESCE((SELECT MIN(created_at) FROM {old}), now())
+                        AT TIME ZONE 'UTC'
+                    ),
+                    date_trunc('month', now() AT TIME ZONE 'UTC')
+                        + interval '{MONTHS_AHEAD} months',
+                    interval '1 month'
+                ) AT TIME ZONE 'UTC'
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                    '{table}_p' || to_char(m AT TIME ZONE 'UTC', 'YYYY_MM'),
+                    m,
+                    m + interval '1 month'
+                );
+            END LOOP;
+        END $$
+        """
+    )
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    op.create_primary_key(f"{table}_pkey", table, ["id", "created_at"])
+    op.create_foreign_key(
+        f"{table}_session_id_fkey",
+        table,
+        "agent_sessions",
+        ["session_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+
+def _unpartition_table(table: str) -> None:
+    """Rebuilds table as a plain table with an id primary key."""
+    old = f"{table}_partitioned"
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey")
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    op.create_primary_key(f"{table}_pkey", table, ["id"])
+    op.create_foreign_key(
+        f"{table}_session_id_fkey",
+        table,
+        "agent_sessions",
+        ["session_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "agent_sessions",
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column("agent_sessions", sa.Column("archive_key", sa.Text(), nullable=True))
+
+    # Partitioned tables cannot be referenced by foreign keys.
+    op.drop_constraint(
+        "agent_runs_user_message_id_fkey", "agent_runs", type_="foreignkey"
+    )
+    op.drop_constraint(
+        "tool_executions_message_id_fkey", "tool_executions", type_="foreignkey"
+    )
+    op.drop_constraint(
+        "tool_executions_result_message_id_fkey",
+        "tool_executions",
+        type_="foreignkey",
+    )
+
+    for table in PARTITIONED_TABLES:
+        _partition_table(table)
+    # Keep the id sequence when the old table is dropped.
+    op.execute("ALTER SEQUENCE agent_messages_id_seq OWNED BY agent_messages.id")
+    for table in PARTITIONED_TABLES:
+        op.drop_table(f"{table}_unpartitioned")
+
+    op.create_index(
+        "ix_agent_messages_session_id_id",
+        "agent_messages",
+        ["session_id", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_agent_messages_search_vector",
+        "agent_messages",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_tool_executions_session_id_tool_use_id",
+        "tool_executions",
+        ["session_id", "tool_use_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_tool_executions_session_id_created_at_id",
+        "tool_executions",
+        ["session_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index("ix_usage_logs_run_id", "usage_logs", ["run_id"], unique=False)
+    op.create_index(
+        "ix_usage_logs_session_id_created_at",
+        "usage_logs",
+        ["session_id", "created_at"],
+        unique=False,
+    )
+    op.create_foreign_key(
+        "fk_usage_logs_run_id",
+        "usage_logs",
+        "agent_runs",
+        ["run_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Archived transcripts are not restored; rehydrate sessions before downgrading.
+    for table in PARTITIONED_TABLES:
+        _unpartition_table(table)
+    op.execute("ALTER SEQUENCE agent_messages_id_seq OWNED BY agent_messages.id")
+    for table in PARTITIONED_TABLES:
+        op.drop_table(f"{table}_partitioned")
+
+    op.create_index(
+        "ix_agent_messages_session_id_id",
+        "agent_messages",
+        ["session_id", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_agent_messages_search_vector",
+        "agent_messages",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_tool_executions_session_id_created_at_id",
+        "tool_executions",
+        ["session_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_unique_constraint(
+        "uq_tool_executions_session_tool_use_id",
+        "tool_executions",
+        ["session_id", "tool_use_id"],
+    )
+    op.create_index("ix_usage_logs_run_id", "usage_logs", ["run_id"], unique=False)
+    op.create_foreign_key(
+        "fk_usage_logs_run_id",
+        "usage_logs",
+        "agent_runs",
+        ["run_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_foreign_key(
+        "tool_executions_message_id_fkey",
+        "tool_executions",
+        "agent_messages",
+        ["message_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_foreign_key(
+        "tool_executions_result_message_id_fkey",
+        "tool_executions",
+        "agent_messages",
+        ["result_message_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_foreign_key(
+        "agent_runs_user_message_id_fkey",
+        "agent_runs",
+        "agent_messages",
+        ["user_message_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+    op.drop_column("agent_sessions", "archive_key")
+    op.drop_column("agent_sessions", "archived_at")
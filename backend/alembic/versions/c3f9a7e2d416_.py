@@ -0,0 +1,41 @@
+"""order session run pages by scheduled_at
+
+Revision ID: c3f9a7e2d416
+Revises: b7e5f2a19c64
+Create Date: 2026-02-09 09:21:44.603127
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f9a7e2d416"
+down_revision: Union[str, Sequence[str], None] = "b7e5f2a19c64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_agent_runs_session_id_scheduled_at_created_at_id",
+        "agent_runs",
+        ["session_id", "scheduled_at", "created_at", "id"],
+        unique=False,
+    )
+    op.drop_index("ix_agent_runs_session_id_created_at_id", table_name="agent_runs")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        "ix_agent_runs_session_id_created_at_id",
+        "agent_runs",
+        ["session_id", "created_at", "id"],
+        unique=False,
+    )
+    op.drop_index(
+        "ix_agent_runs_session_id_scheduled_at_created_at_id", table_name="agent_runs"
+    )
@@ -0,0 +1,32 @@
+"""add session state version
+
+Revision ID: c4e7a9d20b15
+Revises: a83c1f42d9e6
+Create Date: 2026-02-04 10:12:43.118205
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e7a9d20b15"
+down_revision: Union[str, Sequence[str], None] = "a83c1f42d9e6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "agent_sessions",
+        sa.Column("state_version", sa.Integer(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("agent_sessions", "state_version")
@@ -0,0 +1,142 @@
+"""add usage rollups
+
+Revision ID: d2b8f6e31a47
+Revises: c4e7a9d20b15
+Create Date: 2026-02-05 16:40:12.907431
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2b8f6e31a47"
+down_revision: Union[str, Sequence[str], None] = "c4e7a9d20b15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TOKEN_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+
+def _counter_columns() -> list[sa.Column]:
+    def counter(name: str, type_: sa.types.TypeEngine) -> sa.Column:
+        return sa.Column(name, type_, server_default=sa.text("0"), nullable=False)
+
+    return [
+        counter("result_count", sa.Integer()),
+        counter("total_cost_usd", sa.Numeric(14, 6)),
+        counter("total_duration_ms", sa.BigInteger()),
+        *(counter(field, sa.BigInteger()) for field in TOKEN_FIELDS),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    ]
+
+
+def _aggregates() -> str:
+    tokens = ",\n".join(
+        f"""COALESCE(SUM(CASE WHEN json_typeof(l.usage_json -> '{field}') = 'number'
+                THEN (l.usage_json ->> '{field}')::numeric END), 0)::bigint"""
+        for field in TOKEN_FIELDS
+    )
+    return f"""
+        COUNT(*),
+        COALESCE(SUM(l.total_cost_usd), 0),
+        COALESCE(SUM(l.duration_ms), 0),
+        {tokens}
+    """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "usage_run_rollups",
+        sa.Column("run_id", sa.Uuid(), nullable=False),
+        sa.Column("session_id", sa.Uuid(), nullable=False),
+        *_counter_columns(),
+        sa.ForeignKeyConstraint(["run_id"], ["agent_runs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["session_id"], ["agent_sessions.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("run_id"),
+    )
+    op.create_index(
+        op.f("ix_usage_run_rollups_session_id"),
+        "usage_run_rollups",
+        ["session_id"],
+        unique=False,
+    )
+    op.create_table(
+        "usage_session_rollups",
+        sa.Column("session_id", sa.Uuid(), nullable=False),
+        *_counter_columns(),
+        sa.ForeignKeyConstraint(
+            ["session_id"], ["agent_sessions.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("session_id"),
+    )
+    op.create_table(
+        "usage_user_daily_rollups",
+        sa.Column("user_id", sa.String(length=255), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        *_counter_columns(),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+
+    # Backfill from the existing usage logs.
+    columns = ", ".join(
+        ["result_count", "total_cost_usd", "total_duration_ms", *TOKEN_FIELDS]
+    )
+    op.execute(
+        f"""
+        INSERT INTO usage_run_rollups (run_id, session_id, {columns})
+        SELECT l.run_id, MIN(l.session_id::text)::uuid, {_aggregates()}
+        FROM usage_logs l
+        WHERE l.run_id IS NOT NULL
+        GROUP BY l.run_id
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO usage_session_rollups (session_id, {columns})
+        SELECT l.session_id, {_aggregates()}
+        FROM usage_logs l
+        GROUP BY l.session_id
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO usage_user_daily_rollups (user_id, day, {columns})
+        SELECT s.user_id, (l.created_at AT TIME ZONE 'UTC')::date, {_aggregates()}
+        FROM usage_logs l
+        JOIN agent_sessions s ON s.id = l.session_id
+        GROUP BY s.user_id, (l.created_at AT TIME ZONE 'UTC')::date
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("usage_user_daily_rollups")
+    op.drop_table("usage_session_rollups")
+    op.drop_index(
+        op.f("ix_usage_run_rollups_session_id"), table_name="usage_run_rollups"
+    )
+    op.drop_table("usage_run_rollups")
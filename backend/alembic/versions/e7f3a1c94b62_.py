@@ -0,0 +1,53 @@
+"""add keyset pagination indexes
+
+Revision ID: e7f3a1c94b62
+Revises: d2b8f6e31a47
+Create Date: 2026-02-06 11:05:37.214896
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7f3a1c94b62"
+down_revision: Union[str, Sequence[str], None] = "d2b8f6e31a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_agent_messages_session_id_id",
+        "agent_messages",
+        ["session_id", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_agent_runs_session_id_created_at_id",
+        "agent_runs",
+        ["session_id", "created_at", "id"],
+        unique=False,
+    )
+    # The composite index has session_id as its prefix.
+    op.drop_index(op.f("ix_agent_runs_session_id"), table_name="agent_runs")
+    op.create_index(
+        "ix_tool_executions_session_id_created_at_id",
+        "tool_executions",
+        ["session_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_tool_executions_session_id_created_at_id", table_name="tool_executions"
+    )
+    op.create_index(
+        op.f("ix_agent_runs_session_id"), "agent_runs", ["session_id"], unique=False
+    )
+    op.drop_index("ix_agent_runs_session_id_created_at_id", table_name="agent_runs")
+    op.drop_index("ix_agent_messages_session_id_id", table_name="agent_messages")
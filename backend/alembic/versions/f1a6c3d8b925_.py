@@ -0,0 +1,136 @@
+"""add session summary columns
+
+Revision ID: f1a6c3d8b925
+Revises: e7f3a1c94b62
+Create Date: 2026-02-07 09:42:18.531204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1a6c3d8b925"
+down_revision: Union[str, Sequence[str], None] = "e7f3a1c94b62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "agent_sessions",
+        sa.Column(
+            "message_count", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.add_column(
+        "agent_sessions", sa.Column("last_message_preview", sa.Text(), nullable=True)
+    )
+    op.add_column(
+        "agent_sessions",
+        sa.Column("last_message_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "agent_sessions", sa.Column("latest_run_id", sa.Uuid(), nullable=True)
+    )
+    op.add_column(
+        "agent_sessions",
+        sa.Column("latest_run_status", sa.String(length=50), nullable=True),
+    )
+    op.add_column(
+        "agent_sessions",
+        sa.Column(
+            "latest_run_progress",
+            sa.Integer(),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "agent_sessions",
+        sa.Column(
+            "total_cost_usd",
+            sa.Numeric(14, 6),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+    )
+
+    # Backfill from the existing messages, runs and usage rollups.
+    op.execute(
+        """
+        UPDATE agent_sessions s
+        SET message_count = m.message_count,
+            last_message_at = m.last_message_at
+        FROM (
+            SELECT session_id, COUNT(*) AS message_count,
+                   MAX(created_at) AS last_message_at
+            FROM agent_messages
+            GROUP BY session_id
+        ) m
+        WHERE m.session_id = s.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE agent_sessions s
+        SET last_message_preview = LEFT(m.text_preview, 200)
+        FROM (
+            SELECT DISTINCT ON (session_id) session_id, text_preview
+            FROM agent_messages
+            WHERE text_preview IS NOT NULL AND text_preview <> ''
+            ORDER BY session_id, id DESC
+        ) m
+        WHERE m.session_id = s.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE agent_sessions s
+        SET latest_run_id = r.id,
+            latest_run_status = r.status,
+            latest_run_progress = r.progress
+        FROM (
+            SELECT DISTINCT ON (session_id) session_id, id, status, progress
+            FROM agent_runs
+            ORDER BY session_id, created_at DESC, id DESC
+        ) r
+        WHERE r.session_id = s.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE agent_sessions s
+        SET total_cost_usd = u.total_cost_usd
+        FROM usage_session_rollups u
+        WHERE u.session_id = s.id
+        """
+    )
+
+    op.create_index(
+        "ix_agent_sessions_user_id_created_at",
+        "agent_sessions",
+        ["user_id", "created_at"],
+        unique=False,
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_agent_sessions_user_id_created_at",
+        table_name="agent_sessions",
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+    op.drop_column("agent_sessions", "total_cost_usd")
+    op.drop_column("agent_sessions", "latest_run_progress")
+    op.drop_column("agent_sessions", "latest_run_status")
+    op.drop_column("agent_sessions", "latest_run_id")
+    op.drop_column("agent_sessions", "last_message_at")
+    op.drop_column("agent_sessions", "last_message_preview")
+    op.drop_column("agent_sessions", "message_count")
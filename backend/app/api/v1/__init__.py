@@ -5,17 +5,21 @@ from app.api.v1 import (
     callback,
     env_vars,
     internal_env_vars,
+    internal_maintenance,
     internal_slash_commands,
     internal_mcp_config,
+    internal_runs,
     internal_scheduled_tasks,
     internal_skill_config,
     internal_user_input_requests,
+    internal_ws,
     mcp_servers,
     messages,
     projects,
     runs,
     schedules,
     scheduled_tasks,
+    search,
     sessions,
     slash_commands,
     skill_installs,
@@ -23,6 +27,7 @@ from app.api.v1 import (
     skills,
     tasks,
     tool_executions,
+    usage,
     user_input_requests,
     user_mcp_installs,
     ws,
@@ -40,14 +45,19 @@ api_v1_router.include_router(callback.router)
 api_v1_router.include_router(messages.router)
 api_v1_router.include_router(projects.router)
 api_v1_router.include_router(tool_executions.router)
+api_v1_router.include_router(usage.router)
+api_v1_router.include_router(search.router)
 api_v1_router.include_router(attachments.router)
 api_v1_router.include_router(env_vars.router)
 api_v1_router.include_router(internal_env_vars.router)
 api_v1_router.include_router(internal_mcp_config.router)
 api_v1_router.include_router(internal_skill_config.router)
 api_v1_router.include_router(internal_scheduled_tasks.router)
+api_v1_router.include_router(internal_runs.router)
 api_v1_router.include_router(internal_user_input_requests.router)
 api_v1_router.include_router(internal_slash_commands.router)
+api_v1_router.include_router(internal_maintenance.router)
+api_v1_router.include_router(internal_ws.router)
 api_v1_router.include_router(mcp_servers.router)
 api_v1_router.include_router(user_mcp_installs.router)
 api_v1_router.include_router(skills.router)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from fastapi import APIRouter, Depends
@@ -5,8 +6,14 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db
-from app.schemas.callback import AgentCallbackRequest, CallbackResponse
+from app.core.settings import get_settings
+from app.schemas.callback import (
+    AgentCallbackBatchRequest,
+    AgentCallbackRequest,
+    CallbackResponse,
+)
 from app.schemas.response import Response, ResponseSchema
+from app.services.callback_ingestion_service import callback_ingestion_service
 from app.services.callback_service import CallbackService
 
 logger = logging.getLogger(__name__)
@@ -22,13 +29,85 @@ async def receive_callback(
     db: Session = Depends(get_db),
 ) -> JSONResponse:
     """Receives executor callback and updates session status."""
-    result = callback_service.process_agent_callback(db, callback)
+    async_ingest = get_settings().callback_ingest_async_enabled
+    if async_ingest and callback_ingestion_service.requires_commit_before_ack(callback):
+        # Status changes and snapshots are committed before the ack (the executor does
+        # not retry), after whatever is still queued for the session.
+        await callback_ingestion_service.flush_session(callback.session_id)
+    elif async_ingest:
+        # Acknowledge now; the ingestion stage persists it with the session's next batch.
+        await callback_ingestion_service.submit(callback)
+        return Response.success(
+            data=CallbackResponse(
+                session_id=callback.session_id,
+                status="callback_queued",
+                callback_status=callback.status,
+                state_resync_required=callback_ingestion_service.take_state_resync(
+                    callback.session_id
+                ),
+            ),
+            message="Callback accepted",
+        )
+
+    # The sync write path runs on a worker thread so it does not stall WebSockets.
+    result = await asyncio.to_thread(
+        callback_service.process_agent_callback, db, callback
+    )
+    if async_ingest and callback_ingestion_service.take_state_resync(
+        callback.session_id
+    ):
+        result = result.model_copy(update={"state_resync_required": True})
     return Response.success(
         data=result,
         message="Callback processed successfully",
     )
 
 
+@router.post("/batch", response_model=ResponseSchema[CallbackResponse])
+async def receive_callback_batch(
+    batch: AgentCallbackBatchRequest,
+    db: Session = Depends(get_db),
+) -> JSONResponse:
+    """Receives a batched executor callback (several messages, one final state)."""
+    callbacks = callback_service.expand_callback_batch(batch)
+    async_ingest = get_settings().callback_ingest_async_enabled
+    if async_ingest and any(
+        callback_ingestion_service.requires_commit_before_ack(callback)
+        for callback in callbacks
+    ):
+        # Committed before the ack (see receive_callback), after the queued ones.
+        await callback_ingestion_service.flush_session(batch.session_id)
+    elif async_ingest:
+        for callback in callbacks:
+            await callback_ingestion_service.submit(callback)
+        return Response.success(
+            data=CallbackResponse(
+                session_id=batch.session_id,
+                status="callback_queued",
+                callback_status=batch.status,
+                state_resync_required=callback_ingestion_service.take_state_resync(
+                    batch.session_id
+                ),
+            ),
+            message="Callback accepted",
+        )
+
+    # One transaction for the whole batch.
+    results = await asyncio.to_thread(
+        callback_service.process_agent_callback_batch, db, callbacks
+    )
+    # A delta rejected anywhere in the batch (or queued earlier) needs a snapshot.
+    state_resync_required = any(r.state_resync_required for r in results) or (
+        async_ingest and callback_ingestion_service.take_state_resync(batch.session_id)
+    )
+    return Response.success(
+        data=results[-1].model_copy(
+            update={"state_resync_required": state_resync_required}
+        ),
+        message="Callback processed successfully",
+    )
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -0,0 +1,69 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_db
+from app.core.errors.error_codes import ErrorCode
+from app.core.errors.exceptions import AppException
+from app.core.settings import get_settings
+from app.schemas.maintenance import (
+    PartitionEnsureResponse,
+    SessionArchiveRequest,
+    SessionArchiveResponse,
+)
+from app.schemas.response import Response, ResponseSchema
+from app.services.partition_service import PartitionService
+from app.services.session_archive_service import session_archive_service
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+partition_service = PartitionService()
+
+
+def require_internal_token(
+    x_internal_token: str | None = Header(default=None, alias="X-Internal-Token"),
+) -> None:
+    settings = get_settings()
+    if not settings.internal_api_token:
+        raise AppException(
+            error_code=ErrorCode.FORBIDDEN,
+            message="Internal API token is not configured",
+        )
+    if not x_internal_token or x_internal_token != settings.internal_api_token:
+        raise AppException(
+            error_code=ErrorCode.FORBIDDEN,
+            message="Invalid internal token",
+        )
+
+
+@router.post(
+    "/partitions/ensure",
+    response_model=ResponseSchema[PartitionEnsureResponse],
+)
+async def ensure_partitions(
+    _: None = Depends(require_internal_token),
+    db: Session = Depends(get_db),
+) -> JSONResponse:
+    """Creates the monthly partitions for this month and the next few (idempotent)."""
+    result = partition_service.ensure_partitions(db)
+    return Response.success(data=result, message="Partitions ensured")
+
+
+@router.post(
+    "/sessions/archive-idle",
+    response_model=ResponseSchema[SessionArchiveResponse],
+)
+async def archive_idle_sessions(
+    request: SessionArchiveRequest | None = None,
+    _: None = Depends(require_internal_token),
+    db: Session = Depends(get_db),
+) -> JSONResponse:
+    """Moves the transcripts of idle sessions to S3 (called periodically by the manager)."""
+    limit = request.limit if request else None
+    # Uploads to S3 per session; keep them off the event loop.
+    result = await asyncio.to_thread(
+        session_archive_service.archive_idle_sessions, db, limit
+    )
+    return Response.success(data=result, message="Idle sessions archived")
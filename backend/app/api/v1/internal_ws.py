@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import JSONResponse
+
+from app.core.errors.error_codes import ErrorCode
+from app.core.errors.exceptions import AppException
+from app.core.settings import get_settings
+from app.core.websocket.manager import ws_manager
+from app.schemas.response import Response, ResponseSchema
+from app.schemas.websocket import WSStatsResponse
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+def require_internal_token(
+    x_internal_token: str | None = Header(default=None, alias="X-Internal-Token"),
+) -> None:
+    settings = get_settings()
+    if not settings.internal_api_token:
+        raise AppException(
+            error_code=ErrorCode.FORBIDDEN,
+            message="Internal API token is not configured",
+        )
+    if not x_internal_token or x_internal_token != settings.internal_api_token:
+        raise AppException(
+            error_code=ErrorCode.FORBIDDEN,
+            message="Invalid internal token",
+        )
+
+
+@router.get(
+    "/ws/stats",
+    response_model=ResponseSchema[WSStatsResponse],
+)
+async def get_ws_stats(
+    _: None = Depends(require_internal_token),
+) -> JSONResponse:
+    """WebSocket connections, send queue depth and send latency of this replica."""
+    result = await ws_manager.get_stats()
+    return Response.success(data=result, message="WebSocket stats retrieved")
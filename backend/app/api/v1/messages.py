@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid as uuid_module
 
-from app.core.deps import get_current_user_id, get_db
+from app.core.deps import get_async_db, get_current_user_id
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
-from app.repositories.message_repository import MessageRepository
 from app.schemas.message import MessageResponse
 from app.schemas.response import Response, ResponseSchema
 from app.services.message_service import MessageService
+from app.services.payload_store_service import payload_store_service
+from app.services.session_archive_service import session_archive_service
 from app.services.session_service import SessionService
 
 router = APIRouter(prefix="/messages", tags=["messages"])
@@ -21,19 +22,46 @@ session_service = SessionService()
 @router.get("/{message_id}", response_model=ResponseSchema[MessageResponse])
 async def get_message(
     message_id: int,
+    full: bool = Query(default=False),
+    session_id: uuid_module.UUID | None = Query(default=None),
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
-    """Gets a message by ID."""
-    message = message_service.get_message(db, message_id)
-    db_session = session_service.get_session(db, message.session_id)
-    if db_session.user_id != user_id:
-        raise AppException(
-            error_code=ErrorCode.FORBIDDEN,
-            message="Message does not belong to the user",
+    """Gets a message by ID.
+
+    Large tool results are returned as references with a preview unless full=1. The
+    rows of an archived session are not in the database until it is restored, so
+    pass its session_id to restore it first; without it such a message is not found.
+    """
+    if session_id is not None:
+        db_session = await session_service.get_session_async(db, session_id)
+        if db_session.user_id != user_id:
+            raise AppException(
+                error_code=ErrorCode.FORBIDDEN,
+                message="Session does not belong to the user",
+            )
+        await session_archive_service.rehydrate_if_archived(db_session)
+        message = await message_service.get_message(db, message_id)
+        if message.session_id != session_id:
+            raise AppException(
+                error_code=ErrorCode.NOT_FOUND,
+                message=f"Message not found: {message_id}",
+            )
+    else:
+        message = await message_service.get_message(db, message_id)
+        db_session = await session_service.get_session_async(db, message.session_id)
+        if db_session.user_id != user_id:
+            raise AppException(
+                error_code=ErrorCode.FORBIDDEN,
+                message="Message does not belong to the user",
+            )
+    data = MessageResponse.model_validate(message)
+    if full:
+        data = data.model_copy(
+            update={"content": payload_store_service.hydrate(data.content)}
         )
     return Response.success(
-        data=MessageResponse.model_validate(message),
+        data=data,
         message="Message retrieved successfully",
     )
 
@@ -46,25 +74,26 @@ async def get_messages_since(
     session_id: str,
     after_id: int,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
     """Gets all messages after the specified message ID."""
     try:
         session_uuid = uuid_module.UUID(session_id)
     except ValueError:
         raise AppException(
-            error_code=ErrorCode.INVALID_INPUT,
+            error_code=ErrorCode.BAD_REQUEST,
             message="Invalid session ID format",
         )
 
-    db_session = session_service.get_session(db, session_uuid)
+    db_session = await session_service.get_session_async(db, session_uuid)
     if db_session.user_id != user_id:
         raise AppException(
             error_code=ErrorCode.FORBIDDEN,
             message="Session does not belong to the user",
         )
+    await session_archive_service.rehydrate_if_archived(db_session)
 
-    messages = MessageRepository.get_after_id(db, session_uuid, after_id)
+    messages = await message_service.get_messages_since(db, session_uuid, after_id)
     return Response.success(
         data=[MessageResponse.model_validate(msg) for msg in messages],
         message=f"Found {len(messages)} new messages",
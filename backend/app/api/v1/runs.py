@@ -1,17 +1,21 @@
+import asyncio
 import uuid
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_current_user_id, get_db
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
-from app.schemas.response import Response, ResponseSchema
+from app.schemas.response import CursorPage, Response, ResponseSchema
 from app.schemas.run import (
+    RunClaimBatchRequest,
     RunClaimRequest,
     RunClaimResponse,
     RunFailRequest,
+    RunHeartbeatRequest,
+    RunHeartbeatResponse,
     RunResponse,
     RunStartRequest,
 )
@@ -30,10 +34,36 @@ async def claim_next_run(
     db: Session = Depends(get_db),
 ) -> JSONResponse:
     """Claim the next available run for execution."""
-    result = run_service.claim_next_run(db, request)
+    result = await asyncio.to_thread(run_service.claim_next_run, db, request)
     return Response.success(data=result, message="Run claimed" if result else "No runs")
 
 
+@router.post("/claim-batch", response_model=ResponseSchema[list[RunClaimResponse]])
+async def claim_run_batch(
+    request: RunClaimBatchRequest,
+    db: Session = Depends(get_db),
+) -> JSONResponse:
+    """Claim up to max_runs available runs in one round trip.
+
+    With wait_seconds > 0 the request long-polls until runs become claimable.
+    """
+    result = await run_service.claim_run_batch_wait(db, request)
+    return Response.success(
+        data=result, message=f"Claimed {len(result)} runs" if result else "No runs"
+    )
+
+
+@router.post("/{run_id}/heartbeat", response_model=ResponseSchema[RunHeartbeatResponse])
+async def heartbeat_run(
+    run_id: uuid.UUID,
+    request: RunHeartbeatRequest,
+    db: Session = Depends(get_db),
+) -> JSONResponse:
+    """Renew the claim lease of a run that is still being staged."""
+    result = run_service.heartbeat_run(db, run_id, request)
+    return Response.success(data=result, message="Lease renewed")
+
+
 @router.post("/{run_id}/start", response_model=ResponseSchema[RunResponse])
 async def start_run(
     run_id: uuid.UUID,
@@ -73,20 +103,22 @@ async def get_run(
     return Response.success(data=result, message="Run retrieved successfully")
 
 
-@router.get("/session/{session_id}", response_model=ResponseSchema[list[RunResponse]])
+@router.get(
+    "/session/{session_id}", response_model=ResponseSchema[CursorPage[RunResponse]]
+)
 async def list_runs_by_session(
     session_id: uuid.UUID,
     user_id: str = Depends(get_current_user_id),
-    limit: int = 100,
-    offset: int = 0,
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = Query(default=None),
     db: Session = Depends(get_db),
 ) -> JSONResponse:
-    """List runs for a session."""
+    """List one page of runs for a session; follow next_cursor for more."""
     db_session = session_service.get_session(db, session_id)
     if db_session.user_id != user_id:
         raise AppException(
             error_code=ErrorCode.FORBIDDEN,
             message="Session does not belong to the user",
         )
-    runs = run_service.list_runs(db, session_id, limit=limit, offset=offset)
-    return Response.success(data=runs, message="Runs retrieved successfully")
+    page = run_service.list_runs(db, session_id, limit=limit, cursor=cursor)
+    return Response.success(data=page, message="Runs retrieved successfully")
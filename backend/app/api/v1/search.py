@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import get_async_db, get_current_user_id
+from app.schemas.response import Response, ResponseSchema
+from app.schemas.search import SearchResponse
+from app.services.search_service import SearchService
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+search_service = SearchService()
+
+
+@router.get("", response_model=ResponseSchema[SearchResponse])
+async def search(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=50),
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> JSONResponse:
+    """Searches the current user's session titles and transcripts."""
+    result = await search_service.search(db, user_id, q, limit)
+    return Response.success(
+        data=result,
+        message="Search results retrieved successfully",
+    )
@@ -5,15 +5,16 @@ from urllib.request import Request, urlopen
 
 from fastapi import APIRouter, Depends, Query
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.observability.request_context import get_request_id, get_trace_id
 from app.core.settings import get_settings
-from app.core.deps import get_current_user_id, get_db
+from app.core.deps import get_async_db, get_current_user_id, get_db
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
 from app.schemas.message import MessageResponse, MessageWithFilesResponse
-from app.schemas.response import Response, ResponseSchema
+from app.schemas.response import CursorPage, Response, ResponseSchema
 from app.schemas.session import (
     SessionCancelRequest,
     SessionCancelResponse,
@@ -24,18 +25,20 @@ from app.schemas.session import (
 )
 from app.schemas.tool_execution import ToolExecutionResponse
 from app.schemas.usage import UsageResponse
-from app.schemas.workspace import FileNode, WorkspaceArchiveResponse
+from app.schemas.workspace import (
+    FileNode,
+    WorkspaceArchiveResponse,
+    WorkspaceEntry,
+    WorkspaceFileUrlsRequest,
+    WorkspaceFileUrlsResponse,
+)
 from app.services.message_service import MessageService
+from app.services.session_archive_service import session_archive_service
 from app.services.session_service import SessionService
 from app.services.storage_service import S3StorageService
 from app.services.tool_execution_service import ToolExecutionService
 from app.services.usage_service import UsageService
-from app.utils.workspace import build_workspace_file_nodes
-from app.utils.workspace_manifest import (
-    build_nodes_from_manifest,
-    extract_manifest_files,
-    normalize_manifest_path,
-)
+from app.services.workspace_manifest_cache import workspace_manifest_cache
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
@@ -110,12 +113,12 @@ async def list_sessions(
     offset: int = 0,
     project_id: uuid.UUID | None = Query(default=None),
     kind: str = Query(default="chat"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
     """Lists sessions."""
     kind_filter = kind.strip().lower()
     kind_value = None if kind_filter in {"", "all"} else kind_filter
-    sessions = session_service.list_sessions(
+    sessions = await session_service.list_sessions_async(
         db,
         user_id,
         limit,
@@ -133,10 +136,10 @@ async def list_sessions(
 async def get_session(
     session_id: uuid.UUID,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
     """Gets session details."""
-    db_session = session_service.get_session(db, session_id)
+    db_session = await session_service.get_session_async(db, session_id)
     if db_session.user_id != user_id:
         raise AppException(
             error_code=ErrorCode.FORBIDDEN,
@@ -152,10 +155,10 @@ async def get_session(
 async def get_session_state(
     session_id: uuid.UUID,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
     """Gets session state details."""
-    db_session = session_service.get_session(db, session_id)
+    db_session = await session_service.get_session_async(db, session_id)
     if db_session.user_id != user_id:
         raise AppException(
             error_code=ErrorCode.FORBIDDEN,
@@ -236,62 +239,75 @@ async def delete_session(
 
 
 @router.get(
-    "/{session_id}/messages", response_model=ResponseSchema[list[MessageResponse]]
+    "/{session_id}/messages",
+    response_model=ResponseSchema[CursorPage[MessageResponse]],
 )
 async def get_session_messages(
     session_id: uuid.UUID,
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = Query(default=None),
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
-    """Gets all messages for a session."""
+    """Gets one page of messages for a session; follow next_cursor for more."""
     # Verify session exists
-    db_session = session_service.get_session(db, session_id)
+    db_session = await session_service.get_session_async(db, session_id)
     if db_session.user_id != user_id:
         raise AppException(
             error_code=ErrorCode.FORBIDDEN,
             message="Session does not belong to the user",
         )
-    messages = message_service.get_messages(db, session_id)
+    await session_archive_service.rehydrate_if_archived(db_session)
+    page = await message_service.get_messages(
+        db, session_id, limit=limit, cursor=cursor
+    )
     return Response.success(
-        data=[MessageResponse.model_validate(m) for m in messages],
+        data=page,
         message="Messages retrieved successfully",
     )
 
 
 @router.get(
     "/{session_id}/messages-with-files",
-    response_model=ResponseSchema[list[MessageWithFilesResponse]],
+    response_model=ResponseSchema[CursorPage[MessageWithFilesResponse]],
 )
 async def get_session_messages_with_files(
     session_id: uuid.UUID,
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = Query(default=None),
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
-    """Gets all messages for a session with per-message attachments."""
-    db_session = session_service.get_session(db, session_id)
+    """Gets one page of messages with per-message attachments; follow next_cursor."""
+    db_session = await session_service.get_session_async(db, session_id)
     if db_session.user_id != user_id:
         raise AppException(
             error_code=ErrorCode.FORBIDDEN,
             message="Session does not belong to the user",
         )
+    await session_archive_service.rehydrate_if_archived(db_session)
 
-    messages = message_service.get_messages_with_files(db, session_id, user_id=user_id)
+    page = await message_service.get_messages_with_files(
+        db, session_id, user_id=user_id, limit=limit, cursor=cursor
+    )
     return Response.success(
-        data=messages,
+        data=page,
         message="Messages retrieved successfully",
     )
 
 
 @router.get(
     "/{session_id}/tool-executions",
-    response_model=ResponseSchema[list[ToolExecutionResponse]],
+    response_model=ResponseSchema[CursorPage[ToolExecutionResponse]],
 )
 async def get_session_tool_executions(
     session_id: uuid.UUID,
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = Query(default=None),
     user_id: str = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ) -> JSONResponse:
-    """Gets all tool executions for a session."""
+    """Gets one page of tool executions for a session; follow next_cursor for more."""
     # Verify session exists
     db_session = session_service.get_session(db, session_id)
     if db_session.user_id != user_id:
@@ -299,9 +315,12 @@ async def get_session_tool_executions(
             error_code=ErrorCode.FORBIDDEN,
             message="Session does not belong to the user",
         )
-    executions = tool_execution_service.get_tool_executions(db, session_id)
+    await session_archive_service.rehydrate_if_archived(db_session)
+    page = tool_execution_service.get_tool_executions(
+        db, session_id, limit=limit, cursor=cursor
+    )
     return Response.success(
-        data=[ToolExecutionResponse.model_validate(e) for e in executions],
+        data=page,
         message="Tool executions retrieved successfully",
     )
 
@@ -346,42 +365,76 @@ async def get_session_workspace_files(
     if not db_session.workspace_manifest_key:
         return Response.success(data=[], message="Workspace export not ready")
 
-    manifest = storage_service.get_manifest(db_session.workspace_manifest_key)
-    raw_nodes = build_nodes_from_manifest(manifest)
-    manifest_files = extract_manifest_files(manifest)
-    prefix = (db_session.workspace_files_prefix or "").rstrip("/")
-    file_url_map: dict[str, str] = {}
-
-    for file_entry in manifest_files:
-        file_path = normalize_manifest_path(file_entry.get("path"))
-        if not file_path:
-            continue
-        object_key = (
-            file_entry.get("key")
-            or file_entry.get("object_key")
-            or file_entry.get("oss_key")
-            or file_entry.get("s3_key")
+    nodes = workspace_manifest_cache.build_file_nodes(
+        db_session.workspace_manifest_key, db_session.workspace_files_prefix
+    )
+    return Response.success(data=nodes, message="Workspace files retrieved")
+
+
+@router.get(
+    "/{session_id}/workspace/children",
+    response_model=ResponseSchema[CursorPage[WorkspaceEntry]],
+)
+async def get_session_workspace_children(
+    session_id: uuid.UUID,
+    path: str = Query(default="/"),
+    limit: int = Query(default=200, ge=1, le=1000),
+    cursor: str | None = Query(default=None),
+    user_id: str = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+) -> JSONResponse:
+    """Gets one page of a workspace directory, without URLs; follow next_cursor."""
+    db_session = session_service.get_session(db, session_id)
+    if db_session.user_id != user_id:
+        raise AppException(
+            error_code=ErrorCode.FORBIDDEN,
+            message="Session does not belong to the user",
         )
-        if not object_key and prefix:
-            object_key = f"{prefix}/{file_path.lstrip('/')}"
-        if not object_key:
-            continue
-        mime_type = file_entry.get("mimeType") or file_entry.get("mime_type")
-        file_url_map[file_path] = storage_service.presign_get(
-            object_key,
-            response_content_disposition="inline",
-            response_content_type=mime_type,
+    if not db_session.workspace_manifest_key:
+        return Response.success(
+            data=CursorPage[WorkspaceEntry](items=[]),
+            message="Workspace export not ready",
         )
 
-    def build_file_url(file_path: str) -> str | None:
-        normalized = normalize_manifest_path(file_path) or file_path
-        return file_url_map.get(normalized)
+    page = workspace_manifest_cache.list_children(
+        db_session.workspace_manifest_key,
+        db_session.workspace_files_prefix,
+        path,
+        limit=limit,
+        cursor=cursor,
+    )
+    return Response.success(data=page, message="Workspace directory retrieved")
+
 
-    nodes = build_workspace_file_nodes(
-        raw_nodes,
-        file_url_builder=build_file_url,
+@router.post(
+    "/{session_id}/workspace/file-urls",
+    response_model=ResponseSchema[WorkspaceFileUrlsResponse],
+)
+async def get_session_workspace_file_urls(
+    session_id: uuid.UUID,
+    request: WorkspaceFileUrlsRequest,
+    user_id: str = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+) -> JSONResponse:
+    """Presigns the workspace files a client is about to open or preview."""
+    db_session = session_service.get_session(db, session_id)
+    if db_session.user_id != user_id:
+        raise AppException(
+            error_code=ErrorCode.FORBIDDEN,
+            message="Session does not belong to the user",
+        )
+    if not db_session.workspace_manifest_key:
+        urls: dict[str, str | None] = {path: None for path in request.paths}
+    else:
+        urls = workspace_manifest_cache.file_urls(
+            db_session.workspace_manifest_key,
+            db_session.workspace_files_prefix,
+            request.paths,
+        )
+    return Response.success(
+        data=WorkspaceFileUrlsResponse(urls=urls),
+        message="Workspace file URLs generated",
     )
-    return Response.success(data=nodes, message="Workspace files retrieved")
 
 
 @router.get(
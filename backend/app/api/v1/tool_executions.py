@@ -1,6 +1,6 @@
 import uuid
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
@@ -9,6 +9,7 @@ from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
 from app.schemas.response import Response, ResponseSchema
 from app.schemas.tool_execution import ToolExecutionResponse
+from app.services.payload_store_service import payload_store_service
 from app.services.session_service import SessionService
 from app.services.tool_execution_service import ToolExecutionService
 
@@ -21,10 +22,14 @@ session_service = SessionService()
 @router.get("/{execution_id}", response_model=ResponseSchema[ToolExecutionResponse])
 async def get_tool_execution(
     execution_id: uuid.UUID,
+    full: bool = Query(default=False),
     user_id: str = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ) -> JSONResponse:
-    """Gets a tool execution by ID."""
+    """Gets a tool execution by ID.
+
+    A large tool_output is returned as a reference with a preview unless full=1.
+    """
     execution = tool_execution_service.get_tool_execution(db, execution_id)
     db_session = session_service.get_session(db, execution.session_id)
     if db_session.user_id != user_id:
@@ -32,7 +37,12 @@ async def get_tool_execution(
             error_code=ErrorCode.FORBIDDEN,
             message="Tool execution does not belong to the user",
         )
+    data = ToolExecutionResponse.model_validate(execution)
+    if full and data.tool_output is not None:
+        data = data.model_copy(
+            update={"tool_output": payload_store_service.hydrate(data.tool_output)}
+        )
     return Response.success(
-        data=ToolExecutionResponse.model_validate(execution),
+        data=data,
         message="Tool execution retrieved successfully",
     )
@@ -0,0 +1,46 @@
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_current_user_id, get_db
+from app.core.errors.error_codes import ErrorCode
+from app.core.errors.exceptions import AppException
+from app.schemas.response import Response, ResponseSchema
+from app.schemas.usage import UsageDailyResponse
+from app.services.usage_service import UsageService
+
+router = APIRouter(prefix="/usage", tags=["usage"])
+
+usage_service = UsageService()
+
+MAX_DAILY_RANGE_DAYS = 366
+
+
+@router.get("/daily", response_model=ResponseSchema[list[UsageDailyResponse]])
+async def get_daily_usage(
+    start_date: date | None = Query(default=None),
+    end_date: date | None = Query(default=None),
+    user_id: str = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+) -> JSONResponse:
+    """Gets the current user's usage per UTC day (default: the last 30 days)."""
+    end_day = end_date or datetime.now(timezone.utc).date()
+    start_day = start_date or end_day - timedelta(days=29)
+    if start_day > end_day:
+        raise AppException(
+            error_code=ErrorCode.BAD_REQUEST,
+            message="start_date must not be after end_date",
+        )
+    if (end_day - start_day).days >= MAX_DAILY_RANGE_DAYS:
+        raise AppException(
+            error_code=ErrorCode.BAD_REQUEST,
+            message=f"Date range must not exceed {MAX_DAILY_RANGE_DAYS} days",
+        )
+
+    usage = usage_service.get_daily_usage(db, user_id, start_day, end_day)
+    return Response.success(
+        data=usage,
+        message="Daily usage retrieved successfully",
+    )
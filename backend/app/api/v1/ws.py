@@ -3,13 +3,16 @@ import logging
 import uuid as uuid_module
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import DEFAULT_USER_ID
-from app.core.database import SessionLocal
+from app.core.database import get_async_sessionmaker
+from app.core.websocket.codec import negotiate_subprotocol
 from app.core.websocket.manager import ws_manager
 from app.models.agent_session import AgentSession
 from app.repositories.session_repository import SessionRepository
+from app.schemas.workspace import WorkspaceFileUrlsRequest
 from app.services.websocket_service import websocket_service
 
 logger = logging.getLogger(__name__)
@@ -34,13 +37,30 @@ def _extract_ws_user_id(websocket: WebSocket) -> tuple[str, str | None]:
     return user_id, None
 
 
-def _resolve_session(db: Session, session_id: str) -> AgentSession | None:
+def _extract_ws_since(websocket: WebSocket) -> tuple[str, int] | None:
+    """Extract the resume position (?epoch=...&since_seq=N) of a reconnecting client."""
+    epoch = (websocket.query_params.get("epoch") or "").strip()
+    since_seq = (websocket.query_params.get("since_seq") or "").strip()
+    if not epoch or not since_seq:
+        return None
+    try:
+        return epoch, int(since_seq)
+    except ValueError:
+        return None
+
+
+def _extract_ws_subprotocol(websocket: WebSocket) -> str | None:
+    """Pick the wire format from the subprotocols the client offered."""
+    return negotiate_subprotocol(list(websocket.scope.get("subprotocols") or []))
+
+
+async def _resolve_session(db: AsyncSession, session_id: str) -> AgentSession | None:
     """Resolve session by DB uuid or SDK session id."""
     try:
         session_uuid = uuid_module.UUID(session_id)
-        return SessionRepository.get_by_id(db, session_uuid)
     except ValueError:
-        return SessionRepository.get_by_sdk_session_id(db, session_id)
+        return await SessionRepository.get_by_sdk_session_id_async(db, session_id)
+    return await SessionRepository.get_by_id_async(db, session_uuid)
 
 
 @router.websocket("/ws/sessions/{session_id}")
@@ -48,6 +68,11 @@ async def session_websocket(websocket: WebSocket, session_id: str) -> None:
     """WebSocket endpoint for real-time session updates.
 
     Clients connect with a session_id and receive events for that session.
+    Events carry a per-session seq and epoch; a client reconnecting with
+    ?epoch=...&since_seq=N receives SESSION_RESUMED and the events it missed, or a
+    fresh snapshot when they are no longer buffered.
+    Clients offering the "poco.msgpack" subprotocol receive broadcast events as
+    MessagePack binary frames; direct replies stay JSON text.
     Supports ping/pong for keepalive.
     """
     user_id, user_err = _extract_ws_user_id(websocket)
@@ -65,9 +90,8 @@ async def session_websocket(websocket: WebSocket, session_id: str) -> None:
         return
 
     ws_key = session_id
-    db = SessionLocal()
-    try:
-        db_session = _resolve_session(db, session_id)
+    async with get_async_sessionmaker()() as db:
+        db_session = await _resolve_session(db, session_id)
         if db_session:
             ws_key = str(db_session.id)
             if db_session.user_id != user_id:
@@ -83,11 +107,17 @@ async def session_websocket(websocket: WebSocket, session_id: str) -> None:
                 )
                 await websocket.close(code=1008)
                 return
-    finally:
-        db.close()
 
-    await ws_manager.connect(ws_key, websocket)
-    await websocket_service.send_session_snapshot(websocket, session_id=session_id)
+    position = await ws_manager.connect(
+        ws_key,
+        websocket,
+        since=_extract_ws_since(websocket),
+        subprotocol=_extract_ws_subprotocol(websocket),
+    )
+    if not position.resumed:
+        await websocket_service.send_session_snapshot(
+            websocket, session_id=session_id, position=position
+        )
     try:
         while True:
             data = await websocket.receive_json()
@@ -100,7 +130,9 @@ async def session_websocket(websocket: WebSocket, session_id: str) -> None:
                     session_id=session_id,
                 )
             if msg_type == "workspace.files.request":
-                await websocket_service.send_workspace_files(websocket, session_id=session_id)
+                await websocket_service.send_workspace_files(
+                    websocket, session_id=session_id
+                )
             if msg_type == "workspace.file.url.request":
                 path = data.get("path")
                 if isinstance(path, str) and path.strip():
@@ -109,6 +141,28 @@ async def session_websocket(websocket: WebSocket, session_id: str) -> None:
                         session_id=session_id,
                         path=path,
                     )
+            if msg_type == "workspace.children.request":
+                path = data.get("path")
+                cursor = data.get("cursor")
+                limit = data.get("limit")
+                await websocket_service.send_workspace_children(
+                    websocket,
+                    session_id=session_id,
+                    path=path if isinstance(path, str) else None,
+                    cursor=cursor if isinstance(cursor, str) and cursor else None,
+                    limit=limit if isinstance(limit, int) else None,
+                )
+            if msg_type == "workspace.file.urls.request":
+                try:
+                    request = WorkspaceFileUrlsRequest.model_validate(data)
+                except ValidationError:
+                    request = None
+                if request is not None:
+                    await websocket_service.send_workspace_file_urls(
+                        websocket,
+                        session_id=session_id,
+                        paths=request.paths,
+                    )
             # Other message types can be handled here in the future
     except WebSocketDisconnect:
         await ws_manager.disconnect(ws_key, websocket)
@@ -136,7 +190,9 @@ async def user_websocket(websocket: WebSocket) -> None:
         await websocket.close(code=1008)
         return
     key = f"user:{user_id}"
-    await ws_manager.connect(key, websocket)
+    await ws_manager.connect(
+        key, websocket, subprotocol=_extract_ws_subprotocol(websocket)
+    )
     try:
         while True:
             data = await websocket.receive_json()
@@ -1,6 +1,8 @@
+import threading
 from datetime import datetime
 
-from sqlalchemy import DateTime, func, create_engine
+from sqlalchemy import DateTime, func, create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
 
 from app.core.settings import get_settings
@@ -13,13 +15,64 @@ engine = create_engine(
     echo=settings.log_sql,
     hide_parameters=True,
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    pool_timeout=settings.database_pool_timeout_seconds,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def to_async_database_url(database_url: str) -> str:
+    """Returns the asyncpg form of a Postgres URL (any sync driver suffix is replaced)."""
+    url = make_url(database_url)
+    if url.get_backend_name() != "postgresql":
+        raise ValueError(
+            f"Async database access requires PostgreSQL, got {url.get_backend_name()}"
+        )
+    return url.set(drivername="postgresql+asyncpg").render_as_string(
+        hide_password=False
+    )
+
+
+_async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+_async_sessionmaker_lock = threading.Lock()
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Returns the session factory of the asyncpg engine, creating it on first use.
+
+    Created lazily so importing this module does not require asyncpg (CLI scripts,
+    Alembic, benchmarks only use the sync engine).
+    """
+    global _async_sessionmaker
+    with _async_sessionmaker_lock:
+        if _async_sessionmaker is None:
+            async_engine = create_async_engine(
+                to_async_database_url(settings.database_url),
+                echo=settings.log_sql,
+                hide_parameters=True,
+                pool_pre_ping=True,
+                pool_size=settings.database_async_pool_size,
+                max_overflow=settings.database_async_max_overflow,
+                pool_timeout=settings.database_pool_timeout_seconds,
+            )
+            # Loaded rows are returned after the session closes; never lazy-reload.
+            _async_sessionmaker = async_sessionmaker(
+                async_engine, autoflush=False, expire_on_commit=False
+            )
+        return _async_sessionmaker
+
+
+async def dispose_async_engine() -> None:
+    """Closes the asyncpg pool (application shutdown)."""
+    global _async_sessionmaker
+    with _async_sessionmaker_lock:
+        factory, _async_sessionmaker = _async_sessionmaker, None
+    if factory is not None:
+        await factory.kw["bind"].dispose()
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -1,9 +1,10 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from fastapi import Header
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, get_async_sessionmaker
 
 DEFAULT_USER_ID = "default"
 
@@ -27,3 +28,12 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency for an asyncpg-backed database session.
+
+    Used by hot read paths so queries do not block the event loop serving WebSockets.
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
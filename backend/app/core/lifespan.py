@@ -4,8 +4,13 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from app.core.database import engine
-from app.core.websocket.manager import set_ws_loop
+from app.core.database import dispose_async_engine, engine
+from app.core.run_queue_listener import run_queue_listener
+from app.core.settings import get_settings
+from app.core.websocket.broker import create_broker
+from app.core.websocket.coalescer import ws_event_coalescer
+from app.core.websocket.manager import set_ws_loop, ws_manager
+from app.services.callback_ingestion_service import callback_ingestion_service
 
 logger = logging.getLogger(__name__)
 
@@ -15,10 +20,21 @@ async def lifespan(app: FastAPI):
     """Application lifespan management for database connections."""
     # Startup
     logger.info("Starting application...")
-    set_ws_loop(asyncio.get_running_loop())
+    settings = get_settings()
+    loop = asyncio.get_running_loop()
+    set_ws_loop(loop)
     logger.info("Database engine initialized")
+    if settings.run_queue_listen_enabled:
+        run_queue_listener.start(loop)
+    ws_manager.set_broker(create_broker(settings.ws_broker))
+    ws_manager.broker.start(loop)
     yield
     # Shutdown
+    await callback_ingestion_service.drain()
+    await ws_event_coalescer.flush()
+    run_queue_listener.stop()
+    ws_manager.broker.stop()
     logger.info("Shutting down database engine...")
     engine.dispose()
+    await dispose_async_engine()
     logger.info("Database engine disposed")
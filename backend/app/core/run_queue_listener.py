@@ -0,0 +1,173 @@
+import asyncio
+import logging
+from typing import Any
+
+from app.core.database import engine
+from app.repositories.run_repository import RUN_QUEUE_CHANNEL, RUN_QUEUE_NOTIFY_ANY
+
+logger = logging.getLogger(__name__)
+
+# Reconnect backoff after the LISTEN connection fails (doubles up to the max).
+_RECONNECT_DELAY_SECONDS = 1.0
+_RECONNECT_MAX_DELAY_SECONDS = 30.0
+
+
+class RunQueueListener:
+    """Holds a Postgres LISTEN connection and wakes up run queue long-polls.
+
+    The connection is registered as a reader on the event loop, so an idle listener costs
+    no queries and no threads. Waiters register before they query the queue, which means a
+    NOTIFY that lands while the claim query runs is never missed. When the connection
+    cannot be opened or breaks, it is retried with backoff until it is back (claim
+    long-polls fall back to short waits meanwhile).
+    """
+
+    def __init__(self) -> None:
+        self._raw_connection: Any = None
+        self._dbapi_connection: Any = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._waiters: list[tuple[frozenset[str] | None, asyncio.Future[str]]] = []
+        self._reconnect_handle: asyncio.TimerHandle | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._dbapi_connection is not None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """Open the LISTEN connection (Postgres only). Returns True when listening.
+
+        On failure a reconnect is scheduled, so the listener recovers on its own.
+        """
+        if self._dbapi_connection is not None:
+            return True
+        if engine.dialect.name != "postgresql":
+            logger.info(
+                "run_queue_listener_disabled",
+                extra={"dialect": engine.dialect.name},
+            )
+            return False
+        if self._connect(loop):
+            return True
+        self._schedule_reconnect(loop, _RECONNECT_DELAY_SECONDS)
+        return False
+
+    def _connect(self, loop: asyncio.AbstractEventLoop) -> bool:
+        raw = None
+        try:
+            raw = engine.raw_connection()
+            # Keep this connection out of the pool; it lives for the process lifetime.
+            raw.detach()
+            dbapi_connection = raw.driver_connection
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{RUN_QUEUE_CHANNEL}"')
+            loop.add_reader(dbapi_connection.fileno(), self._on_readable)
+        except Exception as exc:
+            logger.warning("run_queue_listener_start_failed", extra={"error": str(exc)})
+            if raw is not None:
+                # Detached, so the pool would never close it; each retry would leak one.
+                try:
+                    raw.close()
+                except Exception:
+                    pass
+            return False
+
+        self._raw_connection = raw
+        self._dbapi_connection = dbapi_connection
+        self._loop = loop
+        logger.info("run_queue_listener_started", extra={"channel": RUN_QUEUE_CHANNEL})
+        return True
+
+    def stop(self) -> None:
+        if self._reconnect_handle is not None:
+            self._reconnect_handle.cancel()
+            self._reconnect_handle = None
+        self._close()
+
+    def _close(self) -> None:
+        if self._dbapi_connection is None:
+            return
+        if self._loop is not None:
+            try:
+                self._loop.remove_reader(self._dbapi_connection.fileno())
+            except Exception:
+                pass
+        try:
+            self._raw_connection.close()
+        except Exception:
+            pass
+        self._raw_connection = None
+        self._dbapi_connection = None
+        self._loop = None
+        self._wake_all(RUN_QUEUE_NOTIFY_ANY)
+
+    def register(self, schedule_modes: list[str] | None) -> asyncio.Future[str]:
+        """Register interest in the given schedule modes (None = any mode).
+
+        The returned future resolves with the notified schedule mode.
+        """
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        modes = frozenset(schedule_modes) if schedule_modes else None
+        self._waiters.append((modes, future))
+        return future
+
+    def unregister(self, future: asyncio.Future[str]) -> None:
+        self._waiters = [(m, f) for m, f in self._waiters if f is not future]
+        if not future.done():
+            future.cancel()
+
+    def _on_readable(self) -> None:
+        connection = self._dbapi_connection
+        if connection is None:
+            return
+        try:
+            connection.poll()
+        except Exception as exc:
+            logger.warning("run_queue_listener_poll_failed", extra={"error": str(exc)})
+            loop = self._loop
+            self._close()
+            if loop is not None:
+                self._schedule_reconnect(loop, _RECONNECT_DELAY_SECONDS)
+            return
+
+        while connection.notifies:
+            notify = connection.notifies.pop(0)
+            self._wake(str(notify.payload or RUN_QUEUE_NOTIFY_ANY))
+
+    def _schedule_reconnect(
+        self, loop: asyncio.AbstractEventLoop, delay: float
+    ) -> None:
+        if loop.is_closed() or self._reconnect_handle is not None:
+            return
+        self._reconnect_handle = loop.call_later(delay, self._reconnect, loop, delay)
+
+    def _reconnect(self, loop: asyncio.AbstractEventLoop, delay: float) -> None:
+        self._reconnect_handle = None
+        if self._dbapi_connection is not None or self._connect(loop):
+            return
+        self._schedule_reconnect(loop, min(delay * 2, _RECONNECT_MAX_DELAY_SECONDS))
+
+    def _wake(self, schedule_mode: str) -> None:
+        remaining: list[tuple[frozenset[str] | None, asyncio.Future[str]]] = []
+        for modes, future in self._waiters:
+            if future.done():
+                continue
+            if (
+                modes is None
+                or schedule_mode == RUN_QUEUE_NOTIFY_ANY
+                or schedule_mode in modes
+            ):
+                future.set_result(schedule_mode)
+                continue
+            remaining.append((modes, future))
+        self._waiters = remaining
+
+    def _wake_all(self, schedule_mode: str) -> None:
+        for _, future in self._waiters:
+            if not future.done():
+                future.set_result(schedule_mode)
+        self._waiters = []
+
+
+# Global singleton instance
+run_queue_listener = RunQueueListener()
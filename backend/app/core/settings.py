@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -16,6 +17,17 @@ class Settings(BaseSettings):
     port: int = Field(default=8000)
 
     database_url: str = Field(default="sqlite:///./opencowork.db")
+    # Sync engine (most routes, background jobs) and asyncpg engine (hot async routes)
+    # have separate pools; each process may hold up to pool_size + max_overflow of both.
+    database_pool_size: int = Field(default=5, alias="DATABASE_POOL_SIZE")
+    database_max_overflow: int = Field(default=10, alias="DATABASE_MAX_OVERFLOW")
+    database_pool_timeout_seconds: int = Field(
+        default=30, alias="DATABASE_POOL_TIMEOUT_SECONDS"
+    )
+    database_async_pool_size: int = Field(default=10, alias="DATABASE_ASYNC_POOL_SIZE")
+    database_async_max_overflow: int = Field(
+        default=10, alias="DATABASE_ASYNC_MAX_OVERFLOW"
+    )
 
     cors_origins: list[str] = Field(
         default=["http://localhost:3000", "http://127.0.0.1:3000"]
@@ -43,6 +55,10 @@ class Settings(BaseSettings):
     )
     s3_read_timeout_seconds: int = Field(default=60, alias="S3_READ_TIMEOUT_SECONDS")
     s3_max_attempts: int = Field(default=3, alias="S3_MAX_ATTEMPTS")
+    payload_offload_threshold_bytes: int = Field(
+        default=32 * 1024, alias="PAYLOAD_OFFLOAD_THRESHOLD_BYTES"
+    )
+    payload_preview_chars: int = Field(default=2000, alias="PAYLOAD_PREVIEW_CHARS")
     openai_api_key: str = Field(default="", alias="OPENAI_API_KEY")
     openai_base_url: str | None = Field(default=None, alias="OPENAI_BASE_URL")
     openai_default_model: str = Field(
@@ -50,6 +66,76 @@ class Settings(BaseSettings):
     )
     max_upload_size_mb: int = Field(default=100, alias="MAX_UPLOAD_SIZE_MB")
 
+    # WebSocket fan-out across replicas: "memory" (single replica) or "postgres"
+    # (LISTEN/NOTIFY, needed when running more than one backend replica).
+    ws_broker: Literal["memory", "postgres"] = Field(
+        default="memory", alias="WS_BROKER"
+    )
+    # Per-connection send queue. A client whose queue fills up with events that cannot
+    # be dropped, or whose send takes longer than the timeout, is disconnected.
+    ws_send_queue_size: int = Field(default=256, alias="WS_SEND_QUEUE_SIZE")
+    ws_send_timeout_seconds: float = Field(
+        default=10.0, alias="WS_SEND_TIMEOUT_SECONDS"
+    )
+    # Recent events kept per key so reconnecting clients (?since_seq=) receive only
+    # what they missed. Kept for the TTL after the last client leaves.
+    ws_replay_buffer_size: int = Field(default=128, alias="WS_REPLAY_BUFFER_SIZE")
+    ws_replay_ttl_seconds: float = Field(default=300.0, alias="WS_REPLAY_TTL_SECONDS")
+    ws_replay_max_keys: int = Field(default=1000, alias="WS_REPLAY_MAX_KEYS")
+    # SESSION_STATUS/SESSION_PATCH go out at most once per window per session (the
+    # latest state; patches are merged). 0 sends every event.
+    ws_coalesce_window_ms: int = Field(default=100, alias="WS_COALESCE_WINDOW_MS")
+    ws_per_message_deflate: bool = Field(default=True, alias="WS_PER_MESSAGE_DEFLATE")
+
+    # Run queue
+    run_queue_listen_enabled: bool = Field(
+        default=True, alias="RUN_QUEUE_LISTEN_ENABLED"
+    )
+    run_claim_max_wait_seconds: int = Field(
+        default=60, alias="RUN_CLAIM_MAX_WAIT_SECONDS"
+    )
+    run_claim_policy: Literal["fifo", "fair_share"] = Field(
+        default="fifo", alias="RUN_CLAIM_POLICY"
+    )
+    run_claim_user_weights: dict[str, float] = Field(
+        default_factory=dict, alias="RUN_CLAIM_USER_WEIGHTS"
+    )
+    run_claim_max_active_runs_per_user: int = Field(
+        default=0, alias="RUN_CLAIM_MAX_ACTIVE_RUNS_PER_USER"
+    )
+
+    # Callback ingestion
+    callback_ingest_async_enabled: bool = Field(
+        default=True, alias="CALLBACK_INGEST_ASYNC_ENABLED"
+    )
+    callback_ingest_max_batch_size: int = Field(
+        default=100, alias="CALLBACK_INGEST_MAX_BATCH_SIZE"
+    )
+    callback_ingest_linger_ms: int = Field(
+        default=20, alias="CALLBACK_INGEST_LINGER_MS"
+    )
+    callback_ingest_max_concurrency: int = Field(
+        default=4, alias="CALLBACK_INGEST_MAX_CONCURRENCY"
+    )
+    callback_ingest_max_pending: int = Field(
+        default=10000, alias="CALLBACK_INGEST_MAX_PENDING"
+    )
+    callback_session_cache_size: int = Field(
+        default=10000, alias="CALLBACK_SESSION_CACHE_SIZE"
+    )
+    workspace_manifest_cache_max_files: int = Field(
+        default=200000, alias="WORKSPACE_MANIFEST_CACHE_MAX_FILES"
+    )
+
+    # Storage maintenance
+    partition_months_ahead: int = Field(default=2, alias="PARTITION_MONTHS_AHEAD")
+    session_archive_idle_days: int = Field(
+        default=30, alias="SESSION_ARCHIVE_IDLE_DAYS"
+    )
+    session_archive_batch_size: int = Field(
+        default=20, alias="SESSION_ARCHIVE_BATCH_SIZE"
+    )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
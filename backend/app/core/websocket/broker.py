@@ -0,0 +1,275 @@
+# backend/app/core/websocket/broker.py
+import asyncio
+import json
+import logging
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import func, select
+
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+# Delivers an event to this process's connections for a key; returns the send count.
+DeliverFn = Callable[[str, dict[str, Any]], Awaitable[int]]
+
+WS_EVENTS_CHANNEL = "ws_events"
+# NOTIFY payloads are limited to 8000 bytes; larger events are split into chunks. A
+# chunk is JSON re-escaped inside the envelope, which at worst doubles its size.
+_NOTIFY_CHUNK_CHARS = 3800
+# Partially received chunked events kept for reassembly.
+_MAX_PENDING_CHUNKED = 64
+_RECONNECT_DELAY_SECONDS = 1.0
+_RECONNECT_MAX_DELAY_SECONDS = 30.0
+
+
+class WSBroker:
+    """Fans WebSocket events out to every backend replica.
+
+    publish() delivers to this process's connections and forwards the event to the
+    other replicas, each of which delivers it to its own connections.
+    """
+
+    kind = "memory"
+
+    def __init__(self) -> None:
+        self._deliver: DeliverFn | None = None
+
+    @property
+    def distributed(self) -> bool:
+        """True when other processes may hold connections for a key."""
+        return False
+
+    @property
+    def connected(self) -> bool:
+        """False while events from other replicas cannot be received."""
+        return True
+
+    def bind(self, deliver: DeliverFn) -> None:
+        self._deliver = deliver
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> bool:
+        return True
+
+    def stop(self) -> None:
+        return None
+
+    async def publish(self, key: str, event: dict[str, Any]) -> int:
+        """Delivers the event everywhere. Returns the number of local sends."""
+        if self._deliver is None:
+            return 0
+        return await self._deliver(key, event)
+
+
+class InMemoryBroker(WSBroker):
+    """Single-process broker: events only reach this process's connections."""
+
+
+class PostgresBroker(WSBroker):
+    """Broker over Postgres LISTEN/NOTIFY.
+
+    Each replica holds one LISTEN connection registered as a reader on the event loop
+    (like RunQueueListener). Events are delivered locally right away; the replica skips
+    its own notifications when they come back. A lost or failed LISTEN connection is
+    reopened with backoff; meanwhile the broker still counts as distributed (other
+    replicas may hold connections) and keeps publishing, but receives nothing.
+    """
+
+    kind = "postgres"
+
+    def __init__(self, channel: str = WS_EVENTS_CHANNEL) -> None:
+        super().__init__()
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._raw_connection: Any = None
+        self._dbapi_connection: Any = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: OrderedDict[str, list[str | None]] = OrderedDict()
+        self._reconnect_handle: asyncio.TimerHandle | None = None
+        # Set once start() found Postgres; stays set while the connection is down.
+        self._enabled = False
+
+    @property
+    def distributed(self) -> bool:
+        return self._enabled
+
+    @property
+    def connected(self) -> bool:
+        return not self._enabled or self._dbapi_connection is not None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """Open the LISTEN connection (Postgres only). Returns True when listening.
+
+        On failure a reconnect is scheduled, so the broker recovers on its own.
+        """
+        if self._dbapi_connection is not None:
+            return True
+        if engine.dialect.name != "postgresql":
+            logger.info("ws_broker_disabled", extra={"dialect": engine.dialect.name})
+            return False
+        self._enabled = True
+        if self._connect(loop):
+            return True
+        self._schedule_reconnect(loop, _RECONNECT_DELAY_SECONDS)
+        return False
+
+    def _connect(self, loop: asyncio.AbstractEventLoop) -> bool:
+        raw = None
+        try:
+            raw = engine.raw_connection()
+            # Keep this connection out of the pool; it lives for the process lifetime.
+            raw.detach()
+            dbapi_connection = raw.driver_connection
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            loop.add_reader(dbapi_connection.fileno(), self._on_readable)
+        except Exception as exc:
+            logger.warning("ws_broker_start_failed", extra={"error": str(exc)})
+            if raw is not None:
+                # Detached, so the pool would never close it; each retry would leak one.
+                try:
+                    raw.close()
+                except Exception:
+                    pass
+            return False
+
+        self._raw_connection = raw
+        self._dbapi_connection = dbapi_connection
+        self._loop = loop
+        logger.info("ws_broker_started", extra={"channel": self.channel})
+        return True
+
+    def stop(self) -> None:
+        if self._reconnect_handle is not None:
+            self._reconnect_handle.cancel()
+            self._reconnect_handle = None
+        self._enabled = False
+        self._close()
+
+    def _close(self) -> None:
+        if self._dbapi_connection is None:
+            return
+        if self._loop is not None:
+            try:
+                self._loop.remove_reader(self._dbapi_connection.fileno())
+            except Exception:
+                pass
+        try:
+            self._raw_connection.close()
+        except Exception:
+            pass
+        self._raw_connection = None
+        self._dbapi_connection = None
+        self._loop = None
+        self._pending.clear()
+
+    async def publish(self, key: str, event: dict[str, Any]) -> int:
+        sent = await super().publish(key, event)
+        if not self._enabled:
+            return sent
+        try:
+            payloads = self._encode(key, event)
+            await asyncio.to_thread(self._notify, payloads)
+        except Exception as exc:
+            logger.warning(
+                "ws_broker_publish_failed", extra={"key": key, "error": str(exc)}
+            )
+        return sent
+
+    def _encode(self, key: str, event: dict[str, Any]) -> list[str]:
+        # ASCII-only, so the chunk size in characters is also the size in bytes.
+        body = json.dumps({"key": key, "event": event}, default=str)
+        chunks = [
+            body[i : i + _NOTIFY_CHUNK_CHARS]
+            for i in range(0, len(body), _NOTIFY_CHUNK_CHARS)
+        ] or [""]
+        message_id = uuid.uuid4().hex
+        return [
+            json.dumps(
+                {
+                    "o": self.origin,
+                    "m": message_id,
+                    "i": index,
+                    "n": len(chunks),
+                    "d": chunk,
+                }
+            )
+            for index, chunk in enumerate(chunks)
+        ]
+
+    def _notify(self, payloads: list[str]) -> None:
+        # One transaction: the chunks of an event arrive together and in order.
+        with engine.begin() as connection:
+            for payload in payloads:
+                connection.execute(select(func.pg_notify(self.channel, payload)))
+
+    def _on_readable(self) -> None:
+        connection = self._dbapi_connection
+        if connection is None:
+            return
+        try:
+            connection.poll()
+        except Exception as exc:
+            logger.warning("ws_broker_poll_failed", extra={"error": str(exc)})
+            loop = self._loop
+            self._close()
+            if loop is not None:
+                self._schedule_reconnect(loop, _RECONNECT_DELAY_SECONDS)
+            return
+
+        while connection.notifies:
+            notify = connection.notifies.pop(0)
+            try:
+                self._on_notify(str(notify.payload or ""))
+            except Exception as exc:
+                logger.warning("ws_broker_decode_failed", extra={"error": str(exc)})
+
+    def _schedule_reconnect(
+        self, loop: asyncio.AbstractEventLoop, delay: float
+    ) -> None:
+        if loop.is_closed() or self._reconnect_handle is not None:
+            return
+        self._reconnect_handle = loop.call_later(delay, self._reconnect, loop, delay)
+
+    def _reconnect(self, loop: asyncio.AbstractEventLoop, delay: float) -> None:
+        self._reconnect_handle = None
+        if not self._enabled or self._dbapi_connection is not None:
+            return
+        if self._connect(loop):
+            return
+        self._schedule_reconnect(loop, min(delay * 2, _RECONNECT_MAX_DELAY_SECONDS))
+
+    def _on_notify(self, payload: str) -> None:
+        envelope = json.loads(payload)
+        if envelope.get("o") == self.origin:
+            return
+        total = int(envelope["n"])
+        if total == 1:
+            body = envelope["d"]
+        else:
+            message_id = envelope["m"]
+            parts = self._pending.get(message_id)
+            if parts is None:
+                parts = [None] * total
+                self._pending[message_id] = parts
+                while len(self._pending) > _MAX_PENDING_CHUNKED:
+                    self._pending.popitem(last=False)
+            parts[int(envelope["i"])] = envelope["d"]
+            if any(part is None for part in parts):
+                return
+            del self._pending[message_id]
+            body = "".join(part or "" for part in parts)
+
+        message = json.loads(body)
+        if self._deliver is not None and self._loop is not None:
+            self._loop.create_task(self._deliver(message["key"], message["event"]))
+
+
+def create_broker(kind: str) -> WSBroker:
+    if kind == "postgres":
+        return PostgresBroker()
+    return InMemoryBroker()
@@ -0,0 +1,161 @@
+# backend/app/core/websocket/coalescer.py
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.core.settings import get_settings
+from app.core.websocket.events import EventType
+from app.core.websocket.manager import ws_manager
+from app.utils.json_patch import JsonPatchError, apply_patch
+
+logger = logging.getLogger(__name__)
+
+PublishFn = Callable[[str, dict[str, Any]], Awaitable[int]]
+
+
+def merge_status(pending: dict[str, Any], event: dict[str, Any]) -> dict[str, Any]:
+    """SESSION_STATUS carries the whole status: the latest one wins."""
+    return event
+
+
+def merge_patch(
+    pending: dict[str, Any], event: dict[str, Any]
+) -> dict[str, Any] | None:
+    """Folds a SESSION_PATCH into a pending one; None when they cannot be merged.
+
+    A full state_patch replaces whatever is pending. A delta on top of a pending full
+    state is applied to it; a delta on top of a pending delta is appended, and the
+    merged delta records the version it starts from in base_version.
+    """
+    data = event["data"]
+    if data.get("state_patch") is not None:
+        return event
+    pending_data = pending["data"]
+    version = data.get("state_version")
+    pending_version = pending_data.get("state_version")
+    delta = data.get("state_delta")
+    if delta is None or version is None or pending_version != version - 1:
+        return None
+
+    if pending_data.get("state_patch") is not None:
+        try:
+            state = apply_patch(pending_data["state_patch"], delta)
+        except JsonPatchError:
+            return None
+        merged = {"state_version": version, "state_patch": state}
+    elif pending_data.get("state_delta") is not None:
+        merged = {
+            "state_version": version,
+            "base_version": pending_data.get("base_version", pending_version - 1),
+            "state_delta": [*pending_data["state_delta"], *delta],
+        }
+    else:
+        return None
+    return {**event, "data": merged}
+
+
+_MERGERS: dict[str, Callable[..., dict[str, Any] | None]] = {
+    EventType.SESSION_STATUS.value: merge_status,
+    EventType.SESSION_PATCH.value: merge_patch,
+}
+
+
+class _Slot:
+    """Throttle state of one (key, event type)."""
+
+    __slots__ = ("pending", "timer")
+
+    def __init__(self) -> None:
+        self.pending: dict[str, Any] | None = None
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class EventCoalescer:
+    """Rate-limits SESSION_STATUS and SESSION_PATCH per session.
+
+    The first event of a type goes out immediately; events of that type arriving
+    within the next window are merged and the result is published once when the
+    window closes. Other event types (MESSAGE_NEW, ...) are not handled here and keep
+    their order.
+    """
+
+    def __init__(self, publish: PublishFn, window_seconds: float) -> None:
+        self._publish = publish
+        self.window_seconds = window_seconds
+        self._slots: dict[tuple[str, str], _Slot] = {}
+        self._tasks: set[asyncio.Task[Any]] = set()
+        # Frames published, and events folded into another one (metrics).
+        self.published = 0
+        self.merged = 0
+
+    async def submit(self, key: str, event: dict[str, Any]) -> None:
+        event_type = event.get("type")
+        merge = _MERGERS.get(str(event_type))
+        if merge is None or self.window_seconds <= 0:
+            await self._send(key, event)
+            return
+
+        slot_key = (key, str(event_type))
+        slot = self._slots.get(slot_key)
+        if slot is None:
+            # Idle: send now and open a window.
+            slot = _Slot()
+            self._slots[slot_key] = slot
+            self._arm(slot_key, slot)
+            await self._send(key, event)
+            return
+
+        if slot.pending is None:
+            slot.pending = event
+            return
+        merged = merge(slot.pending, event)
+        if merged is not None:
+            self.merged += 1
+            slot.pending = merged
+            return
+        # Not mergeable (e.g. a version gap): keep the order, send what was pending.
+        pending, slot.pending = slot.pending, event
+        await self._send(key, pending)
+
+    def _arm(self, slot_key: tuple[str, str], slot: _Slot) -> None:
+        loop = asyncio.get_running_loop()
+        slot.timer = loop.call_later(self.window_seconds, self._on_window, slot_key)
+
+    def _on_window(self, slot_key: tuple[str, str]) -> None:
+        slot = self._slots.get(slot_key)
+        if slot is None:
+            return
+        if slot.pending is None:
+            # A whole window without events: the next one goes out immediately.
+            del self._slots[slot_key]
+            return
+        event, slot.pending = slot.pending, None
+        self._arm(slot_key, slot)
+        task = asyncio.create_task(self._send(slot_key[0], event))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, key: str, event: dict[str, Any]) -> None:
+        self.published += 1
+        try:
+            await self._publish(key, event)
+        except Exception as e:
+            logger.warning(
+                "ws_coalesced_publish_failed", extra={"key": key, "error": str(e)}
+            )
+
+    async def flush(self) -> None:
+        """Publishes everything pending now (shutdown)."""
+        slots, self._slots = self._slots, {}
+        for (key, _), slot in slots.items():
+            if slot.timer is not None:
+                slot.timer.cancel()
+            if slot.pending is not None:
+                await self._send(key, slot.pending)
+
+
+# Global singleton instance
+ws_event_coalescer = EventCoalescer(
+    ws_manager.broadcast, get_settings().ws_coalesce_window_ms / 1000
+)
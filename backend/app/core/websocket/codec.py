@@ -0,0 +1,90 @@
+# backend/app/core/websocket/codec.py
+import importlib
+import json
+from types import ModuleType
+from typing import Any
+
+# Subprotocols a client may request (Sec-WebSocket-Protocol). Without one, or with
+# "poco.json", broadcast events are JSON text frames; with "poco.msgpack" they are
+# MessagePack binary frames. Direct replies (snapshot, pong, ...) are always JSON text.
+WS_SUBPROTOCOL_JSON = "poco.json"
+WS_SUBPROTOCOL_MSGPACK = "poco.msgpack"
+
+
+def _optional_module(name: str) -> ModuleType | None:
+    """Imports an accelerator declared in pyproject; the codec falls back without it."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+_orjson = _optional_module("orjson")
+_msgpack = _optional_module("msgpack")
+
+
+def _default(value: Any) -> Any:
+    # Every encoder writes datetimes as orjson does natively (ISO 8601).
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_json(event: dict[str, Any]) -> str:
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(
+                event, default=_default, option=_orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except _orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits; the stdlib encoder handles those.
+            pass
+    return json.dumps(
+        event, separators=(",", ":"), ensure_ascii=False, default=_default
+    )
+
+
+def encode_msgpack(event: dict[str, Any]) -> bytes:
+    if _msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return _msgpack.packb(event, use_bin_type=True, default=_default)
+
+
+def negotiate_subprotocol(requested: list[str]) -> str | None:
+    """Picks the subprotocol to accept from the client's list (None: plain JSON)."""
+    if WS_SUBPROTOCOL_MSGPACK in requested and _msgpack is not None:
+        return WS_SUBPROTOCOL_MSGPACK
+    if WS_SUBPROTOCOL_JSON in requested:
+        return WS_SUBPROTOCOL_JSON
+    return None
+
+
+class WSFrame:
+    """One broadcast event, encoded at most once per wire format.
+
+    Every connection of a key receives the same frame, so an event is serialized once
+    however many sockets it goes to (and is reused by the replay buffer).
+    """
+
+    __slots__ = ("event", "_text", "_binary")
+
+    def __init__(self, event: dict[str, Any]) -> None:
+        self.event = event
+        self._text: str | None = None
+        self._binary: bytes | None = None
+
+    @property
+    def type(self) -> Any:
+        return self.event.get("type")
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = encode_json(self.event)
+        return self._text
+
+    @property
+    def binary(self) -> bytes:
+        if self._binary is None:
+            self._binary = encode_msgpack(self.event)
+        return self._binary
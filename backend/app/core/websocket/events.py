@@ -10,6 +10,7 @@ class EventType(str, Enum):
     """WebSocket event types."""
 
     SESSION_SNAPSHOT = "session.snapshot"
+    SESSION_RESUMED = "session.resumed"
     SESSION_STATUS = "session.status"
     SESSION_PROGRESS = "session.progress"
     SESSION_PATCH = "session.patch"
@@ -21,6 +22,8 @@ class EventType(str, Enum):
     WORKSPACE_EXPORT = "workspace.export"
     WORKSPACE_FILES = "workspace.files"
     WORKSPACE_FILE_URL = "workspace.file.url"
+    WORKSPACE_CHILDREN = "workspace.children"
+    WORKSPACE_FILE_URLS = "workspace.file.urls"
     SKILL_IMPORT_JOB = "skill_import.job"
 
 
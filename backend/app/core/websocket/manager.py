@@ -6,6 +6,18 @@ from collections.abc import Coroutine
 
 from fastapi import WebSocket
 
+from app.core.settings import get_settings
+from app.core.websocket.broker import InMemoryBroker, WSBroker
+from app.core.websocket.codec import WS_SUBPROTOCOL_MSGPACK, WSFrame
+from app.core.websocket.events import EventType, WSEvent
+from app.core.websocket.replay import ReplayStore, StreamPosition
+from app.core.websocket.sender import (
+    SEND_LATENCY_BUCKETS_MS,
+    WSSender,
+    WSSendMetrics,
+)
+from app.schemas.websocket import WSLatencyBucket, WSStatsResponse
+
 logger = logging.getLogger(__name__)
 
 _ws_loop: asyncio.AbstractEventLoop | None = None
@@ -36,42 +48,130 @@ def schedule_ws(coro: Coroutine[Any, Any, Any]) -> None:
 
 
 class ConnectionManager:
-    """Manages WebSocket connections grouped by key."""
+    """Manages WebSocket connections grouped by key.
+
+    Connections are local to this process; broadcasts go through the broker so that
+    every replica delivers them to its own connections. Each connection has its own
+    writer (WSSender), so delivery never waits on a client. Events get a per-key
+    sequence number and are kept in a replay buffer, so a reconnecting client can
+    receive only what it missed.
+    """
+
+    # Close code for clients that cannot keep up ("Try Again Later").
+    SLOW_CONSUMER_CLOSE_CODE = 1013
 
-    def __init__(self) -> None:
-        self._connections: dict[str, set[WebSocket]] = {}
+    def __init__(self, broker: WSBroker | None = None) -> None:
+        self._connections: dict[str, dict[WebSocket, WSSender]] = {}
         self._lock: asyncio.Lock | None = None
+        self._metrics = WSSendMetrics()
+        self._closing: set[asyncio.Task[None]] = set()
+        self._replay: ReplayStore | None = None
+        self._broker = broker or InMemoryBroker()
+        self._broker.bind(self._deliver_local)
+
+    def set_broker(self, broker: WSBroker) -> None:
+        """Replace the broker (application startup)."""
+        self._broker.stop()
+        self._broker = broker
+        self._broker.bind(self._deliver_local)
+
+    @property
+    def broker(self) -> WSBroker:
+        return self._broker
 
     def _get_lock(self) -> asyncio.Lock:
         if self._lock is None:
             self._lock = asyncio.Lock()
         return self._lock
 
-    async def connect(self, key: str, websocket: WebSocket) -> None:
-        """Accept and register a WebSocket connection for a key."""
-        await websocket.accept()
+    def _get_replay(self) -> ReplayStore:
+        if self._replay is None:
+            settings = get_settings()
+            self._replay = ReplayStore(
+                size=settings.ws_replay_buffer_size,
+                ttl_seconds=settings.ws_replay_ttl_seconds,
+                max_keys=settings.ws_replay_max_keys,
+            )
+        return self._replay
+
+    async def connect(
+        self,
+        key: str,
+        websocket: WebSocket,
+        *,
+        since: tuple[str, int] | None = None,
+        subprotocol: str | None = None,
+    ) -> StreamPosition:
+        """Accept and register a WebSocket connection for a key.
+
+        since is the (epoch, seq) of the last event the client received. When every
+        later event is still buffered, they are queued ahead of new events, after a
+        SESSION_RESUMED event; otherwise the position is not resumed and the caller
+        sends a snapshot. subprotocol is the one negotiated for the handshake; with
+        MessagePack, broadcast events are sent as binary frames.
+        """
+        await websocket.accept(subprotocol=subprotocol)
+        settings = get_settings()
+        sender = WSSender(
+            key,
+            websocket,
+            max_queue=settings.ws_send_queue_size,
+            send_timeout=settings.ws_send_timeout_seconds,
+            metrics=self._metrics,
+            on_failed=self._on_sender_failed,
+            binary=subprotocol == WS_SUBPROTOCOL_MSGPACK,
+        )
+        sender.start()
         async with self._get_lock():
+            buffer = self._get_replay().attach(key)
+            missed = buffer.since(*since) if since is not None else None
+            if missed is not None:
+                sender.enqueue(
+                    WSFrame(
+                        WSEvent(
+                            type=EventType.SESSION_RESUMED,
+                            session_id=key,
+                            data={
+                                "epoch": buffer.epoch,
+                                "seq": buffer.seq,
+                                "replayed": len(missed),
+                            },
+                        ).to_dict()
+                    )
+                )
+                for frame in missed:
+                    sender.enqueue(frame)
+            position = StreamPosition(
+                epoch=buffer.epoch, seq=buffer.seq, resumed=missed is not None
+            )
             if key not in self._connections:
-                self._connections[key] = set()
-            self._connections[key].add(websocket)
+                self._connections[key] = {}
+            self._connections[key][websocket] = sender
             connection_count = len(self._connections[key])
         logger.info(
             "websocket_connected",
             extra={
                 "key": key,
                 "connection_count": connection_count,
+                "resumed": position.resumed,
+                "replayed": len(missed) if missed is not None else None,
             },
         )
+        return position
 
     async def disconnect(self, key: str, websocket: WebSocket) -> None:
         """Remove a WebSocket connection from a key."""
         remaining = None
+        sender = None
         async with self._get_lock():
             if key in self._connections:
-                self._connections[key].discard(websocket)
+                sender = self._connections[key].pop(websocket, None)
                 remaining = len(self._connections[key])
                 if remaining == 0:
                     del self._connections[key]
+                    self._get_replay().detach(key)
+        if sender is not None:
+            await sender.stop()
         if remaining is not None:
             logger.info(
                 "websocket_disconnected",
@@ -81,41 +181,101 @@ class ConnectionManager:
     async def get_connection_count(self, key: str) -> int:
         """Get the number of active connections for a key."""
         async with self._get_lock():
-            return len(self._connections.get(key, set()))
+            return len(self._connections.get(key, {}))
 
     async def has_connections(self, key: str) -> bool:
         """Check if a key has any active connections."""
         async with self._get_lock():
             return key in self._connections and len(self._connections[key]) > 0
 
+    async def has_listeners(self, key: str) -> bool:
+        """Check if any replica may have connections for a key.
+
+        Other replicas' connections are not tracked, so with a distributed broker this
+        is always True. A key whose clients recently left still has listeners: its
+        events are buffered for them to resume.
+        """
+        if self._broker.distributed:
+            return True
+        async with self._get_lock():
+            return (
+                bool(self._connections.get(key))
+                or self._get_replay().get(key) is not None
+            )
+
     async def broadcast(self, key: str, event: dict[str, Any]) -> int:
-        """Broadcast an event to all connections for a key.
+        """Broadcast an event to all connections for a key, on every replica.
 
-        Returns the number of successful sends.
+        Returns the number of connections on this replica it was queued for.
+        """
+        return await self._broker.publish(key, event)
+
+    async def _deliver_local(self, key: str, event: dict[str, Any]) -> int:
+        """Queue an event on this process's connections for a key.
+
+        The event is wrapped in a single frame shared by every connection, so it is
+        serialized once per wire format rather than once per socket. Returns the
+        number of connections it was queued for.
         """
         async with self._get_lock():
-            connections = list(self._connections.get(key, set()))
-        if not connections:
-            return 0
+            buffer = self._get_replay().get(key)
+            frame = buffer.stamp(event) if buffer is not None else WSFrame(event)
+            senders = list(self._connections.get(key, {}).values())
+            return sum(1 for sender in senders if sender.enqueue(frame))
 
-        dead: list[WebSocket] = []
-        sent = 0
+    def _on_sender_failed(self, sender: WSSender, reason: str) -> None:
+        if reason != "send_failed":
+            self._metrics.slow_disconnects += 1
+            logger.warning(
+                "websocket_slow_consumer",
+                extra={
+                    "key": sender.key,
+                    "reason": reason,
+                    "queue_size": sender.max_queue,
+                },
+            )
+        task = asyncio.create_task(self._close_failed(sender, reason))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
 
-        for ws in connections:
+    async def _close_failed(self, sender: WSSender, reason: str) -> None:
+        await self.disconnect(sender.key, sender.websocket)
+        if reason != "send_failed":
             try:
-                await ws.send_json(event)
-                sent += 1
-            except Exception as e:
-                logger.warning(
-                    "websocket_send_failed",
-                    extra={"key": key, "error": str(e)},
-                )
-                dead.append(ws)
+                await sender.websocket.close(code=self.SLOW_CONSUMER_CLOSE_CODE)
+            except Exception:
+                pass
 
-        for ws in dead:
-            await self.disconnect(key, ws)
-
-        return sent
+    async def get_stats(self) -> WSStatsResponse:
+        """Connection counts, queue depths and send metrics of this replica."""
+        async with self._get_lock():
+            keys = len(self._connections)
+            depths = [
+                sender.queue_depth
+                for senders in self._connections.values()
+                for sender in senders.values()
+            ]
+        metrics = self._metrics
+        upper_bounds: list[float | None] = [
+            float(bound) for bound in SEND_LATENCY_BUCKETS_MS
+        ] + [None]
+        return WSStatsResponse(
+            keys=keys,
+            connections=len(depths),
+            queued_events=sum(depths),
+            max_queue_depth=max(depths, default=0),
+            sent=metrics.sent,
+            dropped=metrics.dropped,
+            coalesced=metrics.coalesced,
+            send_failures=metrics.send_failures,
+            slow_disconnects=metrics.slow_disconnects,
+            broker=self._broker.kind,
+            broker_connected=self._broker.connected,
+            send_latency=[
+                WSLatencyBucket(upper_ms=upper, count=count)
+                for upper, count in zip(upper_bounds, metrics.latency_counts)
+            ],
+        )
 
 
 # Global singleton instance
@@ -0,0 +1,99 @@
+# backend/app/core/websocket/replay.py
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.websocket.codec import WSFrame
+
+
+@dataclass(frozen=True)
+class StreamPosition:
+    """Where a new connection starts in its key's event stream."""
+
+    epoch: str
+    seq: int
+    # True when missed events were replayed; False when the client needs a snapshot.
+    resumed: bool
+
+
+class ReplayBuffer:
+    """Sequence numbers and the most recent events of one key's event stream.
+
+    seq increases by one per event. The epoch identifies this buffer: a client whose
+    epoch differs (another replica, or a buffer that was evicted and recreated) cannot
+    resume from its seq.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.epoch = uuid.uuid4().hex
+        self.seq = 0
+        self._frames: deque[WSFrame] = deque(maxlen=max(1, size))
+        # Set when the last connection for the key leaves; None while connected.
+        self.expires_at: float | None = None
+
+    def stamp(self, event: dict[str, Any]) -> WSFrame:
+        """Returns the event's frame with its seq and epoch, recorded for replay."""
+        self.seq += 1
+        frame = WSFrame({**event, "seq": self.seq, "epoch": self.epoch})
+        self._frames.append(frame)
+        return frame
+
+    def since(self, epoch: str, seq: int) -> list[WSFrame] | None:
+        """Frames after seq, or None when they are no longer all buffered."""
+        if epoch != self.epoch or seq < 0 or seq > self.seq:
+            return None
+        if seq == self.seq:
+            return []
+        if not self._frames or self._frames[0].event["seq"] > seq + 1:
+            return None
+        return [frame for frame in self._frames if frame.event["seq"] > seq]
+
+
+class ReplayStore:
+    """Replay buffers by key.
+
+    A buffer is created when a key gets its first connection and kept for ttl seconds
+    after its last connection leaves, so a reconnecting client can resume. At most
+    max_keys disconnected buffers are kept (least recently used go first).
+    """
+
+    def __init__(self, *, size: int, ttl_seconds: float, max_keys: int) -> None:
+        self.size = size
+        self.ttl_seconds = ttl_seconds
+        self.max_keys = max_keys
+        self._buffers: OrderedDict[str, ReplayBuffer] = OrderedDict()
+
+    def get(self, key: str) -> ReplayBuffer | None:
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            return None
+        if buffer.expires_at is not None and buffer.expires_at <= time.monotonic():
+            del self._buffers[key]
+            return None
+        return buffer
+
+    def attach(self, key: str) -> ReplayBuffer:
+        """Returns the key's buffer for a new connection, creating it if needed."""
+        buffer = self.get(key)
+        if buffer is None:
+            buffer = ReplayBuffer(self.size)
+            self._buffers[key] = buffer
+        buffer.expires_at = None
+        self._buffers.move_to_end(key)
+        return buffer
+
+    def detach(self, key: str) -> None:
+        """Starts the key's expiry (its last connection left)."""
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            return
+        buffer.expires_at = time.monotonic() + self.ttl_seconds
+        self._buffers.move_to_end(key)
+        self._evict()
+
+    def _evict(self) -> None:
+        detached = [k for k, b in self._buffers.items() if b.expires_at is not None]
+        for key in detached[: max(0, len(detached) - self.max_keys)]:
+            del self._buffers[key]
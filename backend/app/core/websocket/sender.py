@@ -0,0 +1,157 @@
+# backend/app/core/websocket/sender.py
+import asyncio
+import bisect
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+
+from fastapi import WebSocket
+
+from app.core.websocket.codec import WSFrame
+from app.core.websocket.events import EventType
+
+logger = logging.getLogger(__name__)
+
+# Superseded by the next event of the same type, so they may be dropped or replaced
+# when a connection falls behind. SESSION_PATCH is versioned and never dropped.
+COALESCIBLE_EVENT_TYPES = frozenset(
+    {EventType.SESSION_STATUS.value, EventType.SESSION_PROGRESS.value}
+)
+# Send latency histogram bounds, in milliseconds.
+SEND_LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class WSSendMetrics:
+    """Process-wide WebSocket send counters and latency histogram."""
+
+    def __init__(self) -> None:
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.send_failures = 0
+        self.slow_disconnects = 0
+        # One count per bucket plus the overflow bucket.
+        self.latency_counts = [0] * (len(SEND_LATENCY_BUCKETS_MS) + 1)
+
+    def observe_send(self, latency_ms: float) -> None:
+        self.sent += 1
+        index = bisect.bisect_right(SEND_LATENCY_BUCKETS_MS, latency_ms)
+        self.latency_counts[index] += 1
+
+
+class WSSender:
+    """Writes events to one WebSocket from a dedicated task through a bounded queue.
+
+    A slow client then only delays itself: broadcasts enqueue and return. When the
+    queue is full, coalescible events supersede a queued event of the same type (which
+    is removed; the new one goes to the tail) or are dropped; any other event marks
+    the connection as a slow consumer, as does a send that exceeds send_timeout.
+    on_failed is called once, and the owner disconnects it.
+
+    Frames are shared by all connections of a key and sent as pre-encoded JSON text,
+    or as MessagePack binary frames when binary is set (negotiated subprotocol).
+    """
+
+    def __init__(
+        self,
+        key: str,
+        websocket: WebSocket,
+        *,
+        max_queue: int,
+        send_timeout: float,
+        metrics: WSSendMetrics,
+        on_failed: Callable[["WSSender", str], None],
+        binary: bool = False,
+    ) -> None:
+        self.key = key
+        self.websocket = websocket
+        self.max_queue = max(1, max_queue)
+        self.send_timeout = send_timeout
+        self._metrics = metrics
+        self._on_failed = on_failed
+        self.binary = binary
+        self._queue: deque[WSFrame] = deque()
+        self._ready = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._failed = False
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task = self._task
+        self._task = None
+        self._queue.clear()
+        if task is None or task is asyncio.current_task():
+            return
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
+
+    def enqueue(self, frame: WSFrame) -> bool:
+        """Queue a frame. Returns False once the connection has failed."""
+        if self._failed:
+            return False
+        if len(self._queue) < self.max_queue:
+            self._queue.append(frame)
+            self._ready.set()
+            return True
+
+        event_type = frame.type
+        if event_type in COALESCIBLE_EVENT_TYPES:
+            for index in range(len(self._queue) - 1, -1, -1):
+                if self._queue[index].type == event_type:
+                    # Drop the superseded frame and queue the new one at the tail:
+                    # frames must leave in seq order, since clients resume from the
+                    # highest seq they received.
+                    del self._queue[index]
+                    self._queue.append(frame)
+                    self._metrics.coalesced += 1
+                    return True
+            self._metrics.dropped += 1
+            return True
+
+        self._fail("queue_full")
+        return False
+
+    async def _run(self) -> None:
+        while True:
+            if not self._queue:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            frame = self._queue.popleft()
+            started = time.perf_counter()
+            try:
+                if self.binary:
+                    send = self.websocket.send_bytes(frame.binary)
+                else:
+                    send = self.websocket.send_text(frame.text)
+                await asyncio.wait_for(send, timeout=self.send_timeout)
+            except asyncio.TimeoutError:
+                self._fail("send_timeout")
+                return
+            except Exception as e:
+                self._metrics.send_failures += 1
+                logger.warning(
+                    "websocket_send_failed",
+                    extra={"key": self.key, "error": str(e)},
+                )
+                self._fail("send_failed")
+                return
+            self._metrics.observe_send((time.perf_counter() - started) * 1000)
+
+    def _fail(self, reason: str) -> None:
+        if self._failed:
+            return
+        self._failed = True
+        self._queue.clear()
+        self._on_failed(self, reason)
@@ -12,6 +12,11 @@ from app.models.skill_import_job import SkillImportJob
 from app.models.slash_command import SlashCommand
 from app.models.tool_execution import ToolExecution
 from app.models.usage_log import UsageLog
+from app.models.usage_rollup import (
+    UsageRunRollup,
+    UsageSessionRollup,
+    UsageUserDailyRollup,
+)
 from app.models.user_mcp_install import UserMcpInstall
 from app.models.user_input_request import UserInputRequest
 from app.models.user_skill_install import UserSkillInstall
@@ -31,6 +36,9 @@ __all__ = [
     "SlashCommand",
     "ToolExecution",
     "UsageLog",
+    "UsageRunRollup",
+    "UsageSessionRollup",
+    "UsageUserDailyRollup",
     "UserMcpInstall",
     "UserInputRequest",
     "UserSkillInstall",
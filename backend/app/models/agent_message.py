@@ -1,7 +1,16 @@
 import uuid
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import JSON, BigInteger, ForeignKey, String, Text
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    ForeignKey,
+    Index,
+    PrimaryKeyConstraint,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base, TimestampMixin
@@ -13,22 +22,45 @@ if TYPE_CHECKING:
 
 class AgentMessage(Base, TimestampMixin):
     __tablename__ = "agent_messages"
+    __table_args__ = (
+        # Monthly range partitions on created_at (see PartitionService); Postgres
+        # requires the partition key in the primary key.
+        PrimaryKeyConstraint("id", "created_at"),
+        # Keyset pagination of a session's messages.
+        Index("ix_agent_messages_session_id_id", "session_id", "id"),
+        # Full-text search over transcripts.
+        Index(
+            "ix_agent_messages_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BigInteger, autoincrement=True)
     session_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("agent_sessions.id", ondelete="CASCADE"), nullable=False
     )
     role: Mapped[str] = mapped_column(String(50), nullable=False)
     content: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
     text_preview: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Written once at insert from the message's text blocks; only search reads it.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, nullable=True, deferred=True
+    )
 
     session: Mapped["AgentSession"] = relationship(back_populates="messages")
+    # Partitioned tables cannot be referenced by foreign keys, so these joins are
+    # declared on the ORM side only.
     tool_executions: Mapped[list["ToolExecution"]] = relationship(
         back_populates="message",
         cascade="all, delete-orphan",
-        foreign_keys="ToolExecution.message_id",
+        primaryjoin="AgentMessage.id == foreign(ToolExecution.message_id)",
     )
     tool_result_executions: Mapped[list["ToolExecution"]] = relationship(
         back_populates="result_message",
-        foreign_keys="ToolExecution.result_message_id",
+        primaryjoin="AgentMessage.id == foreign(ToolExecution.result_message_id)",
     )
+
+    # The ORM identity stays the bare id.
+    __mapper_args__ = {"primary_key": [id]}
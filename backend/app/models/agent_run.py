@@ -6,6 +6,7 @@ from sqlalchemy import (
     BigInteger,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     JSON,
     String,
@@ -26,6 +27,32 @@ if TYPE_CHECKING:
 
 class AgentRun(Base, TimestampMixin):
     __tablename__ = "agent_runs"
+    __table_args__ = (
+        # Claim scan: only queued rows, already in claim order per schedule mode.
+        Index(
+            "ix_agent_runs_queued_claim_order",
+            "schedule_mode",
+            "scheduled_at",
+            "created_at",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        # At most one claimed/running run per session; also serves the
+        # "session has an active run" probe as a tiny index lookup.
+        Index(
+            "uq_agent_runs_active_session",
+            "session_id",
+            unique=True,
+            postgresql_where=text("status IN ('claimed', 'running')"),
+        ),
+        # Keyset pagination of a session's runs; also serves session_id lookups.
+        Index(
+            "ix_agent_runs_session_id_scheduled_at_created_at_id",
+            "session_id",
+            "scheduled_at",
+            "created_at",
+            "id",
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True,
@@ -34,11 +61,10 @@ class AgentRun(Base, TimestampMixin):
     session_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("agent_sessions.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
+    # No foreign key: agent_messages is partitioned (and may be archived).
     user_message_id: Mapped[int] = mapped_column(
         BigInteger,
-        ForeignKey("agent_messages.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
     )
@@ -77,11 +103,17 @@ class AgentRun(Base, TimestampMixin):
     attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
-    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    started_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), index=True
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), index=True
+    )
 
     session: Mapped["AgentSession"] = relationship(back_populates="runs")
-    user_message: Mapped["AgentMessage"] = relationship(foreign_keys=[user_message_id])
+    user_message: Mapped["AgentMessage"] = relationship(
+        primaryjoin="foreign(AgentRun.user_message_id) == AgentMessage.id"
+    )
     scheduled_task: Mapped[Optional["AgentScheduledTask"]] = relationship(
         back_populates="runs"
     )
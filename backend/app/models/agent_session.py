@@ -1,7 +1,19 @@
 import uuid
+from datetime import datetime
 from typing import TYPE_CHECKING, Any, Optional
 
-from sqlalchemy import ForeignKey, JSON, Boolean, String, Text, text
+from sqlalchemy import (
+    ForeignKey,
+    JSON,
+    Boolean,
+    DateTime,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base, TimestampMixin
@@ -17,6 +29,22 @@ if TYPE_CHECKING:
 
 class AgentSession(Base, TimestampMixin):
     __tablename__ = "agent_sessions"
+    __table_args__ = (
+        # Serves the session list: a user's live sessions, newest first.
+        Index(
+            "ix_agent_sessions_user_id_created_at",
+            "user_id",
+            "created_at",
+            postgresql_where=text("is_deleted = false"),
+        ),
+        # Substring/fuzzy title search (pg_trgm).
+        Index(
+            "ix_agent_sessions_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True,
@@ -32,6 +60,7 @@ class AgentSession(Base, TimestampMixin):
     config_snapshot: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
     workspace_archive_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     state_patch: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    state_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
     workspace_files_prefix: Mapped[str | None] = mapped_column(Text, nullable=True)
     workspace_manifest_key: Mapped[str | None] = mapped_column(Text, nullable=True)
     workspace_archive_key: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -51,6 +80,31 @@ class AgentSession(Base, TimestampMixin):
         Boolean, default=False, server_default=text("false"), nullable=False
     )
 
+    # Denormalized summary for the session list, maintained as messages, runs and
+    # usage are written so listing never touches the child tables.
+    message_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default=text("0"), nullable=False
+    )
+    last_message_preview: Mapped[str | None] = mapped_column(Text, nullable=True)
+    last_message_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # No foreign key: agent_runs already references agent_sessions.
+    latest_run_id: Mapped[uuid.UUID | None] = mapped_column(nullable=True)
+    latest_run_status: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    latest_run_progress: Mapped[int] = mapped_column(
+        Integer, default=0, server_default=text("0"), nullable=False
+    )
+    total_cost_usd: Mapped[float] = mapped_column(
+        Numeric(14, 6), default=0, server_default=text("0"), nullable=False
+    )
+    # Set while the session's messages, tool executions and usage logs live in the
+    # S3 archive object instead of the database (see SessionArchiveService).
+    archived_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    archive_key: Mapped[str | None] = mapped_column(Text, nullable=True)
+
     project: Mapped[Optional["Project"]] = relationship(back_populates="sessions")
     messages: Mapped[list["AgentMessage"]] = relationship(
         back_populates="session", cascade="all, delete-orphan"
@@ -3,11 +3,13 @@ from typing import TYPE_CHECKING, Any
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     ForeignKey,
+    Index,
     Integer,
+    PrimaryKeyConstraint,
     String,
-    UniqueConstraint,
     text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -22,38 +24,47 @@ if TYPE_CHECKING:
 class ToolExecution(Base, TimestampMixin):
     __tablename__ = "tool_executions"
     __table_args__ = (
-        UniqueConstraint(
+        # Monthly range partitions on created_at (see PartitionService). A unique
+        # (session_id, tool_use_id) would have to include created_at, so upserts
+        # serialize per session instead (see ToolExecutionRepository).
+        PrimaryKeyConstraint("id", "created_at"),
+        Index(
+            "ix_tool_executions_session_id_tool_use_id",
             "session_id",
             "tool_use_id",
-            name="uq_tool_executions_session_tool_use_id",
         ),
+        # Keyset pagination of a session's tool executions (ids are random UUIDs).
+        Index(
+            "ix_tool_executions_session_id_created_at_id",
+            "session_id",
+            "created_at",
+            "id",
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
-    id: Mapped[uuid.UUID] = mapped_column(
-        primary_key=True, server_default=text("gen_random_uuid()")
-    )
+    id: Mapped[uuid.UUID] = mapped_column(server_default=text("gen_random_uuid()"))
     session_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("agent_sessions.id", ondelete="CASCADE"), nullable=False
     )
-    message_id: Mapped[int] = mapped_column(
-        ForeignKey("agent_messages.id", ondelete="CASCADE"), nullable=False
-    )
+    message_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
     tool_use_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     tool_name: Mapped[str] = mapped_column(String(100), nullable=False)
     tool_input: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
     tool_output: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
-    result_message_id: Mapped[int | None] = mapped_column(
-        ForeignKey("agent_messages.id", ondelete="SET NULL"), nullable=True
-    )
+    result_message_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     is_error: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     session: Mapped["AgentSession"] = relationship(back_populates="tool_executions")
     message: Mapped["AgentMessage"] = relationship(
         back_populates="tool_executions",
-        foreign_keys=[message_id],
+        primaryjoin="foreign(ToolExecution.message_id) == AgentMessage.id",
     )
     result_message: Mapped["AgentMessage"] = relationship(
-        foreign_keys=[result_message_id],
         back_populates="tool_result_executions",
+        primaryjoin="foreign(ToolExecution.result_message_id) == AgentMessage.id",
     )
+
+    # The ORM identity stays the bare id.
+    __mapper_args__ = {"primary_key": [id]}
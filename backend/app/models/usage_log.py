@@ -1,7 +1,15 @@
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Integer, JSON, Numeric, text
+from sqlalchemy import (
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    Numeric,
+    PrimaryKeyConstraint,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base, TimestampMixin
@@ -13,10 +21,14 @@ if TYPE_CHECKING:
 
 class UsageLog(Base, TimestampMixin):
     __tablename__ = "usage_logs"
-
-    id: Mapped[uuid.UUID] = mapped_column(
-        primary_key=True, server_default=text("gen_random_uuid()")
+    __table_args__ = (
+        # Monthly range partitions on created_at (see PartitionService).
+        PrimaryKeyConstraint("id", "created_at"),
+        Index("ix_usage_logs_session_id_created_at", "session_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
+
+    id: Mapped[uuid.UUID] = mapped_column(server_default=text("gen_random_uuid()"))
     session_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("agent_sessions.id", ondelete="CASCADE"), nullable=False
     )
@@ -29,3 +41,6 @@ class UsageLog(Base, TimestampMixin):
 
     session: Mapped["AgentSession"] = relationship(back_populates="usage_logs")
     run: Mapped["AgentRun"] = relationship(back_populates="usage_logs")
+
+    # The ORM identity stays the bare id.
+    __mapper_args__ = {"primary_key": [id]}
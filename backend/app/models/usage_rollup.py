@@ -0,0 +1,69 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, ForeignKey, Integer, Numeric, String, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base, TimestampMixin
+
+# Token counters summed from ResultMessage usage; other usage keys are kept only in
+# usage_logs.usage_json.
+USAGE_TOKEN_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+
+class UsageRollupMixin:
+    result_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default=text("0"), nullable=False
+    )
+    total_cost_usd: Mapped[float] = mapped_column(
+        Numeric(14, 6), default=0, server_default=text("0"), nullable=False
+    )
+    total_duration_ms: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default=text("0"), nullable=False
+    )
+    input_tokens: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default=text("0"), nullable=False
+    )
+    output_tokens: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default=text("0"), nullable=False
+    )
+    cache_creation_input_tokens: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default=text("0"), nullable=False
+    )
+    cache_read_input_tokens: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default=text("0"), nullable=False
+    )
+
+
+class UsageRunRollup(Base, UsageRollupMixin, TimestampMixin):
+    __tablename__ = "usage_run_rollups"
+
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("agent_runs.id", ondelete="CASCADE"), primary_key=True
+    )
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("agent_sessions.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+
+class UsageSessionRollup(Base, UsageRollupMixin, TimestampMixin):
+    __tablename__ = "usage_session_rollups"
+
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("agent_sessions.id", ondelete="CASCADE"), primary_key=True
+    )
+
+
+class UsageUserDailyRollup(Base, UsageRollupMixin, TimestampMixin):
+    __tablename__ = "usage_user_daily_rollups"
+
+    user_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # UTC day the results were reported on.
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
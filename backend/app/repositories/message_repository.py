@@ -1,9 +1,13 @@
 import uuid
 from typing import Any
 
+from sqlalchemy import Row, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.agent_message import AgentMessage
+from app.models.agent_session import AgentSession
+from app.utils.search import SEARCH_TEXT_CONFIG, extract_message_text
 
 
 class MessageRepository:
@@ -17,13 +21,16 @@ class MessageRepository:
         content: dict[str, Any],
         text_preview: str | None = None,
     ) -> AgentMessage:
-        """Creates a new message."""
+        """Creates a new message and indexes its text for search."""
         message = AgentMessage(
             session_id=session_id,
             role=role,
             content=content,
             text_preview=text_preview,
         )
+        search_text = extract_message_text(content)
+        if search_text:
+            message.search_vector = func.to_tsvector(SEARCH_TEXT_CONFIG, search_text)
         session_db.add(message)
         return message
 
@@ -35,19 +42,57 @@ class MessageRepository:
         )
 
     @staticmethod
-    def list_by_session(
-        session_db: Session, session_id: uuid.UUID, limit: int = 100, offset: int = 0
-    ) -> list[AgentMessage]:
-        """Lists messages for a session."""
+    async def get_by_id_async(
+        session_db: AsyncSession, message_id: int
+    ) -> AgentMessage | None:
+        """Gets a message by ID."""
+        return await session_db.get(AgentMessage, message_id)
+
+    @staticmethod
+    def list_by_ids(session_db: Session, message_ids: list[int]) -> list[AgentMessage]:
+        """Gets messages by IDs."""
+        if not message_ids:
+            return []
         return (
             session_db.query(AgentMessage)
-            .filter(AgentMessage.session_id == session_id)
-            .order_by(AgentMessage.created_at.asc())
-            .limit(limit)
-            .offset(offset)
+            .filter(AgentMessage.id.in_(message_ids))
             .all()
         )
 
+    @staticmethod
+    def list_by_session(
+        session_db: Session,
+        session_id: uuid.UUID,
+        limit: int = 100,
+        after_id: int | None = None,
+    ) -> list[AgentMessage]:
+        """Lists messages for a session in id order, starting after after_id.
+
+        Keyset scan on ix_agent_messages_session_id_id, so every page costs the same.
+        """
+        stmt = MessageRepository._list_by_session_stmt(session_id, limit, after_id)
+        return list(session_db.scalars(stmt).all())
+
+    @staticmethod
+    async def list_by_session_async(
+        session_db: AsyncSession,
+        session_id: uuid.UUID,
+        limit: int = 100,
+        after_id: int | None = None,
+    ) -> list[AgentMessage]:
+        """Lists messages for a session in id order, starting after after_id."""
+        stmt = MessageRepository._list_by_session_stmt(session_id, limit, after_id)
+        return list((await session_db.scalars(stmt)).all())
+
+    @staticmethod
+    def _list_by_session_stmt(
+        session_id: uuid.UUID, limit: int | None, after_id: int | None
+    ) -> Select[tuple[AgentMessage]]:
+        stmt = select(AgentMessage).where(AgentMessage.session_id == session_id)
+        if after_id is not None:
+            stmt = stmt.where(AgentMessage.id > after_id)
+        return stmt.order_by(AgentMessage.id.asc()).limit(limit)
+
     @staticmethod
     def count_by_session(session_db: Session, session_id: uuid.UUID) -> int:
         """Counts messages for a session."""
@@ -62,10 +107,45 @@ class MessageRepository:
         session_db: Session, session_id: uuid.UUID, after_id: int
     ) -> list[AgentMessage]:
         """Gets all messages after the specified message ID."""
-        return (
-            session_db.query(AgentMessage)
-            .filter(AgentMessage.session_id == session_id)
-            .filter(AgentMessage.id > after_id)
-            .order_by(AgentMessage.created_at.asc())
-            .all()
+        stmt = MessageRepository._list_by_session_stmt(session_id, None, after_id)
+        return list(session_db.scalars(stmt).all())
+
+    @staticmethod
+    async def get_after_id_async(
+        session_db: AsyncSession, session_id: uuid.UUID, after_id: int
+    ) -> list[AgentMessage]:
+        """Gets all messages after the specified message ID."""
+        stmt = MessageRepository._list_by_session_stmt(session_id, None, after_id)
+        return list((await session_db.scalars(stmt)).all())
+
+    @staticmethod
+    async def search_async(
+        session_db: AsyncSession, user_id: str, query: str, limit: int = 20
+    ) -> list[Row]:
+        """Full-text searches a user's messages, best matches first.
+
+        Returns rows of (id, session_id, session_title, role, text_preview,
+        created_at, rank).
+        """
+        tsquery = func.websearch_to_tsquery(SEARCH_TEXT_CONFIG, query)
+        rank = func.ts_rank_cd(AgentMessage.search_vector, tsquery).label("rank")
+        stmt = (
+            select(
+                AgentMessage.id,
+                AgentMessage.session_id,
+                AgentSession.title.label("session_title"),
+                AgentMessage.role,
+                AgentMessage.text_preview,
+                AgentMessage.created_at,
+                rank,
+            )
+            .join(AgentSession, AgentSession.id == AgentMessage.session_id)
+            .where(
+                AgentMessage.search_vector.bool_op("@@")(tsquery),
+                AgentSession.user_id == user_id,
+                AgentSession.is_deleted.is_(False),
+            )
+            .order_by(rank.desc(), AgentMessage.id.desc())
+            .limit(limit)
         )
+        return list((await session_db.execute(stmt)).all())
@@ -0,0 +1,39 @@
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Tables range-partitioned by month on created_at.
+PARTITIONED_TABLES = ("agent_messages", "tool_executions", "usage_logs")
+
+
+def month_partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+class PartitionRepository:
+    """Data access layer for monthly table partitions."""
+
+    @staticmethod
+    def create_month_partition(session_db: Session, table: str, month: date) -> None:
+        """Creates the partition of table holding rows created in month.
+
+        Does nothing if it already exists. Fails if the default partition already holds
+        rows of that month.
+
+        Note: Does not commit.
+        """
+        if table not in PARTITIONED_TABLES:
+            raise ValueError(f"Not a partitioned table: {table}")
+        name = month_partition_name(table, month)
+        session_db.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d} 00:00:00+00') "
+                f"TO ('{next_month(month):%Y-%m-%d} 00:00:00+00')"
+            )
+        )
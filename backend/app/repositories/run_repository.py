@@ -1,10 +1,61 @@
 import uuid
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import exists, select, update
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    Select,
+    case,
+    cast,
+    exists,
+    func,
+    literal,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, aliased
 
 from app.models.agent_run import AgentRun
+from app.models.agent_session import AgentSession
+
+# Postgres NOTIFY channel used to wake up run queue long-polls.
+RUN_QUEUE_CHANNEL = "agent_run_queue"
+# Payload meaning "any schedule mode may have claimable runs now".
+RUN_QUEUE_NOTIFY_ANY = "*"
+
+RUN_CLAIM_POLICY_FIFO = "fifo"
+RUN_CLAIM_POLICY_FAIR_SHARE = "fair_share"
+
+
+@dataclass(frozen=True)
+class RunClaimPolicy:
+    """Decides which queued runs a claim batch takes first.
+
+    - fifo: earliest scheduled_at first, regardless of who owns the run.
+    - fair_share: weighted fair queueing across users. A candidate's virtual finish
+      time is (user's active runs + its rank among the user's candidates) / weight,
+      so a user with many queued runs cannot starve users with a few.
+
+    max_active_runs_per_user caps claimed+running runs per user under either policy
+    (None/0 = unlimited). The cap is evaluated on the claim snapshot, so concurrent
+    claimers may briefly overshoot it by their batch sizes.
+    """
+
+    name: str = RUN_CLAIM_POLICY_FIFO
+    user_weights: Mapping[str, float] = field(default_factory=dict)
+    default_weight: float = 1.0
+    max_active_runs_per_user: int | None = None
+
+    @property
+    def needs_user_ranking(self) -> bool:
+        return self.name == RUN_CLAIM_POLICY_FAIR_SHARE or bool(
+            self.max_active_runs_per_user
+        )
 
 
 class RunRepository:
@@ -38,30 +89,110 @@ class RunRepository:
         if scheduled_at is not None:
             run.scheduled_at = scheduled_at
         session_db.add(run)
+        RunRepository.notify_queue(session_db, schedule_mode)
         return run
 
+    @staticmethod
+    def notify_queue(session_db: Session, schedule_mode: str) -> None:
+        """Queue a NOTIFY for run queue listeners.
+
+        NOTIFY is transactional in Postgres: it is delivered when the caller commits and
+        dropped on rollback. No-op on other databases.
+        """
+        if session_db.get_bind().dialect.name != "postgresql":
+            return
+        session_db.execute(
+            select(
+                func.pg_notify(RUN_QUEUE_CHANNEL, schedule_mode or RUN_QUEUE_NOTIFY_ANY)
+            )
+        )
+
     @staticmethod
     def get_by_id(session_db: Session, run_id: uuid.UUID) -> AgentRun | None:
         """Gets a run by ID."""
         return session_db.query(AgentRun).filter(AgentRun.id == run_id).first()
 
+    @staticmethod
+    def list_by_ids(session_db: Session, run_ids: list[uuid.UUID]) -> list[AgentRun]:
+        """Gets runs by IDs."""
+        if not run_ids:
+            return []
+        return session_db.query(AgentRun).filter(AgentRun.id.in_(run_ids)).all()
+
     @staticmethod
     def list_by_session(
         session_db: Session,
         session_id: uuid.UUID,
         limit: int = 100,
-        offset: int = 0,
+        after: tuple[datetime, datetime, uuid.UUID] | None = None,
     ) -> list[AgentRun]:
-        """Lists runs for a session."""
+        """Lists runs for a session in (scheduled_at, created_at, id) order.
+
+        after is the (scheduled_at, created_at, id) of the last row of the previous
+        page. Keyset scan on ix_agent_runs_session_id_scheduled_at_created_at_id.
+        """
+        query = session_db.query(AgentRun).filter(AgentRun.session_id == session_id)
+        if after is not None:
+            query = query.filter(
+                tuple_(AgentRun.scheduled_at, AgentRun.created_at, AgentRun.id)
+                > tuple_(*after)
+            )
         return (
-            session_db.query(AgentRun)
-            .filter(AgentRun.session_id == session_id)
-            .order_by(AgentRun.scheduled_at.asc(), AgentRun.created_at.asc())
+            query.order_by(
+                AgentRun.scheduled_at.asc(),
+                AgentRun.created_at.asc(),
+                AgentRun.id.asc(),
+            )
             .limit(limit)
-            .offset(offset)
             .all()
         )
 
+    @staticmethod
+    def list_by_user_message_ids(
+        session_db: Session, session_id: uuid.UUID, user_message_ids: list[int]
+    ) -> list[AgentRun]:
+        """Lists the runs of a session started by the given user messages."""
+        if not user_message_ids:
+            return []
+        stmt = RunRepository._list_by_user_message_ids_stmt(
+            session_id, user_message_ids
+        )
+        return list(session_db.scalars(stmt).all())
+
+    @staticmethod
+    async def list_by_user_message_ids_async(
+        session_db: AsyncSession, session_id: uuid.UUID, user_message_ids: list[int]
+    ) -> list[AgentRun]:
+        """Lists the runs of a session started by the given user messages."""
+        if not user_message_ids:
+            return []
+        stmt = RunRepository._list_by_user_message_ids_stmt(
+            session_id, user_message_ids
+        )
+        return list((await session_db.scalars(stmt)).all())
+
+    @staticmethod
+    def _list_by_user_message_ids_stmt(
+        session_id: uuid.UUID, user_message_ids: list[int]
+    ) -> Select[tuple[AgentRun]]:
+        return select(AgentRun).where(
+            AgentRun.session_id == session_id,
+            AgentRun.user_message_id.in_(user_message_ids),
+        )
+
+    @staticmethod
+    async def get_latest_by_session_async(
+        session_db: AsyncSession, session_id: uuid.UUID
+    ) -> AgentRun | None:
+        """Gets the most recently created run of a session."""
+        result = await session_db.scalars(
+            select(AgentRun)
+            .where(AgentRun.session_id == session_id)
+            .order_by(AgentRun.created_at.desc())
+            .limit(1)
+        )
+        return result.first()
+
     @staticmethod
     def list_by_scheduled_task(
         session_db: Session,
@@ -80,11 +211,140 @@ class RunRepository:
         )
 
     @staticmethod
-    def release_expired_claims(session_db: Session) -> int:
+    def count_queued_by_schedule_mode(
+        session_db: Session, now: datetime
+    ) -> list[tuple[str, int, int, datetime | None]]:
+        """Queued/due counts and oldest due scheduled_at per schedule mode.
+
+        Served by the partial queued-claim index, so the cost follows the queue length
+        rather than the run history.
+        """
+        due = AgentRun.scheduled_at <= now
+        stmt = (
+            select(
+                AgentRun.schedule_mode,
+                func.count(),
+                func.count().filter(due),
+                func.min(AgentRun.scheduled_at).filter(due),
+            )
+            .where(AgentRun.status == "queued")
+            .group_by(AgentRun.schedule_mode)
+            .order_by(AgentRun.schedule_mode)
+        )
+        return [tuple(row) for row in session_db.execute(stmt).all()]
+
+    @staticmethod
+    def next_scheduled_at(
+        session_db: Session, now: datetime, schedule_modes: list[str] | None = None
+    ) -> datetime | None:
+        """Earliest scheduled_at of a queued run that is not due yet.
+
+        Runs becoming due send no NOTIFY, so claim long-polls wait at most until then.
+        Note: Does not commit.
+        """
+        stmt = (
+            select(func.min(AgentRun.scheduled_at))
+            .where(AgentRun.status == "queued")
+            .where(AgentRun.scheduled_at > now)
+        )
+        if schedule_modes:
+            stmt = stmt.where(AgentRun.schedule_mode.in_(schedule_modes))
+        return session_db.execute(stmt).scalar_one_or_none()
+
+    @staticmethod
+    def count_active_by_worker(session_db: Session) -> list[tuple[str, int, int]]:
+        """Claimed/running counts per claimed_by worker."""
+        stmt = (
+            select(
+                AgentRun.claimed_by,
+                func.count().filter(AgentRun.status == "claimed"),
+                func.count().filter(AgentRun.status == "running"),
+            )
+            .where(AgentRun.status.in_(["claimed", "running"]))
+            .where(AgentRun.claimed_by.is_not(None))
+            .group_by(AgentRun.claimed_by)
+            .order_by(AgentRun.claimed_by)
+        )
+        return [tuple(row) for row in session_db.execute(stmt).all()]
+
+    @staticmethod
+    def latency_histogram(
+        session_db: Session,
+        start_column: ColumnElement[datetime],
+        end_column: ColumnElement[datetime],
+        since: datetime,
+        bounds: list[float],
+    ) -> tuple[int, float | None, float | None, list[int]]:
+        """Histogram of end - start (seconds) for runs whose end falls after since.
+
+        Returns (count, p50, p95, bucket_counts); bucket_counts has len(bounds) + 1
+        entries: [0, bounds[0]), [bounds[0], bounds[1]), ..., [bounds[-1], inf).
+        """
+        seconds = cast(func.extract("epoch", end_column - start_column), Float)
+        window = (
+            select(seconds.label("seconds"))
+            .where(end_column >= since)
+            .where(start_column.is_not(None))
+            .subquery("latencies")
+        )
+
+        summary = session_db.execute(
+            select(
+                func.count(),
+                func.percentile_cont(0.5).within_group(window.c.seconds),
+                func.percentile_cont(0.95).within_group(window.c.seconds),
+            ).select_from(window)
+        ).one()
+
+        bucket_counts = [0] * (len(bounds) + 1)
+        if summary[0]:
+            # width_bucket returns 0 below the first bound and len(bounds) past the last,
+            # which lines up with bucket_counts indexes.
+            bucket = func.width_bucket(window.c.seconds, postgresql.array(bounds))
+            rows = session_db.execute(
+                select(bucket, func.count()).select_from(window).group_by(bucket)
+            ).all()
+            for index, count in rows:
+                bucket_counts[int(index)] = count
+
+        return (
+            summary[0],
+            float(summary[1]) if summary[1] is not None else None,
+            float(summary[2]) if summary[2] is not None else None,
+            bucket_counts,
+        )
+
+    @staticmethod
+    def renew_lease(
+        session_db: Session,
+        run_id: uuid.UUID,
+        worker_id: str,
+        lease_seconds: int,
+    ) -> datetime | None:
+        """Extend the lease of a run still claimed by worker_id.
+
+        Returns:
+            The new lease expiry, or None when the run is no longer claimed by the worker.
+        """
+        lease_until = datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)
+        stmt = (
+            update(AgentRun)
+            .where(AgentRun.id == run_id)
+            .where(AgentRun.status == "claimed")
+            .where(AgentRun.claimed_by == worker_id)
+            .values(lease_expires_at=lease_until)
+            .returning(AgentRun.lease_expires_at)
+        )
+        return session_db.connection().execute(stmt).scalar_one_or_none()
+
+    @staticmethod
+    def release_expired_claims(
+        session_db: Session,
+    ) -> list[tuple[uuid.UUID, uuid.UUID]]:
         """Release expired claimed runs back to queued.
 
         Returns:
-            Number of released runs.
+            (run_id, session_id) of each released run.
         """
         now = datetime.now(timezone.utc)
         stmt = (
@@ -93,9 +353,12 @@ class RunRepository:
             .where(AgentRun.lease_expires_at.is_not(None))
             .where(AgentRun.lease_expires_at < now)
             .values(status="queued", claimed_by=None, lease_expires_at=None)
+            .returning(AgentRun.id, AgentRun.session_id)
         )
-        result = session_db.connection().execute(stmt)
-        return result.rowcount
+        released = [tuple(row) for row in session_db.connection().execute(stmt)]
+        if released:
+            RunRepository.notify_queue(session_db, RUN_QUEUE_NOTIFY_ANY)
+        return released
 
     @staticmethod
     def claim_next(
@@ -103,16 +366,44 @@ class RunRepository:
         worker_id: str,
         lease_seconds: int = 30,
         schedule_modes: list[str] | None = None,
+        policy: RunClaimPolicy | None = None,
     ) -> AgentRun | None:
         """Claims the next available run for execution.
 
         Uses SELECT ... FOR UPDATE SKIP LOCKED to support multiple workers.
         Ensures only one claimed/running run per session at a time.
         """
+        runs = RunRepository.claim_batch(
+            session_db,
+            worker_id,
+            max_runs=1,
+            lease_seconds=lease_seconds,
+            schedule_modes=schedule_modes,
+            policy=policy,
+        )
+        return runs[0] if runs else None
+
+    @staticmethod
+    def claim_batch(
+        session_db: Session,
+        worker_id: str,
+        max_runs: int,
+        lease_seconds: int = 30,
+        schedule_modes: list[str] | None = None,
+        policy: RunClaimPolicy | None = None,
+    ) -> list[AgentRun]:
+        """Claims up to max_runs available runs in a single statement.
+
+        Candidates are reduced to the earliest due run per session (DISTINCT ON), so a
+        batch never holds two runs of the same session, and sessions that already have a
+        claimed/running run are skipped. Rows locked by concurrent workers are skipped.
+        The order across sessions (and any per-user cap) comes from the claim policy.
+        """
+        if max_runs <= 0:
+            return []
         if lease_seconds <= 0:
             lease_seconds = 30
-
-        _ = RunRepository.release_expired_claims(session_db)
+        policy = policy or RunClaimPolicy()
 
         now = datetime.now(timezone.utc)
         lease_until = now + timedelta(seconds=lease_seconds)
@@ -125,23 +416,124 @@ class RunRepository:
             .where(running_or_claimed.status.in_(["claimed", "running"]))
         )
 
-        stmt = (
-            select(AgentRun)
+        head_per_session = (
+            select(AgentRun.id)
             .where(AgentRun.status == "queued")
             .where(AgentRun.scheduled_at <= now)
             .where(~has_active_run)
-            .order_by(AgentRun.scheduled_at.asc(), AgentRun.created_at.asc())
-            .with_for_update(skip_locked=True)
-            .limit(1)
+            .distinct(AgentRun.session_id)
+            .order_by(
+                AgentRun.session_id,
+                AgentRun.scheduled_at.asc(),
+                AgentRun.created_at.asc(),
+            )
         )
         if schedule_modes:
-            stmt = stmt.where(AgentRun.schedule_mode.in_(schedule_modes))
+            head_per_session = head_per_session.where(
+                AgentRun.schedule_mode.in_(schedule_modes)
+            )
 
-        run = session_db.execute(stmt).scalars().first()
-        if not run:
-            return None
+        if policy.needs_user_ranking:
+            stmt = RunRepository._user_ranked_claim_stmt(head_per_session, policy)
+        else:
+            stmt = (
+                select(AgentRun)
+                .where(AgentRun.id.in_(head_per_session))
+                .where(AgentRun.status == "queued")
+                .order_by(AgentRun.scheduled_at.asc(), AgentRun.created_at.asc())
+                .with_for_update(skip_locked=True)
+            )
 
-        run.status = "claimed"
-        run.claimed_by = worker_id
-        run.lease_expires_at = lease_until
-        return run
+        runs = list(session_db.execute(stmt.limit(max_runs)).scalars().all())
+        for run in runs:
+            run.status = "claimed"
+            run.claimed_by = worker_id
+            run.lease_expires_at = lease_until
+        return runs
+
+    @staticmethod
+    def _user_ranked_claim_stmt(
+        head_per_session: Select, policy: RunClaimPolicy
+    ) -> Select:
+        """Build the claim select for policies that look at the run owner.
+
+        Session heads are joined to their owner and ranked within the user; the user's
+        current claimed/running count is added so the rank continues from what the user
+        already holds. Everything stays one statement, so SKIP LOCKED still applies.
+        """
+        heads = (
+            head_per_session.add_columns(
+                AgentRun.scheduled_at, AgentRun.created_at, AgentSession.user_id
+            )
+            .join(AgentSession, AgentSession.id == AgentRun.session_id)
+            .subquery("heads")
+        )
+
+        active_run = aliased(AgentRun)
+        active_session = aliased(AgentSession)
+        active_per_user = (
+            select(
+                active_session.user_id,
+                func.count().label("active_runs"),
+            )
+            .select_from(active_run)
+            .join(active_session, active_session.id == active_run.session_id)
+            .where(active_run.status.in_(["claimed", "running"]))
+            .group_by(active_session.user_id)
+            .subquery("active_per_user")
+        )
+
+        user_slot = func.coalesce(
+            active_per_user.c.active_runs, 0
+        ) + func.row_number().over(
+            partition_by=heads.c.user_id,
+            order_by=(heads.c.scheduled_at.asc(), heads.c.created_at.asc()),
+        )
+
+        columns = [heads.c.id, user_slot.label("user_slot")]
+        fair_share = policy.name == RUN_CLAIM_POLICY_FAIR_SHARE
+        if fair_share:
+            columns.append(
+                (
+                    cast(user_slot, Float)
+                    / RunRepository._user_weight(heads.c.user_id, policy)
+                ).label("virtual_finish")
+            )
+
+        ranked = (
+            select(*columns)
+            .select_from(heads)
+            .outerjoin(active_per_user, active_per_user.c.user_id == heads.c.user_id)
+            .subquery("ranked")
+        )
+
+        order_by = [AgentRun.scheduled_at.asc(), AgentRun.created_at.asc()]
+        if fair_share:
+            order_by.insert(0, ranked.c.virtual_finish.asc())
+        stmt = (
+            select(AgentRun)
+            .join(ranked, ranked.c.id == AgentRun.id)
+            .where(AgentRun.status == "queued")
+            .order_by(*order_by)
+            .with_for_update(of=AgentRun, skip_locked=True)
+        )
+        if policy.max_active_runs_per_user:
+            stmt = stmt.where(ranked.c.user_slot <= policy.max_active_runs_per_user)
+        return stmt
+
+    @staticmethod
+    def _user_weight(
+        user_id_column: ColumnElement[str], policy: RunClaimPolicy
+    ) -> ColumnElement[float]:
+        """SQL expression for the fair-share weight of a user (non-positive -> default)."""
+        default_weight = literal(
+            policy.default_weight if policy.default_weight > 0 else 1.0, Float
+        )
+        weights = [
+            (user_id_column == user_id, literal(float(weight), Float))
+            for user_id, weight in policy.user_weights.items()
+            if weight and weight > 0
+        ]
+        if not weights:
+            return default_weight
+        return case(*weights, else_=default_weight)
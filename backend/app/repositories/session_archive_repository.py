@@ -0,0 +1,118 @@
+import uuid
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Table, delete, exists, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.agent_message import AgentMessage
+from app.models.agent_run import AgentRun
+from app.models.agent_session import AgentSession
+from app.models.tool_execution import ToolExecution
+from app.models.usage_log import UsageLog
+
+# Per-session rows moved to the archive, in restore order.
+ARCHIVED_TABLES: tuple[Table, ...] = (
+    AgentMessage.__table__,
+    ToolExecution.__table__,
+    UsageLog.__table__,
+)
+# Derived from other columns; rebuilt on restore instead of archived.
+DERIVED_COLUMNS = frozenset({"search_vector"})
+
+UNFINISHED_RUN_STATUSES = ("queued", "claimed", "running")
+
+
+class SessionArchiveRepository:
+    """Data access layer for archiving session transcripts."""
+
+    @staticmethod
+    def _idle_conditions(idle_before: datetime) -> list[Any]:
+        has_unfinished_run = exists().where(
+            AgentRun.session_id == AgentSession.id,
+            AgentRun.status.in_(UNFINISHED_RUN_STATUSES),
+        )
+        return [
+            AgentSession.archived_at.is_(None),
+            AgentSession.updated_at < idle_before,
+            ~has_unfinished_run,
+        ]
+
+    @staticmethod
+    def list_idle_session_ids(
+        session_db: Session, idle_before: datetime, limit: int
+    ) -> list[uuid.UUID]:
+        """Lists unarchived sessions untouched since idle_before with no pending runs."""
+        stmt = (
+            select(AgentSession.id)
+            .where(*SessionArchiveRepository._idle_conditions(idle_before))
+            .order_by(AgentSession.updated_at.asc())
+            .limit(limit)
+        )
+        return list(session_db.scalars(stmt).all())
+
+    @staticmethod
+    def lock_idle_session(
+        session_db: Session, session_id: uuid.UUID, idle_before: datetime
+    ) -> AgentSession | None:
+        """Locks the session if it is still idle; None if it is not or is locked.
+
+        Note: Does not commit.
+        """
+        stmt = (
+            select(AgentSession)
+            .where(
+                AgentSession.id == session_id,
+                *SessionArchiveRepository._idle_conditions(idle_before),
+            )
+            .with_for_update(skip_locked=True)
+        )
+        return session_db.scalars(stmt).first()
+
+    @staticmethod
+    def lock_archived_session(
+        session_db: Session, session_id: uuid.UUID
+    ) -> AgentSession | None:
+        """Locks the session if it is archived, waiting for a concurrent restore.
+
+        Note: Does not commit.
+        """
+        stmt = (
+            select(AgentSession)
+            .where(
+                AgentSession.id == session_id,
+                AgentSession.archived_at.is_not(None),
+            )
+            .with_for_update()
+        )
+        return session_db.scalars(stmt).first()
+
+    @staticmethod
+    def list_rows(
+        session_db: Session, table: Table, session_id: uuid.UUID
+    ) -> Sequence[Any]:
+        """Lists a session's rows of table as mappings, without derived columns."""
+        columns = [c for c in table.c if c.name not in DERIVED_COLUMNS]
+        stmt = (
+            select(*columns)
+            .where(table.c.session_id == session_id)
+            .order_by(table.c.created_at.asc())
+        )
+        return session_db.execute(stmt).mappings().all()
+
+    @staticmethod
+    def delete_rows(session_db: Session, table: Table, session_id: uuid.UUID) -> None:
+        """Note: Does not commit."""
+        session_db.execute(delete(table).where(table.c.session_id == session_id))
+
+    @staticmethod
+    def insert_rows(
+        session_db: Session, table: Table, rows: list[dict[str, Any]]
+    ) -> None:
+        """Inserts rows (with their original ids) in one multi-VALUES statement.
+
+        Note: Does not commit.
+        """
+        if rows:
+            session_db.execute(insert(table).values(rows))
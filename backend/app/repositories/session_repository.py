@@ -1,9 +1,15 @@
 import uuid
 from typing import Any
 
+from sqlalchemy import Select, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.models.agent_run import AgentRun
 from app.models.agent_session import AgentSession
+from app.utils.search import escape_like
+
+LAST_MESSAGE_PREVIEW_CHARS = 200
 
 
 class SessionRepository:
@@ -32,16 +38,49 @@ class SessionRepository:
         session_db.add(db_session)
         return db_session
 
+    @staticmethod
+    def _get_by_id_stmt(session_id: uuid.UUID) -> Select[tuple[AgentSession]]:
+        return select(AgentSession).where(
+            AgentSession.id == session_id,
+            AgentSession.is_deleted.is_(False),
+        )
+
     @staticmethod
     def get_by_id(session_db: Session, session_id: uuid.UUID) -> AgentSession | None:
         """Gets a session by ID."""
+        return session_db.scalars(SessionRepository._get_by_id_stmt(session_id)).first()
+
+    @staticmethod
+    async def get_by_id_async(
+        session_db: AsyncSession, session_id: uuid.UUID
+    ) -> AgentSession | None:
+        """Gets a session by ID."""
+        result = await session_db.scalars(SessionRepository._get_by_id_stmt(session_id))
+        return result.first()
+
+    @staticmethod
+    def list_by_ids(
+        session_db: Session, session_ids: list[uuid.UUID]
+    ) -> list[AgentSession]:
+        """Gets non-deleted sessions by IDs."""
+        if not session_ids:
+            return []
         return (
             session_db.query(AgentSession)
             .filter(
-                AgentSession.id == session_id,
+                AgentSession.id.in_(session_ids),
                 AgentSession.is_deleted.is_(False),
             )
-            .first()
+            .all()
+        )
+
+    @staticmethod
+    def _get_by_sdk_session_id_stmt(
+        sdk_session_id: str,
+    ) -> Select[tuple[AgentSession]]:
+        return select(AgentSession).where(
+            AgentSession.sdk_session_id == sdk_session_id,
+            AgentSession.is_deleted.is_(False),
         )
 
     @staticmethod
@@ -49,14 +88,36 @@ class SessionRepository:
         session_db: Session, sdk_session_id: str
     ) -> AgentSession | None:
         """Gets a session by SDK session ID."""
-        return (
-            session_db.query(AgentSession)
-            .filter(
-                AgentSession.sdk_session_id == sdk_session_id,
-                AgentSession.is_deleted.is_(False),
-            )
-            .first()
+        return session_db.scalars(
+            SessionRepository._get_by_sdk_session_id_stmt(sdk_session_id)
+        ).first()
+
+    @staticmethod
+    async def get_by_sdk_session_id_async(
+        session_db: AsyncSession, sdk_session_id: str
+    ) -> AgentSession | None:
+        """Gets a session by SDK session ID."""
+        result = await session_db.scalars(
+            SessionRepository._get_by_sdk_session_id_stmt(sdk_session_id)
         )
+        return result.first()
+
+    @staticmethod
+    def _list_stmt(
+        user_id: str | None,
+        limit: int,
+        offset: int,
+        project_id: uuid.UUID | None,
+        kind: str | None,
+    ) -> Select[tuple[AgentSession]]:
+        stmt = select(AgentSession).where(AgentSession.is_deleted.is_(False))
+        if user_id is not None:
+            stmt = stmt.where(AgentSession.user_id == user_id)
+        if kind:
+            stmt = stmt.where(AgentSession.kind == kind)
+        if project_id is not None:
+            stmt = stmt.where(AgentSession.project_id == project_id)
+        return stmt.order_by(AgentSession.created_at.desc()).limit(limit).offset(offset)
 
     @staticmethod
     def list_by_user(
@@ -68,20 +129,8 @@ class SessionRepository:
         kind: str | None = None,
     ) -> list[AgentSession]:
         """Lists sessions for a user."""
-        query = session_db.query(AgentSession).filter(
-            AgentSession.user_id == user_id,
-            AgentSession.is_deleted.is_(False),
-        )
-        if kind:
-            query = query.filter(AgentSession.kind == kind)
-        if project_id is not None:
-            query = query.filter(AgentSession.project_id == project_id)
-        return (
-            query.order_by(AgentSession.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-            .all()
-        )
+        stmt = SessionRepository._list_stmt(user_id, limit, offset, project_id, kind)
+        return list(session_db.scalars(stmt).all())
 
     @staticmethod
     def list_all(
@@ -92,19 +141,41 @@ class SessionRepository:
         kind: str | None = None,
     ) -> list[AgentSession]:
         """Lists all sessions."""
-        query = session_db.query(AgentSession).filter(
-            AgentSession.is_deleted.is_(False)
-        )
-        if kind:
-            query = query.filter(AgentSession.kind == kind)
-        if project_id is not None:
-            query = query.filter(AgentSession.project_id == project_id)
-        return (
-            query.order_by(AgentSession.created_at.desc())
+        stmt = SessionRepository._list_stmt(None, limit, offset, project_id, kind)
+        return list(session_db.scalars(stmt).all())
+
+    @staticmethod
+    async def list_async(
+        session_db: AsyncSession,
+        user_id: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        project_id: uuid.UUID | None = None,
+        kind: str | None = None,
+    ) -> list[AgentSession]:
+        """Lists sessions, optionally only those of user_id."""
+        stmt = SessionRepository._list_stmt(user_id, limit, offset, project_id, kind)
+        return list((await session_db.scalars(stmt)).all())
+
+    @staticmethod
+    async def search_by_title_async(
+        session_db: AsyncSession, user_id: str, query: str, limit: int = 20
+    ) -> list[AgentSession]:
+        """Lists a user's sessions whose title contains query, closest first."""
+        stmt = (
+            select(AgentSession)
+            .where(
+                AgentSession.user_id == user_id,
+                AgentSession.is_deleted.is_(False),
+                AgentSession.title.ilike(f"%{escape_like(query)}%", escape="\\"),
+            )
+            .order_by(
+                func.similarity(AgentSession.title, query).desc(),
+                AgentSession.updated_at.desc(),
+            )
             .limit(limit)
-            .offset(offset)
-            .all()
         )
+        return list((await session_db.scalars(stmt)).all())
 
     @staticmethod
     def count_by_user(session_db: Session, user_id: str) -> int:
@@ -118,6 +189,76 @@ class SessionRepository:
             .count()
         )
 
+    @staticmethod
+    def record_message(db_session: AgentSession, text_preview: str | None) -> None:
+        """Counts a new message in the session summary.
+
+        The count is incremented in SQL, so concurrent writers do not lose updates.
+        Flush before recording another message on the same session.
+
+        Note: Does not commit.
+        """
+        db_session.message_count = AgentSession.message_count + 1
+        db_session.last_message_at = func.now()
+        if text_preview:
+            db_session.last_message_preview = text_preview[:LAST_MESSAGE_PREVIEW_CHARS]
+
+    @staticmethod
+    def record_run(
+        db_session: AgentSession, db_run: AgentRun, *, latest: bool = False
+    ) -> None:
+        """Mirrors a run's status and progress into the session summary.
+
+        Only the session's latest run is mirrored; pass latest=True for a newly
+        created run. The run must be flushed so it has an id.
+
+        Note: Does not commit.
+        """
+        # Avoid older runs overriding the latest run status.
+        if (
+            not latest
+            and db_session.latest_run_id
+            and db_session.latest_run_id != db_run.id
+        ):
+            return
+        db_session.latest_run_id = db_run.id
+        db_session.latest_run_status = db_run.status
+        db_session.latest_run_progress = db_run.progress or 0
+
+    @staticmethod
+    def add_cost(db_session: AgentSession, total_cost_usd: float | None) -> None:
+        """Adds a result's cost to the session summary.
+
+        Note: Does not commit.
+        """
+        if not total_cost_usd:
+            return
+        db_session.total_cost_usd = AgentSession.total_cost_usd + total_cost_usd
+
+    @staticmethod
+    def sync_latest_run_status(
+        session_db: Session,
+        runs: list[tuple[uuid.UUID, uuid.UUID]],
+        status: str,
+    ) -> None:
+        """Sets latest_run_status for bulk-updated (run_id, session_id) pairs.
+
+        Sessions whose latest run is a different run are left alone.
+
+        Note: Does not commit.
+        """
+        if not runs:
+            return
+        run_ids = [run_id for run_id, _ in runs]
+        session_ids = list({session_id for _, session_id in runs})
+        session_db.execute(
+            update(AgentSession)
+            .where(AgentSession.id.in_(session_ids))
+            .where(AgentSession.latest_run_id.in_(run_ids))
+            .values(latest_run_status=status),
+            execution_options={"synchronize_session": False},
+        )
+
     @staticmethod
     def clear_project_id(session_db: Session, project_id: uuid.UUID) -> None:
         session_db.query(AgentSession).filter(
@@ -1,6 +1,24 @@
 import uuid
+from datetime import datetime, timezone
 from typing import Any
 
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Integer,
+    String,
+    case,
+    cast,
+    column,
+    func,
+    insert,
+    null,
+    select,
+    tuple_,
+    update,
+    values,
+)
 from sqlalchemy.orm import Session
 
 from app.models.tool_execution import ToolExecution
@@ -37,6 +55,156 @@ class ToolExecutionRepository:
         session_db.add(tool_execution)
         return tool_execution
 
+    @staticmethod
+    def upsert_for_message(
+        session_db: Session,
+        session_id: uuid.UUID,
+        message_id: int,
+        tool_uses: list[dict[str, Any]],
+        tool_results: list[dict[str, Any]],
+    ) -> int:
+        """Upserts all ToolUse/ToolResult blocks of one message.
+
+        Args:
+            tool_uses: {"tool_use_id", "tool_name", "tool_input"} per ToolUse block.
+            tool_results: {"tool_use_id", "tool_output", "is_error"} per ToolResult block.
+
+        A ToolUse row (re)sets name/input/message; a ToolResult row sets output/error and
+        fills duration_ms from the row's created_at. A result without a known use inserts
+        a placeholder named "unknown" that a later ToolUse completes.
+
+        tool_executions is partitioned by created_at, so (session_id, tool_use_id) cannot
+        be a unique constraint to upsert against. Writers of one session serialize on a
+        transaction-scoped advisory lock instead; under it one UPDATE ... FROM (VALUES
+        ...) updates the rows that exist and one multi-VALUES INSERT adds the rest.
+        Postgres only.
+
+        Note: Does not commit. Transaction handled by Service layer.
+
+        Returns:
+            Number of inserted or updated rows.
+        """
+        # Blocks sharing a tool_use_id are merged into one row first (later blocks win).
+        rows: dict[str, dict[str, Any]] = {}
+        for use in tool_uses:
+            row = rows.setdefault(
+                use["tool_use_id"],
+                {
+                    "tool_output": None,
+                    "result_message_id": None,
+                    "is_error": False,
+                },
+            )
+            row["tool_name"] = use["tool_name"]
+            row["tool_input"] = use.get("tool_input")
+        for result in tool_results:
+            row = rows.setdefault(
+                result["tool_use_id"],
+                {"tool_name": "unknown", "tool_input": None},
+            )
+            row["tool_output"] = result.get("tool_output")
+            row["result_message_id"] = message_id
+            row["is_error"] = bool(result.get("is_error", False))
+        if not rows:
+            return 0
+
+        session_db.execute(
+            select(
+                func.pg_advisory_xact_lock(
+                    func.hashtextextended(f"tool_executions:{session_id}", 0)
+                )
+            )
+        )
+
+        # none_as_null: missing payloads are SQL NULL rather than JSON null.
+        incoming = values(
+            column("tool_use_id", String),
+            column("tool_name", String),
+            column("tool_input", JSON(none_as_null=True)),
+            column("tool_output", JSON(none_as_null=True)),
+            column("result_message_id", BigInteger),
+            column("is_error", Boolean),
+            name="incoming",
+        ).data(
+            [
+                (
+                    tool_use_id,
+                    row["tool_name"],
+                    row["tool_input"],
+                    row["tool_output"],
+                    row["result_message_id"],
+                    row["is_error"],
+                )
+                for tool_use_id, row in rows.items()
+            ]
+        )
+        # A column that is NULL in every row is typed text by Postgres; cast it back.
+        tool_input = cast(incoming.c.tool_input, JSON)
+        tool_output = cast(incoming.c.tool_output, JSON)
+        result_message_id = cast(incoming.c.result_message_id, BigInteger)
+        # Rows carrying a ToolResult have result_message_id set; pure ToolUse rows don't.
+        has_result = result_message_id.is_not(None)
+        table = ToolExecution.__table__
+        now = datetime.now(timezone.utc)
+        updated = set(
+            session_db.scalars(
+                update(table)
+                .where(
+                    table.c.session_id == session_id,
+                    table.c.tool_use_id == incoming.c.tool_use_id,
+                )
+                .values(
+                    tool_name=case(
+                        (incoming.c.tool_name == "unknown", table.c.tool_name),
+                        else_=incoming.c.tool_name,
+                    ),
+                    tool_input=func.coalesce(tool_input, table.c.tool_input),
+                    message_id=case((has_result, table.c.message_id), else_=message_id),
+                    tool_output=case(
+                        (has_result, tool_output), else_=table.c.tool_output
+                    ),
+                    result_message_id=case(
+                        (has_result, result_message_id),
+                        else_=table.c.result_message_id,
+                    ),
+                    is_error=case(
+                        (has_result, incoming.c.is_error), else_=table.c.is_error
+                    ),
+                    duration_ms=case(
+                        (
+                            has_result & table.c.duration_ms.is_(None),
+                            cast(
+                                func.floor(
+                                    func.extract("epoch", now - table.c.created_at)
+                                    * 1000
+                                ),
+                                Integer,
+                            ),
+                        ),
+                        else_=table.c.duration_ms,
+                    ),
+                )
+                .returning(table.c.tool_use_id)
+            )
+        )
+
+        missing = [
+            {
+                "session_id": session_id,
+                "message_id": message_id,
+                "tool_use_id": tool_use_id,
+                **{
+                    key: null() if value is None else value
+                    for key, value in row.items()
+                },
+            }
+            for tool_use_id, row in rows.items()
+            if tool_use_id not in updated
+        ]
+        if missing:
+            session_db.execute(insert(table).values(missing))
+        return len(rows)
+
     @staticmethod
     def get_by_id(session_db: Session, execution_id: uuid.UUID) -> ToolExecution | None:
         """Gets a tool execution by ID."""
@@ -64,15 +232,26 @@ class ToolExecutionRepository:
 
     @staticmethod
     def list_by_session(
-        session_db: Session, session_id: uuid.UUID, limit: int = 100, offset: int = 0
+        session_db: Session,
+        session_id: uuid.UUID,
+        limit: int = 100,
+        after: tuple[datetime, uuid.UUID] | None = None,
     ) -> list[ToolExecution]:
-        """Lists tool executions for a session."""
+        """Lists tool executions for a session in (created_at, id) order.
+
+        after is the (created_at, id) of the last row of the previous page. Keyset scan
+        on ix_tool_executions_session_id_created_at_id.
+        """
+        query = session_db.query(ToolExecution).filter(
+            ToolExecution.session_id == session_id
+        )
+        if after is not None:
+            query = query.filter(
+                tuple_(ToolExecution.created_at, ToolExecution.id) > tuple_(*after)
+            )
         return (
-            session_db.query(ToolExecution)
-            .filter(ToolExecution.session_id == session_id)
-            .order_by(ToolExecution.created_at.asc())
+            query.order_by(ToolExecution.created_at.asc(), ToolExecution.id.asc())
             .limit(limit)
-            .offset(offset)
             .all()
         )
 
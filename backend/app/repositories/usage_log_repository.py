@@ -36,30 +36,39 @@ class UsageLogRepository:
 
     @staticmethod
     def list_by_session(
-        session_db: Session, session_id: uuid.UUID, limit: int = 100, offset: int = 0
+        session_db: Session,
+        session_id: uuid.UUID,
+        limit: int | None = None,
+        offset: int = 0,
     ) -> list[UsageLog]:
-        """Lists usage logs for a session."""
-        return (
+        """Lists usage logs for a session (all of them unless limit is given)."""
+        query = (
             session_db.query(UsageLog)
             .filter(UsageLog.session_id == session_id)
             .order_by(UsageLog.created_at.asc())
-            .limit(limit)
             .offset(offset)
-            .all()
         )
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
 
     @staticmethod
     def list_by_run(
-        session_db: Session, run_id: uuid.UUID, limit: int = 100, offset: int = 0
+        session_db: Session,
+        run_id: uuid.UUID,
+        limit: int | None = None,
+        offset: int = 0,
     ) -> list[UsageLog]:
-        return (
+        """Lists usage logs for a run (all of them unless limit is given)."""
+        query = (
             session_db.query(UsageLog)
             .filter(UsageLog.run_id == run_id)
             .order_by(UsageLog.created_at.asc())
-            .limit(limit)
             .offset(offset)
-            .all()
         )
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
 
     @staticmethod
     def list_by_run_ids(
@@ -0,0 +1,131 @@
+import uuid
+from datetime import date
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.usage_rollup import (
+    USAGE_TOKEN_FIELDS,
+    UsageRunRollup,
+    UsageSessionRollup,
+    UsageUserDailyRollup,
+)
+
+
+class UsageRollupRepository:
+    """Data access layer for pre-aggregated usage (per run, session and user-day)."""
+
+    @staticmethod
+    def _increments(
+        total_cost_usd: float | None,
+        duration_ms: int | None,
+        usage_json: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        increments: dict[str, Any] = {
+            "result_count": 1,
+            "total_cost_usd": float(total_cost_usd or 0),
+            "total_duration_ms": int(duration_ms or 0),
+        }
+        usage = usage_json or {}
+        for field in USAGE_TOKEN_FIELDS:
+            value = usage.get(field)
+            # bool is an int subclass; a flag is not a token count.
+            is_number = isinstance(value, int | float) and not isinstance(value, bool)
+            increments[field] = int(value) if is_number else 0
+        return increments
+
+    @staticmethod
+    def add_result(
+        session_db: Session,
+        *,
+        session_id: uuid.UUID,
+        user_id: str,
+        day: date,
+        run_id: uuid.UUID | None = None,
+        total_cost_usd: float | None = None,
+        duration_ms: int | None = None,
+        usage_json: dict[str, Any] | None = None,
+    ) -> None:
+        """Adds one ResultMessage's usage to the run, session and user-day rollups.
+
+        Each rollup is a single INSERT ... ON CONFLICT DO UPDATE that increments the
+        counters in place, so concurrent results for the same row do not lose updates.
+
+        Note: Does not commit.
+        """
+        increments = UsageRollupRepository._increments(
+            total_cost_usd, duration_ms, usage_json
+        )
+
+        targets: list[tuple[type, dict[str, Any], list[str]]] = [
+            (UsageSessionRollup, {"session_id": session_id}, ["session_id"]),
+            (
+                UsageUserDailyRollup,
+                {"user_id": user_id, "day": day},
+                ["user_id", "day"],
+            ),
+        ]
+        if run_id is not None:
+            targets.insert(
+                0,
+                (
+                    UsageRunRollup,
+                    {"run_id": run_id, "session_id": session_id},
+                    ["run_id"],
+                ),
+            )
+
+        for model, keys, conflict_columns in targets:
+            stmt = insert(model).values(**keys, **increments)
+            table = model.__table__
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_columns,
+                set_={
+                    **{
+                        field: table.c[field] + stmt.excluded[field]
+                        for field in increments
+                    },
+                    "updated_at": func.now(),
+                },
+            )
+            session_db.execute(stmt)
+
+    @staticmethod
+    def get_by_session(
+        session_db: Session, session_id: uuid.UUID
+    ) -> UsageSessionRollup | None:
+        return session_db.get(UsageSessionRollup, session_id)
+
+    @staticmethod
+    def get_by_run(session_db: Session, run_id: uuid.UUID) -> UsageRunRollup | None:
+        return session_db.get(UsageRunRollup, run_id)
+
+    @staticmethod
+    def list_by_run_ids(
+        session_db: Session, run_ids: list[uuid.UUID]
+    ) -> list[UsageRunRollup]:
+        if not run_ids:
+            return []
+        return (
+            session_db.query(UsageRunRollup)
+            .filter(UsageRunRollup.run_id.in_(run_ids))
+            .all()
+        )
+
+    @staticmethod
+    def list_user_daily(
+        session_db: Session, user_id: str, start_day: date, end_day: date
+    ) -> list[UsageUserDailyRollup]:
+        """Lists a user's daily rollups in [start_day, end_day], oldest first."""
+        return (
+            session_db.query(UsageUserDailyRollup)
+            .filter(
+                UsageUserDailyRollup.user_id == user_id,
+                UsageUserDailyRollup.day >= start_day,
+                UsageUserDailyRollup.day <= end_day,
+            )
+            .order_by(UsageUserDailyRollup.day.asc())
+            .all()
+        )
@@ -69,7 +69,37 @@ class AgentCallbackRequest(BaseModel):
     status: CallbackStatus
     progress: int
     new_message: Any | None = None
+    # Full state snapshot; set together with state_version it is a resync point.
     state_patch: AgentCurrentState | None = None
+    # Version of the state after this callback (None: state unchanged / legacy).
+    state_version: int | None = None
+    # JSON Patch from state_version - 1 to state_version (instead of state_patch).
+    state_delta: list[dict[str, Any]] | None = None
+    # Run the executor was dispatched for; None for executors that predate it.
+    run_id: str | None = None
+    sdk_session_id: str | None = None
+    workspace_files_prefix: str | None = None
+    workspace_manifest_key: str | None = None
+    workspace_archive_key: str | None = None
+    workspace_export_status: str | None = None
+
+
+class AgentCallbackBatchRequest(BaseModel):
+    """Several messages of one session delivered in a single callback.
+
+    Messages are applied in order; status, progress, state_patch and the workspace
+    fields describe the state after the last message.
+    """
+
+    session_id: str
+    time: datetime
+    status: CallbackStatus
+    progress: int
+    new_messages: list[Any] = Field(default_factory=list)
+    state_patch: AgentCurrentState | None = None
+    state_version: int | None = None
+    state_delta: list[dict[str, Any]] | None = None
+    run_id: str | None = None
     sdk_session_id: str | None = None
     workspace_files_prefix: str | None = None
     workspace_manifest_key: str | None = None
@@ -84,3 +114,6 @@ class CallbackResponse(BaseModel):
     status: str
     callback_status: CallbackStatus | None = None
     message: str | None = None
+    # A state delta could not be applied (its base version is missing); the sender
+    # should include a full state snapshot in its next callback.
+    state_resync_required: bool = False
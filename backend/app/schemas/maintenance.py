@@ -0,0 +1,21 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class PartitionEnsureResponse(BaseModel):
+    """Monthly partitions created (or already present) and those that failed."""
+
+    ensured: list[str] = Field(default_factory=list)
+    failed: list[str] = Field(default_factory=list)
+
+
+class SessionArchiveRequest(BaseModel):
+    # Defaults to SESSION_ARCHIVE_BATCH_SIZE.
+    limit: int | None = None
+
+
+class SessionArchiveResponse(BaseModel):
+    archived: int
+    session_ids: list[UUID] = Field(default_factory=list)
+    errors: int = 0
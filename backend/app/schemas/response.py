@@ -13,6 +13,16 @@ class ResponseSchema(BaseModel, Generic[T]):
     data: T | None
 
 
+class CursorPage(BaseModel, Generic[T]):
+    """One page of a keyset-paginated listing.
+
+    next_cursor is None on the last page; otherwise pass it back as ?cursor=.
+    """
+
+    items: list[T]
+    next_cursor: str | None = None
+
+
 class Response:
     """Unified API response builder."""
 
@@ -52,6 +52,18 @@ class RunClaimRequest(BaseModel):
     schedule_modes: list[str] | None = None
 
 
+class RunClaimBatchRequest(BaseModel):
+    """Claim a batch of runs request."""
+
+    worker_id: str
+    max_runs: int = Field(default=1, ge=1, le=100)
+    lease_seconds: int = 30
+    schedule_modes: list[str] | None = None
+    # Long-poll: when nothing is claimable, wait up to this many seconds for a queue
+    # notification before returning an empty batch.
+    wait_seconds: float = Field(default=0, ge=0)
+
+
 class RunClaimResponse(BaseModel):
     """Claim next run response for worker dispatch."""
 
@@ -62,6 +74,72 @@ class RunClaimResponse(BaseModel):
     sdk_session_id: str | None = None
 
 
+class RunHeartbeatRequest(BaseModel):
+    """Renew a claimed run's lease request."""
+
+    worker_id: str
+    lease_seconds: int = 30
+
+
+class RunHeartbeatResponse(BaseModel):
+    """Renewed lease info."""
+
+    run_id: UUID
+    lease_expires_at: datetime
+
+
+class RunReleaseExpiredResponse(BaseModel):
+    """Expired claim release result."""
+
+    released: int
+
+
+class RunQueueModeStats(BaseModel):
+    """Queued runs of one schedule mode."""
+
+    schedule_mode: str
+    queued: int
+    due: int
+    oldest_due_age_seconds: float | None = None
+
+
+class RunWorkerStats(BaseModel):
+    """Active runs held by one worker."""
+
+    worker_id: str
+    claimed: int
+    running: int
+
+
+class RunLatencyBucket(BaseModel):
+    """Samples in [previous bound, upper_seconds); upper_seconds=None is the overflow."""
+
+    upper_seconds: float | None = None
+    count: int
+
+
+class RunLatencyHistogram(BaseModel):
+    """Latency distribution over the stats window."""
+
+    count: int
+    p50_seconds: float | None = None
+    p95_seconds: float | None = None
+    buckets: list[RunLatencyBucket]
+
+
+class RunQueueStatsResponse(BaseModel):
+    """Run queue depth, worker occupancy and latency statistics."""
+
+    generated_at: datetime
+    window_seconds: int
+    queue: list[RunQueueModeStats]
+    workers: list[RunWorkerStats]
+    # scheduled_at -> started_at of runs started within the window.
+    claim_to_start: RunLatencyHistogram
+    # started_at -> finished_at of runs finished within the window.
+    start_to_finish: RunLatencyHistogram
+
+
 class RunStartRequest(BaseModel):
     """Mark run as running request."""
 
@@ -0,0 +1,37 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class SessionSearchHit(BaseModel):
+    """A session whose title matched the query."""
+
+    session_id: UUID = Field(validation_alias="id")
+    title: str | None = None
+    status: str
+    last_message_preview: str | None = None
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class MessageSearchHit(BaseModel):
+    """A message whose text matched the query."""
+
+    message_id: int = Field(validation_alias="id")
+    session_id: UUID
+    session_title: str | None = None
+    role: str
+    text_preview: str | None = None
+    created_at: datetime
+    rank: float
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class SearchResponse(BaseModel):
+    """Ranked search hits across a user's sessions and messages."""
+
+    sessions: list[SessionSearchHit]
+    messages: list[MessageSearchHit]
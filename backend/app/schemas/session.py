@@ -55,6 +55,13 @@ class SessionResponse(BaseModel):
     state_patch: AgentCurrentState | None = None
     workspace_export_status: str | None = None
     status: str
+    message_count: int = 0
+    last_message_preview: str | None = None
+    last_message_at: datetime | None = None
+    latest_run_id: UUID | None = None
+    latest_run_status: str | None = None
+    latest_run_progress: int = 0
+    total_cost_usd: float = 0
     created_at: datetime
     updated_at: datetime
 
@@ -1,3 +1,4 @@
+from datetime import date
 from typing import Any
 
 from pydantic import BaseModel
@@ -9,3 +10,10 @@ class UsageResponse(BaseModel):
     total_cost_usd: float | None
     total_duration_ms: int | None
     usage_json: dict[str, Any] | None
+
+
+class UsageDailyResponse(UsageResponse):
+    """Usage of one user on one UTC day."""
+
+    day: date
+    result_count: int
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+
+
+class WSLatencyBucket(BaseModel):
+    """Sends in [previous bound, upper_ms); upper_ms=None is the overflow."""
+
+    upper_ms: float | None = None
+    count: int
+
+
+class WSStatsResponse(BaseModel):
+    """WebSocket connections and send metrics of one backend replica."""
+
+    keys: int
+    connections: int
+    # Events waiting in per-connection send queues.
+    queued_events: int
+    max_queue_depth: int
+    # Counters since process start.
+    sent: int
+    dropped: int
+    coalesced: int
+    send_failures: int
+    slow_disconnects: int
+    # Cross-replica broker ("memory" or "postgres"); while broker_connected is False
+    # this replica does not receive other replicas' events.
+    broker: str
+    broker_connected: bool
+    send_latency: list[WSLatencyBucket]
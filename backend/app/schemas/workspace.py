@@ -1,6 +1,6 @@
 from typing import Any, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class FileNode(BaseModel):
@@ -17,6 +17,35 @@ class FileNode(BaseModel):
     oss_meta: dict[str, Any] | None = None
 
 
+class WorkspaceEntry(BaseModel):
+    """One entry of a workspace directory listing.
+
+    Carries no URL: request URLs for the files being opened via workspace file-urls.
+    """
+
+    id: str
+    name: str
+    type: Literal["file", "folder"]
+    path: str
+    mimeType: str | None = None
+    oss_status: str | None = None
+    oss_meta: dict[str, Any] | None = None
+    # Folders only: number of direct children.
+    child_count: int | None = None
+
+
+class WorkspaceFileUrlsRequest(BaseModel):
+    """Workspace file paths to presign."""
+
+    paths: list[str] = Field(min_length=1, max_length=100)
+
+
+class WorkspaceFileUrlsResponse(BaseModel):
+    """Presigned URLs by normalized path (None when the file is not in the workspace)."""
+
+    urls: dict[str, str | None]
+
+
 class WorkspaceArchiveResponse(BaseModel):
     """Workspace archive download response."""
 
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+
+from app.core.database import SessionLocal
+from app.core.settings import get_settings
+from app.schemas.callback import (
+    AgentCallbackRequest,
+    CallbackResponse,
+    CallbackStatus,
+)
+from app.services.callback_service import CallbackService
+
+logger = logging.getLogger(__name__)
+
+
+class CallbackIngestionService:
+    """Acknowledges executor callbacks immediately and persists them in micro-batches.
+
+    Callbacks are queued per session. Each session has at most one flush task, which
+    drains whatever accumulated (after a short linger) and applies it in arrival order in
+    a single transaction, so a burst of N callbacks costs one commit instead of several
+    per callback. Different sessions flush concurrently, bounded by max_concurrency; the
+    number of queued callbacks is bounded by max_pending, beyond which submit() waits.
+
+    Queued callbacks are lost if the process dies before they are flushed, and the
+    executor does not retry, so only the running message stream is queued: callbacks
+    that change the run's status or carry a full state snapshot or workspace export
+    (see requires_commit_before_ack) are persisted before they are acknowledged.
+    A queued state delta that turns out not to apply is answered on the session's next
+    callback, which asks the executor for a full snapshot (take_state_resync).
+    """
+
+    def __init__(
+        self,
+        *,
+        callback_service: CallbackService | None = None,
+        max_batch_size: int | None = None,
+        linger_seconds: float | None = None,
+        max_concurrency: int | None = None,
+        max_pending: int | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.callback_service = callback_service or CallbackService()
+        self.max_batch_size = max(
+            1, max_batch_size or settings.callback_ingest_max_batch_size
+        )
+        self.linger_seconds = max(
+            0.0,
+            linger_seconds
+            if linger_seconds is not None
+            else settings.callback_ingest_linger_ms / 1000,
+        )
+        self._flush_slots = asyncio.Semaphore(
+            max(1, max_concurrency or settings.callback_ingest_max_concurrency)
+        )
+        self._pending_slots = asyncio.Semaphore(
+            max(1, max_pending or settings.callback_ingest_max_pending)
+        )
+        self._pending: dict[str, list[AgentCallbackRequest]] = {}
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        # Sessions whose queued state delta was rejected, until the executor is told.
+        self._resync_sessions: set[str] = set()
+
+    @staticmethod
+    def requires_commit_before_ack(callback: AgentCallbackRequest) -> bool:
+        """Whether losing this callback would leave the session or run wrong for good."""
+        return (
+            callback.status != CallbackStatus.RUNNING
+            or callback.state_patch is not None
+            or callback.workspace_export_status is not None
+        )
+
+    async def submit(self, callback: AgentCallbackRequest) -> None:
+        """Queue a callback for persistence (waits only when the backlog is full)."""
+        await self._pending_slots.acquire()
+        key = callback.session_id
+        self._pending.setdefault(key, []).append(callback)
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.create_task(self._flush_session(key))
+
+    def take_state_resync(self, session_id: str) -> bool:
+        """Whether a queued delta of the session was rejected since the last call."""
+        if session_id not in self._resync_sessions:
+            return False
+        self._resync_sessions.discard(session_id)
+        return True
+
+    async def flush_session(self, session_id: str) -> None:
+        """Wait until the callbacks queued for a session have been persisted.
+
+        Called before a callback is persisted synchronously, so it lands after them.
+        """
+        while (task := self._tasks.get(session_id)) is not None:
+            await asyncio.gather(asyncio.shield(task), return_exceptions=True)
+
+    async def drain(self) -> None:
+        """Wait until every queued callback has been persisted (shutdown)."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+
+    async def _flush_session(self, key: str) -> None:
+        try:
+            while self._pending.get(key):
+                if self.linger_seconds:
+                    # Let the rest of a burst arrive so it lands in the same batch.
+                    await asyncio.sleep(self.linger_seconds)
+                queued = self._pending[key]
+                batch = queued[: self.max_batch_size]
+                del queued[: self.max_batch_size]
+                try:
+                    async with self._flush_slots:
+                        await asyncio.to_thread(self._persist_batch, batch)
+                finally:
+                    for _ in batch:
+                        self._pending_slots.release()
+        finally:
+            self._pending.pop(key, None)
+            self._tasks.pop(key, None)
+
+    def _persist_batch(self, callbacks: list[AgentCallbackRequest]) -> None:
+        db = SessionLocal()
+        try:
+            try:
+                results = self.callback_service.process_agent_callback_batch(
+                    db, callbacks
+                )
+                self._record_state_resync(callbacks, results)
+                logger.debug(
+                    "callback_batch_persisted",
+                    extra={
+                        "session_id": callbacks[0].session_id,
+                        "batch_size": len(callbacks),
+                    },
+                )
+                return
+            except Exception:
+                db.rollback()
+                if len(callbacks) == 1:
+                    raise
+                logger.warning(
+                    "callback_batch_failed_retrying_individually",
+                    extra={
+                        "session_id": callbacks[0].session_id,
+                        "batch_size": len(callbacks),
+                    },
+                    exc_info=True,
+                )
+
+            # Isolate the failing callback so the rest of the batch is not lost.
+            for callback in callbacks:
+                try:
+                    result = self.callback_service.process_agent_callback(db, callback)
+                    self._record_state_resync([callback], [result])
+                except Exception:
+                    db.rollback()
+                    logger.exception(
+                        "callback_ingest_failed",
+                        extra={
+                            "session_id": callback.session_id,
+                            "status": callback.status.value,
+                        },
+                    )
+        except Exception:
+            logger.exception(
+                "callback_ingest_failed",
+                extra={"session_id": callbacks[0].session_id},
+            )
+        finally:
+            db.close()
+
+    def _record_state_resync(
+        self, callbacks: list[AgentCallbackRequest], results: list[CallbackResponse]
+    ) -> None:
+        for callback, result in zip(callbacks, results):
+            if result.state_resync_required:
+                self._resync_sessions.add(callback.session_id)
+
+
+# Global singleton instance
+callback_ingestion_service = CallbackIngestionService()
@@ -1,28 +1,50 @@
 import logging
 import uuid
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, NamedTuple
 
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app.models.agent_message import AgentMessage
 from app.models.agent_run import AgentRun
+from app.models.agent_session import AgentSession
 from app.repositories.scheduled_task_repository import ScheduledTaskRepository
 from app.repositories.message_repository import MessageRepository
+from app.repositories.run_repository import RUN_QUEUE_NOTIFY_ANY, RunRepository
+from app.repositories.session_repository import SessionRepository
 from app.repositories.tool_execution_repository import ToolExecutionRepository
 from app.repositories.usage_log_repository import UsageLogRepository
+from app.repositories.usage_rollup_repository import UsageRollupRepository
 from app.schemas.callback import (
+    AgentCallbackBatchRequest,
     AgentCallbackRequest,
+    AgentCurrentState,
     CallbackResponse,
     CallbackStatus,
 )
-from app.schemas.session import SessionUpdateRequest
+from app.services.callback_session_cache import (
+    CallbackSessionRef,
+    callback_session_cache,
+)
+from app.services.payload_store_service import payload_store_service
 from app.services.session_service import SessionService
 from app.core.websocket.manager import schedule_ws
+from app.utils.json_patch import JsonPatchError, apply_patch, make_patch
 
 logger = logging.getLogger(__name__)
 
 
+class _AppliedCallback(NamedTuple):
+    """A callback applied in the current transaction, pending its broadcast."""
+
+    callback: AgentCallbackRequest
+    message: AgentMessage | None
+    # SESSION_PATCH payload, None when the state did not change.
+    state_update: dict[str, Any] | None
+    current_step: str | None
+
+
 class CallbackService:
     """Service layer for processing executor callbacks."""
 
@@ -100,6 +122,8 @@ class CallbackService:
         if not isinstance(content, list):
             return
 
+        tool_uses: list[dict[str, Any]] = []
+        tool_results: list[dict[str, Any]] = []
         for block in content:
             if not isinstance(block, dict):
                 continue
@@ -109,84 +133,66 @@ class CallbackService:
             if "ToolUseBlock" in block_type:
                 tool_use_id = block.get("id")
                 tool_name = block.get("name")
-                tool_input = block.get("input")
-
                 if not tool_use_id or not tool_name:
                     continue
-
-                existing = ToolExecutionRepository.get_by_session_and_tool_use_id(
-                    session_db=session_db,
-                    session_id=session_id,
-                    tool_use_id=tool_use_id,
-                )
-                if existing:
-                    existing.tool_name = tool_name
-                    existing.tool_input = tool_input
-                    existing.message_id = message_id
-                    logger.debug(
-                        f"Updated tool execution (tool_use_id={tool_use_id}) in message {message_id}"
-                    )
-                    continue
-
-                ToolExecutionRepository.create(
-                    session_db=session_db,
-                    session_id=session_id,
-                    message_id=message_id,
-                    tool_use_id=tool_use_id,
-                    tool_name=tool_name,
-                    tool_input=tool_input,
-                )
-                logger.debug(
-                    f"Created tool execution (tool_use_id={tool_use_id}, tool={tool_name}) in message {message_id}"
+                tool_uses.append(
+                    {
+                        "tool_use_id": tool_use_id,
+                        "tool_name": tool_name,
+                        "tool_input": block.get("input"),
+                    }
                 )
 
             elif "ToolResultBlock" in block_type:
                 tool_use_id = block.get("tool_use_id")
-                result_content = block.get("content")
-                is_error = block.get("is_error", False)
-
                 if not tool_use_id:
                     continue
-
-                tool_output = {"content": result_content} if result_content else None
-                existing = ToolExecutionRepository.get_by_session_and_tool_use_id(
-                    session_db=session_db,
-                    session_id=session_id,
-                    tool_use_id=tool_use_id,
+                result_content = block.get("content")
+                tool_results.append(
+                    {
+                        "tool_use_id": tool_use_id,
+                        "tool_output": {"content": result_content}
+                        if result_content
+                        else None,
+                        "is_error": bool(block.get("is_error", False)),
+                    }
                 )
 
-                if not existing:
-                    ToolExecutionRepository.create(
-                        session_db=session_db,
-                        session_id=session_id,
-                        message_id=message_id,
-                        tool_use_id=tool_use_id,
-                        tool_name="unknown",
-                        tool_output=tool_output,
-                        result_message_id=message_id,
-                        is_error=bool(is_error),
-                    )
-                    logger.debug(
-                        f"Created tool execution placeholder (tool_use_id={tool_use_id}) in message {message_id}"
-                    )
-                    continue
-
-                existing.tool_output = tool_output
-                existing.result_message_id = message_id
-                existing.is_error = bool(is_error)
-
-                if existing.duration_ms is None and existing.created_at is not None:
-                    duration = datetime.now(timezone.utc) - existing.created_at
-                    existing.duration_ms = int(duration.total_seconds() * 1000)
+        if not tool_uses and not tool_results:
+            return
 
-                logger.debug(
-                    f"Updated tool execution result (tool_use_id={tool_use_id}) in message {message_id}"
-                )
+        upserted = ToolExecutionRepository.upsert_for_message(
+            session_db=session_db,
+            session_id=session_id,
+            message_id=message_id,
+            tool_uses=tool_uses,
+            tool_results=tool_results,
+        )
+        logger.debug(
+            "tool_executions_upserted",
+            extra={
+                "session_id": str(session_id),
+                "message_id": message_id,
+                "tool_uses": len(tool_uses),
+                "tool_results": len(tool_results),
+                "rows": upserted,
+            },
+        )
 
     def _extract_and_persist_usage(
-        self, db: Session, session_id: uuid.UUID, message: dict[str, Any]
+        self,
+        db: Session,
+        db_session: AgentSession,
+        message: dict[str, Any],
+        db_run: AgentRun | None,
     ) -> None:
-        """Extracts and persists usage data from a ResultMessage."""
+        """Extracts and persists usage data from a ResultMessage.
+
+        Besides the raw usage log, the run, session and user-day rollups are
+        incremented so usage reads never scan the logs.
+
+        Note: Does not commit. The caller commits the whole callback (or batch).
+        """
         message_type = message.get("_type", "")
 
         if "ResultMessage" not in message_type:
@@ -194,20 +200,13 @@ class CallbackService:
 
         usage_data = message.get("usage")
         if not usage_data or not isinstance(usage_data, dict):
-            logger.debug(f"No usage data in ResultMessage for session {session_id}")
+            logger.debug(f"No usage data in ResultMessage for session {db_session.id}")
             return
 
         total_cost_usd = message.get("total_cost_usd")
         duration_ms = message.get("duration_ms")
 
-        db_run = (
-            db.query(AgentRun)
-            .filter(AgentRun.session_id == session_id)
-            .filter(AgentRun.status.in_(["claimed", "running"]))
-            .order_by(AgentRun.created_at.desc())
-            .first()
-        )
-
+        session_id = db_session.id
         UsageLogRepository.create(
             session_db=db,
             session_id=session_id,
@@ -216,7 +215,17 @@ class CallbackService:
             duration_ms=duration_ms,
             usage_json=usage_data,
         )
-        db.commit()
+        UsageRollupRepository.add_result(
+            db,
+            session_id=session_id,
+            user_id=db_session.user_id,
+            day=datetime.now(timezone.utc).date(),
+            run_id=db_run.id if db_run else None,
+            total_cost_usd=total_cost_usd,
+            duration_ms=duration_ms,
+            usage_json=usage_data,
+        )
+        SessionRepository.add_cost(db_session, total_cost_usd)
 
         input_tokens = usage_data.get("input_tokens")
         output_tokens = usage_data.get("output_tokens")
@@ -234,8 +243,16 @@ class CallbackService:
         )
 
     def _persist_message_and_tools(
-        self, db: Session, session_id: uuid.UUID, message: dict[str, Any]
+        self, db: Session, db_session: AgentSession, message: dict[str, Any]
     ) -> "AgentMessage":
+        """Persists a message and its tool executions.
+
+        Oversized tool results are offloaded to blob storage first, so the message
+        row, the tool execution rows and the MESSAGE_NEW broadcast carry references.
+
+        Note: Does not commit. The caller commits the whole callback (or batch).
+        """
+        message = payload_store_service.offload_message(message)
         role = self._extract_role_from_message(message)
 
         text_preview = None
@@ -246,6 +263,7 @@ class CallbackService:
                     text_preview = block.get("text", "")[:500]
                     break
 
+        session_id = db_session.id
         db_message = MessageRepository.create(
             session_db=db,
             session_id=session_id,
@@ -253,12 +271,12 @@ class CallbackService:
             content=message,
             text_preview=text_preview,
         )
+        SessionRepository.record_message(db_session, text_preview)
 
         db.flush()
 
         self._extract_tool_executions(db, message, session_id, db_message.id)
 
-        db.commit()
         logger.debug(
             "message_persisted",
             extra={
@@ -269,23 +287,152 @@ class CallbackService:
         )
         return db_message
 
-    def process_agent_callback(
-        self, db: Session, callback: AgentCallbackRequest
-    ) -> CallbackResponse:
-        session_service = SessionService()
-        db_session = session_service.find_session_by_sdk_id_or_uuid(
-            db, callback.session_id
+    @staticmethod
+    def _get_active_run(db: Session, session_id: uuid.UUID) -> AgentRun | None:
+        return (
+            db.query(AgentRun)
+            .filter(AgentRun.session_id == session_id)
+            .filter(AgentRun.status.in_(["claimed", "running"]))
+            .order_by(AgentRun.created_at.desc())
+            .first()
+        )
+
+    @staticmethod
+    def _resolve_session(db: Session, key: str) -> AgentSession | None:
+        """Finds the callback's session, by primary key when the key is cached."""
+        cached = callback_session_cache.get(key)
+        if cached is not None:
+            db_session = db.get(AgentSession, cached.session_id)
+            if db_session is not None and not db_session.is_deleted:
+                return db_session
+            callback_session_cache.invalidate(key)
+
+        db_session = SessionService().find_session_by_sdk_id_or_uuid(db, key)
+        if db_session is not None:
+            callback_session_cache.put(
+                key, CallbackSessionRef(session_id=db_session.id)
+            )
+        return db_session
+
+    def _resolve_active_run(
+        self, db: Session, callback: AgentCallbackRequest, db_session: AgentSession
+    ) -> AgentRun | None:
+        """Finds the run a callback reports on.
+
+        Callbacks carrying run_id resolve it by primary key; a run that is no longer
+        active is not replaced by a newer one, so late callbacks of a finished run do
+        not leak into the next run. Legacy callbacks use the cached active run and fall
+        back to the latest claimed/running run of the session.
+        """
+        run_id: uuid.UUID | None = None
+        if callback.run_id:
+            try:
+                run_id = uuid.UUID(callback.run_id)
+            except ValueError:
+                logger.warning(
+                    "callback_run_id_invalid",
+                    extra={"session_id": str(db_session.id), "run_id": callback.run_id},
+                )
+
+        cached = callback_session_cache.get(callback.session_id)
+        candidate = run_id or (cached.run_id if cached is not None else None)
+        db_run = db.get(AgentRun, candidate) if candidate is not None else None
+        if (
+            db_run is None
+            or db_run.session_id != db_session.id
+            or db_run.status not in ("claimed", "running")
+        ):
+            db_run = None
+            if run_id is None:
+                db_run = self._get_active_run(db, db_session.id)
+
+        callback_session_cache.put(
+            callback.session_id,
+            CallbackSessionRef(
+                session_id=db_session.id, run_id=db_run.id if db_run else None
+            ),
         )
+        return db_run
+
+    @staticmethod
+    def _apply_state(
+        db_session: AgentSession, callback: AgentCallbackRequest
+    ) -> tuple[dict[str, Any] | None, bool]:
+        """Applies the callback's state snapshot or delta to the session.
+
+        A delta applies only on top of the version it was computed from. On a gap, or
+        when it does not apply, it is rejected and the state left as is until the next
+        full snapshot, which the sender is asked for.
+
+        Returns:
+            The SESSION_PATCH payload (None when nothing changed), and whether a full
+            snapshot is required.
+        """
+        version = callback.state_version
+
+        if callback.state_patch is not None:
+            state = callback.state_patch.model_dump(mode="json")
+            db_session.state_patch = state
+            db_session.state_version = version
+            return {"state_version": version, "state_patch": state}, False
+
+        if callback.state_delta is None or version is None:
+            return None, False
+
+        current = db_session.state_patch
+        if current is None or db_session.state_version != version - 1:
+            logger.warning(
+                "state_patch_version_gap",
+                extra={
+                    "session_id": str(db_session.id),
+                    "state_version": version,
+                    "stored_state_version": db_session.state_version,
+                },
+            )
+            return None, True
 
+        try:
+            state = AgentCurrentState.model_validate(
+                apply_patch(current, callback.state_delta)
+            ).model_dump(mode="json")
+        except (JsonPatchError, ValidationError):
+            logger.warning(
+                "state_delta_apply_failed",
+                extra={"session_id": str(db_session.id), "state_version": version},
+                exc_info=True,
+            )
+            return None, True
+
+        db_session.state_patch = state
+        db_session.state_version = version
+        # Re-diff the normalized states so clients end up with exactly what is stored.
+        return {
+            "state_version": version,
+            "state_delta": make_patch(current, state),
+        }, False
+
+    def _apply_agent_callback(
+        self,
+        db: Session,
+        callback: AgentCallbackRequest,
+        db_session: AgentSession | None,
+    ) -> tuple[CallbackResponse, _AppliedCallback | None]:
+        """Applies one callback to the current transaction without committing.
+
+        Changes are flushed so a following callback in the same transaction sees them.
+        """
         if not db_session:
             logger.warning(
                 "callback_session_not_found",
                 extra={"callback_session_id": callback.session_id},
             )
-            return CallbackResponse(
-                session_id=callback.session_id,
-                status="callback_received",
-                message="Session not found yet",
+            return (
+                CallbackResponse(
+                    session_id=callback.session_id,
+                    status="callback_received",
+                    message="Session not found yet",
+                ),
+                None,
             )
 
         derived_sdk_session_id = callback.sdk_session_id
@@ -313,9 +460,6 @@ class CallbackService:
         ]:
             update_data["status"] = callback.status.value
 
-        if callback.state_patch is not None:
-            update_data["state_patch"] = callback.state_patch.model_dump(mode="json")
-
         if callback.workspace_files_prefix is not None:
             update_data["workspace_files_prefix"] = callback.workspace_files_prefix
         if callback.workspace_manifest_key is not None:
@@ -326,9 +470,9 @@ class CallbackService:
             update_data["workspace_export_status"] = callback.workspace_export_status
 
         if update_data:
-            db_session = session_service.update_session(
-                db, db_session.id, SessionUpdateRequest(**update_data)
-            )
+            # Plain column updates; SessionService.update_session would commit per call.
+            for field, value in update_data.items():
+                setattr(db_session, field, value)
             if "sdk_session_id" in update_data:
                 logger.info(
                     "session_sdk_session_id_updated",
@@ -347,21 +491,22 @@ class CallbackService:
                     },
                 )
 
+        state_update, state_resync_required = self._apply_state(db_session, callback)
+
+        db_run = self._resolve_active_run(db, callback, db_session)
+
         db_message = None
         if callback.new_message:
-            db_message = self._persist_message_and_tools(db, db_session.id, callback.new_message)
+            db_message = self._persist_message_and_tools(
+                db, db_session, callback.new_message
+            )
             # Extract and persist usage data if this is a ResultMessage
-            self._extract_and_persist_usage(db, db_session.id, callback.new_message)
-
-        db_run = (
-            db.query(AgentRun)
-            .filter(AgentRun.session_id == db_session.id)
-            .filter(AgentRun.status.in_(["claimed", "running"]))
-            .order_by(AgentRun.created_at.desc())
-            .first()
-        )
+            self._extract_and_persist_usage(
+                db, db_session, callback.new_message, db_run
+            )
 
         if db_run:
+            run_status = db_run.status
             db_run.progress = int(callback.progress or 0)
 
             if callback.status == CallbackStatus.RUNNING and db_run.status == "claimed":
@@ -374,16 +519,130 @@ class CallbackService:
                 db_run.finished_at = datetime.now(timezone.utc)
                 if callback.status == CallbackStatus.COMPLETED:
                     db_run.progress = 100
+                # The session is free again; its next queued run may now be claimable.
+                RunRepository.notify_queue(db, RUN_QUEUE_NOTIFY_ANY)
 
-            self._sync_scheduled_task_last_status(db, db_run)
-        db.commit()
+            SessionRepository.record_run(db_session, db_run)
+            # Claim/start/fail sync in RunService; only status changes here need it.
+            if db_run.status != run_status:
+                self._sync_scheduled_task_last_status(db, db_run)
+
+        if callback.status in [CallbackStatus.COMPLETED, CallbackStatus.FAILED]:
+            callback_session_cache.invalidate(callback.session_id)
+        db.flush()
 
-        # Broadcast to WebSocket clients
+        return (
+            CallbackResponse(
+                session_id=str(db_session.id),
+                status=db_session.status,
+                callback_status=callback.status,
+                state_resync_required=state_resync_required,
+            ),
+            _AppliedCallback(
+                callback=callback,
+                message=db_message,
+                state_update=state_update,
+                current_step=(db_session.state_patch or {}).get("current_step"),
+            ),
+        )
+
+    @staticmethod
+    def _broadcast(db: Session, applied: list[_AppliedCallback]) -> None:
+        """Schedules WebSocket broadcasts for committed callbacks, in order."""
         from app.services.websocket_service import websocket_service
-        schedule_ws(websocket_service.broadcast_callback(callback, db_message=db_message))
 
-        return CallbackResponse(
-            session_id=str(db_session.id),
-            status=db_session.status,
-            callback_status=callback.status,
+        # Commit expired the new messages; reload them in one query so the broadcasts
+        # can read them after this DB session is closed.
+        message_ids = [a.message.id for a in applied if a.message is not None]
+        if message_ids:
+            MessageRepository.list_by_ids(db, message_ids)
+
+        for item in applied:
+            schedule_ws(
+                websocket_service.broadcast_callback(
+                    item.callback,
+                    db_message=item.message,
+                    state_update=item.state_update,
+                    current_step=item.current_step,
+                )
+            )
+
+    @staticmethod
+    def expand_callback_batch(
+        batch: AgentCallbackBatchRequest,
+    ) -> list[AgentCallbackRequest]:
+        """Splits a batch envelope into per-message callbacks.
+
+        Earlier messages are reported as running without state; the last callback
+        carries the batch's final status, progress, state and workspace fields.
+        """
+        final = AgentCallbackRequest(
+            session_id=batch.session_id,
+            time=batch.time,
+            status=batch.status,
+            progress=batch.progress,
+            new_message=batch.new_messages[-1] if batch.new_messages else None,
+            state_patch=batch.state_patch,
+            state_version=batch.state_version,
+            state_delta=batch.state_delta,
+            run_id=batch.run_id,
+            sdk_session_id=batch.sdk_session_id,
+            workspace_files_prefix=batch.workspace_files_prefix,
+            workspace_manifest_key=batch.workspace_manifest_key,
+            workspace_archive_key=batch.workspace_archive_key,
+            workspace_export_status=batch.workspace_export_status,
         )
+        leading = [
+            AgentCallbackRequest(
+                session_id=batch.session_id,
+                time=batch.time,
+                status=CallbackStatus.RUNNING,
+                progress=batch.progress,
+                new_message=message,
+                run_id=batch.run_id,
+                sdk_session_id=batch.sdk_session_id,
+            )
+            for message in batch.new_messages[:-1]
+        ]
+        return [*leading, final]
+
+    def process_agent_callback(
+        self, db: Session, callback: AgentCallbackRequest
+    ) -> CallbackResponse:
+        db_session = self._resolve_session(db, callback.session_id)
+        result, applied = self._apply_agent_callback(db, callback, db_session)
+        if applied is None:
+            return result
+        db.commit()
+
+        self._broadcast(db, [applied])
+        return result
+
+    def process_agent_callback_batch(
+        self, db: Session, callbacks: list[AgentCallbackRequest]
+    ) -> list[CallbackResponse]:
+        """Applies callbacks in order and commits them as a single transaction.
+
+        Broadcasts are scheduled only after the commit, in the same order.
+        """
+        sessions: dict[str, AgentSession | None] = {}
+        results: list[CallbackResponse] = []
+        applied: list[_AppliedCallback] = []
+
+        for callback in callbacks:
+            if callback.session_id not in sessions:
+                sessions[callback.session_id] = self._resolve_session(
+                    db, callback.session_id
+                )
+            db_session = sessions[callback.session_id]
+            result, applied_callback = self._apply_agent_callback(
+                db, callback, db_session
+            )
+            results.append(result)
+            if applied_callback is not None:
+                applied.append(applied_callback)
+
+        db.commit()
+
+        self._broadcast(db, applied)
+        return results
@@ -0,0 +1,55 @@
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.core.settings import get_settings
+
+
+@dataclass(frozen=True)
+class CallbackSessionRef:
+    """What a callback's session_id resolved to."""
+
+    session_id: uuid.UUID
+    run_id: uuid.UUID | None = None
+
+
+class CallbackSessionCache:
+    """Bounded LRU from callback session keys (session UUID or SDK session id) to refs.
+
+    Entries are hints: callers re-load the session and run by primary key and fall back
+    to the full lookup when a hint no longer matches, so a stale entry costs one extra
+    query rather than a wrong write. Shared by ingestion worker threads, hence the lock.
+    """
+
+    def __init__(self, max_size: int | None = None) -> None:
+        self.max_size = max(
+            1,
+            max_size
+            if max_size is not None
+            else get_settings().callback_session_cache_size,
+        )
+        self._entries: OrderedDict[str, CallbackSessionRef] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CallbackSessionRef | None:
+        with self._lock:
+            ref = self._entries.get(key)
+            if ref is not None:
+                self._entries.move_to_end(key)
+            return ref
+
+    def put(self, key: str, ref: CallbackSessionRef) -> None:
+        with self._lock:
+            self._entries[key] = ref
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+# Global singleton instance
+callback_session_cache = CallbackSessionCache()
@@ -3,7 +3,7 @@ import uuid
 
 from pydantic import ValidationError
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
@@ -16,7 +16,9 @@ from app.schemas.message import (
     MessageResponse,
     MessageWithFilesResponse,
 )
+from app.schemas.response import CursorPage
 from app.services.storage_service import S3StorageService
+from app.utils.cursor import decode_id_cursor, encode_id_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -24,21 +26,46 @@ logger = logging.getLogger(__name__)
 class MessageService:
     """Service layer for message queries."""
 
-    def get_messages(self, db: Session, session_id: uuid.UUID) -> list[AgentMessage]:
-        """Gets all messages for a session.
+    @staticmethod
+    async def _list_page(
+        db: AsyncSession, session_id: uuid.UUID, limit: int, cursor: str | None
+    ) -> tuple[list[AgentMessage], str | None]:
+        # One extra row tells whether another page exists without a COUNT.
+        messages = await MessageRepository.list_by_session_async(
+            db, session_id, limit=limit + 1, after_id=decode_id_cursor(cursor)
+        )
+        if len(messages) <= limit:
+            return messages, None
+        messages = messages[:limit]
+        return messages, encode_id_cursor(messages[-1].id)
+
+    async def get_messages(
+        self,
+        db: AsyncSession,
+        session_id: uuid.UUID,
+        *,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> CursorPage[MessageResponse]:
+        """Gets one page of messages for a session.
 
         Args:
             db: Database session
             session_id: Session ID
+            limit: Page size
+            cursor: next_cursor of the previous page, or None for the first page
 
         Returns:
-            List of messages ordered by creation time
+            Messages in id order and the cursor of the next page
         """
-        messages = MessageRepository.list_by_session(db, session_id)
+        messages, next_cursor = await self._list_page(db, session_id, limit, cursor)
         logger.debug(f"Retrieved {len(messages)} messages for session {session_id}")
-        return messages
+        return CursorPage[MessageResponse](
+            items=[MessageResponse.model_validate(m) for m in messages],
+            next_cursor=next_cursor,
+        )
 
-    def get_message(self, db: Session, message_id: int) -> AgentMessage:
+    async def get_message(self, db: AsyncSession, message_id: int) -> AgentMessage:
         """Gets a message by ID.
 
         Args:
@@ -51,7 +78,7 @@ class MessageService:
         Raises:
             AppException: If message not found
         """
-        message = MessageRepository.get_by_id(db, message_id)
+        message = await MessageRepository.get_by_id_async(db, message_id)
         if not message:
             raise AppException(
                 error_code=ErrorCode.NOT_FOUND,
@@ -59,10 +86,22 @@ class MessageService:
             )
         return message
 
-    def get_messages_with_files(
-        self, db: Session, session_id: uuid.UUID, *, user_id: str
-    ) -> list[MessageWithFilesResponse]:
-        """Gets messages for a session and attaches per-run uploaded files.
+    async def get_messages_since(
+        self, db: AsyncSession, session_id: uuid.UUID, after_id: int
+    ) -> list[AgentMessage]:
+        """Gets all messages of a session after the given message ID, in id order."""
+        return await MessageRepository.get_after_id_async(db, session_id, after_id)
+
+    async def get_messages_with_files(
+        self,
+        db: AsyncSession,
+        session_id: uuid.UUID,
+        *,
+        user_id: str,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> CursorPage[MessageWithFilesResponse]:
+        """Gets one page of messages for a session and attaches per-run uploaded files.
 
         Attachments are derived from the run snapshot to avoid coupling the
         message content schema to any upstream agent SDK format.
@@ -71,8 +110,10 @@ class MessageService:
         storage_service = S3StorageService()
         key_prefix = f"attachments/{user_id}/"
 
-        messages = MessageRepository.list_by_session(db, session_id, limit=1000)
-        runs = RunRepository.list_by_session(db, session_id, limit=1000)
+        messages, next_cursor = await self._list_page(db, session_id, limit, cursor)
+        runs = await RunRepository.list_by_user_message_ids_async(
+            db, session_id, [m.id for m in messages]
+        )
 
         message_id_to_attachments: dict[int, list[InputFile]] = {}
         for run in runs:
@@ -134,4 +175,6 @@ class MessageService:
                 "attachments_mapped": len(message_id_to_attachments),
             },
         )
-        return result
+        return CursorPage[MessageWithFilesResponse](
+            items=result, next_cursor=next_cursor
+        )
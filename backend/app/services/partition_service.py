@@ -0,0 +1,54 @@
+import logging
+from datetime import date, datetime, timezone
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.settings import get_settings
+from app.repositories.partition_repository import (
+    PARTITIONED_TABLES,
+    PartitionRepository,
+    month_partition_name,
+    next_month,
+)
+from app.schemas.maintenance import PartitionEnsureResponse
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionService:
+    """Keeps monthly partitions of the append-heavy tables created ahead of time.
+
+    agent_messages, tool_executions and usage_logs are range-partitioned by month on
+    created_at, so old months can be vacuumed, reindexed or dropped independently.
+    Rows outside every monthly partition land in each table's default partition;
+    creating partitions ahead keeps that one empty.
+    """
+
+    def ensure_partitions(
+        self, db: Session, today: date | None = None
+    ) -> PartitionEnsureResponse:
+        """Creates this month's and the next PARTITION_MONTHS_AHEAD months' partitions."""
+        month = (today or datetime.now(timezone.utc).date()).replace(day=1)
+        months = [month]
+        for _ in range(max(0, get_settings().partition_months_ahead)):
+            months.append(next_month(months[-1]))
+
+        ensured: list[str] = []
+        failed: list[str] = []
+        for table in PARTITIONED_TABLES:
+            for partition_month in months:
+                name = month_partition_name(table, partition_month)
+                try:
+                    # A failure (rows already in the default partition) only skips
+                    # this partition.
+                    with db.begin_nested():
+                        PartitionRepository.create_month_partition(
+                            db, table, partition_month
+                        )
+                    ensured.append(name)
+                except SQLAlchemyError:
+                    logger.exception("partition_create_failed", extra={"name": name})
+                    failed.append(name)
+        db.commit()
+        return PartitionEnsureResponse(ensured=ensured, failed=failed)
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import logging
+import threading
+from typing import Any
+
+from app.core.errors.exceptions import AppException
+from app.core.settings import get_settings
+from app.services.storage_service import S3StorageService
+
+logger = logging.getLogger(__name__)
+
+BLOB_REF_TYPE = "BlobRef"
+BLOB_KEY_PREFIX = "blobs/sha256/"
+
+
+class PayloadStoreService:
+    """Keeps large tool results out of message and tool execution rows.
+
+    A ToolResultBlock whose content serializes above the threshold is stored once in
+    S3 under its sha256 and replaced by a compact reference:
+
+        {"_type": "BlobRef", "key": ..., "sha256": ..., "size": ..., "preview": ...}
+
+    The same content always maps to the same key, so agent_messages.content and
+    tool_executions.tool_output share one object. Readers get the reference (with its
+    preview) by default and hydrate it on demand.
+    """
+
+    def __init__(self) -> None:
+        self._storage: S3StorageService | None = None
+        self._storage_lock = threading.Lock()
+
+    def _get_storage(self) -> S3StorageService:
+        # boto3 clients are thread-safe; build one lazily and share it.
+        with self._storage_lock:
+            if self._storage is None:
+                self._storage = S3StorageService()
+            return self._storage
+
+    @staticmethod
+    def is_ref(value: Any) -> bool:
+        return isinstance(value, dict) and value.get("_type") == BLOB_REF_TYPE
+
+    @staticmethod
+    def _preview(value: Any, limit: int) -> str:
+        if isinstance(value, str):
+            text = value
+        elif isinstance(value, list) and all(
+            isinstance(item, dict) and isinstance(item.get("text"), str)
+            for item in value
+        ):
+            # Tool results may be a list of text parts.
+            text = "\n".join(item["text"] for item in value)
+        else:
+            text = json.dumps(value, ensure_ascii=False)
+        return text[:limit]
+
+    def offload_message(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Returns the message with oversized tool results replaced by references.
+
+        The input is not modified. When storage is unavailable the payload stays
+        inline, so a storage outage never loses a callback.
+        """
+        threshold = get_settings().payload_offload_threshold_bytes
+        content = message.get("content")
+        if threshold <= 0 or not isinstance(content, list):
+            return message
+
+        blocks: list[Any] | None = None
+        for index, block in enumerate(content):
+            if not isinstance(block, dict):
+                continue
+            if "ToolResultBlock" not in block.get("_type", ""):
+                continue
+            value = block.get("content")
+            if value is None or self.is_ref(value):
+                continue
+            ref = self._offload(value, threshold)
+            if ref is None:
+                continue
+            if blocks is None:
+                blocks = list(content)
+            blocks[index] = {**block, "content": ref}
+
+        if blocks is None:
+            return message
+        return {**message, "content": blocks}
+
+    def _offload(self, value: Any, threshold: int) -> dict[str, Any] | None:
+        body = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+        if len(body) < threshold:
+            return None
+
+        digest = hashlib.sha256(body).hexdigest()
+        key = f"{BLOB_KEY_PREFIX}{digest}.json"
+        try:
+            storage = self._get_storage()
+            if not storage.object_exists(key):
+                storage.put_object(key=key, body=body, content_type="application/json")
+        except AppException:
+            logger.warning(
+                "payload_offload_failed_keeping_inline",
+                extra={"key": key, "size": len(body)},
+                exc_info=True,
+            )
+            return None
+
+        return {
+            "_type": BLOB_REF_TYPE,
+            "key": key,
+            "sha256": digest,
+            "size": len(body),
+            "preview": self._preview(value, get_settings().payload_preview_chars),
+        }
+
+    def hydrate(self, value: Any) -> Any:
+        """Returns a copy of value with every reference replaced by its content.
+
+        Raises:
+            AppException: If a referenced object cannot be fetched.
+        """
+        if self.is_ref(value):
+            body = self._get_storage().get_object(str(value.get("key")))
+            return json.loads(body.decode("utf-8"))
+        if isinstance(value, dict):
+            return {k: self.hydrate(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.hydrate(v) for v in value]
+        return value
+
+
+# Global singleton instance
+payload_store_service = PayloadStoreService()
@@ -1,25 +1,60 @@
+import asyncio
+import logging
+import time
 import uuid
-from datetime import datetime, timezone
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import ColumnElement
 from sqlalchemy.orm import Session
 
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
+from app.core.run_queue_listener import run_queue_listener
+from app.core.settings import get_settings
+from app.models.agent_message import AgentMessage
+from app.models.agent_run import AgentRun
+from app.models.agent_session import AgentSession
 from app.repositories.scheduled_task_repository import ScheduledTaskRepository
 from app.repositories.message_repository import MessageRepository
-from app.repositories.run_repository import RunRepository
+from app.repositories.run_repository import (
+    RUN_QUEUE_NOTIFY_ANY,
+    RunClaimPolicy,
+    RunRepository,
+)
 from app.repositories.session_repository import SessionRepository
+from app.schemas.response import CursorPage
 from app.schemas.run import (
+    RunClaimBatchRequest,
     RunClaimRequest,
     RunClaimResponse,
     RunFailRequest,
+    RunHeartbeatRequest,
+    RunHeartbeatResponse,
+    RunLatencyBucket,
+    RunLatencyHistogram,
+    RunQueueModeStats,
+    RunQueueStatsResponse,
+    RunReleaseExpiredResponse,
+    RunWorkerStats,
     RunResponse,
     RunStartRequest,
 )
 from app.services.usage_service import UsageService
+from app.utils.cursor import decode_scheduled_cursor, encode_scheduled_cursor
+
+logger = logging.getLogger(__name__)
 
 usage_service = UsageService()
 
+# Histogram bucket upper bounds (seconds).
+_CLAIM_TO_START_BUCKETS = [1, 5, 15, 30, 60, 300, 900, 3600]
+_START_TO_FINISH_BUCKETS = [10, 30, 60, 300, 900, 1800, 3600, 7200]
+# Claim long-polls re-query at least this often while the queue listener is down.
+_UNLISTENED_CLAIM_POLL_SECONDS = 2.0
+# Lower bound of a long-poll wait, so a run due "now" cannot cause a busy loop.
+_MIN_CLAIM_WAIT_SECONDS = 0.05
+
 
 class RunService:
     """Service layer for run queue operations."""
@@ -79,16 +114,84 @@ class RunService:
         db: Session,
         session_id: uuid.UUID,
         limit: int = 100,
-        offset: int = 0,
-    ) -> list[RunResponse]:
-        runs = RunRepository.list_by_session(db, session_id, limit=limit, offset=offset)
+        cursor: str | None = None,
+    ) -> CursorPage[RunResponse]:
+        runs = RunRepository.list_by_session(
+            db, session_id, limit=limit + 1, after=decode_scheduled_cursor(cursor)
+        )
+        next_cursor = None
+        if len(runs) > limit:
+            runs = runs[:limit]
+            last = runs[-1]
+            next_cursor = encode_scheduled_cursor(
+                last.scheduled_at, last.created_at, last.id
+            )
         responses = [RunResponse.model_validate(r) for r in runs]
         usage_by_run_id = usage_service.get_usage_summaries_by_run_ids(
             db, [r.id for r in runs]
         )
         for item in responses:
             item.usage = usage_by_run_id.get(item.run_id)
-        return responses
+        return CursorPage[RunResponse](items=responses, next_cursor=next_cursor)
+
+    @staticmethod
+    def _clean_schedule_modes(schedule_modes: list[str] | None) -> list[str] | None:
+        if not schedule_modes:
+            return None
+        return [m.strip() for m in schedule_modes if isinstance(m, str) and m.strip()]
+
+    @staticmethod
+    def _claim_policy() -> RunClaimPolicy:
+        settings = get_settings()
+        max_active = settings.run_claim_max_active_runs_per_user
+        return RunClaimPolicy(
+            name=settings.run_claim_policy,
+            user_weights=settings.run_claim_user_weights,
+            max_active_runs_per_user=max_active if max_active > 0 else None,
+        )
+
+    def _resolve_claim_prompt(
+        self,
+        db_run: AgentRun,
+        db_session: AgentSession | None,
+        db_message: AgentMessage | None,
+    ) -> str:
+        """Validate a claimed run's session/message and return its prompt."""
+        if not db_session:
+            raise AppException(
+                error_code=ErrorCode.NOT_FOUND,
+                message=f"Session not found: {db_run.session_id}",
+            )
+
+        if not db_message:
+            raise AppException(
+                error_code=ErrorCode.NOT_FOUND,
+                message=f"Message not found: {db_run.user_message_id}",
+            )
+
+        prompt = (
+            self._extract_prompt_from_message(db_message.content)
+            or db_message.text_preview
+        )
+
+        if not prompt:
+            raise AppException(
+                error_code=ErrorCode.BAD_REQUEST,
+                message="Unable to extract prompt from message",
+            )
+        return prompt
+
+    @staticmethod
+    def _build_claim_response(
+        db_run: AgentRun, db_session: AgentSession, prompt: str
+    ) -> RunClaimResponse:
+        return RunClaimResponse(
+            run=RunResponse.model_validate(db_run),
+            user_id=db_session.user_id,
+            prompt=prompt,
+            config_snapshot=db_run.config_snapshot or db_session.config_snapshot,
+            sdk_session_id=db_session.sdk_session_id,
+        )
 
     def claim_next_run(
         self, db: Session, request: RunClaimRequest
@@ -100,21 +203,12 @@ class RunService:
                 message="worker_id cannot be empty",
             )
 
-        schedule_modes = (
-            [
-                m.strip()
-                for m in request.schedule_modes
-                if isinstance(m, str) and m.strip()
-            ]
-            if request.schedule_modes
-            else None
-        )
-
         db_run = RunRepository.claim_next(
             session_db=db,
             worker_id=worker_id,
             lease_seconds=request.lease_seconds,
-            schedule_modes=schedule_modes,
+            schedule_modes=self._clean_schedule_modes(request.schedule_modes),
+            policy=self._claim_policy(),
         )
 
         if not db_run:
@@ -122,39 +216,261 @@ class RunService:
             return None
 
         db_session = SessionRepository.get_by_id(db, db_run.session_id)
-        if not db_session:
+        db_message = MessageRepository.get_by_id(db, db_run.user_message_id)
+        if db_session:
+            SessionRepository.record_run(db_session, db_run)
+        self._sync_scheduled_task_last_status(db, db_run.id)
+        prompt = self._resolve_claim_prompt(db_run, db_session, db_message)
+
+        db.commit()
+        db.refresh(db_run)
+
+        return self._build_claim_response(db_run, db_session, prompt)
+
+    def claim_run_batch(
+        self, db: Session, request: RunClaimBatchRequest
+    ) -> list[RunClaimResponse]:
+        """Claim up to request.max_runs runs in one round trip.
+
+        Runs whose session/message/prompt cannot be resolved are marked failed instead of
+        aborting the whole batch.
+        """
+        worker_id = request.worker_id.strip()
+        if not worker_id:
             raise AppException(
-                error_code=ErrorCode.NOT_FOUND,
-                message=f"Session not found: {db_run.session_id}",
+                error_code=ErrorCode.BAD_REQUEST,
+                message="worker_id cannot be empty",
             )
 
-        db_message = MessageRepository.get_by_id(db, db_run.user_message_id)
-        if not db_message:
-            raise AppException(
-                error_code=ErrorCode.NOT_FOUND,
-                message=f"Message not found: {db_run.user_message_id}",
+        db_runs = RunRepository.claim_batch(
+            session_db=db,
+            worker_id=worker_id,
+            max_runs=request.max_runs,
+            lease_seconds=request.lease_seconds,
+            schedule_modes=self._clean_schedule_modes(request.schedule_modes),
+            policy=self._claim_policy(),
+        )
+        if not db_runs:
+            db.commit()
+            return []
+
+        sessions_by_id = {
+            s.id: s
+            for s in SessionRepository.list_by_ids(
+                db, list({r.session_id for r in db_runs})
             )
+        }
+        messages_by_id = {
+            m.id: m
+            for m in MessageRepository.list_by_ids(
+                db, list({r.user_message_id for r in db_runs})
+            )
+        }
 
-        prompt = (
-            self._extract_prompt_from_message(db_message.content)
-            or db_message.text_preview
+        claimed: list[tuple[AgentRun, str]] = []
+        now = datetime.now(timezone.utc)
+        for db_run in db_runs:
+            try:
+                prompt = self._resolve_claim_prompt(
+                    db_run,
+                    sessions_by_id.get(db_run.session_id),
+                    messages_by_id.get(db_run.user_message_id),
+                )
+            except AppException as exc:
+                logger.warning(
+                    "run_claim_invalid",
+                    extra={"run_id": str(db_run.id), "error": exc.message},
+                )
+                db_run.status = "failed"
+                db_run.last_error = exc.message
+                db_run.finished_at = now
+                db_run.lease_expires_at = None
+                continue
+            claimed.append((db_run, prompt))
+
+        for db_run in db_runs:
+            db_session = sessions_by_id.get(db_run.session_id)
+            if db_session:
+                SessionRepository.record_run(db_session, db_run)
+            if db_run.scheduled_task_id:
+                self._sync_scheduled_task_last_status(db, db_run.id)
+        db.commit()
+        # Reload all claimed rows in one query instead of refreshing them one by one.
+        RunRepository.list_by_ids(db, [db_run.id for db_run, _ in claimed])
+
+        return [
+            self._build_claim_response(
+                db_run, sessions_by_id[db_run.session_id], prompt
+            )
+            for db_run, prompt in claimed
+        ]
+
+    async def claim_run_batch_wait(
+        self, db: Session, request: RunClaimBatchRequest
+    ) -> list[RunClaimResponse]:
+        """Claim a batch, long-polling on queue notifications while nothing is claimable.
+
+        The waiter is registered before each claim attempt, so a NOTIFY committed while
+        the claim query runs still wakes this request up. Runs becoming due send no
+        NOTIFY, so each wait also ends when the earliest queued run becomes due, and
+        while the listener is reconnecting the queue is re-queried every few seconds.
+        """
+        max_wait = max(0, int(get_settings().run_claim_max_wait_seconds))
+        wait_seconds = min(float(request.wait_seconds), float(max_wait))
+        # Claims run on a worker thread so the queries do not stall WebSockets.
+        if wait_seconds <= 0:
+            return await asyncio.to_thread(self.claim_run_batch, db, request)
+
+        schedule_modes = self._clean_schedule_modes(request.schedule_modes)
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            waiter = run_queue_listener.register(schedule_modes)
+            try:
+                results, next_due_at = await asyncio.to_thread(
+                    self._claim_or_next_due, db, request, schedule_modes
+                )
+                remaining = deadline - time.monotonic()
+                if results or remaining <= 0:
+                    return results
+                timeout = remaining
+                if next_due_at is not None:
+                    until_due = next_due_at - datetime.now(timezone.utc)
+                    timeout = min(timeout, until_due.total_seconds())
+                if not run_queue_listener.enabled:
+                    timeout = min(timeout, _UNLISTENED_CLAIM_POLL_SECONDS)
+                # Woken up or timed out: claim again (the loop returns at the deadline).
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        waiter, timeout=max(timeout, _MIN_CLAIM_WAIT_SECONDS)
+                    )
+            finally:
+                run_queue_listener.unregister(waiter)
+
+    def _claim_or_next_due(
+        self,
+        db: Session,
+        request: RunClaimBatchRequest,
+        schedule_modes: list[str] | None,
+    ) -> tuple[list[RunClaimResponse], datetime | None]:
+        """Claim a batch; when nothing was claimed, also when the next run becomes due."""
+        results = self.claim_run_batch(db, request)
+        if results:
+            return results, None
+        next_due_at = RunRepository.next_scheduled_at(
+            db, datetime.now(timezone.utc), schedule_modes
         )
+        db.rollback()
+        return [], next_due_at
 
-        if not prompt:
+    def heartbeat_run(
+        self, db: Session, run_id: uuid.UUID, request: RunHeartbeatRequest
+    ) -> RunHeartbeatResponse:
+        """Renew the lease of a claimed run while the worker is still staging it."""
+        worker_id = request.worker_id.strip()
+        if not worker_id:
             raise AppException(
                 error_code=ErrorCode.BAD_REQUEST,
-                message="Unable to extract prompt from message",
+                message="worker_id cannot be empty",
+            )
+        lease_seconds = request.lease_seconds if request.lease_seconds > 0 else 30
+
+        lease_expires_at = RunRepository.renew_lease(
+            db, run_id, worker_id, lease_seconds
+        )
+        if lease_expires_at is None:
+            db.rollback()
+            db_run = RunRepository.get_by_id(db, run_id)
+            if not db_run:
+                raise AppException(
+                    error_code=ErrorCode.NOT_FOUND,
+                    message=f"Run not found: {run_id}",
+                )
+            raise AppException(
+                error_code=ErrorCode.FORBIDDEN,
+                message=f"Run lease lost (status={db_run.status})",
             )
 
         db.commit()
-        db.refresh(db_run)
+        return RunHeartbeatResponse(run_id=run_id, lease_expires_at=lease_expires_at)
 
-        return RunClaimResponse(
-            run=RunResponse.model_validate(db_run),
-            user_id=db_session.user_id,
-            prompt=prompt,
-            config_snapshot=db_run.config_snapshot or db_session.config_snapshot,
-            sdk_session_id=db_session.sdk_session_id,
+    def release_expired_claims(self, db: Session) -> RunReleaseExpiredResponse:
+        """Requeue claimed runs whose lease expired (periodic reaper)."""
+        released_runs = RunRepository.release_expired_claims(db)
+        SessionRepository.sync_latest_run_status(db, released_runs, "queued")
+        db.commit()
+        released = len(released_runs)
+        if released:
+            logger.info("run_claims_released", extra={"released": released})
+        return RunReleaseExpiredResponse(released=released)
+
+    def get_queue_stats(
+        self, db: Session, window_seconds: int = 3600
+    ) -> RunQueueStatsResponse:
+        """Queue depth, per-worker occupancy and latency histograms for the run queue."""
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(seconds=window_seconds)
+
+        queue = [
+            RunQueueModeStats(
+                schedule_mode=schedule_mode,
+                queued=queued,
+                due=due,
+                oldest_due_age_seconds=(
+                    max(0.0, (now - oldest_due).total_seconds())
+                    if oldest_due is not None
+                    else None
+                ),
+            )
+            for schedule_mode, queued, due, oldest_due in (
+                RunRepository.count_queued_by_schedule_mode(db, now)
+            )
+        ]
+        workers = [
+            RunWorkerStats(worker_id=worker_id, claimed=claimed, running=running)
+            for worker_id, claimed, running in RunRepository.count_active_by_worker(db)
+        ]
+
+        return RunQueueStatsResponse(
+            generated_at=now,
+            window_seconds=window_seconds,
+            queue=queue,
+            workers=workers,
+            claim_to_start=self._latency_histogram(
+                db,
+                AgentRun.scheduled_at,
+                AgentRun.started_at,
+                since,
+                _CLAIM_TO_START_BUCKETS,
+            ),
+            start_to_finish=self._latency_histogram(
+                db,
+                AgentRun.started_at,
+                AgentRun.finished_at,
+                since,
+                _START_TO_FINISH_BUCKETS,
+            ),
+        )
+
+    @staticmethod
+    def _latency_histogram(
+        db: Session,
+        start_column: ColumnElement[datetime],
+        end_column: ColumnElement[datetime],
+        since: datetime,
+        bounds: list[int],
+    ) -> RunLatencyHistogram:
+        count, p50, p95, bucket_counts = RunRepository.latency_histogram(
+            db, start_column, end_column, since, [float(b) for b in bounds]
+        )
+        upper_bounds: list[float | None] = [float(b) for b in bounds[1:]] + [None]
+        buckets = [
+            RunLatencyBucket(upper_seconds=float(bounds[0]), count=bucket_counts[0])
+        ] + [
+            RunLatencyBucket(upper_seconds=upper, count=bucket_count)
+            for upper, bucket_count in zip(upper_bounds, bucket_counts[1:])
+        ]
+        return RunLatencyHistogram(
+            count=count, p50_seconds=p50, p95_seconds=p95, buckets=buckets
         )
 
     def start_run(
@@ -210,6 +526,7 @@ class RunService:
                 message=f"Session not found: {db_run.session_id}",
             )
         db_session.status = "running"
+        SessionRepository.record_run(db_session, db_run)
 
         self._sync_scheduled_task_last_status(db, db_run.id)
         db.commit()
@@ -252,7 +569,10 @@ class RunService:
         db_session = SessionRepository.get_by_id(db, db_run.session_id)
         if db_session:
             db_session.status = "failed"
+            SessionRepository.record_run(db_session, db_run)
 
+        # The session is free again; its next queued run may now be claimable.
+        RunRepository.notify_queue(db, RUN_QUEUE_NOTIFY_ANY)
         self._sync_scheduled_task_last_status(db, db_run.id)
         db.commit()
         db.refresh(db_run)
@@ -439,6 +439,7 @@ class ScheduledTaskService:
             content=user_message_content,
             text_preview=prompt[:500],
         )
+        SessionRepository.record_message(db_session, db_message.text_preview)
         db.flush()
 
         run_snapshot = dict(task.config_snapshot or {})
@@ -456,5 +457,6 @@ class ScheduledTaskService:
         )
         db_run.scheduled_task_id = task.id
         db.flush()
+        SessionRepository.record_run(db_session, db_run, latest=True)
 
         return db_run
@@ -0,0 +1,37 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.errors.error_codes import ErrorCode
+from app.core.errors.exceptions import AppException
+from app.repositories.message_repository import MessageRepository
+from app.repositories.session_repository import SessionRepository
+from app.schemas.search import MessageSearchHit, SearchResponse, SessionSearchHit
+
+
+class SearchService:
+    """Service layer for transcript search.
+
+    Messages are matched through the tsvector written when they are stored, and
+    session titles through a trigram index, so neither scans transcripts. Messages of
+    archived sessions are not in the database and only match once the session has
+    been opened again; their session titles still match.
+    """
+
+    async def search(
+        self, db: AsyncSession, user_id: str, query: str, limit: int = 20
+    ) -> SearchResponse:
+        """Searches the user's session titles and message text."""
+        query = query.strip()
+        if not query:
+            raise AppException(
+                error_code=ErrorCode.BAD_REQUEST,
+                message="Search query cannot be empty",
+            )
+
+        sessions = await SessionRepository.search_by_title_async(
+            db, user_id, query, limit
+        )
+        messages = await MessageRepository.search_async(db, user_id, query, limit)
+        return SearchResponse(
+            sessions=[SessionSearchHit.model_validate(s) for s in sessions],
+            messages=[MessageSearchHit.model_validate(m) for m in messages],
+        )
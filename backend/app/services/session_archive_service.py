@@ -0,0 +1,230 @@
+import asyncio
+import gzip
+import json
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import Column, Table, func, null
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.settings import get_settings
+from app.models.agent_message import AgentMessage
+from app.models.agent_session import AgentSession
+from app.repositories.session_archive_repository import (
+    ARCHIVED_TABLES,
+    SessionArchiveRepository,
+)
+from app.schemas.maintenance import SessionArchiveResponse
+from app.services.storage_service import S3StorageService
+from app.utils.search import SEARCH_TEXT_CONFIG, extract_message_text
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_KEY_PREFIX = "archives/sessions/"
+# Rows per INSERT when restoring.
+RESTORE_CHUNK_SIZE = 500
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"Cannot archive value of type {type(value).__name__}")
+
+
+def _decode(column: Column, value: Any) -> Any:
+    if value is None:
+        # SQL NULL, not JSON null.
+        return null()
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type in (uuid.UUID, Decimal):
+        return python_type(value)
+    return value
+
+
+class SessionArchiveService:
+    """Moves the transcripts of idle sessions to S3 and restores them on demand.
+
+    A session untouched for SESSION_ARCHIVE_IDLE_DAYS, with no unfinished run, has its
+    messages, tool executions and usage logs written to one gzip-compressed JSONL
+    object and deleted from the database. The session row itself stays, with its
+    summary columns, so listing it is unaffected. The first read of its transcript
+    restores the rows with their original ids and deletes the object.
+    """
+
+    def __init__(self) -> None:
+        self._storage: S3StorageService | None = None
+        self._storage_lock = threading.Lock()
+
+    def _get_storage(self) -> S3StorageService:
+        with self._storage_lock:
+            if self._storage is None:
+                self._storage = S3StorageService()
+            return self._storage
+
+    def archive_idle_sessions(
+        self, db: Session, limit: int | None = None
+    ) -> SessionArchiveResponse:
+        """Archives up to limit idle sessions (default SESSION_ARCHIVE_BATCH_SIZE)."""
+        settings = get_settings()
+        if settings.session_archive_idle_days <= 0:
+            return SessionArchiveResponse(archived=0)
+
+        idle_before = datetime.now(timezone.utc) - timedelta(
+            days=settings.session_archive_idle_days
+        )
+        session_ids = SessionArchiveRepository.list_idle_session_ids(
+            db, idle_before, limit or settings.session_archive_batch_size
+        )
+        db.rollback()
+
+        archived: list[uuid.UUID] = []
+        errors = 0
+        for session_id in session_ids:
+            try:
+                if self.archive_session(db, session_id, idle_before):
+                    archived.append(session_id)
+            except Exception:
+                db.rollback()
+                errors += 1
+                logger.exception(
+                    "session_archive_failed", extra={"session_id": str(session_id)}
+                )
+        if archived:
+            logger.info("sessions_archived", extra={"archived": len(archived)})
+        return SessionArchiveResponse(
+            archived=len(archived), session_ids=archived, errors=errors
+        )
+
+    def archive_session(
+        self, db: Session, session_id: uuid.UUID, idle_before: datetime
+    ) -> bool:
+        """Archives one session if it is still idle. Commits.
+
+        The object is uploaded before the rows are deleted, so a failure at any point
+        leaves the transcript in the database.
+        """
+        db_session = SessionArchiveRepository.lock_idle_session(
+            db, session_id, idle_before
+        )
+        if db_session is None:
+            db.rollback()
+            return False
+
+        row_count = 0
+        lines: list[bytes] = []
+        for table in ARCHIVED_TABLES:
+            for row in SessionArchiveRepository.list_rows(db, table, session_id):
+                record = {"table": table.name, "row": dict(row)}
+                lines.append(json.dumps(record, default=_encode).encode("utf-8"))
+                row_count += 1
+
+        key = None
+        if row_count:
+            key = f"{ARCHIVE_KEY_PREFIX}{session_id}.jsonl.gz"
+            self._get_storage().put_object(
+                key=key,
+                body=gzip.compress(b"\n".join(lines)),
+                content_type="application/gzip",
+            )
+            for table in ARCHIVED_TABLES:
+                SessionArchiveRepository.delete_rows(db, table, session_id)
+
+        db_session.archived_at = datetime.now(timezone.utc)
+        db_session.archive_key = key
+        db.commit()
+        logger.info(
+            "session_archived",
+            extra={"session_id": str(session_id), "rows": row_count, "key": key},
+        )
+        return True
+
+    def rehydrate_session(self, session_id: uuid.UUID) -> None:
+        """Restores an archived session's rows, in its own transaction.
+
+        Concurrent callers wait on the session row lock; the first one restores and
+        the others find the session no longer archived.
+        """
+        db = SessionLocal()
+        key = None
+        try:
+            db_session = SessionArchiveRepository.lock_archived_session(db, session_id)
+            if db_session is None:
+                return
+            key = db_session.archive_key
+            if key:
+                body = gzip.decompress(self._get_storage().get_object(key))
+                self._restore_rows(db, body)
+            db_session.archived_at = None
+            db_session.archive_key = None
+            db.commit()
+        finally:
+            db.close()
+
+        logger.info(
+            "session_rehydrated", extra={"session_id": str(session_id), "key": key}
+        )
+        if key:
+            try:
+                self._get_storage().delete_object(key)
+            except Exception:
+                # The rows are back; a leftover object is only wasted space.
+                logger.warning(
+                    "session_archive_delete_failed",
+                    extra={"key": key},
+                    exc_info=True,
+                )
+
+    @staticmethod
+    def _restore_rows(db: Session, body: bytes) -> None:
+        tables: dict[str, Table] = {table.name: table for table in ARCHIVED_TABLES}
+        pending: dict[str, list[dict[str, Any]]] = {name: [] for name in tables}
+
+        def flush(name: str) -> None:
+            SessionArchiveRepository.insert_rows(db, tables[name], pending[name])
+            pending[name] = []
+
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            table = tables[record["table"]]
+            row = {
+                name: _decode(table.c[name], value)
+                for name, value in record["row"].items()
+            }
+            if table is AgentMessage.__table__:
+                search_text = extract_message_text(record["row"].get("content") or {})
+                row["search_vector"] = (
+                    func.to_tsvector(SEARCH_TEXT_CONFIG, search_text)
+                    if search_text
+                    else null()
+                )
+            pending[table.name].append(row)
+            if len(pending[table.name]) >= RESTORE_CHUNK_SIZE:
+                flush(table.name)
+        # Tables were archived in ARCHIVED_TABLES order; restore in the same order.
+        for name in tables:
+            flush(name)
+
+    async def rehydrate_if_archived(self, db_session: AgentSession) -> None:
+        """Restores the session's transcript before it is read, if it is archived.
+
+        Runs in a worker thread: it downloads from S3 and writes in its own
+        transaction.
+        """
+        if db_session.archived_at is None:
+            return
+        await asyncio.to_thread(self.rehydrate_session, db_session.id)
+
+
+# Global singleton instance
+session_archive_service = SessionArchiveService()
@@ -2,6 +2,7 @@ import logging
 import uuid
 from datetime import datetime, timezone
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.errors.error_codes import ErrorCode
@@ -62,6 +63,22 @@ class SessionService:
             )
         return db_session
 
+    async def get_session_async(
+        self, db: AsyncSession, session_id: uuid.UUID
+    ) -> AgentSession:
+        """Gets a session by ID without blocking the event loop.
+
+        Raises:
+            AppException: If session not found.
+        """
+        db_session = await SessionRepository.get_by_id_async(db, session_id)
+        if not db_session:
+            raise AppException(
+                error_code=ErrorCode.NOT_FOUND,
+                message=f"Session not found: {session_id}",
+            )
+        return db_session
+
     def update_session(
         self, db: Session, session_id: uuid.UUID, request: SessionUpdateRequest
     ) -> AgentSession:
@@ -131,6 +148,21 @@ class SessionService:
             )
         return SessionRepository.list_all(db, limit, offset, project_id, kind=kind)
 
+    async def list_sessions_async(
+        self,
+        db: AsyncSession,
+        user_id: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        project_id: uuid.UUID | None = None,
+        *,
+        kind: str | None = None,
+    ) -> list[AgentSession]:
+        """Lists sessions, optionally filtered by user."""
+        return await SessionRepository.list_async(
+            db, user_id or None, limit, offset, project_id, kind=kind
+        )
+
     def find_session_by_sdk_id_or_uuid(
         self, db: Session, session_id: str
     ) -> AgentSession | None:
@@ -185,6 +217,7 @@ class SessionService:
             run.claimed_by = None
             run.lease_expires_at = None
             canceled_runs += 1
+            SessionRepository.record_run(db_session, run)
 
             # Keep scheduled task summary fields in sync when the latest run is canceled.
             if run.scheduled_task_id:
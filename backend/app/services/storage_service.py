@@ -118,6 +118,67 @@ class S3StorageService:
                 details={"key": key, "error": str(exc)},
             ) from exc
 
+    def object_exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as exc:
+            code = str(exc.response.get("Error", {}).get("Code", ""))
+            if code in ("404", "NoSuchKey", "NotFound"):
+                return False
+            logger.error(f"Failed to stat object {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to stat object",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+        except BotoCoreError as exc:
+            logger.error(f"Failed to stat object {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to stat object",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+
+    def put_object(
+        self, *, key: str, body: bytes, content_type: str | None = None
+    ) -> None:
+        extra_args: dict[str, Any] = {}
+        if content_type:
+            extra_args["ContentType"] = content_type
+        try:
+            self.client.put_object(Bucket=self.bucket, Key=key, Body=body, **extra_args)
+        except (ClientError, BotoCoreError) as exc:
+            logger.error(f"Failed to put object {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to upload object",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+
+    def get_object(self, key: str) -> bytes:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+            return response["Body"].read()
+        except (ClientError, BotoCoreError) as exc:
+            logger.error(f"Failed to fetch object {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to fetch object",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+
+    def delete_object(self, key: str) -> None:
+        try:
+            self.client.delete_object(Bucket=self.bucket, Key=key)
+        except (ClientError, BotoCoreError) as exc:
+            logger.error(f"Failed to delete object {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to delete object",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+
     def upload_fileobj(
         self,
         *,
@@ -167,6 +167,7 @@ class TaskService:
             content=user_message_content,
             text_preview=prompt[:500],
         )
+        SessionRepository.record_message(db_session, db_message.text_preview)
         db.flush()
 
         # Keep session-level config snapshots free of input_files.
@@ -188,8 +189,10 @@ class TaskService:
             scheduled_at=scheduled_at,
             config_snapshot=run_config_snapshot,
         )
+        db.flush()
 
         db_session.status = "pending"
+        SessionRepository.record_run(db_session, db_run, latest=True)
 
         db.commit()
         db.refresh(db_session)
@@ -7,6 +7,9 @@ from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
 from app.models.tool_execution import ToolExecution
 from app.repositories.tool_execution_repository import ToolExecutionRepository
+from app.schemas.response import CursorPage
+from app.schemas.tool_execution import ToolExecutionResponse
+from app.utils.cursor import decode_time_id_cursor, encode_time_id_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -15,22 +18,39 @@ class ToolExecutionService:
     """Service layer for tool execution queries."""
 
     def get_tool_executions(
-        self, db: Session, session_id: uuid.UUID
-    ) -> list[ToolExecution]:
-        """Gets all tool executions for a session.
+        self,
+        db: Session,
+        session_id: uuid.UUID,
+        *,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> CursorPage[ToolExecutionResponse]:
+        """Gets one page of tool executions for a session.
 
         Args:
             db: Database session
             session_id: Session ID
+            limit: Page size
+            cursor: next_cursor of the previous page, or None for the first page
 
         Returns:
-            List of tool executions ordered by creation time
+            Tool executions ordered by creation time and the cursor of the next page
         """
-        executions = ToolExecutionRepository.list_by_session(db, session_id)
+        executions = ToolExecutionRepository.list_by_session(
+            db, session_id, limit=limit + 1, after=decode_time_id_cursor(cursor)
+        )
+        next_cursor = None
+        if len(executions) > limit:
+            executions = executions[:limit]
+            last = executions[-1]
+            next_cursor = encode_time_id_cursor(last.created_at, last.id)
         logger.debug(
             f"Retrieved {len(executions)} tool executions for session {session_id}"
         )
-        return executions
+        return CursorPage[ToolExecutionResponse](
+            items=[ToolExecutionResponse.model_validate(e) for e in executions],
+            next_cursor=next_cursor,
+        )
 
     def get_tool_execution(self, db: Session, execution_id: uuid.UUID) -> ToolExecution:
         """Gets a tool execution by ID.
@@ -5,60 +5,69 @@ import uuid
 from typing import Any
 
 from fastapi import WebSocket
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.websocket.coalescer import ws_event_coalescer
 from app.core.websocket.events import EventType, WSEvent
 from app.core.websocket.manager import ws_manager
-from app.models.agent_run import AgentRun
+from app.core.websocket.replay import StreamPosition
 from app.models.agent_message import AgentMessage
+from app.repositories.run_repository import RunRepository
 from app.repositories.session_repository import SessionRepository
 from app.repositories.skill_import_job_repository import SkillImportJobRepository
 from app.repositories.user_input_request_repository import UserInputRequestRepository
 from app.schemas.callback import AgentCallbackRequest
 from app.schemas.skill_import import SkillImportCommitResponse, SkillImportJobResponse
 from app.schemas.user_input_request import UserInputRequestResponse
-from app.services.storage_service import S3StorageService
-from app.utils.workspace import build_workspace_file_nodes
-from app.utils.workspace_manifest import (
-    build_nodes_from_manifest,
-    extract_manifest_files,
-    find_manifest_file,
-    normalize_manifest_path,
-)
+from app.services.workspace_manifest_cache import workspace_manifest_cache
+from app.utils.workspace_manifest import normalize_manifest_path
 
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, get_async_sessionmaker
 
 logger = logging.getLogger(__name__)
 
+# Bounds of a workspace.children.request page.
+WORKSPACE_CHILDREN_DEFAULT_LIMIT = 200
+WORKSPACE_CHILDREN_MAX_LIMIT = 1000
+
 
 class WebSocketService:
     """Service for broadcasting events to WebSocket clients."""
 
     @staticmethod
-    def _get_progress(db: Session, session_uuid: uuid.UUID, status: str) -> int:
-        db_run = (
-            db.query(AgentRun)
-            .filter(AgentRun.session_id == session_uuid)
-            .order_by(AgentRun.created_at.desc())
-            .first()
-        )
+    async def _get_progress(db: AsyncSession, session_uuid: uuid.UUID, status: str) -> int:
         if status == "completed":
             return 100
+        db_run = await RunRepository.get_latest_by_session_async(db, session_uuid)
         if not db_run:
             return 0
         return int(db_run.progress or 0)
 
-    async def send_session_snapshot(self, websocket: WebSocket, *, session_id: str) -> None:
-        """Send a full session snapshot over an active WebSocket connection."""
-        db = SessionLocal()
-        try:
+    async def send_session_snapshot(
+        self,
+        websocket: WebSocket,
+        *,
+        session_id: str,
+        position: StreamPosition | None = None,
+    ) -> None:
+        """Send a full session snapshot over an active WebSocket connection.
+
+        position is the connection's place in the event stream; the client resumes
+        from it on reconnect.
+        """
+        stream = (
+            {"epoch": position.epoch, "seq": position.seq} if position else {}
+        )
+        async with get_async_sessionmaker()() as db:
             session_uuid: uuid.UUID | None = None
             db_session = None
             try:
                 session_uuid = uuid.UUID(session_id)
-                db_session = SessionRepository.get_by_id(db, session_uuid)
+                db_session = await SessionRepository.get_by_id_async(db, session_uuid)
             except ValueError:
-                db_session = SessionRepository.get_by_sdk_session_id(db, session_id)
+                db_session = await SessionRepository.get_by_sdk_session_id_async(
+                    db, session_id
+                )
                 session_uuid = db_session.id if db_session else None
 
             if not db_session or not session_uuid:
@@ -70,6 +79,7 @@ class WebSocketService:
                             "status": "not_found",
                             "progress": 0,
                             "state_patch": {},
+                            "state_version": None,
                             "config_snapshot": None,
                             "workspace_export_status": None,
                             "workspace_manifest_key": None,
@@ -86,8 +96,11 @@ class WebSocketService:
                 session_id=str(session_uuid),
                 data={
                     "status": db_session.status,
-                    "progress": self._get_progress(db, session_uuid, db_session.status),
+                    "progress": await self._get_progress(
+                        db, session_uuid, db_session.status
+                    ),
                     "state_patch": db_session.state_patch or {},
+                    "state_version": db_session.state_version,
                     "config_snapshot": db_session.config_snapshot,
                     "workspace_export_status": db_session.workspace_export_status,
                     "workspace_manifest_key": db_session.workspace_manifest_key,
@@ -96,6 +109,7 @@ class WebSocketService:
                     "updated_at": db_session.updated_at.isoformat()
                     if db_session.updated_at
                     else None,
+                    **stream,
                 },
             )
             await websocket.send_json(snapshot_event.to_dict())
@@ -108,8 +122,6 @@ class WebSocketService:
                 and db_session.workspace_manifest_key
             ):
                 await self.send_workspace_files(websocket, session_id=str(session_uuid))
-        finally:
-            db.close()
 
     async def send_user_input_requests(self, websocket: WebSocket, *, session_id: str) -> None:
         """Send current pending user input requests for a session."""
@@ -215,8 +227,11 @@ class WebSocketService:
                 return
 
             try:
-                storage_service = S3StorageService()
-                manifest = storage_service.get_manifest(db_session.workspace_manifest_key)
+                url = workspace_manifest_cache.file_url(
+                    db_session.workspace_manifest_key,
+                    db_session.workspace_files_prefix,
+                    normalized,
+                )
             except Exception as exc:
                 logger.warning(
                     "ws_workspace_file_url_failed",
@@ -234,49 +249,119 @@ class WebSocketService:
                     ).to_dict()
                 )
                 return
-            entry = find_manifest_file(manifest, normalized)
-            if not entry:
-                await websocket.send_json(
-                    WSEvent(
-                        type=EventType.WORKSPACE_FILE_URL,
-                        session_id=str(session_uuid),
-                        data={"path": normalized, "url": None},
-                    ).to_dict()
-                )
-                return
 
-            prefix = (db_session.workspace_files_prefix or "").rstrip("/")
-            object_key = (
-                entry.get("key")
-                or entry.get("object_key")
-                or entry.get("oss_key")
-                or entry.get("s3_key")
+            await websocket.send_json(
+                WSEvent(
+                    type=EventType.WORKSPACE_FILE_URL,
+                    session_id=str(session_uuid),
+                    data={"path": normalized, "url": url},
+                ).to_dict()
             )
-            if not object_key and prefix:
-                object_key = f"{prefix}/{normalized.lstrip('/')}"
+        finally:
+            db.close()
 
-            if not object_key:
-                await websocket.send_json(
-                    WSEvent(
-                        type=EventType.WORKSPACE_FILE_URL,
-                        session_id=str(session_uuid),
-                        data={"path": normalized, "url": None},
-                    ).to_dict()
-                )
+    async def send_workspace_children(
+        self,
+        websocket: WebSocket,
+        *,
+        session_id: str,
+        path: str | None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> None:
+        """Send one page of a workspace directory, without URLs (best-effort)."""
+        directory = normalize_manifest_path(path) or "/"
+        page_size = min(
+            max(1, limit or WORKSPACE_CHILDREN_DEFAULT_LIMIT), WORKSPACE_CHILDREN_MAX_LIMIT
+        )
+        data: dict[str, Any] = {
+            "path": directory,
+            "cursor": cursor,
+            "items": [],
+            "next_cursor": None,
+            "error": None,
+        }
+        db = SessionLocal()
+        try:
+            try:
+                session_uuid = uuid.UUID(session_id)
+            except ValueError:
                 return
-
-            mime_type = entry.get("mimeType") or entry.get("mime_type")
-            url = storage_service.presign_get(
-                object_key,
-                response_content_disposition="inline",
-                response_content_type=mime_type,
+            db_session = SessionRepository.get_by_id(db, session_uuid)
+            if not db_session:
+                return
+            if not db_session.workspace_manifest_key:
+                data["error"] = "Workspace export is not ready"
+            else:
+                try:
+                    page = workspace_manifest_cache.list_children(
+                        db_session.workspace_manifest_key,
+                        db_session.workspace_files_prefix,
+                        directory,
+                        limit=page_size,
+                        cursor=cursor,
+                    )
+                    data["items"] = [item.model_dump(mode="json") for item in page.items]
+                    data["next_cursor"] = page.next_cursor
+                except Exception as exc:
+                    logger.warning(
+                        "ws_workspace_children_failed",
+                        extra={
+                            "session_id": str(session_uuid),
+                            "path": directory,
+                            "error": str(exc),
+                        },
+                    )
+                    data["error"] = "Failed to list workspace directory"
+            await websocket.send_json(
+                WSEvent(
+                    type=EventType.WORKSPACE_CHILDREN,
+                    session_id=str(session_uuid),
+                    data=data,
+                ).to_dict()
             )
+        finally:
+            db.close()
 
+    async def send_workspace_file_urls(
+        self,
+        websocket: WebSocket,
+        *,
+        session_id: str,
+        paths: list[str],
+    ) -> None:
+        """Send presigned URLs for the workspace files a client is opening."""
+        db = SessionLocal()
+        try:
+            try:
+                session_uuid = uuid.UUID(session_id)
+            except ValueError:
+                return
+            db_session = SessionRepository.get_by_id(db, session_uuid)
+            if not db_session:
+                return
+            urls: dict[str, str | None] = {path: None for path in paths}
+            if db_session.workspace_manifest_key:
+                try:
+                    urls = workspace_manifest_cache.file_urls(
+                        db_session.workspace_manifest_key,
+                        db_session.workspace_files_prefix,
+                        paths,
+                    )
+                except Exception as exc:
+                    logger.warning(
+                        "ws_workspace_file_urls_failed",
+                        extra={
+                            "session_id": str(session_uuid),
+                            "paths": len(paths),
+                            "error": str(exc),
+                        },
+                    )
             await websocket.send_json(
                 WSEvent(
-                    type=EventType.WORKSPACE_FILE_URL,
+                    type=EventType.WORKSPACE_FILE_URLS,
                     session_id=str(session_uuid),
-                    data={"path": normalized, "url": url},
+                    data={"urls": urls},
                 ).to_dict()
             )
         finally:
@@ -297,42 +382,7 @@ class WebSocketService:
             }
 
         try:
-            storage_service = S3StorageService()
-            manifest = storage_service.get_manifest(manifest_key)
-            raw_nodes = build_nodes_from_manifest(manifest)
-            manifest_files = extract_manifest_files(manifest)
-            prefix = (files_prefix or "").rstrip("/")
-
-            file_url_map: dict[str, str] = {}
-            for file_entry in manifest_files:
-                file_path = normalize_manifest_path(file_entry.get("path"))
-                if not file_path:
-                    continue
-                object_key = (
-                    file_entry.get("key")
-                    or file_entry.get("object_key")
-                    or file_entry.get("oss_key")
-                    or file_entry.get("s3_key")
-                )
-                if not object_key and prefix:
-                    object_key = f"{prefix}/{file_path.lstrip('/')}"
-                if not object_key:
-                    continue
-                mime_type = file_entry.get("mimeType") or file_entry.get("mime_type")
-                file_url_map[file_path] = storage_service.presign_get(
-                    object_key,
-                    response_content_disposition="inline",
-                    response_content_type=mime_type,
-                )
-
-            def build_file_url(file_path: str) -> str | None:
-                normalized = normalize_manifest_path(file_path) or file_path
-                return file_url_map.get(normalized)
-
-            nodes = build_workspace_file_nodes(
-                raw_nodes,
-                file_url_builder=build_file_url,
-            )
+            nodes = workspace_manifest_cache.build_file_nodes(manifest_key, files_prefix)
             files_json = [node.model_dump(mode="json") for node in nodes]
             return {
                 "export_status": export_status,
@@ -354,11 +404,19 @@ class WebSocketService:
         self,
         callback: AgentCallbackRequest,
         db_message: AgentMessage | None = None,
+        *,
+        state_update: dict[str, Any] | None = None,
+        current_step: str | None = None,
     ) -> None:
-        """Broadcast callback data as WebSocket events."""
+        """Broadcast callback data as WebSocket events.
+
+        state_update is the versioned SESSION_PATCH payload (full state_patch or
+        state_delta) produced when the callback was applied; current_step comes from
+        the session's resulting state.
+        """
         session_id = callback.session_id
 
-        if not await ws_manager.has_connections(session_id):
+        if not await ws_manager.has_listeners(session_id):
             return
 
         # Status/progress event
@@ -370,25 +428,20 @@ class WebSocketService:
                 if hasattr(callback.status, "value")
                 else str(callback.status),
                 "progress": callback.progress or 0,
-                "current_step": callback.state_patch.current_step
-                if callback.state_patch
-                else None,
+                "current_step": current_step,
             },
         )
-        sent = await ws_manager.broadcast(session_id, status_event.to_dict())
-        logger.debug(
-            "ws_status_broadcast",
-            extra={"session_id": session_id, "sent_count": sent},
-        )
+        # Status and patch are rate-limited per session; messages are sent as they come.
+        await ws_event_coalescer.submit(session_id, status_event.to_dict())
 
         # State patch event (todos/mcp/workspace/current_step)
-        if callback.state_patch is not None:
+        if state_update is not None:
             patch_event = WSEvent(
                 type=EventType.SESSION_PATCH,
                 session_id=session_id,
-                data={"state_patch": callback.state_patch.model_dump(mode="json")},
+                data=state_update,
             )
-            await ws_manager.broadcast(session_id, patch_event.to_dict())
+            await ws_event_coalescer.submit(session_id, patch_event.to_dict())
 
         # New message event - push full message content
         if db_message:
@@ -427,6 +480,8 @@ class WebSocketService:
             callback.workspace_export_status == "ready"
             and callback.workspace_manifest_key
         ):
+            # The export rewrote the manifest under the same key.
+            workspace_manifest_cache.invalidate(callback.workspace_manifest_key)
             files_payload = self._build_workspace_files_payload(
                 manifest_key=callback.workspace_manifest_key,
                 files_prefix=callback.workspace_files_prefix,
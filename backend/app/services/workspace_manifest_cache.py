@@ -0,0 +1,302 @@
+import bisect
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.errors.error_codes import ErrorCode
+from app.core.errors.exceptions import AppException
+from app.core.settings import get_settings
+from app.schemas.response import CursorPage
+from app.schemas.workspace import FileNode, WorkspaceEntry
+from app.services.storage_service import S3StorageService
+from app.utils.cursor import decode_cursor, encode_cursor
+from app.utils.workspace import build_workspace_file_nodes
+from app.utils.workspace_manifest import (
+    build_nodes_from_manifest,
+    directory_sort_key,
+    extract_manifest_files,
+    index_directories,
+    normalize_manifest_path,
+)
+
+# Cached URLs are handed out at least this long before they expire.
+PRESIGN_TTL_MARGIN_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class WorkspaceObject:
+    """Where a manifest file is stored."""
+
+    object_key: str
+    mime_type: str | None
+
+
+@dataclass
+class CachedManifest:
+    """A parsed manifest: its tree, a path index and the URLs signed so far."""
+
+    # None when the tree was dropped to keep an oversize manifest (see get()).
+    raw_nodes: list[dict[str, Any]] | None
+    # Normalized path -> object, for every file that has an object key.
+    objects: dict[str, WorkspaceObject]
+    expires_at: float
+    # Normalized path -> (presigned URL, time it stops being handed out).
+    urls: dict[str, tuple[str, float]] = field(default_factory=dict)
+    # Directory path -> sorted entries; built on the first directory listing.
+    directories: dict[str, list[dict[str, Any]]] | None = None
+
+
+def index_manifest(
+    manifest: Any, files_prefix: str | None
+) -> dict[str, WorkspaceObject]:
+    """Maps each manifest file's normalized path to its object key and MIME type."""
+    prefix = (files_prefix or "").rstrip("/")
+    objects: dict[str, WorkspaceObject] = {}
+    for file_entry in extract_manifest_files(manifest):
+        file_path = normalize_manifest_path(file_entry.get("path"))
+        if not file_path or file_path in objects:
+            continue
+        object_key = (
+            file_entry.get("key")
+            or file_entry.get("object_key")
+            or file_entry.get("oss_key")
+            or file_entry.get("s3_key")
+        )
+        if not object_key and prefix:
+            object_key = f"{prefix}/{file_path.lstrip('/')}"
+        if not object_key:
+            continue
+        objects[file_path] = WorkspaceObject(
+            object_key=object_key,
+            mime_type=file_entry.get("mimeType") or file_entry.get("mime_type"),
+        )
+    return objects
+
+
+class WorkspaceManifestCache:
+    """Bounded LRU of parsed workspace manifests and their presigned file URLs.
+
+    Opening a workspace used to mean one S3 GET and a SigV4 signature per file for
+    every viewer and reconnect. Entries live for the presign TTL minus a margin, so a
+    re-export seen by another replica is picked up within that time; the replica that
+    receives the export callback invalidates the key right away. URLs are signed on
+    first use and reused until they are close to expiring. The cache is bounded by
+    the total number of indexed files rather than by manifests, since that is what
+    its memory grows with. A manifest larger than the whole budget is still kept, as
+    the only entry and without its tree: directory pages and file URLs are served from
+    its indexes, and only a full-tree request downloads it again.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_files: int | None = None,
+        storage_service: S3StorageService | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.max_files = max(
+            0,
+            max_files
+            if max_files is not None
+            else settings.workspace_manifest_cache_max_files,
+        )
+        self.ttl_seconds = max(
+            0, settings.s3_presign_expires - PRESIGN_TTL_MARGIN_SECONDS
+        )
+        self._storage = storage_service
+        self._entries: OrderedDict[tuple[str, str], CachedManifest] = OrderedDict()
+        self._file_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def storage(self) -> S3StorageService:
+        if self._storage is None:
+            self._storage = S3StorageService()
+        return self._storage
+
+    def get(
+        self, manifest_key: str, files_prefix: str | None, *, tree: bool = False
+    ) -> CachedManifest:
+        """Returns the parsed manifest, fetching it from S3 on a miss.
+
+        With tree=True the returned entry always has raw_nodes; an oversize manifest
+        cached without its tree is then fetched again (keeping its signed URLs).
+
+        Raises AppException when the manifest cannot be fetched.
+        """
+        key = (manifest_key, (files_prefix or "").rstrip("/"))
+        now = time.monotonic()
+        urls: dict[str, tuple[str, float]] = {}
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at <= now:
+                    self._remove(key)
+                elif tree and entry.raw_nodes is None:
+                    urls = entry.urls
+                else:
+                    self._entries.move_to_end(key)
+                    return entry
+
+        manifest = self.storage.get_manifest(manifest_key)
+        raw_nodes = build_nodes_from_manifest(manifest)
+        entry = CachedManifest(
+            raw_nodes=raw_nodes,
+            objects=index_manifest(manifest, files_prefix),
+            expires_at=now + self.ttl_seconds,
+            urls=urls,
+        )
+        if self.ttl_seconds <= 0 or self.max_files <= 0:
+            return entry
+        cached = entry
+        if len(entry.objects) > self.max_files:
+            # Too big to share the budget: keep the indexes directory pages and file
+            # URLs need, but not the tree.
+            entry.directories = index_directories(raw_nodes)
+            cached = CachedManifest(
+                raw_nodes=None,
+                objects=entry.objects,
+                expires_at=entry.expires_at,
+                urls=entry.urls,
+                directories=entry.directories,
+            )
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = cached
+            self._file_count += len(cached.objects)
+            # The newest entry stays even when it alone exceeds the budget.
+            while self._file_count > self.max_files and len(self._entries) > 1:
+                self._remove(next(iter(self._entries)))
+        return entry
+
+    def file_url(
+        self, manifest_key: str, files_prefix: str | None, path: str
+    ) -> str | None:
+        """Presigned URL of one workspace file, or None when it is not in the manifest."""
+        normalized = normalize_manifest_path(path)
+        if not normalized:
+            return None
+        return self._sign(self.get(manifest_key, files_prefix), normalized)
+
+    def build_file_nodes(
+        self, manifest_key: str, files_prefix: str | None
+    ) -> list[FileNode]:
+        """The workspace tree with a presigned URL on every stored file."""
+        entry = self.get(manifest_key, files_prefix, tree=True)
+        assert entry.raw_nodes is not None
+
+        def build_file_url(file_path: str) -> str | None:
+            normalized = normalize_manifest_path(file_path) or file_path
+            return self._sign(entry, normalized)
+
+        return build_workspace_file_nodes(
+            entry.raw_nodes, file_url_builder=build_file_url
+        )
+
+    def list_children(
+        self,
+        manifest_key: str,
+        files_prefix: str | None,
+        path: str | None,
+        *,
+        limit: int,
+        cursor: str | None = None,
+    ) -> CursorPage[WorkspaceEntry]:
+        """One page of a directory's entries ("/" for the root), without URLs.
+
+        Pages follow the directory order (folders first, then by name); the cursor is
+        the last entry returned, so a page stays consistent when the manifest changes.
+        An unknown directory yields an empty page.
+
+        Raises:
+            AppException: If the cursor is malformed.
+        """
+        entry = self.get(manifest_key, files_prefix)
+        if entry.directories is None:
+            assert entry.raw_nodes is not None
+            entry.directories = index_directories(entry.raw_nodes)
+        children = entry.directories.get(normalize_manifest_path(path) or "/", [])
+
+        start = 0
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            name = position.get("name")
+            if not isinstance(name, str):
+                raise AppException(
+                    error_code=ErrorCode.BAD_REQUEST, message="Invalid cursor"
+                )
+            start = bisect.bisect_right(
+                children,
+                directory_sort_key(position.get("type"), name),
+                key=lambda e: directory_sort_key(e.get("type"), e["name"]),
+            )
+        page = children[start : start + limit]
+        next_cursor = None
+        if page and start + limit < len(children):
+            last = page[-1]
+            next_cursor = encode_cursor(
+                {"type": last.get("type"), "name": last["name"]}
+            )
+        return CursorPage(
+            items=[_to_workspace_entry(e) for e in page], next_cursor=next_cursor
+        )
+
+    def file_urls(
+        self, manifest_key: str, files_prefix: str | None, paths: list[str]
+    ) -> dict[str, str | None]:
+        """Presigned URLs for a batch of files, by normalized path."""
+        entry = self.get(manifest_key, files_prefix)
+        urls: dict[str, str | None] = {}
+        for path in paths:
+            normalized = normalize_manifest_path(path)
+            urls[normalized or path] = (
+                self._sign(entry, normalized) if normalized else None
+            )
+        return urls
+
+    def invalidate(self, manifest_key: str) -> None:
+        """Drops a manifest (e.g. after the workspace was exported again)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == manifest_key]:
+                self._remove(key)
+
+    def _sign(self, entry: CachedManifest, path: str) -> str | None:
+        obj = entry.objects.get(path)
+        if obj is None:
+            return None
+        now = time.monotonic()
+        cached = entry.urls.get(path)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        url = self.storage.presign_get(
+            obj.object_key,
+            response_content_disposition="inline",
+            response_content_type=obj.mime_type,
+        )
+        if self.ttl_seconds > 0:
+            entry.urls[path] = (url, now + self.ttl_seconds)
+        return url
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._file_count -= len(entry.objects)
+
+
+def _to_workspace_entry(entry: dict[str, Any]) -> WorkspaceEntry:
+    return WorkspaceEntry(
+        id=str(entry.get("id") or entry["path"]),
+        name=str(entry["name"]),
+        type=entry["type"],
+        path=entry["path"],
+        mimeType=entry.get("mimeType") or entry.get("mime_type"),
+        oss_status=entry.get("oss_status") or entry.get("ossStatus"),
+        oss_meta=entry.get("oss_meta") or entry.get("ossMeta"),
+        child_count=entry.get("child_count"),
+    )
+
+
+# Global singleton instance
+workspace_manifest_cache = WorkspaceManifestCache()
@@ -0,0 +1,101 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any
+
+from app.core.errors.error_codes import ErrorCode
+from app.core.errors.exceptions import AppException
+
+
+def encode_cursor(position: dict[str, Any]) -> str:
+    """Encodes a keyset position as an opaque, URL-safe cursor."""
+    raw = json.dumps(position, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """Decodes a cursor produced by encode_cursor.
+
+    Raises:
+        AppException: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as exc:
+        raise AppException(
+            error_code=ErrorCode.BAD_REQUEST,
+            message="Invalid cursor",
+        ) from exc
+    if not isinstance(position, dict):
+        raise AppException(error_code=ErrorCode.BAD_REQUEST, message="Invalid cursor")
+    return position
+
+
+def encode_id_cursor(last_id: int) -> str:
+    """Cursor for tables whose integer id already follows insertion order."""
+    return encode_cursor({"id": last_id})
+
+
+def decode_id_cursor(cursor: str | None) -> int | None:
+    if cursor is None:
+        return None
+    position = decode_cursor(cursor)
+    last_id = position.get("id")
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise AppException(error_code=ErrorCode.BAD_REQUEST, message="Invalid cursor")
+    return last_id
+
+
+def encode_time_id_cursor(created_at: datetime, last_id: uuid.UUID) -> str:
+    """Cursor for tables keyed by random UUIDs, ordered by (created_at, id)."""
+    return encode_cursor({"created_at": created_at.isoformat(), "id": str(last_id)})
+
+
+def decode_time_id_cursor(cursor: str | None) -> tuple[datetime, uuid.UUID] | None:
+    if cursor is None:
+        return None
+    position = decode_cursor(cursor)
+    try:
+        return (
+            datetime.fromisoformat(str(position["created_at"])),
+            uuid.UUID(str(position["id"])),
+        )
+    except (KeyError, ValueError) as exc:
+        raise AppException(
+            error_code=ErrorCode.BAD_REQUEST,
+            message="Invalid cursor",
+        ) from exc
+
+
+def encode_scheduled_cursor(
+    scheduled_at: datetime, created_at: datetime, last_id: uuid.UUID
+) -> str:
+    """Cursor for runs, ordered by (scheduled_at, created_at, id)."""
+    return encode_cursor(
+        {
+            "scheduled_at": scheduled_at.isoformat(),
+            "created_at": created_at.isoformat(),
+            "id": str(last_id),
+        }
+    )
+
+
+def decode_scheduled_cursor(
+    cursor: str | None,
+) -> tuple[datetime, datetime, uuid.UUID] | None:
+    if cursor is None:
+        return None
+    position = decode_cursor(cursor)
+    try:
+        return (
+            datetime.fromisoformat(str(position["scheduled_at"])),
+            datetime.fromisoformat(str(position["created_at"])),
+            uuid.UUID(str(position["id"])),
+        )
+    except (KeyError, ValueError) as exc:
+        raise AppException(
+            error_code=ErrorCode.BAD_REQUEST,
+            message="Invalid cursor",
+        ) from exc
@@ -0,0 +1,160 @@
+"""Minimal JSON Patch (RFC 6902 subset: add/remove/replace) for agent state deltas.
+
+The same module lives in executor, executor_manager and backend so every hop speaks the
+same delta format.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+JsonPatch = list[dict[str, Any]]
+
+
+class JsonPatchError(ValueError):
+    """Raised when a patch does not apply to the given document."""
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(old: Any, new: Any, path: str = "") -> JsonPatch:
+    """Return operations that turn old into new.
+
+    Lists are diffed after trimming their common prefix and suffix, so inserting or
+    removing one element (e.g. a file change) costs one operation rather than rewriting
+    every following index.
+    """
+    if old == new:
+        return []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: JsonPatch = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(str(key))}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(str(key))}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(make_patch(old[key], value, child))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        prefix = 0
+        while prefix < min(len(old), len(new)) and old[prefix] == new[prefix]:
+            prefix += 1
+        suffix = 0
+        while (
+            suffix < min(len(old), len(new)) - prefix
+            and old[len(old) - 1 - suffix] == new[len(new) - 1 - suffix]
+        ):
+            suffix += 1
+        old_mid = old[prefix : len(old) - suffix]
+        new_mid = new[prefix : len(new) - suffix]
+
+        ops = []
+        for offset in range(min(len(old_mid), len(new_mid))):
+            ops.extend(
+                make_patch(
+                    old_mid[offset], new_mid[offset], f"{path}/{prefix + offset}"
+                )
+            )
+        for offset in range(len(old_mid), len(new_mid)):
+            ops.append(
+                {
+                    "op": "add",
+                    "path": f"{path}/{prefix + offset}",
+                    "value": new_mid[offset],
+                }
+            )
+        # Remove from the back so earlier indexes stay valid.
+        for offset in reversed(range(len(new_mid), len(old_mid))):
+            ops.append({"op": "remove", "path": f"{path}/{prefix + offset}"})
+        return ops
+
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document: Any, patch: JsonPatch) -> Any:
+    """Return a copy of document with patch applied (the input is not modified)."""
+    result = copy.deepcopy(document)
+    for op in patch:
+        result = _apply_op(result, op)
+    return result
+
+
+def _apply_op(document: Any, op: dict[str, Any]) -> Any:
+    kind = op.get("op")
+    path = op.get("path")
+    if kind not in ("add", "remove", "replace") or not isinstance(path, str):
+        raise JsonPatchError(f"Unsupported patch operation: {op!r}")
+    if kind != "remove" and "value" not in op:
+        raise JsonPatchError(f"Missing value in patch operation: {op!r}")
+
+    value = copy.deepcopy(op.get("value"))
+    if path == "":
+        if kind == "remove":
+            raise JsonPatchError("Cannot remove the document root")
+        return value
+    if not path.startswith("/"):
+        raise JsonPatchError(f"Invalid patch path: {path!r}")
+
+    tokens = [_unescape(t) for t in path[1:].split("/")]
+    parent = document
+    for token in tokens[:-1]:
+        parent = _child(parent, token, path)
+    last = tokens[-1]
+
+    if isinstance(parent, dict):
+        if kind != "add" and last not in parent:
+            raise JsonPatchError(f"Path not found: {path!r}")
+        if kind == "remove":
+            del parent[last]
+        else:
+            parent[last] = value
+        return document
+
+    if isinstance(parent, list):
+        if kind == "add" and last == "-":
+            parent.append(value)
+            return document
+        index = _index(last, path)
+        upper = len(parent) if kind == "add" else len(parent) - 1
+        if index > upper:
+            raise JsonPatchError(f"Index out of range: {path!r}")
+        if kind == "add":
+            parent.insert(index, value)
+        elif kind == "remove":
+            del parent[index]
+        else:
+            parent[index] = value
+        return document
+
+    raise JsonPatchError(f"Path not found: {path!r}")
+
+
+def _child(node: Any, token: str, path: str) -> Any:
+    if isinstance(node, dict):
+        if token not in node:
+            raise JsonPatchError(f"Path not found: {path!r}")
+        return node[token]
+    if isinstance(node, list):
+        index = _index(token, path)
+        if index >= len(node):
+            raise JsonPatchError(f"Index out of range: {path!r}")
+        return node[index]
+    raise JsonPatchError(f"Path not found: {path!r}")
+
+
+def _index(token: str, path: str) -> int:
+    if not token.isdigit():
+        raise JsonPatchError(f"Invalid list index in path: {path!r}")
+    return int(token)
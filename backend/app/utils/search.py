@@ -0,0 +1,27 @@
+from typing import Any
+
+# Language-neutral parsing: transcripts mix languages, and stemming for one would
+# mangle the others.
+SEARCH_TEXT_CONFIG = "simple"
+# Keeps each message's tsvector well below the 1MB limit.
+MAX_SEARCH_TEXT_CHARS = 32_000
+
+
+def extract_message_text(message: dict[str, Any]) -> str:
+    """Returns the text blocks of a stored message, joined for indexing."""
+    content = message.get("content")
+    if not isinstance(content, list):
+        return ""
+    parts = [
+        block["text"]
+        for block in content
+        if isinstance(block, dict)
+        and "TextBlock" in str(block.get("_type", ""))
+        and isinstance(block.get("text"), str)
+    ]
+    return "\n".join(parts)[:MAX_SEARCH_TEXT_CHARS]
+
+
+def escape_like(value: str) -> str:
+    """Escapes LIKE wildcards so value matches literally (with escape="\\")."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
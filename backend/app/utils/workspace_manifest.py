@@ -151,3 +151,38 @@ def find_manifest_file(manifest: Any, path: str) -> dict[str, Any] | None:
         if item_path == normalized:
             return item
     return None
+
+
+def directory_sort_key(node_type: str | None, name: str) -> tuple[int, str, str]:
+    """Order of entries within a directory: folders first, then by name."""
+    return (0 if node_type == "folder" else 1, name.lower(), name)
+
+
+def index_directories(nodes: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    """Maps each directory path ("/" for the root) to its sorted, childless entries.
+
+    Entries are the manifest nodes without "children"; folders get a "child_count".
+    """
+    directories: dict[str, list[dict[str, Any]]] = {}
+
+    def visit(items: list[Any], parent: str) -> None:
+        entries = directories.setdefault(parent, [])
+        for node in items:
+            if not isinstance(node, dict):
+                continue
+            node_type = node.get("type")
+            path = normalize_manifest_path(node.get("path"))
+            if node_type not in ("file", "folder") or not path:
+                continue
+            entry = {k: v for k, v in node.items() if k != "children"}
+            entry["path"] = path
+            entry["name"] = node.get("name") or path.rsplit("/", 1)[-1]
+            if node_type == "folder":
+                children = node.get("children")
+                visit(children if isinstance(children, list) else [], path)
+                entry["child_count"] = len(directories[path])
+            entries.append(entry)
+        entries.sort(key=lambda e: directory_sort_key(e.get("type"), e["name"]))
+
+    visit(nodes, "/")
+    return directories
@@ -0,0 +1,137 @@
+"""Benchmark callback persistence throughput: per-request commits vs batched ingestion.
+
+Simulates N agents streaming M callbacks each (assistant text + tool use, every message
+persisted) and reports callbacks/sec for:
+
+- direct: CallbackService.process_agent_callback per callback, N concurrent requests
+- batched: CallbackIngestionService (per-session micro-batches, one commit per batch)
+
+Unlike the claim benchmarks this one has to commit, because ingestion uses its own DB
+sessions. It creates sessions under a dedicated user id and deletes them afterwards:
+
+    DATABASE_URL=postgresql://... uv run python -m benchmarks.callback_ingest_throughput
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+from app.schemas.callback import AgentCallbackRequest, CallbackStatus
+from app.services.callback_ingestion_service import CallbackIngestionService
+from app.services.callback_service import CallbackService
+
+BENCH_USER_ID = "bench-callback-ingest"
+
+
+def _create_sessions(count: int) -> list[str]:
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            text(
+                """
+                INSERT INTO agent_sessions (id, user_id, status, kind, is_deleted)
+                SELECT gen_random_uuid(), :user_id, 'running', 'chat', false
+                FROM generate_series(1, :n)
+                RETURNING id
+                """
+            ),
+            {"user_id": BENCH_USER_ID, "n": count},
+        ).all()
+        db.commit()
+        return [str(row[0]) for row in rows]
+    finally:
+        db.close()
+
+
+def _cleanup() -> None:
+    db = SessionLocal()
+    try:
+        db.execute(
+            text("DELETE FROM agent_sessions WHERE user_id = :user_id"),
+            {"user_id": BENCH_USER_ID},
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _callback(session_id: str, index: int) -> AgentCallbackRequest:
+    return AgentCallbackRequest(
+        session_id=session_id,
+        time=datetime.now(timezone.utc),
+        status=CallbackStatus.RUNNING,
+        progress=min(99, index),
+        new_message={
+            "_type": "AssistantMessage",
+            "content": [
+                {"_type": "TextBlock", "text": f"step {index}"},
+                {
+                    "_type": "ToolUseBlock",
+                    "id": f"toolu_{session_id[:8]}_{index}",
+                    "name": "Bash",
+                    "input": {"command": "ls"},
+                },
+            ],
+        },
+    )
+
+
+async def _run_direct(sessions: list[str], per_agent: int) -> float:
+    service = CallbackService()
+
+    def handle(callback: AgentCallbackRequest) -> None:
+        db = SessionLocal()
+        try:
+            service.process_agent_callback(db, callback)
+        finally:
+            db.close()
+
+    async def agent(session_id: str) -> None:
+        for index in range(per_agent):
+            await asyncio.to_thread(handle, _callback(session_id, index))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(agent(session_id) for session_id in sessions))
+    return time.perf_counter() - started
+
+
+async def _run_batched(sessions: list[str], per_agent: int) -> float:
+    ingestion = CallbackIngestionService()
+
+    async def agent(session_id: str) -> None:
+        for index in range(per_agent):
+            await ingestion.submit(_callback(session_id, index))
+            # Yield like a real request handler would between callbacks.
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(agent(session_id) for session_id in sessions))
+    await ingestion.drain()
+    return time.perf_counter() - started
+
+
+async def _main(args: argparse.Namespace) -> None:
+    total = args.agents * args.callbacks
+    print(f"{'mode':>8} {'callbacks':>10} {'seconds':>8} {'cb/s':>8}")
+    try:
+        for mode, run in (("direct", _run_direct), ("batched", _run_batched)):
+            sessions = _create_sessions(args.agents)
+            elapsed = await run(sessions, args.callbacks)
+            print(f"{mode:>8} {total:>10} {elapsed:>8.2f} {total / elapsed:>8.0f}")
+    finally:
+        _cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--agents", type=int, default=10)
+    parser.add_argument("--callbacks", type=int, default=200)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Simulate a skewed run queue and compare claim policies by per-user queue wait.
+
+One heavy user floods the queue (think: a burst of scheduled tasks) while a few light
+users submit the occasional run. A fixed pool of worker slots claims through
+RunRepository.claim_batch every tick; runs hold their slot for a random number of ticks.
+Time is virtual (one tick = one second of scheduled_at), so the result only depends on
+the claim order the SQL produces. Everything happens in one transaction that is rolled
+back at the end:
+
+    DATABASE_URL=postgresql://... uv run python -m benchmarks.run_claim_fairness
+
+Under fifo the light users inherit the heavy user's backlog; under fair_share their
+p95 wait should stay within a few ticks.
+"""
+
+import argparse
+import random
+import statistics
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text, update
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.models.agent_run import AgentRun
+from app.repositories.run_repository import (
+    RUN_CLAIM_POLICY_FAIR_SHARE,
+    RUN_CLAIM_POLICY_FIFO,
+    RunClaimPolicy,
+    RunRepository,
+)
+
+BENCH_USER_PREFIX = "bench-fair-"
+
+
+def _submit(db: Session, user_id: str, scheduled_at: datetime) -> uuid.UUID:
+    """Create a session with one queued run, returning the run id."""
+    return db.execute(
+        text(
+            """
+            WITH s AS (
+                INSERT INTO agent_sessions (id, user_id, status, kind, is_deleted)
+                VALUES (gen_random_uuid(), :user_id, 'pending', 'chat', false)
+                RETURNING id
+            ), m AS (
+                INSERT INTO agent_messages (session_id, role, content, text_preview)
+                SELECT id, 'user', '{"_type": "UserMessage", "content": []}', 'bench'
+                FROM s
+                RETURNING session_id, id
+            )
+            INSERT INTO agent_runs (
+                session_id, user_message_id, status, permission_mode, progress,
+                schedule_mode, scheduled_at, attempts
+            )
+            SELECT m.session_id, m.id, 'queued', 'default', 0, 'immediate', :at, 0
+            FROM m
+            RETURNING id
+            """
+        ),
+        {"user_id": user_id, "at": scheduled_at},
+    ).scalar_one()
+
+
+def _simulate(db: Session, policy: RunClaimPolicy, args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    # Keep every virtual timestamp in the past so all submitted runs are due.
+    epoch = datetime.now(timezone.utc) - timedelta(seconds=args.ticks * 2)
+
+    heavy = f"{BENCH_USER_PREFIX}heavy"
+    light = [f"{BENCH_USER_PREFIX}light-{i}" for i in range(args.light_users)]
+
+    submitted: dict[uuid.UUID, tuple[str, int]] = {}
+    finishes: dict[int, list[uuid.UUID]] = {}
+    waits: dict[str, list[int]] = {user: [] for user in [heavy, *light]}
+    free = args.workers
+
+    for tick in range(args.ticks):
+        for run_id in finishes.pop(tick, []):
+            db.execute(
+                update(AgentRun).where(AgentRun.id == run_id).values(status="completed")
+            )
+            free += 1
+
+        at = epoch + timedelta(seconds=tick)
+        arrivals = [heavy] * args.heavy_rate
+        arrivals += [user for user in light if rng.random() < args.light_rate]
+        for offset, user in enumerate(arrivals):
+            run_id = _submit(db, user, at + timedelta(microseconds=offset))
+            submitted[run_id] = (user, tick)
+
+        if free:
+            runs = RunRepository.claim_batch(
+                db, "bench-worker", max_runs=free, policy=policy
+            )
+            for run in runs:
+                run.status = "running"
+                user, submitted_tick = submitted[run.id]
+                waits[user].append(tick - submitted_tick)
+                duration = rng.randint(args.min_duration, args.max_duration)
+                finishes.setdefault(tick + duration, []).append(run.id)
+            free -= len(runs)
+            db.flush()
+
+    return waits
+
+
+def _p95(samples: list[int]) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[max(0, int(len(ordered) * 0.95) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=20)
+    parser.add_argument("--heavy-rate", type=int, default=9)
+    parser.add_argument("--light-users", type=int, default=5)
+    parser.add_argument("--light-rate", type=float, default=0.4)
+    parser.add_argument("--min-duration", type=int, default=1)
+    parser.add_argument("--max-duration", type=int, default=3)
+    parser.add_argument("--max-active-per-user", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    policies = [
+        RunClaimPolicy(
+            name=name,
+            max_active_runs_per_user=args.max_active_per_user or None,
+        )
+        for name in (RUN_CLAIM_POLICY_FIFO, RUN_CLAIM_POLICY_FAIR_SHARE)
+    ]
+
+    print(f"{'policy':>12} {'user':>24} {'runs':>6} {'p50':>6} {'p95':>6} {'max':>6}")
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            for policy in policies:
+                savepoint = db.begin_nested()
+                waits = _simulate(db, policy, args)
+                savepoint.rollback()
+                for user, samples in waits.items():
+                    median = statistics.median(samples) if samples else float("nan")
+                    print(
+                        f"{policy.name:>12} {user:>24} {len(samples):>6} "
+                        f"{median:>6.1f} {_p95(samples):>6.1f} "
+                        f"{max(samples, default=0):>6}"
+                    )
+        finally:
+            db.close()
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
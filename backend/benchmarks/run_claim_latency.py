@@ -0,0 +1,120 @@
+"""Benchmark RunRepository.claim_batch latency against run table size.
+
+Grows agent_runs from 1k to 1M historical (completed) runs while keeping a fixed queue of
+queued runs, and reports claim latency percentiles at each size. Everything happens in
+one transaction that is rolled back at the end, so it is safe to point at a dev database:
+
+    DATABASE_URL=postgresql://... uv run python -m benchmarks.run_claim_latency
+
+With the partial claim indexes in place the numbers should stay flat across sizes.
+"""
+
+import argparse
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.repositories.run_repository import RunRepository
+
+BENCH_USER_ID = "bench-run-claim"
+
+
+def _seed_sessions(db: Session, sessions: int) -> None:
+    db.execute(
+        text(
+            """
+            INSERT INTO agent_sessions (id, user_id, status, kind, is_deleted)
+            SELECT gen_random_uuid(), :user_id, 'completed', 'chat', false
+            FROM generate_series(1, :n)
+            """
+        ),
+        {"user_id": BENCH_USER_ID, "n": sessions},
+    )
+    db.execute(
+        text(
+            """
+            INSERT INTO agent_messages (session_id, role, content, text_preview)
+            SELECT id, 'user', '{"_type": "UserMessage", "content": []}', 'bench'
+            FROM agent_sessions WHERE user_id = :user_id
+            """
+        ),
+        {"user_id": BENCH_USER_ID},
+    )
+
+
+def _insert_runs(db: Session, count: int, status: str) -> None:
+    db.execute(
+        text(
+            """
+            WITH m AS (
+                SELECT session_id, id, row_number() OVER (ORDER BY id) - 1 AS idx
+                FROM agent_messages
+                WHERE session_id IN (
+                    SELECT id FROM agent_sessions WHERE user_id = :user_id
+                )
+            )
+            INSERT INTO agent_runs (
+                session_id, user_message_id, status, permission_mode, progress,
+                schedule_mode, scheduled_at, attempts
+            )
+            SELECT m.session_id, m.id, :status, 'default', 0, 'immediate',
+                   now() - (g * interval '1 second'), 0
+            FROM generate_series(1, :n) AS g
+            JOIN m ON m.idx = g % 1000
+            """
+        ),
+        {"status": status, "n": count, "user_id": BENCH_USER_ID},
+    )
+
+
+def _measure(db: Session, iterations: int, batch: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(iterations):
+        savepoint = db.begin_nested()
+        started = time.perf_counter()
+        RunRepository.claim_batch(db, "bench-worker", max_runs=batch, lease_seconds=30)
+        db.flush()
+        samples.append((time.perf_counter() - started) * 1000)
+        savepoint.rollback()
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000")
+    parser.add_argument("--queued", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    sizes = sorted(int(s) for s in args.sizes.split(",") if s.strip())
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            _seed_sessions(db, 1000)
+            _insert_runs(db, args.queued, "queued")
+
+            current = 0
+            print(f"{'runs':>10} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+            for size in sizes:
+                _insert_runs(db, size - current, "completed")
+                current = size
+                db.execute(text("ANALYZE agent_runs"))
+                samples = sorted(_measure(db, args.iterations, args.batch))
+                p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+                print(
+                    f"{size:>10} {statistics.median(samples):>8.2f} "
+                    f"{p95:>8.2f} {samples[-1]:>8.2f}"
+                )
+        finally:
+            db.close()
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
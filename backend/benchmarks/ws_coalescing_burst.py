@@ -0,0 +1,152 @@
+"""Benchmark WebSocket frames and CPU for a burst of callbacks, with and without coalescing.
+
+Replays what WebSocketService.broadcast_callback emits during a tool-heavy phase: per
+callback one SESSION_STATUS and one versioned SESSION_PATCH delta, plus a MESSAGE_NEW
+for every few callbacks. Events go through EventCoalescer into a ConnectionManager with
+V in-process viewers whose sockets count the pre-encoded frames they are sent, and the
+run reports frames per viewer by type and the process CPU time spent.
+
+No database or network is involved:
+
+    uv run python -m benchmarks.ws_coalescing_burst --viewers 20 --callbacks 2000
+
+Window 0 is the uncoalesced baseline. MESSAGE_NEW counts must match across windows.
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import Any
+
+from app.core.websocket.coalescer import EventCoalescer
+from app.core.websocket.events import EventType, WSEvent
+from app.core.websocket.manager import ConnectionManager
+
+SESSION_ID = "bench-ws-coalescing"
+
+
+class _CountingSocket:
+    """Stands in for a WebSocket: counts frames and their bytes."""
+
+    def __init__(self) -> None:
+        self.frames: Counter[str] = Counter()
+        self.bytes = 0
+
+    async def accept(self, subprotocol: str | None = None) -> None:
+        return None
+
+    async def send_text(self, data: str) -> None:
+        self.bytes += len(data)
+        # Frames are WSEvent.to_dict() encodings: they start with {"type":"...".
+        start = len('{"type":"')
+        self.frames[data[start : data.index('"', start)]] += 1
+
+    async def close(self, code: int = 1000) -> None:
+        return None
+
+
+def _events(index: int, message_every: int) -> list[dict[str, Any]]:
+    events = [
+        WSEvent(
+            type=EventType.SESSION_STATUS,
+            session_id=SESSION_ID,
+            data={
+                "status": "running",
+                "progress": index % 100,
+                "current_step": f"tool call {index}",
+            },
+        ).to_dict(),
+        WSEvent(
+            type=EventType.SESSION_PATCH,
+            session_id=SESSION_ID,
+            data={
+                "state_version": index + 2,
+                "state_delta": [
+                    {
+                        "op": "replace",
+                        "path": "/current_step",
+                        "value": f"tool call {index}",
+                    }
+                ],
+            },
+        ).to_dict(),
+    ]
+    if index % message_every == 0:
+        events.append(
+            WSEvent(
+                type=EventType.MESSAGE_NEW,
+                session_id=SESSION_ID,
+                data={
+                    "id": index,
+                    "role": "assistant",
+                    "content": {"content": [{"text": "x" * 400}]},
+                    "text_preview": "x" * 100,
+                },
+            ).to_dict()
+        )
+    return events
+
+
+async def _run(args: argparse.Namespace, window_ms: int) -> None:
+    manager = ConnectionManager()
+    coalescer = EventCoalescer(manager.broadcast, window_ms / 1000)
+    sockets = [_CountingSocket() for _ in range(args.viewers)]
+    for socket in sockets:
+        await manager.connect(SESSION_ID, socket)  # type: ignore[arg-type]
+
+    interval = 1 / args.rate
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    for index in range(args.callbacks):
+        for event in _events(index, args.message_every):
+            if event["type"] == EventType.MESSAGE_NEW.value:
+                await manager.broadcast(SESSION_ID, event)
+            else:
+                await coalescer.submit(SESSION_ID, event)
+        await asyncio.sleep(interval)
+    await asyncio.sleep(window_ms / 1000 * 2 + 0.05)
+    await coalescer.flush()
+    # Let the writers drain.
+    while (await manager.get_stats()).queued_events:
+        await asyncio.sleep(0.01)
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    frames = sockets[0].frames
+    print(
+        f"{window_ms:>6} {sum(frames.values()):>8} "
+        f"{frames[EventType.SESSION_STATUS.value]:>8} "
+        f"{frames[EventType.SESSION_PATCH.value]:>8} "
+        f"{frames[EventType.MESSAGE_NEW.value]:>8} "
+        f"{sockets[0].bytes / 1024:>8.0f} {cpu:>8.2f} {wall:>8.2f}"
+    )
+    for socket in sockets:
+        await manager.disconnect(SESSION_ID, socket)  # type: ignore[arg-type]
+
+
+async def _main(args: argparse.Namespace) -> None:
+    print(
+        f"{args.callbacks} callbacks at {args.rate}/s, {args.viewers} viewers; "
+        "frames are per viewer"
+    )
+    print(
+        f"{'win ms':>6} {'frames':>8} {'status':>8} {'patch':>8} {'message':>8} "
+        f"{'KiB':>8} {'cpu s':>8} {'wall s':>8}"
+    )
+    for window_ms in args.windows:
+        await _run(args, window_ms)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--viewers", type=int, default=20)
+    parser.add_argument("--callbacks", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=500.0, help="callbacks/second")
+    parser.add_argument("--message-every", type=int, default=4)
+    parser.add_argument("--windows", type=int, nargs="+", default=[0, 50, 100, 250])
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
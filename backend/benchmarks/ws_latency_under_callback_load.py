@@ -0,0 +1,127 @@
+"""Benchmark WebSocket round-trip latency while the backend ingests callbacks.
+
+Measures ping -> pong time on one session WebSocket, first with the backend idle and
+then while N agents stream callbacks to POST /api/v1/callback as fast as they can.
+Anything that blocks the event loop (a sync DB call inside an async route) shows up
+directly in the loaded percentiles, so they should stay close to the idle ones.
+
+Runs against a live backend. It creates sessions under a dedicated user id and deletes
+them afterwards:
+
+    DATABASE_URL=postgresql://... uv run python -m benchmarks.ws_latency_under_callback_load \\
+        --base-url http://localhost:8000
+
+Set CALLBACK_INGEST_ASYNC_ENABLED=false on the backend to load the per-request write
+path instead of the batched ingestion queue.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+import websockets
+
+# Reuses the session fixtures (and bench user) of the ingestion throughput benchmark.
+from benchmarks.callback_ingest_throughput import (
+    BENCH_USER_ID,
+    _callback,
+    _cleanup,
+    _create_sessions,
+)
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _measure_pings(ws_url: str, count: int, interval: float) -> list[float]:
+    """Returns ping -> pong round trips in milliseconds."""
+    samples: list[float] = []
+    async with websockets.connect(ws_url) as ws:
+        # Let the connect-time snapshot arrive before timing anything.
+        await asyncio.sleep(0.5)
+        for _ in range(count):
+            started = time.perf_counter()
+            await ws.send(json.dumps({"type": "ping"}))
+            while True:
+                message = json.loads(await ws.recv())
+                if message.get("type") == "pong":
+                    break
+            samples.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(interval)
+    return samples
+
+
+async def _stream_callbacks(
+    client: httpx.AsyncClient, session_id: str, stop: asyncio.Event
+) -> int:
+    sent = 0
+    while not stop.is_set():
+        callback = _callback(session_id, sent)
+        response = await client.post(
+            "/api/v1/callback", json=callback.model_dump(mode="json")
+        )
+        response.raise_for_status()
+        sent += 1
+    return sent
+
+
+def _report(phase: str, samples: list[float], callbacks_per_s: float | None) -> None:
+    rate = f"{callbacks_per_s:>8.0f}" if callbacks_per_s is not None else f"{'-':>8}"
+    print(
+        f"{phase:>6} {len(samples):>6} "
+        f"{statistics.median(samples):>8.2f} {_percentile(samples, 95):>8.2f} "
+        f"{_percentile(samples, 99):>8.2f} {max(samples):>8.2f} {rate}"
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    sessions = _create_sessions(args.agents + 1)
+    ws_base = args.base_url.replace("http", "ws", 1)
+    ws_url = f"{ws_base}/api/v1/ws/sessions/{sessions[0]}?user_id={BENCH_USER_ID}"
+    interval = args.ping_interval_ms / 1000
+    print(
+        f"{'phase':>6} {'pings':>6} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'max ms':>8} {'cb/s':>8}"
+    )
+    try:
+        idle = await _measure_pings(ws_url, args.pings, interval)
+        _report("idle", idle, None)
+
+        stop = asyncio.Event()
+        limits = httpx.Limits(max_connections=args.agents)
+        async with httpx.AsyncClient(
+            base_url=args.base_url, limits=limits, timeout=60
+        ) as client:
+            agents = [
+                asyncio.create_task(_stream_callbacks(client, session_id, stop))
+                for session_id in sessions[1:]
+            ]
+            started = time.perf_counter()
+            try:
+                loaded = await _measure_pings(ws_url, args.pings, interval)
+            finally:
+                stop.set()
+                sent = sum(await asyncio.gather(*agents))
+            elapsed = time.perf_counter() - started
+        _report("load", loaded, sent / elapsed)
+    finally:
+        _cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--pings", type=int, default=200)
+    parser.add_argument("--ping-interval-ms", type=int, default=20)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import asyncio
+import unittest
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from app.schemas.callback import AgentCallbackRequest, CallbackResponse
+from app.services.callback_ingestion_service import CallbackIngestionService
+from app.services.callback_service import CallbackService
+
+
+def _callback(**kwargs: Any) -> AgentCallbackRequest:
+    return AgentCallbackRequest(
+        session_id="s1",
+        time=datetime.now(timezone.utc),
+        status="running",
+        progress=0,
+        **kwargs,
+    )
+
+
+def _db_session(state: dict[str, Any] | None, version: int | None) -> Any:
+    return SimpleNamespace(id=uuid.uuid4(), state_patch=state, state_version=version)
+
+
+def _step(current_step: str) -> list[dict[str, Any]]:
+    return [{"op": "replace", "path": "/current_step", "value": current_step}]
+
+
+class TestApplyState(unittest.TestCase):
+    def setUp(self) -> None:
+        self.state = {
+            "todos": [],
+            "mcp_status": [],
+            "workspace_state": None,
+            "current_step": "plan",
+        }
+
+    def test_delta_on_its_base_version_applies(self) -> None:
+        db_session = _db_session(self.state, 3)
+
+        update, resync = CallbackService._apply_state(
+            db_session, _callback(state_delta=_step("build"), state_version=4)
+        )
+
+        self.assertFalse(resync)
+        self.assertEqual(db_session.state_version, 4)
+        self.assertEqual(db_session.state_patch["current_step"], "build")
+        self.assertEqual(update, {"state_version": 4, "state_delta": _step("build")})
+
+    def test_version_gap_rejects_delta_and_asks_for_snapshot(self) -> None:
+        db_session = _db_session(self.state, 3)
+
+        update, resync = CallbackService._apply_state(
+            db_session, _callback(state_delta=_step("build"), state_version=5)
+        )
+
+        self.assertIsNone(update)
+        self.assertTrue(resync)
+        self.assertEqual(db_session.state_version, 3)
+        self.assertEqual(db_session.state_patch["current_step"], "plan")
+
+    def test_delta_without_stored_state_asks_for_snapshot(self) -> None:
+        update, resync = CallbackService._apply_state(
+            _db_session(None, None),
+            _callback(state_delta=_step("build"), state_version=1),
+        )
+
+        self.assertIsNone(update)
+        self.assertTrue(resync)
+
+    def test_unappliable_delta_asks_for_snapshot(self) -> None:
+        db_session = _db_session(self.state, 3)
+
+        update, resync = CallbackService._apply_state(
+            db_session,
+            _callback(
+                state_delta=[{"op": "remove", "path": "/missing"}], state_version=4
+            ),
+        )
+
+        self.assertIsNone(update)
+        self.assertTrue(resync)
+        self.assertEqual(db_session.state_version, 3)
+
+    def test_snapshot_resets_state(self) -> None:
+        db_session = _db_session(self.state, 3)
+
+        update, resync = CallbackService._apply_state(
+            db_session,
+            _callback(state_patch={"current_step": "review"}, state_version=9),
+        )
+
+        self.assertFalse(resync)
+        self.assertEqual(db_session.state_version, 9)
+        self.assertEqual(update["state_patch"]["current_step"], "review")
+
+
+class TestQueuedStateResync(unittest.IsolatedAsyncioTestCase):
+    async def test_rejected_queued_delta_is_reported_once(self) -> None:
+        callback_service = MagicMock()
+        callback_service.process_agent_callback_batch = MagicMock(
+            return_value=[
+                CallbackResponse(
+                    session_id=str(uuid.uuid4()),
+                    status="running",
+                    state_resync_required=True,
+                )
+            ]
+        )
+        service = CallbackIngestionService(
+            callback_service=callback_service,
+            linger_seconds=0,
+            max_batch_size=10,
+            max_concurrency=1,
+            max_pending=10,
+        )
+
+        with patch(
+            "app.services.callback_ingestion_service.SessionLocal",
+            return_value=MagicMock(),
+        ):
+            await service.submit(_callback(state_delta=_step("x"), state_version=7))
+            await asyncio.wait_for(service.drain(), timeout=5)
+
+        self.assertTrue(service.take_state_resync("s1"))
+        self.assertFalse(service.take_state_resync("s1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+from typing import Any
+from unittest.mock import MagicMock
+
+from app.core.errors.exceptions import AppException
+from app.services.workspace_manifest_cache import WorkspaceManifestCache
+
+
+def _manifest(*paths: str) -> dict[str, Any]:
+    return {"files": [{"path": p, "key": f"objects{p}"} for p in paths]}
+
+
+def _storage(manifest: dict[str, Any]) -> MagicMock:
+    storage = MagicMock()
+    storage.get_manifest = MagicMock(return_value=manifest)
+    storage.presign_get = MagicMock(
+        side_effect=lambda key, **_: f"https://s3.example/{key}"
+    )
+    return storage
+
+
+def _walk(
+    cache: WorkspaceManifestCache, path: str, limit: int
+) -> tuple[list[str], int]:
+    names: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        page = cache.list_children("manifest", None, path, limit=limit, cursor=cursor)
+        pages += 1
+        names.extend(entry.name for entry in page.items)
+        if page.next_cursor is None:
+            return names, pages
+        cursor = page.next_cursor
+
+
+class TestWorkspaceChildrenPaging(unittest.TestCase):
+    def test_cursor_pages_cover_directory_once_in_order(self) -> None:
+        storage = _storage(
+            _manifest(
+                "/b.txt",
+                "/A.txt",
+                "/c.txt",
+                "/docs/readme.md",
+                "/src/main.py",
+                "/src/util.py",
+                "/d.txt",
+            )
+        )
+        cache = WorkspaceManifestCache(max_files=100, storage_service=storage)
+
+        names, pages = _walk(cache, "/", limit=2)
+
+        self.assertEqual(names, ["docs", "src", "A.txt", "b.txt", "c.txt", "d.txt"])
+        self.assertEqual(pages, 3)
+        storage.get_manifest.assert_called_once()
+
+    def test_folders_report_child_count(self) -> None:
+        cache = WorkspaceManifestCache(
+            max_files=100,
+            storage_service=_storage(_manifest("/src/a.py", "/src/b.py", "/x")),
+        )
+
+        page = cache.list_children("manifest", None, "/", limit=10)
+
+        self.assertEqual([(e.name, e.child_count) for e in page.items][0], ("src", 2))
+        self.assertIsNone(page.next_cursor)
+
+    def test_cursor_resumes_after_last_entry_when_manifest_changes(self) -> None:
+        storage = _storage(_manifest("/b.txt", "/d.txt", "/f.txt"))
+        cache = WorkspaceManifestCache(max_files=100, storage_service=storage)
+        first = cache.list_children("manifest", None, "/", limit=2)
+        self.assertEqual([e.name for e in first.items], ["b.txt", "d.txt"])
+
+        storage.get_manifest.return_value = _manifest(
+            "/a.txt", "/b.txt", "/c.txt", "/e.txt", "/f.txt"
+        )
+        cache.invalidate("manifest")
+        second = cache.list_children(
+            "manifest", None, "/", limit=2, cursor=first.next_cursor
+        )
+
+        self.assertEqual([e.name for e in second.items], ["e.txt", "f.txt"])
+        self.assertIsNone(second.next_cursor)
+
+    def test_malformed_cursor_is_rejected(self) -> None:
+        cache = WorkspaceManifestCache(
+            max_files=100, storage_service=_storage(_manifest("/a.txt"))
+        )
+
+        with self.assertRaises(AppException):
+            cache.list_children("manifest", None, "/", limit=2, cursor="not-a-cursor")
+
+
+class TestOversizeManifest(unittest.TestCase):
+    def test_oversize_manifest_keeps_indexes_between_pages(self) -> None:
+        storage = _storage(_manifest(*(f"/dir/f{i:02d}.txt" for i in range(10))))
+        cache = WorkspaceManifestCache(max_files=4, storage_service=storage)
+
+        names, pages = _walk(cache, "/dir", limit=3)
+        urls = cache.file_urls("manifest", None, ["/dir/f00.txt", "/dir/f09.txt"])
+
+        self.assertEqual(len(names), 10)
+        self.assertEqual(pages, 4)
+        self.assertEqual(urls["/dir/f09.txt"], "https://s3.example/objects/dir/f09.txt")
+        storage.get_manifest.assert_called_once()
+
+    def test_full_tree_refetches_oversize_manifest_but_reuses_urls(self) -> None:
+        storage = _storage(_manifest(*(f"/f{i}.txt" for i in range(6))))
+        cache = WorkspaceManifestCache(max_files=4, storage_service=storage)
+        cache.file_urls("manifest", None, ["/f0.txt"])
+
+        nodes = cache.build_file_nodes("manifest", None)
+
+        self.assertEqual(len(nodes), 6)
+        self.assertEqual(storage.get_manifest.call_count, 2)
+        # One signature per file: /f0.txt was signed before the tree was fetched.
+        self.assertEqual(storage.presign_get.call_count, 6)
+
+    def test_next_manifest_evicts_oversize_entry(self) -> None:
+        storage = _storage(_manifest(*(f"/f{i}.txt" for i in range(6))))
+        cache = WorkspaceManifestCache(max_files=4, storage_service=storage)
+        cache.list_children("manifest", None, "/", limit=2)
+
+        storage.get_manifest.return_value = _manifest("/a.txt")
+        cache.list_children("other", None, "/", limit=2)
+        cache.list_children("manifest", None, "/", limit=2)
+
+        self.assertEqual(storage.get_manifest.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import unittest
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from app.core.websocket import broker as broker_module
+from app.core.websocket.broker import InMemoryBroker, PostgresBroker
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.delivered: list[tuple[str, dict[str, Any]]] = []
+
+    async def __call__(self, key: str, event: dict[str, Any]) -> int:
+        self.delivered.append((key, event))
+        return 1
+
+
+def _listening(broker: PostgresBroker, deliver: _Recorder) -> None:
+    broker.bind(deliver)
+    broker._loop = asyncio.get_running_loop()
+
+
+class TestInMemoryBroker(unittest.IsolatedAsyncioTestCase):
+    async def test_publish_delivers_locally(self) -> None:
+        deliver = _Recorder()
+        broker = InMemoryBroker()
+        broker.bind(deliver)
+
+        sent = await broker.publish("s1", {"type": "x"})
+
+        self.assertEqual(sent, 1)
+        self.assertEqual(deliver.delivered, [("s1", {"type": "x"})])
+        self.assertFalse(broker.distributed)
+        self.assertTrue(broker.connected)
+
+
+class TestPostgresBrokerNotifications(unittest.IsolatedAsyncioTestCase):
+    async def test_other_replica_event_is_delivered(self) -> None:
+        deliver = _Recorder()
+        receiver = PostgresBroker()
+        _listening(receiver, deliver)
+        event = {"type": "message.new", "data": {"text": "hi"}}
+
+        for payload in PostgresBroker()._encode("s1", event):
+            receiver._on_notify(payload)
+        await asyncio.sleep(0)
+
+        self.assertEqual(deliver.delivered, [("s1", event)])
+
+    async def test_own_notifications_are_skipped(self) -> None:
+        deliver = _Recorder()
+        broker = PostgresBroker()
+        _listening(broker, deliver)
+
+        for payload in broker._encode("s1", {"type": "x"}):
+            broker._on_notify(payload)
+        await asyncio.sleep(0)
+
+        self.assertEqual(deliver.delivered, [])
+
+    async def test_chunks_are_reassembled_in_any_order(self) -> None:
+        deliver = _Recorder()
+        receiver = PostgresBroker()
+        _listening(receiver, deliver)
+        event = {"type": "message.new", "data": {"text": "x" * 500}}
+
+        with patch.object(broker_module, "_NOTIFY_CHUNK_CHARS", 100):
+            payloads = PostgresBroker()._encode("s1", event)
+        self.assertGreater(len(payloads), 3)
+        for payload in reversed(payloads):
+            self.assertLessEqual(len(payload), 8000)
+            receiver._on_notify(payload)
+        await asyncio.sleep(0)
+
+        self.assertEqual(deliver.delivered, [("s1", event)])
+        self.assertEqual(len(receiver._pending), 0)
+
+    async def test_incomplete_chunked_events_are_bounded(self) -> None:
+        receiver = PostgresBroker()
+        _listening(receiver, _Recorder())
+        sender = PostgresBroker()
+
+        with patch.object(broker_module, "_NOTIFY_CHUNK_CHARS", 10):
+            for index in range(broker_module._MAX_PENDING_CHUNKED + 5):
+                # Only the first chunk of each event arrives.
+                receiver._on_notify(sender._encode(f"s{index}", {"type": "x"})[0])
+
+        self.assertEqual(len(receiver._pending), broker_module._MAX_PENDING_CHUNKED)
+
+    async def test_readable_connection_delivers_queued_notifies(self) -> None:
+        deliver = _Recorder()
+        receiver = PostgresBroker()
+        _listening(receiver, deliver)
+        payloads = PostgresBroker()._encode("s1", {"type": "x"})
+        receiver._dbapi_connection = SimpleNamespace(
+            poll=lambda: None,
+            notifies=[SimpleNamespace(payload=p) for p in payloads + ["not json"]],
+        )
+
+        receiver._on_readable()
+        await asyncio.sleep(0)
+
+        self.assertEqual(deliver.delivered, [("s1", {"type": "x"})])
+
+
+class TestPostgresBrokerConnection(unittest.IsolatedAsyncioTestCase):
+    def _raw(self, *, listen_error: Exception | None = None) -> MagicMock:
+        raw = MagicMock()
+        cursor = raw.driver_connection.cursor.return_value.__enter__.return_value
+        cursor.execute.side_effect = listen_error
+        raw.driver_connection.fileno.return_value = 99
+        return raw
+
+    async def test_failed_start_retries_with_backoff_until_listening(self) -> None:
+        loop = asyncio.get_running_loop()
+        failed = self._raw(listen_error=RuntimeError("listen failed"))
+        healthy = self._raw()
+        broker = PostgresBroker()
+
+        with (
+            patch.object(broker_module.engine.dialect, "name", "postgresql"),
+            patch.object(broker_module, "_RECONNECT_DELAY_SECONDS", 0.01),
+            patch.object(
+                broker_module.engine,
+                "raw_connection",
+                side_effect=[failed, failed, healthy],
+            ),
+            patch.object(loop, "add_reader"),
+            patch.object(loop, "remove_reader"),
+        ):
+            self.assertFalse(broker.start(loop))
+            # Disconnected, but other replicas may still hold connections.
+            self.assertTrue(broker.distributed)
+            self.assertFalse(broker.connected)
+            await asyncio.sleep(0.1)
+
+            self.assertTrue(broker.connected)
+            # Every connection detached for a failed attempt was closed.
+            self.assertEqual(failed.close.call_count, 2)
+            healthy.close.assert_not_called()
+            broker.stop()
+
+        self.assertFalse(broker.distributed)
+        healthy.close.assert_called_once()
+
+    async def test_lost_connection_is_reopened(self) -> None:
+        loop = asyncio.get_running_loop()
+        broker = PostgresBroker()
+        first, second = self._raw(), self._raw()
+        first.driver_connection.poll.side_effect = OSError("connection lost")
+
+        with (
+            patch.object(broker_module.engine.dialect, "name", "postgresql"),
+            patch.object(broker_module, "_RECONNECT_DELAY_SECONDS", 0.01),
+            patch.object(
+                broker_module.engine, "raw_connection", side_effect=[first, second]
+            ),
+            patch.object(loop, "add_reader"),
+            patch.object(loop, "remove_reader"),
+        ):
+            self.assertTrue(broker.start(loop))
+            broker._on_readable()
+            self.assertFalse(broker.connected)
+            first.close.assert_called_once()
+            await asyncio.sleep(0.05)
+
+            self.assertTrue(broker.connected)
+            broker.stop()
+
+    async def test_publish_notifies_while_disconnected(self) -> None:
+        broker = PostgresBroker()
+        broker.bind(_Recorder())
+        broker._enabled = True
+        notified: list[list[str]] = []
+
+        with patch.object(broker, "_notify", side_effect=notified.append):
+            await broker.publish("s1", {"type": "x"})
+
+        self.assertEqual(len(notified), 1)
+        self.assertEqual(json.loads(notified[0][0])["o"], broker.origin)
+
+
+if __name__ == "__main__":
+    unittest.main()
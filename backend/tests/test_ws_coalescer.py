@@ -0,0 +1,118 @@
+import asyncio
+import unittest
+from typing import Any
+
+from app.core.websocket.coalescer import EventCoalescer, merge_patch
+from app.core.websocket.events import EventType
+
+PATCH = EventType.SESSION_PATCH.value
+STATUS = EventType.SESSION_STATUS.value
+MESSAGE = EventType.MESSAGE_NEW.value
+
+
+def _delta(version: int, step: str) -> dict[str, Any]:
+    return {
+        "type": PATCH,
+        "data": {
+            "state_version": version,
+            "state_delta": [{"op": "replace", "path": "/step", "value": step}],
+        },
+    }
+
+
+def _snapshot(version: int, step: str) -> dict[str, Any]:
+    return {
+        "type": PATCH,
+        "data": {"state_version": version, "state_patch": {"step": step}},
+    }
+
+
+def _status(status: str) -> dict[str, Any]:
+    return {"type": STATUS, "data": {"status": status}}
+
+
+class TestMergePatch(unittest.TestCase):
+    def test_deltas_fold_keeping_the_first_base_version(self) -> None:
+        merged = merge_patch(_delta(4, "a"), _delta(5, "b"))
+        merged = merge_patch(merged, _delta(6, "c"))
+
+        self.assertEqual(merged["data"]["state_version"], 6)
+        self.assertEqual(merged["data"]["base_version"], 3)
+        self.assertEqual(
+            [op["value"] for op in merged["data"]["state_delta"]], ["a", "b", "c"]
+        )
+
+    def test_delta_is_applied_to_pending_snapshot(self) -> None:
+        merged = merge_patch(_snapshot(4, "a"), _delta(5, "b"))
+
+        self.assertEqual(
+            merged["data"], {"state_version": 5, "state_patch": {"step": "b"}}
+        )
+
+    def test_snapshot_replaces_pending(self) -> None:
+        snapshot = _snapshot(9, "z")
+
+        self.assertIs(merge_patch(_delta(4, "a"), snapshot), snapshot)
+
+    def test_version_gap_is_not_merged(self) -> None:
+        self.assertIsNone(merge_patch(_delta(4, "a"), _delta(6, "c")))
+
+    def test_unappliable_delta_is_not_merged(self) -> None:
+        event = _delta(5, "b")
+        event["data"]["state_delta"] = [{"op": "remove", "path": "/missing"}]
+
+        self.assertIsNone(merge_patch(_snapshot(4, "a"), event))
+
+
+class TestEventCoalescer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.published: list[tuple[str, dict[str, Any]]] = []
+
+        async def publish(key: str, event: dict[str, Any]) -> int:
+            self.published.append((key, event))
+            return 1
+
+        self.coalescer = EventCoalescer(publish, window_seconds=0.05)
+        self.addAsyncCleanup(self.coalescer.flush)
+
+    async def test_first_event_is_sent_and_window_merges_the_rest(self) -> None:
+        await self.coalescer.submit("s1", _status("running"))
+        await self.coalescer.submit("s1", _status("finishing"))
+        await self.coalescer.submit("s1", _status("completed"))
+
+        self.assertEqual(self.published, [("s1", _status("running"))])
+        await asyncio.sleep(0.08)
+
+        self.assertEqual(self.published[1], ("s1", _status("completed")))
+        self.assertEqual(self.coalescer.merged, 1)
+        self.assertEqual(self.coalescer.published, 2)
+
+    async def test_unmergeable_event_sends_pending_in_order(self) -> None:
+        await self.coalescer.submit("s1", _delta(4, "a"))
+        await self.coalescer.submit("s1", _delta(5, "b"))
+        await self.coalescer.submit("s1", _delta(7, "d"))
+
+        self.assertEqual(
+            [e["data"]["state_version"] for _, e in self.published], [4, 5]
+        )
+
+    async def test_other_event_types_pass_through(self) -> None:
+        event = {"type": MESSAGE, "data": {}}
+        await self.coalescer.submit("s1", event)
+        await self.coalescer.submit("s1", event)
+
+        self.assertEqual(self.published, [("s1", event), ("s1", event)])
+
+    async def test_flush_publishes_pending(self) -> None:
+        await self.coalescer.submit("s1", _status("running"))
+        await self.coalescer.submit("s1", _status("completed"))
+
+        await self.coalescer.flush()
+
+        self.assertEqual(self.published[-1], ("s1", _status("completed")))
+        await asyncio.sleep(0.08)
+        self.assertEqual(len(self.published), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
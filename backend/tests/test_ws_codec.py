@@ -0,0 +1,77 @@
+import json
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import msgpack
+
+from app.core.websocket import codec
+from app.core.websocket.codec import (
+    WS_SUBPROTOCOL_JSON,
+    WS_SUBPROTOCOL_MSGPACK,
+    WSFrame,
+    encode_json,
+    encode_msgpack,
+    negotiate_subprotocol,
+)
+
+_WHEN = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+class TestEncodeJson(unittest.TestCase):
+    def test_accelerated_and_stdlib_encoders_agree(self) -> None:
+        event = {"type": "message.new", "data": {"text": "héllo", "at": _WHEN}}
+
+        fast = encode_json(event)
+        with patch.object(codec, "_orjson", None):
+            slow = encode_json(event)
+
+        self.assertEqual(json.loads(fast), json.loads(slow))
+        self.assertEqual(json.loads(fast)["data"]["at"], _WHEN.isoformat())
+
+    def test_integers_beyond_64_bits_fall_back_to_stdlib(self) -> None:
+        big = 2**70
+
+        self.assertEqual(json.loads(encode_json({"n": big})), {"n": big})
+
+
+class TestEncodeMsgpack(unittest.TestCase):
+    def test_round_trip_with_datetimes_as_iso_strings(self) -> None:
+        event = {"type": "session.status", "data": {"at": _WHEN, "n": 3}}
+
+        decoded = msgpack.unpackb(encode_msgpack(event))
+
+        self.assertEqual(
+            decoded,
+            {"type": "session.status", "data": {"at": _WHEN.isoformat(), "n": 3}},
+        )
+
+    def test_frame_encodes_each_form_once(self) -> None:
+        frame = WSFrame({"type": "x"})
+
+        self.assertIs(frame.text, frame.text)
+        self.assertIs(frame.binary, frame.binary)
+        self.assertEqual(frame.type, "x")
+
+
+class TestNegotiateSubprotocol(unittest.TestCase):
+    def test_prefers_msgpack_when_offered(self) -> None:
+        self.assertEqual(
+            negotiate_subprotocol([WS_SUBPROTOCOL_JSON, WS_SUBPROTOCOL_MSGPACK]),
+            WS_SUBPROTOCOL_MSGPACK,
+        )
+
+    def test_falls_back_to_json_without_msgpack(self) -> None:
+        offered = [WS_SUBPROTOCOL_MSGPACK, WS_SUBPROTOCOL_JSON]
+
+        with patch.object(codec, "_msgpack", None):
+            self.assertEqual(negotiate_subprotocol(offered), WS_SUBPROTOCOL_JSON)
+            self.assertIsNone(negotiate_subprotocol([WS_SUBPROTOCOL_MSGPACK]))
+
+    def test_unknown_subprotocols_are_ignored(self) -> None:
+        self.assertIsNone(negotiate_subprotocol(["chat"]))
+        self.assertIsNone(negotiate_subprotocol([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
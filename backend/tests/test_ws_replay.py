@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+
+from app.core.websocket import replay as replay_module
+from app.core.websocket.replay import ReplayBuffer, ReplayStore
+
+
+def _buffer(size: int, events: int) -> ReplayBuffer:
+    buffer = ReplayBuffer(size)
+    for index in range(events):
+        buffer.stamp({"type": "message.new", "data": {"index": index}})
+    return buffer
+
+
+def _seqs(frames: list) -> list[int]:
+    return [frame.event["seq"] for frame in frames]
+
+
+class TestReplayBuffer(unittest.TestCase):
+    def test_stamp_adds_seq_and_epoch(self) -> None:
+        buffer = ReplayBuffer(4)
+
+        first = buffer.stamp({"type": "x"})
+        second = buffer.stamp({"type": "x"})
+
+        self.assertEqual(first.event, {"type": "x", "seq": 1, "epoch": buffer.epoch})
+        self.assertEqual(second.event["seq"], 2)
+        self.assertEqual(buffer.seq, 2)
+
+    def test_since_returns_frames_after_seq(self) -> None:
+        buffer = _buffer(10, 5)
+
+        self.assertEqual(_seqs(buffer.since(buffer.epoch, 2)), [3, 4, 5])
+        self.assertEqual(_seqs(buffer.since(buffer.epoch, 0)), [1, 2, 3, 4, 5])
+
+    def test_since_current_seq_is_empty(self) -> None:
+        buffer = _buffer(10, 3)
+
+        self.assertEqual(buffer.since(buffer.epoch, 3), [])
+
+    def test_since_rejects_other_epoch_and_out_of_range_seq(self) -> None:
+        buffer = _buffer(10, 3)
+
+        self.assertIsNone(buffer.since(ReplayBuffer(10).epoch, 1))
+        self.assertIsNone(buffer.since(buffer.epoch, 4))
+        self.assertIsNone(buffer.since(buffer.epoch, -1))
+
+    def test_since_rejects_seq_no_longer_buffered(self) -> None:
+        buffer = _buffer(3, 6)
+
+        # Frames 4-6 remain: resuming after 3 works, after 2 would skip frame 3.
+        self.assertEqual(_seqs(buffer.since(buffer.epoch, 3)), [4, 5, 6])
+        self.assertIsNone(buffer.since(buffer.epoch, 2))
+
+
+class TestReplayStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 1000.0
+        patcher = patch.object(
+            replay_module.time, "monotonic", side_effect=lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_attach_reuses_buffer_until_ttl_expires(self) -> None:
+        store = ReplayStore(size=10, ttl_seconds=30, max_keys=10)
+        buffer = store.attach("s1")
+        store.detach("s1")
+
+        self.now += 29
+        self.assertIs(store.attach("s1"), buffer)
+        self.assertIsNone(buffer.expires_at)
+
+        store.detach("s1")
+        self.now += 30
+        self.assertIsNone(store.get("s1"))
+        self.assertIsNot(store.attach("s1"), buffer)
+
+    def test_attached_buffer_never_expires(self) -> None:
+        store = ReplayStore(size=10, ttl_seconds=30, max_keys=10)
+        buffer = store.attach("s1")
+
+        self.now += 3600
+
+        self.assertIs(store.get("s1"), buffer)
+
+    def test_detached_buffers_are_bounded_oldest_first(self) -> None:
+        store = ReplayStore(size=10, ttl_seconds=30, max_keys=2)
+        store.attach("live")
+        for key in ("a", "b", "c"):
+            store.attach(key)
+            store.detach(key)
+
+        self.assertIsNone(store.get("a"))
+        self.assertIsNotNone(store.get("b"))
+        self.assertIsNotNone(store.get("c"))
+        # Buffers with connections are not counted against max_keys.
+        self.assertIsNotNone(store.get("live"))
+
+
+if __name__ == "__main__":
+    unittest.main()
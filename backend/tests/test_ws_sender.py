@@ -0,0 +1,162 @@
+import asyncio
+import json
+import unittest
+from typing import Any
+
+import msgpack
+
+from app.core.websocket.codec import WSFrame
+from app.core.websocket.events import EventType
+from app.core.websocket.sender import WSSender, WSSendMetrics
+
+STATUS = EventType.SESSION_STATUS.value
+MESSAGE = EventType.MESSAGE_NEW.value
+
+
+class _Socket:
+    """Records sent frames; each send waits for the gate when one is set."""
+
+    def __init__(self) -> None:
+        self.sent: list[Any] = []
+        self.gate: asyncio.Event | None = None
+        self.error: Exception | None = None
+
+    async def send_text(self, text: str) -> None:
+        await self._send(text)
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self._send(data)
+
+    async def _send(self, payload: Any) -> None:
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        self.sent.append(payload)
+
+
+def _frame(event_type: str, seq: int) -> WSFrame:
+    return WSFrame({"type": event_type, "seq": seq})
+
+
+def _seqs(socket: _Socket) -> list[int]:
+    return [json.loads(payload)["seq"] for payload in socket.sent]
+
+
+class TestWSSender(unittest.IsolatedAsyncioTestCase):
+    def _sender(
+        self,
+        socket: _Socket,
+        *,
+        max_queue: int = 10,
+        send_timeout: float = 1.0,
+        binary: bool = False,
+    ) -> WSSender:
+        self.metrics = WSSendMetrics()
+        self.failures: list[str] = []
+        sender = WSSender(
+            "s1",
+            socket,  # type: ignore[arg-type]
+            max_queue=max_queue,
+            send_timeout=send_timeout,
+            metrics=self.metrics,
+            on_failed=lambda _, reason: self.failures.append(reason),
+            binary=binary,
+        )
+        self.addAsyncCleanup(sender.stop)
+        return sender
+
+    async def _drain(self, sender: WSSender) -> None:
+        for _ in range(50):
+            if sender.queue_depth == 0:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+
+    async def test_frames_are_sent_in_order(self) -> None:
+        socket = _Socket()
+        sender = self._sender(socket)
+        sender.start()
+
+        for seq in range(1, 4):
+            self.assertTrue(sender.enqueue(_frame(MESSAGE, seq)))
+        await self._drain(sender)
+
+        self.assertEqual(_seqs(socket), [1, 2, 3])
+        self.assertEqual(self.metrics.sent, 3)
+
+    async def test_binary_sender_sends_msgpack_frames(self) -> None:
+        socket = _Socket()
+        sender = self._sender(socket, binary=True)
+        sender.start()
+
+        sender.enqueue(_frame(MESSAGE, 1))
+        await self._drain(sender)
+
+        self.assertEqual(msgpack.unpackb(socket.sent[0]), {"type": MESSAGE, "seq": 1})
+
+    async def test_full_queue_supersedes_status_and_keeps_seq_order(self) -> None:
+        socket = _Socket()
+        sender = self._sender(socket, max_queue=3)
+        sender.enqueue(_frame(STATUS, 1))
+        sender.enqueue(_frame(MESSAGE, 2))
+        sender.enqueue(_frame(MESSAGE, 3))
+
+        self.assertTrue(sender.enqueue(_frame(STATUS, 4)))
+        sender.start()
+        await self._drain(sender)
+
+        # The superseding status goes to the tail, after the frames it overtook.
+        self.assertEqual(_seqs(socket), [2, 3, 4])
+        self.assertEqual(self.metrics.coalesced, 1)
+        self.assertEqual(self.failures, [])
+
+    async def test_full_queue_drops_status_without_a_queued_one(self) -> None:
+        socket = _Socket()
+        sender = self._sender(socket, max_queue=1)
+        sender.enqueue(_frame(MESSAGE, 1))
+
+        self.assertTrue(sender.enqueue(_frame(STATUS, 2)))
+
+        self.assertEqual(sender.queue_depth, 1)
+        self.assertEqual(self.metrics.dropped, 1)
+        self.assertEqual(self.failures, [])
+
+    async def test_full_queue_fails_slow_consumer_once(self) -> None:
+        socket = _Socket()
+        sender = self._sender(socket, max_queue=1)
+        sender.enqueue(_frame(MESSAGE, 1))
+
+        self.assertFalse(sender.enqueue(_frame(MESSAGE, 2)))
+        self.assertFalse(sender.enqueue(_frame(MESSAGE, 3)))
+
+        self.assertEqual(self.failures, ["queue_full"])
+        self.assertEqual(sender.queue_depth, 0)
+
+    async def test_send_timeout_fails_connection(self) -> None:
+        socket = _Socket()
+        socket.gate = asyncio.Event()
+        sender = self._sender(socket, send_timeout=0.01)
+        sender.start()
+
+        sender.enqueue(_frame(MESSAGE, 1))
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(self.failures, ["send_timeout"])
+        self.assertFalse(sender.enqueue(_frame(MESSAGE, 2)))
+
+    async def test_send_error_fails_connection(self) -> None:
+        socket = _Socket()
+        socket.error = RuntimeError("closed")
+        sender = self._sender(socket)
+        sender.start()
+
+        sender.enqueue(_frame(MESSAGE, 1))
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(self.failures, ["send_failed"])
+        self.assertEqual(self.metrics.send_failures, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
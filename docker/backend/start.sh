@@ -49,4 +49,5 @@ else
 fi
 
 echo "Starting Backend API server..."
-exec /app/.venv/bin/uvicorn app.main:app --host 0.0.0.0 --port "${PORT:-8000}"
+exec /app/.venv/bin/uvicorn app.main:app --host 0.0.0.0 --port "${PORT:-8000}" \
+  --ws-per-message-deflate "${WS_PER_MESSAGE_DEFLATE:-true}"
@@ -35,7 +35,7 @@ async def run_task(req: TaskRun, background_tasks: BackgroundTasks) -> dict:
     hooks = [
         WorkspaceHook(),
         TodoHook(),
-        CallbackHook(client=callback_client),
+        CallbackHook(client=callback_client, run_id=req.run_id),
         RunSnapshotHook(run_id=req.run_id),
     ]
     executor = AgentExecutor(
@@ -1,6 +1,6 @@
 import httpx
 
-from app.schemas.callback import AgentCallbackRequest
+from app.schemas.callback import AgentCallbackBatchRequest, AgentCallbackRequest
 from app.core.observability.request_context import (
     generate_request_id,
     generate_trace_id,
@@ -12,19 +12,34 @@ from app.core.observability.request_context import (
 class CallbackClient:
     def __init__(self, callback_url: str, timeout: float = 30.0):
         self.callback_url = callback_url
+        self.batch_callback_url = f"{callback_url.rstrip('/')}/batch"
         self.timeout = timeout
 
-    async def send(self, report: AgentCallbackRequest) -> bool:
+    async def send(self, report: AgentCallbackRequest) -> dict | None:
+        """Send a callback. Returns the response data, or None when delivery failed."""
+        return await self._post(self.callback_url, report.model_dump(mode="json"))
+
+    async def send_batch(self, report: AgentCallbackBatchRequest) -> dict | None:
+        """Send a batched callback. Returns the response data, or None on failure."""
+        return await self._post(self.batch_callback_url, report.model_dump(mode="json"))
+
+    async def _post(self, url: str, payload: dict) -> dict | None:
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
                 response = await client.post(
-                    self.callback_url,
-                    json=report.model_dump(mode="json"),
+                    url,
+                    json=payload,
                     headers={
                         "X-Request-ID": get_request_id() or generate_request_id(),
                         "X-Trace-ID": get_trace_id() or generate_trace_id(),
                     },
                 )
-                return response.is_success
+                if not response.is_success:
+                    return None
+                try:
+                    data = response.json().get("data")
+                except ValueError:
+                    data = None
+                return data if isinstance(data, dict) else {}
         except httpx.RequestError:
-            return False
+            return None
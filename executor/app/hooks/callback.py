@@ -1,19 +1,59 @@
+import asyncio
+import logging
 from typing import Any, Optional
 
 from claude_agent_sdk.types import ResultMessage, SystemMessage
 
 from app.core.callback import CallbackClient
 from app.hooks.base import AgentHook, ExecutionContext
-from app.schemas.callback import AgentCallbackRequest
+from app.schemas.callback import AgentCallbackBatchRequest, AgentCallbackRequest
 from app.schemas.enums import CallbackStatus, TodoStatus
+from app.utils.json_patch import make_patch
 from app.utils.serializer import serialize_message
 
+logger = logging.getLogger(__name__)
+
 
 class CallbackHook(AgentHook):
-    def __init__(self, client: CallbackClient):
+    def __init__(self, client: CallbackClient, run_id: Optional[str] = None):
         self.client = client
+        # Lets backend resolve the run by primary key instead of searching for it.
+        self.run_id = run_id
         self.execution_error: Optional[Exception] = None
         self.sdk_session_id: Optional[str] = None
+        # Messages produced while a callback is in flight go out together as one batch.
+        self._pending_messages: list[Any] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        # Last state sent downstream; reports carry a JSON Patch against it.
+        self._state_version = 0
+        self._sent_state: Optional[dict[str, Any]] = None
+
+    def _next_state(
+        self, context: ExecutionContext, *, full: bool = False
+    ) -> dict[str, Any]:
+        """State fields for the next report.
+
+        A full snapshot goes out on the first report, after a failed delivery or a
+        resync request, and when forced; otherwise only the delta (or nothing when the
+        state did not change).
+        """
+        current = context.current_state.model_dump(mode="json")
+        if full or self._sent_state is None:
+            self._state_version += 1
+            self._sent_state = current
+            return {"state_patch": current, "state_version": self._state_version}
+
+        delta = make_patch(self._sent_state, current)
+        if not delta:
+            return {}
+        self._state_version += 1
+        self._sent_state = current
+        return {"state_delta": delta, "state_version": self._state_version}
+
+    def _on_delivered(self, result: Optional[dict]) -> None:
+        if result is None or result.get("state_resync_required"):
+            # A version may have been lost on the way; resync with the next report.
+            self._sent_state = None
 
     def _build_report(
         self,
@@ -21,14 +61,17 @@ class CallbackHook(AgentHook):
         status: str,
         progress: int,
         new_message: Optional[Any] = None,
+        *,
+        full_state: bool = False,
     ) -> AgentCallbackRequest:
         return AgentCallbackRequest(
             session_id=context.session_id,
             status=status,
             progress=progress,
             new_message=serialize_message(new_message),
-            state_patch=context.current_state,
+            run_id=self.run_id,
             sdk_session_id=self.sdk_session_id,
+            **self._next_state(context, full=full_state),
         )
 
     def _calculate_progress(self, todos) -> int:
@@ -45,16 +88,53 @@ class CallbackHook(AgentHook):
         elif isinstance(message, ResultMessage):
             self.sdk_session_id = message.session_id
 
-        await self.client.send(
-            self._build_report(
-                context=context,
-                status=CallbackStatus.RUNNING,
-                progress=self._calculate_progress(context.current_state.todos),
-                new_message=message,
-            )
-        )
+        self._pending_messages.append(serialize_message(message))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush(context))
+
+    async def _flush(self, context: ExecutionContext) -> None:
+        while self._pending_messages:
+            messages = self._pending_messages
+            self._pending_messages = []
+            progress = self._calculate_progress(context.current_state.todos)
+            try:
+                if len(messages) == 1:
+                    result = await self.client.send(
+                        self._build_report(
+                            context=context,
+                            status=CallbackStatus.RUNNING,
+                            progress=progress,
+                            new_message=messages[0],
+                        )
+                    )
+                else:
+                    result = await self.client.send_batch(
+                        AgentCallbackBatchRequest(
+                            session_id=context.session_id,
+                            status=CallbackStatus.RUNNING,
+                            progress=progress,
+                            new_messages=messages,
+                            run_id=self.run_id,
+                            sdk_session_id=self.sdk_session_id,
+                            **self._next_state(context),
+                        )
+                    )
+                self._on_delivered(result)
+            except Exception:
+                self._on_delivered(None)
+                logger.exception(
+                    "callback_flush_failed",
+                    extra={
+                        "session_id": context.session_id,
+                        "message_count": len(messages),
+                    },
+                )
 
     async def on_teardown(self, context: ExecutionContext):
+        # Deliver every streamed message before the terminal status.
+        if self._flush_task is not None:
+            await self._flush_task
+
         status = (
             CallbackStatus.COMPLETED
             if self.execution_error is None
@@ -62,11 +142,14 @@ class CallbackHook(AgentHook):
         )
         progress = 100
 
+        # The terminal report always carries the full state, so every hop ends the
+        # run consistent even if a delta went missing.
         await self.client.send(
             self._build_report(
                 context=context,
                 status=status,
                 progress=progress,
+                full_state=True,
             )
         )
 
@@ -15,5 +15,30 @@ class AgentCallbackRequest(BaseModel):
     status: CallbackStatus
     progress: int
     new_message: Optional[Any] = None
+    # Full state snapshot; set together with state_version it is a resync point.
     state_patch: Optional[AgentCurrentState] = None
+    # Version of the state after this callback (None: state unchanged / legacy).
+    state_version: Optional[int] = None
+    # JSON Patch from state_version - 1 to state_version (instead of state_patch).
+    state_delta: Optional[list[dict[str, Any]]] = None
+    run_id: Optional[str] = None
+    sdk_session_id: Optional[str] = None
+
+
+class AgentCallbackBatchRequest(BaseModel):
+    """Several messages of one session delivered in a single callback.
+
+    Messages are applied in order; status, progress and state_patch describe the state
+    after the last message.
+    """
+
+    session_id: str
+    time: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    status: CallbackStatus
+    progress: int
+    new_messages: list[Any] = Field(default_factory=list)
+    state_patch: Optional[AgentCurrentState] = None
+    state_version: Optional[int] = None
+    state_delta: Optional[list[dict[str, Any]]] = None
+    run_id: Optional[str] = None
     sdk_session_id: Optional[str] = None
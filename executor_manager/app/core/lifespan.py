@@ -1,5 +1,6 @@
 import logging
 from contextlib import asynccontextmanager, suppress
+from datetime import datetime, timezone
 
 from fastapi import FastAPI
 
@@ -39,7 +40,24 @@ async def lifespan(app: FastAPI):
             schedule_config = default_pull_schedule_config_from_settings(settings)
 
         pull_job_ids = register_pull_jobs(scheduler, pull_service, schedule_config)
-        logger.info(f"Run pull service started (jobs={pull_job_ids})")
+
+        from app.services.run_claim_reaper_service import RunClaimReaperService
+
+        reaper_interval = max(1, int(settings.task_claim_reaper_interval_seconds))
+        scheduler.add_job(
+            RunClaimReaperService().release_expired,
+            trigger="interval",
+            seconds=reaper_interval,
+            id="release-expired-run-claims",
+            replace_existing=True,
+        )
+        pull_job_ids.append("release-expired-run-claims")
+        if settings.task_pull_long_poll_enabled:
+            pull_service.start_long_poll()
+        logger.info(
+            f"Run pull service started (jobs={pull_job_ids}, "
+            f"long_poll={settings.task_pull_long_poll_enabled})"
+        )
 
     if settings.workspace_cleanup_enabled:
         from app.services.cleanup_service import CleanupService
@@ -68,6 +86,26 @@ async def lifespan(app: FastAPI):
         )
         logger.info("Scheduled task dispatch service initialized")
 
+    if settings.storage_maintenance_enabled:
+        from app.services.storage_maintenance_service import (
+            StorageMaintenanceService,
+        )
+
+        interval = max(60, int(settings.storage_maintenance_interval_seconds))
+        logger.info(
+            "Initializing storage maintenance service...",
+            extra={"interval_seconds": interval},
+        )
+        scheduler.add_job(
+            StorageMaintenanceService().run,
+            trigger="interval",
+            seconds=interval,
+            id="storage-maintenance",
+            next_run_time=datetime.now(timezone.utc),
+            replace_existing=True,
+        )
+        logger.info("Storage maintenance service initialized")
+
     yield
 
     if pull_service:
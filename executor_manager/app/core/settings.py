@@ -34,10 +34,26 @@ class Settings(BaseSettings):
     task_pull_interval_seconds: int = Field(
         default=2, alias="TASK_PULL_INTERVAL_SECONDS"
     )
-    # NOTE: This lease must cover "claim -> start_run" time on the manager side. That path can
-    # include staging skills/attachments + spawning the executor container, which may take
-    # longer than 30s on slow networks or large repos.
-    task_claim_lease_seconds: int = Field(default=180, alias="TASK_CLAIM_LEASE_SECONDS")
+    # Claim lease. The manager renews it with heartbeats while it stages skills/attachments
+    # and spawns the executor container, so it can stay short: runs of a crashed manager
+    # return to the queue within roughly one lease + one reaper interval.
+    task_claim_lease_seconds: int = Field(default=15, alias="TASK_CLAIM_LEASE_SECONDS")
+    # How often the manager asks Backend to requeue runs with expired leases.
+    task_claim_reaper_interval_seconds: int = Field(
+        default=5, alias="TASK_CLAIM_REAPER_INTERVAL_SECONDS"
+    )
+    # Long-poll the backend claim endpoint; the backend wakes it up via Postgres NOTIFY on
+    # run enqueue/completion. Interval polling then only acts as a slow safety net.
+    task_pull_long_poll_enabled: bool = Field(
+        default=True, alias="TASK_PULL_LONG_POLL_ENABLED"
+    )
+    task_pull_long_poll_wait_seconds: int = Field(
+        default=30, alias="TASK_PULL_LONG_POLL_WAIT_SECONDS"
+    )
+    # Default interval poll period while long-polling is enabled.
+    task_pull_fallback_interval_seconds: int = Field(
+        default=30, alias="TASK_PULL_FALLBACK_INTERVAL_SECONDS"
+    )
 
     # Optional schedule config file (TOML/JSON). When provided, it becomes the source of truth.
     schedule_config_path: str | None = Field(default=None, alias="SCHEDULE_CONFIG_PATH")
@@ -51,6 +67,15 @@ class Settings(BaseSettings):
         default=50, alias="SCHEDULED_TASKS_DISPATCH_BATCH_SIZE"
     )
 
+    # Backend storage maintenance: rolls the monthly transcript partitions forward and
+    # archives idle sessions to S3.
+    storage_maintenance_enabled: bool = Field(
+        default=True, alias="STORAGE_MAINTENANCE_ENABLED"
+    )
+    storage_maintenance_interval_seconds: int = Field(
+        default=3600, alias="STORAGE_MAINTENANCE_INTERVAL_SECONDS"
+    )
+
     # Queue-based scheduling (AgentRun.schedule_mode)
     task_pull_immediate_enabled: bool = Field(
         default=True, alias="TASK_PULL_IMMEDIATE_ENABLED"
@@ -157,6 +157,12 @@ def load_pull_schedule_config(path: str | None) -> PullScheduleConfig | None:
 
 def default_pull_schedule_config_from_settings(settings: Any) -> PullScheduleConfig:
     default_interval = max(1, int(getattr(settings, "task_pull_interval_seconds", 2)))
+    if bool(getattr(settings, "task_pull_long_poll_enabled", False)):
+        # Long-polling delivers new runs; interval polling is only a safety net.
+        default_interval = max(
+            default_interval,
+            int(getattr(settings, "task_pull_fallback_interval_seconds", 30)),
+        )
 
     rules: list[PullRule] = []
 
@@ -69,6 +69,32 @@ class AgentCallbackRequest(BaseModel):
     progress: int
     new_message: object | None = None
     state_patch: AgentCurrentState | None = None
+    state_version: int | None = None
+    state_delta: list[dict[str, object]] | None = None
+    run_id: str | None = None
+    sdk_session_id: str | None = None
+    workspace_files_prefix: str | None = None
+    workspace_manifest_key: str | None = None
+    workspace_archive_key: str | None = None
+    workspace_export_status: str | None = None
+
+
+class AgentCallbackBatchRequest(BaseModel):
+    """Several messages of one session delivered in a single callback.
+
+    Messages are applied in order; status, progress, state_patch and the workspace
+    fields describe the state after the last message.
+    """
+
+    session_id: str
+    time: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    status: CallbackStatus
+    progress: int
+    new_messages: list[object] = Field(default_factory=list)
+    state_patch: AgentCurrentState | None = None
+    state_version: int | None = None
+    state_delta: list[dict[str, object]] | None = None
+    run_id: str | None = None
     sdk_session_id: str | None = None
     workspace_files_prefix: str | None = None
     workspace_manifest_key: str | None = None
@@ -83,3 +109,5 @@ class CallbackReceiveResponse(BaseModel):
     session_id: str
     callback_status: CallbackStatus
     progress: int
+    # The state delta could not be applied; the executor should send a full snapshot.
+    state_resync_required: bool = False
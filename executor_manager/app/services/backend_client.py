@@ -46,8 +46,8 @@ class BackendClient:
             )
             response.raise_for_status()
 
-    async def forward_callback(self, callback_data: dict) -> None:
-        """Forward Executor callback to Backend."""
+    async def forward_callback(self, callback_data: dict) -> dict:
+        """Forward Executor callback to Backend. Returns Backend's callback response."""
         async with httpx.AsyncClient() as client:
             response = await client.post(
                 f"{self.base_url}/api/v1/callback",
@@ -55,6 +55,18 @@ class BackendClient:
                 headers=self._trace_headers(),
             )
             response.raise_for_status()
+            return response.json().get("data") or {}
+
+    async def forward_callback_batch(self, batch_data: dict) -> dict:
+        """Forward a batched Executor callback to Backend. Returns its response."""
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                f"{self.base_url}/api/v1/callback/batch",
+                json=batch_data,
+                headers=self._trace_headers(),
+            )
+            response.raise_for_status()
+            return response.json().get("data") or {}
 
     async def claim_run(
         self,
@@ -77,6 +89,41 @@ class BackendClient:
             data = response.json()
             return data.get("data")
 
+    async def claim_runs(
+        self,
+        worker_id: str,
+        max_runs: int,
+        lease_seconds: int = 30,
+        schedule_modes: list[str] | None = None,
+        wait_seconds: float = 0,
+    ) -> list[dict]:
+        """Claim up to max_runs runs from backend queue in one request.
+
+        With wait_seconds > 0 the backend holds the request until runs become claimable
+        or the wait elapses.
+        """
+        payload: dict = {
+            "worker_id": worker_id,
+            "max_runs": max(1, int(max_runs)),
+            "lease_seconds": lease_seconds,
+        }
+        if schedule_modes:
+            payload["schedule_modes"] = schedule_modes
+        if wait_seconds > 0:
+            payload["wait_seconds"] = wait_seconds
+
+        timeout = httpx.Timeout(5.0 + max(0.0, float(wait_seconds)), connect=5.0)
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            response = await client.post(
+                f"{self.base_url}/api/v1/runs/claim-batch",
+                json=payload,
+                headers=self._trace_headers(),
+            )
+            response.raise_for_status()
+            data = response.json()
+            claims = data.get("data") or []
+            return [c for c in claims if isinstance(c, dict)]
+
     async def start_run(self, run_id: str, worker_id: str) -> dict:
         """Mark run as running."""
         async with httpx.AsyncClient() as client:
@@ -89,6 +136,77 @@ class BackendClient:
             data = response.json()
             return data["data"]
 
+    async def heartbeat_run(
+        self, run_id: str, worker_id: str, lease_seconds: int = 30
+    ) -> dict:
+        """Renew the claim lease of a run that is still being dispatched."""
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                f"{self.base_url}/api/v1/runs/{run_id}/heartbeat",
+                json={"worker_id": worker_id, "lease_seconds": lease_seconds},
+                headers=self._trace_headers(),
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data["data"]
+
+    async def release_expired_run_claims(self) -> dict:
+        """Ask backend to requeue claimed runs whose lease expired."""
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                f"{self.base_url}/api/v1/internal/runs/release-expired",
+                headers={
+                    "X-Internal-Token": self.settings.internal_api_token,
+                    **self._trace_headers(),
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data.get("data", {}) or {}
+
+    async def ensure_partitions(self) -> dict:
+        """Ask backend to create the upcoming monthly transcript partitions."""
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                f"{self.base_url}/api/v1/internal/partitions/ensure",
+                headers={
+                    "X-Internal-Token": self.settings.internal_api_token,
+                    **self._trace_headers(),
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data.get("data", {}) or {}
+
+    async def archive_idle_sessions(self) -> dict:
+        """Ask backend to archive one batch of idle sessions to S3."""
+        async with httpx.AsyncClient(timeout=300.0) as client:
+            response = await client.post(
+                f"{self.base_url}/api/v1/internal/sessions/archive-idle",
+                headers={
+                    "X-Internal-Token": self.settings.internal_api_token,
+                    **self._trace_headers(),
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data.get("data", {}) or {}
+
+    async def get_run_queue_stats(self, window_seconds: int = 3600) -> dict:
+        """Get run queue depth, worker occupancy and latency histograms."""
+        async with httpx.AsyncClient() as client:
+            response = await client.get(
+                f"{self.base_url}/api/v1/internal/runs/stats",
+                params={"window_seconds": window_seconds},
+                headers={
+                    "X-Internal-Token": self.settings.internal_api_token,
+                    **self._trace_headers(),
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data.get("data", {}) or {}
+
     async def fail_run(
         self, run_id: str, worker_id: str, error_message: str | None = None
     ) -> dict:
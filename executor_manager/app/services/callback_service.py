@@ -1,13 +1,23 @@
 import asyncio
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Any
 
-from app.schemas.callback import AgentCallbackRequest, CallbackReceiveResponse
+from pydantic import ValidationError
+
+from app.schemas.callback import (
+    AgentCallbackBatchRequest,
+    AgentCallbackRequest,
+    AgentCurrentState,
+    CallbackReceiveResponse,
+)
 from app.services.backend_client import BackendClient
 from app.services.workspace_export_service import (
     WorkspaceExportService,
     workspace_manager,
 )
+from app.utils.json_patch import JsonPatchError, apply_patch, make_patch
 
 logger = logging.getLogger(__name__)
 
@@ -16,9 +26,22 @@ backend_client = BackendClient()
 workspace_export_service = WorkspaceExportService()
 
 
+@dataclass(frozen=True)
+class _TrackedState:
+    """Last state version seen for a session: as sent by executor and as forwarded."""
+
+    version: int
+    raw: dict[str, Any]
+    forwarded: dict[str, Any]
+
+
 class CallbackService:
     """Service layer for callback processing."""
 
+    def __init__(self) -> None:
+        # session_id -> last state version, so deltas can be re-encoded after filtering.
+        self._states: dict[str, _TrackedState] = {}
+
     @staticmethod
     def _is_ignored_workspace_path(path: str) -> bool:
         """Check whether a workspace-relative path should be ignored.
@@ -54,8 +77,8 @@ class CallbackService:
 
     @classmethod
     def _filter_state_patch(
-        cls, callback: AgentCallbackRequest
-    ) -> AgentCallbackRequest:
+        cls, callback: AgentCallbackRequest | AgentCallbackBatchRequest
+    ) -> AgentCallbackRequest | AgentCallbackBatchRequest:
         state = callback.state_patch
         if not state or not state.workspace_state:
             return callback
@@ -84,6 +107,75 @@ class CallbackService:
         new_state = state.model_copy(update={"workspace_state": new_workspace_state})
         return callback.model_copy(update={"state_patch": new_state})
 
+    def _resolve_state(
+        self, callback: AgentCallbackRequest | AgentCallbackBatchRequest
+    ) -> tuple[AgentCallbackRequest | AgentCallbackBatchRequest, bool]:
+        """Filter the callback's state and re-encode deltas against what was forwarded.
+
+        Full snapshots are filtered and forwarded as they are. A delta is applied to the
+        last raw snapshot, the result filtered, and the forwarded delta recomputed from
+        the filtered states, so ignored workspace paths never reach backend. When the
+        delta's base version is unknown the state is dropped and the second value of
+        the result asks executor for a full snapshot.
+        """
+        key = callback.session_id
+        version = callback.state_version
+
+        if callback.state_patch is not None:
+            filtered = self._filter_state_patch(callback)
+            if version is None:
+                self._states.pop(key, None)
+            else:
+                self._states[key] = _TrackedState(
+                    version=version,
+                    raw=callback.state_patch.model_dump(mode="json"),
+                    forwarded=filtered.state_patch.model_dump(mode="json"),
+                )
+            return filtered, False
+
+        if callback.state_delta is None or version is None:
+            return callback, False
+
+        tracked = self._states.get(key)
+        if tracked is not None and tracked.version == version - 1:
+            try:
+                state = AgentCurrentState.model_validate(
+                    apply_patch(tracked.raw, callback.state_delta)
+                )
+            except (JsonPatchError, ValidationError):
+                logger.warning(
+                    "callback_state_delta_invalid",
+                    extra={"session_id": key, "state_version": version},
+                    exc_info=True,
+                )
+            else:
+                filtered_state = self._filter_state_patch(
+                    callback.model_copy(update={"state_patch": state})
+                ).state_patch
+                forwarded = filtered_state.model_dump(mode="json")
+                self._states[key] = _TrackedState(
+                    version=version,
+                    raw=state.model_dump(mode="json"),
+                    forwarded=forwarded,
+                )
+                return callback.model_copy(
+                    update={"state_delta": make_patch(tracked.forwarded, forwarded)}
+                ), False
+        else:
+            logger.warning(
+                "callback_state_delta_base_missing",
+                extra={
+                    "session_id": key,
+                    "state_version": version,
+                    "known_version": tracked.version if tracked else None,
+                },
+            )
+
+        self._states.pop(key, None)
+        return callback.model_copy(
+            update={"state_delta": None, "state_version": None}
+        ), True
+
     async def process_callback(
         self, callback: AgentCallbackRequest
     ) -> CallbackReceiveResponse:
@@ -98,6 +190,23 @@ class CallbackService:
         Raises:
             AppException: If callback forwarding to backend fails
         """
+        return await self._process(callback)
+
+    async def process_callback_batch(
+        self, batch: AgentCallbackBatchRequest
+    ) -> CallbackReceiveResponse:
+        """Process a batched callback (several messages, one final state) from executor.
+
+        The batch is forwarded to backend as a single request.
+
+        Raises:
+            AppException: If callback forwarding to backend fails
+        """
+        return await self._process(batch)
+
+    async def _process(
+        self, callback: AgentCallbackRequest | AgentCallbackBatchRequest
+    ) -> CallbackReceiveResponse:
         from app.core.errors.error_codes import ErrorCode
         from app.core.errors.exceptions import AppException
 
@@ -115,10 +224,13 @@ class CallbackService:
                 "status": callback.status,
                 "progress": callback.progress,
                 "sdk_session_id": callback.sdk_session_id,
+                "message_count": len(callback.new_messages)
+                if isinstance(callback, AgentCallbackBatchRequest)
+                else None,
             },
         )
 
-        callback = self._filter_state_patch(callback)
+        callback, state_resync_required = self._resolve_state(callback)
 
         if callback.state_patch:
             state = callback.state_patch
@@ -146,10 +258,19 @@ class CallbackService:
             payload = payload_model.model_dump(mode="json")
 
             # Forward callback to backend
-            await backend_client.forward_callback(payload)
+            if isinstance(callback, AgentCallbackBatchRequest):
+                forwarded = await backend_client.forward_callback_batch(payload)
+            else:
+                forwarded = await backend_client.forward_callback(payload)
+            if forwarded.get("state_resync_required"):
+                # Backend rejected a delta; the executor's next report is a snapshot.
+                state_resync_required = True
+                self._states.pop(callback.session_id, None)
 
             if callback.status in ["completed", "failed"]:
                 from app.scheduler.task_dispatcher import TaskDispatcher
+
+                self._states.pop(callback.session_id, None)
                 from app.core.runtime import get_pull_service
 
                 logger.info(
@@ -173,6 +294,7 @@ class CallbackService:
                 session_id=callback.session_id,
                 callback_status=callback.status,
                 progress=callback.progress,
+                state_resync_required=state_resync_required,
             )
 
         except Exception:
@@ -185,7 +307,9 @@ class CallbackService:
                 message="Failed to forward callback to backend",
             )
 
-    async def _export_and_forward(self, callback: AgentCallbackRequest) -> None:
+    async def _export_and_forward(
+        self, callback: AgentCallbackRequest | AgentCallbackBatchRequest
+    ) -> None:
         try:
             result = await asyncio.to_thread(
                 workspace_export_service.export_workspace, callback.session_id
@@ -202,6 +326,7 @@ class CallbackService:
             time=datetime.now(timezone.utc),
             status=callback.status,
             progress=100 if callback.status == "completed" else callback.progress,
+            run_id=callback.run_id,
             sdk_session_id=callback.sdk_session_id,
             workspace_files_prefix=result.workspace_files_prefix if result else None,
             workspace_manifest_key=result.workspace_manifest_key if result else None,
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import time
 from typing import TYPE_CHECKING
@@ -76,14 +77,9 @@ class ContainerPool:
 
         # 清理可能存在的同名容器
         step_started = time.perf_counter()
-        removed_stale = False
-        try:
-            old_container = self.docker_client.containers.get(container_name)
-            logger.warning(f"Removing stale container {container_name}")
-            old_container.remove(force=True)
-            removed_stale = True
-        except docker.errors.NotFound:
-            pass
+        removed_stale = await asyncio.to_thread(
+            self._remove_stale_container, container_name
+        )
         logger.info(
             "timing",
             extra={
@@ -100,7 +96,8 @@ class ContainerPool:
         logger.info(f"Creating new container {container_id} (mode: {container_mode})")
 
         step_started = time.perf_counter()
-        workspace_volume = self.workspace_manager.get_workspace_volume(
+        workspace_volume = await asyncio.to_thread(
+            self.workspace_manager.get_workspace_volume,
             user_id=user_id,
             session_id=session_id,
         )
@@ -124,7 +121,10 @@ class ContainerPool:
         }
 
         step_started = time.perf_counter()
-        container = self.docker_client.containers.run(
+        # Docker calls block (an image pull can take minutes); keep them off the event
+        # loop so claim lease heartbeats keep running meanwhile.
+        container = await asyncio.to_thread(
+            self.docker_client.containers.run,
             image=self.settings.executor_image,
             name=container_name,
             environment={
@@ -158,10 +158,10 @@ class ContainerPool:
         self.containers[container_id] = container
         self.session_to_container[session_id] = container_id
 
-        self._wait_for_container_ready(container)
+        await asyncio.to_thread(self._wait_for_container_ready, container)
 
         step_started = time.perf_counter()
-        container.reload()
+        await asyncio.to_thread(container.reload)
         port_info = container.ports.get("8000/tcp")
         if not port_info:
             raise AppException(
@@ -182,7 +182,7 @@ class ContainerPool:
         host_port = port_info[0]["HostPort"]
         executor_url = f"http://{published_host}:{host_port}"
 
-        self._wait_for_service_ready(executor_url)
+        await asyncio.to_thread(self._wait_for_service_ready, executor_url)
 
         logger.info(
             f"Container {container_id} started for session {session_id} on port {host_port}"
@@ -202,6 +202,16 @@ class ContainerPool:
         )
         return executor_url, container_id
 
+    def _remove_stale_container(self, container_name: str) -> bool:
+        """Remove a leftover container with the same name. Returns True if one existed."""
+        try:
+            old_container = self.docker_client.containers.get(container_name)
+            logger.warning(f"Removing stale container {container_name}")
+            old_container.remove(force=True)
+        except docker.errors.NotFound:
+            return False
+        return True
+
     def _wait_for_container_ready(
         self,
         container: "Container",
@@ -314,7 +324,7 @@ class ContainerPool:
             if container_mode == "ephemeral":
                 logger.info(f"Container {container_id} is ephemeral, stopping")
                 try:
-                    container.stop(timeout=10)
+                    await asyncio.to_thread(container.stop, timeout=10)
                 except Exception as e:
                     logger.error(f"Failed to stop container {container_id}: {e}")
 
@@ -339,12 +349,12 @@ class ContainerPool:
             return
 
         try:
-            container.stop(timeout=10)
+            await asyncio.to_thread(container.stop, timeout=10)
         except Exception as e:
             logger.error(f"Failed to stop container {cid}: {e}")
 
         try:
-            container.remove(force=True)
+            await asyncio.to_thread(container.remove, force=True)
         except Exception:
             # Best-effort: the container might have already been removed.
             pass
@@ -360,7 +370,7 @@ class ContainerPool:
         if container_id in self.containers:
             container = self.containers.pop(container_id)
             try:
-                container.stop(timeout=10)
+                await asyncio.to_thread(container.stop, timeout=10)
                 logger.info(f"Container {container_id} stopped")
             except Exception as e:
                 logger.error(f"Failed to stop container {container_id}: {e}")
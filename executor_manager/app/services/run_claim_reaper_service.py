@@ -0,0 +1,41 @@
+import logging
+import time
+
+from app.core.runtime import get_pull_service
+from app.services.backend_client import BackendClient
+
+logger = logging.getLogger(__name__)
+
+
+class RunClaimReaperService:
+    """Background service that asks Backend to requeue runs with expired claim leases."""
+
+    def __init__(self, backend_client: BackendClient | None = None) -> None:
+        self.backend_client = backend_client or BackendClient()
+
+    async def release_expired(self) -> None:
+        started = time.perf_counter()
+        try:
+            payload = await self.backend_client.release_expired_run_claims()
+            released = 0
+            if isinstance(payload, dict):
+                released = int(payload.get("released", 0))
+            if released > 0:
+                logger.info(
+                    "run_claims_released",
+                    extra={
+                        "duration_ms": int((time.perf_counter() - started) * 1000),
+                        "released": released,
+                    },
+                )
+                pull_service = get_pull_service()
+                if pull_service is not None:
+                    pull_service.trigger_poll(reason="release_expired_run_claims")
+        except Exception as e:
+            logger.error(
+                "run_claims_release_failed",
+                extra={
+                    "duration_ms": int((time.perf_counter() - started) * 1000),
+                    "error": str(e),
+                },
+            )
@@ -7,6 +7,8 @@ from contextlib import suppress
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
+import httpx
+
 from app.core.settings import get_settings
 from app.scheduler.task_dispatcher import TaskDispatcher
 from app.services.backend_client import BackendClient
@@ -18,6 +20,33 @@ from app.services.slash_command_stager import SlashCommandStager
 
 logger = logging.getLogger(__name__)
 
+# Heartbeat responses meaning the run is no longer claimed by this worker (the backend
+# answers FORBIDDEN for another claimant and NOT_FOUND for a missing run). Any other
+# error is transient and retried until the lease runs out.
+_LEASE_LOST_STATUS_CODES = frozenset({403, 404})
+
+
+class RunLeaseLostError(Exception):
+    """The claim lease of a run being dispatched was lost or could not be renewed."""
+
+
+class _ClaimLease:
+    """Claim lease of one run while it is being dispatched."""
+
+    def __init__(self, lease_seconds: int) -> None:
+        self.lease_seconds = lease_seconds
+        # The claim itself granted the lease.
+        self.renewed_at = time.monotonic()
+        self.lost = False
+        # Set right before execute_task: from then on the dispatch is not aborted.
+        self.executing = False
+        # Set once the run is marked running and the lease no longer needs renewing.
+        self.released = asyncio.Event()
+
+    def expired(self) -> bool:
+        """Lost, or not renewed for a whole lease (the reaper may requeue the run)."""
+        return self.lost or time.monotonic() - self.renewed_at >= self.lease_seconds
+
 
 class RunPullService:
     """Background service that pulls queued runs from Backend and dispatches them."""
@@ -43,6 +72,7 @@ class RunPullService:
         self._trigger_task: asyncio.Task[None] | None = None
         self._trigger_pending_modes: set[str] = set()
         self._trigger_debounce_seconds: float = 0.25
+        self._long_poll_task: asyncio.Task[None] | None = None
 
     def get_active_schedule_modes(self) -> list[str]:
         """Return currently active schedule modes for pulling runs.
@@ -220,8 +250,11 @@ class RunPullService:
         async with self._poll_lock:
             await self._poll_locked(schedule_modes=schedule_modes)
 
+    def _lease_seconds(self) -> int:
+        return max(5, int(self.settings.task_claim_lease_seconds))
+
     async def _poll_locked(self, schedule_modes: list[str] | None = None) -> None:
-        lease_seconds = max(5, int(self.settings.task_claim_lease_seconds))
+        lease_seconds = self._lease_seconds()
 
         if not self._logged_started:
             logger.info(
@@ -231,44 +264,133 @@ class RunPullService:
             self._logged_started = True
 
         while not self._shutdown and not self._semaphore.locked():
+            # Reserve every free slot up front and ask for exactly that many runs.
+            reserved = await self._reserve_free_slots()
+            claims = await self._claim_reserved(
+                reserved,
+                lease_seconds=lease_seconds,
+                schedule_modes=schedule_modes,
+            )
+            if claims is None:
+                return
+
+            # A short batch means the queue is drained for these schedule modes.
+            if len(claims) < reserved:
+                return
+
+    def start_long_poll(self) -> None:
+        """Start the background long-poll loop (idempotent)."""
+        if self._shutdown:
+            return
+        existing = self._long_poll_task
+        if existing and not existing.done():
+            return
+        self._long_poll_task = asyncio.get_running_loop().create_task(
+            self._long_poll_loop()
+        )
+
+    async def _long_poll_loop(self) -> None:
+        """Keep one long-poll claim request open whenever there is free capacity.
+
+        The backend answers as soon as a NOTIFY says runs became claimable, so idle
+        managers issue no queue queries and new runs are picked up without waiting for the
+        next interval poll.
+        """
+        wait_seconds = max(1, int(self.settings.task_pull_long_poll_wait_seconds))
+        lease_seconds = self._lease_seconds()
+        backoff_seconds = 1.0
+
+        while not self._shutdown:
+            # Block until at least one slot is free, then take every other free slot too.
             await self._semaphore.acquire()
+            reserved = 1 + await self._reserve_free_slots()
 
-            try:
-                step_started = time.perf_counter()
-                claim = await self.backend_client.claim_run(
-                    worker_id=self.worker_id,
-                    lease_seconds=lease_seconds,
-                    schedule_modes=schedule_modes,
+            schedule_modes = self.get_active_schedule_modes()
+            if not schedule_modes:
+                self._release_slots(reserved)
+                await asyncio.sleep(wait_seconds)
+                continue
+
+            claims = await self._claim_reserved(
+                reserved,
+                lease_seconds=lease_seconds,
+                schedule_modes=schedule_modes,
+                wait_seconds=wait_seconds,
+            )
+            if claims is None:
+                await asyncio.sleep(backoff_seconds)
+                backoff_seconds = min(backoff_seconds * 2, 30.0)
+                continue
+            backoff_seconds = 1.0
+
+    async def _reserve_free_slots(self) -> int:
+        reserved = 0
+        while not self._semaphore.locked():
+            await self._semaphore.acquire()
+            reserved += 1
+        return reserved
+
+    async def _claim_reserved(
+        self,
+        reserved: int,
+        *,
+        lease_seconds: int,
+        schedule_modes: list[str] | None,
+        wait_seconds: float = 0,
+    ) -> list[dict[str, Any]] | None:
+        """Claim up to `reserved` runs and dispatch them.
+
+        Unused slots are released. Returns None when the claim request failed.
+        """
+        try:
+            step_started = time.perf_counter()
+            claims = await self.backend_client.claim_runs(
+                worker_id=self.worker_id,
+                max_runs=reserved,
+                lease_seconds=lease_seconds,
+                schedule_modes=schedule_modes,
+                wait_seconds=wait_seconds,
+            )
+            claims = claims[:reserved]
+            if claims:
+                logger.info(
+                    "timing",
+                    extra={
+                        "step": "run_pull_claim_runs",
+                        "duration_ms": int((time.perf_counter() - step_started) * 1000),
+                        "worker_id": self.worker_id,
+                        "lease_seconds": lease_seconds,
+                        "schedule_modes": schedule_modes,
+                        "requested": reserved,
+                        "claimed": len(claims),
+                        "wait_seconds": wait_seconds,
+                    },
                 )
-                if claim:
-                    logger.info(
-                        "timing",
-                        extra={
-                            "step": "run_pull_claim_run",
-                            "duration_ms": int(
-                                (time.perf_counter() - step_started) * 1000
-                            ),
-                            "worker_id": self.worker_id,
-                            "lease_seconds": lease_seconds,
-                            "schedule_modes": schedule_modes,
-                        },
-                    )
-            except Exception as e:
-                logger.error(f"Failed to claim run from backend: {e}")
-                self._semaphore.release()
-                return
+        except Exception as e:
+            logger.error(f"Failed to claim runs from backend: {e}")
+            self._release_slots(reserved)
+            return None
 
-            if not claim:
-                self._semaphore.release()
-                return
+        self._release_slots(reserved - len(claims))
 
+        for claim in claims:
             task = asyncio.create_task(self._handle_claim(claim))
             self._tasks.add(task)
             task.add_done_callback(self._on_task_done)
+        return claims
+
+    def _release_slots(self, count: int) -> None:
+        for _ in range(max(0, count)):
+            self._semaphore.release()
 
     async def shutdown(self) -> None:
         """Request shutdown and cancel inflight dispatch tasks."""
         self._shutdown = True
+        if self._long_poll_task:
+            self._long_poll_task.cancel()
+            with suppress(asyncio.CancelledError, Exception):
+                await self._long_poll_task
+            self._long_poll_task = None
         if self._trigger_task:
             self._trigger_task.cancel()
             with suppress(Exception):
@@ -296,6 +418,111 @@ class RunPullService:
         self._tasks.clear()
 
     async def _handle_claim(self, claim: dict[str, Any]) -> None:
+        """Dispatch a claimed run while keeping its claim lease alive.
+
+        If the lease is lost (or not renewed for a whole lease) before the executor was
+        asked to run it, the dispatch is aborted: the reaper hands the run to another
+        worker, and starting it here as well would run it twice.
+        """
+        run = claim.get("run") or {}
+        run_id = run.get("run_id")
+        if not run_id:
+            await self._dispatch_claim(claim)
+            return
+
+        session_id = str(run.get("session_id"))
+        lease = _ClaimLease(self._lease_seconds())
+        dispatch = asyncio.create_task(self._dispatch_claim(claim, lease=lease))
+        heartbeat = asyncio.create_task(
+            self._heartbeat_lease(str(run_id), session_id, lease, dispatch)
+        )
+        try:
+            await dispatch
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if not lease.lost or (current is not None and current.cancelling()):
+                raise
+            await self._abort_dispatch(str(run_id), session_id)
+        finally:
+            heartbeat.cancel()
+            with suppress(asyncio.CancelledError):
+                await heartbeat
+
+    async def _heartbeat_lease(
+        self,
+        run_id: str,
+        session_id: str,
+        lease: _ClaimLease,
+        dispatch: asyncio.Task[None],
+    ) -> None:
+        """Renew the claim lease every third of the lease until it is released.
+
+        Cancels the dispatch when the lease is lost before the run was handed to the
+        executor.
+        """
+        interval = max(1.0, lease.lease_seconds / 3)
+        while not lease.released.is_set():
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(lease.released.wait(), timeout=interval)
+            if lease.released.is_set():
+                return
+            sent_at = time.monotonic()
+            try:
+                await self.backend_client.heartbeat_run(
+                    run_id=run_id,
+                    worker_id=self.worker_id,
+                    lease_seconds=lease.lease_seconds,
+                )
+                lease.renewed_at = sent_at
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
+                if status_code in _LEASE_LOST_STATUS_CODES:
+                    lease.lost = True
+                    logger.warning(
+                        "run_lease_lost",
+                        extra={
+                            "run_id": run_id,
+                            "session_id": session_id,
+                            "status_code": status_code,
+                        },
+                    )
+                else:
+                    logger.warning(
+                        "run_lease_heartbeat_failed",
+                        extra={
+                            "run_id": run_id,
+                            "session_id": session_id,
+                            "status_code": status_code,
+                        },
+                    )
+            except Exception as e:
+                # Transient failure: keep trying while the lease may still be valid.
+                logger.warning(
+                    "run_lease_heartbeat_failed",
+                    extra={"run_id": run_id, "session_id": session_id, "error": str(e)},
+                )
+            if lease.expired():
+                lease.lost = True
+                if not lease.executing:
+                    dispatch.cancel()
+                return
+
+    async def _abort_dispatch(self, run_id: str, session_id: str) -> None:
+        """Give up a run whose lease was lost; its new owner runs it."""
+        logger.warning(
+            "run_dispatch_aborted",
+            extra={"run_id": run_id, "session_id": session_id, "reason": "lease_lost"},
+        )
+        try:
+            await self.container_pool.cancel_task(session_id)
+        except Exception as cancel_err:
+            logger.error(
+                f"Failed to cancel task for session {session_id}: {cancel_err}"
+            )
+
+    async def _dispatch_claim(
+        self, claim: dict[str, Any], *, lease: _ClaimLease | None = None
+    ) -> None:
         dispatch_started = time.perf_counter()
         run = claim.get("run") or {}
         run_id = run.get("run_id")
@@ -339,7 +566,8 @@ class RunPullService:
             )
 
             step_started = time.perf_counter()
-            staged_skills = self.skill_stager.stage_skills(
+            staged_skills = await asyncio.to_thread(
+                self.skill_stager.stage_skills,
                 user_id=user_id,
                 session_id=session_id,
                 skills=resolved_config.get("skill_files") or {},
@@ -356,7 +584,8 @@ class RunPullService:
             )
 
             step_started = time.perf_counter()
-            staged_inputs = self.attachment_stager.stage_inputs(
+            staged_inputs = await asyncio.to_thread(
+                self.attachment_stager.stage_inputs,
                 user_id=user_id,
                 session_id=session_id,
                 inputs=resolved_config.get("input_files") or [],
@@ -376,7 +605,8 @@ class RunPullService:
             resolved_commands = await self.backend_client.resolve_slash_commands(
                 user_id=user_id
             )
-            staged_commands = self.slash_command_stager.stage_commands(
+            staged_commands = await asyncio.to_thread(
+                self.slash_command_stager.stage_commands,
                 user_id=user_id,
                 session_id=session_id,
                 commands=resolved_commands,
@@ -412,6 +642,12 @@ class RunPullService:
                 },
             )
 
+            if lease is not None:
+                # Last point where the run can be given up without running it twice.
+                if lease.expired():
+                    raise RunLeaseLostError(f"Claim lease of run {run_id} was lost")
+                lease.executing = True
+
             step_started = time.perf_counter()
             await self.executor_client.execute_task(
                 executor_url=executor_url,
@@ -439,6 +675,8 @@ class RunPullService:
                 await self.backend_client.start_run(
                     run_id=run_id, worker_id=self.worker_id
                 )
+                if lease is not None:
+                    lease.released.set()
                 logger.info(
                     "timing",
                     extra={
@@ -463,6 +701,8 @@ class RunPullService:
                 },
             )
 
+        except RunLeaseLostError:
+            await self._abort_dispatch(str(run_id), session_id)
         except Exception as e:
             logger.error(
                 f"Failed to dispatch run {run_id} (session={session_id}): "
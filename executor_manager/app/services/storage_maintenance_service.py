@@ -0,0 +1,68 @@
+import logging
+import time
+
+from app.services.backend_client import BackendClient
+
+logger = logging.getLogger(__name__)
+
+
+class StorageMaintenanceService:
+    """Background service that asks Backend to roll partitions and archive idle sessions."""
+
+    def __init__(self, backend_client: BackendClient | None = None) -> None:
+        self.backend_client = backend_client or BackendClient()
+
+    async def run(self) -> None:
+        await self.ensure_partitions()
+        await self.archive_idle_sessions()
+
+    async def ensure_partitions(self) -> None:
+        started = time.perf_counter()
+        try:
+            payload = await self.backend_client.ensure_partitions()
+            failed = []
+            if isinstance(payload, dict):
+                failed = payload.get("failed") or []
+            if failed:
+                logger.warning(
+                    "partitions_ensure_incomplete",
+                    extra={
+                        "duration_ms": int((time.perf_counter() - started) * 1000),
+                        "failed": failed,
+                    },
+                )
+        except Exception as e:
+            logger.error(
+                "partitions_ensure_failed",
+                extra={
+                    "duration_ms": int((time.perf_counter() - started) * 1000),
+                    "error": str(e),
+                },
+            )
+
+    async def archive_idle_sessions(self) -> None:
+        started = time.perf_counter()
+        try:
+            payload = await self.backend_client.archive_idle_sessions()
+            archived = 0
+            errors = 0
+            if isinstance(payload, dict):
+                archived = int(payload.get("archived", 0))
+                errors = int(payload.get("errors", 0))
+            if archived > 0 or errors > 0:
+                logger.info(
+                    "idle_sessions_archived",
+                    extra={
+                        "duration_ms": int((time.perf_counter() - started) * 1000),
+                        "archived": archived,
+                        "errors": errors,
+                    },
+                )
+        except Exception as e:
+            logger.error(
+                "idle_sessions_archive_failed",
+                extra={
+                    "duration_ms": int((time.perf_counter() - started) * 1000),
+                    "error": str(e),
+                },
+            )
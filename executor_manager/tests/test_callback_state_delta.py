@@ -0,0 +1,80 @@
+import unittest
+
+from app.schemas.callback import AgentCallbackRequest
+from app.services.callback_service import CallbackService
+from app.utils.json_patch import apply_patch, make_patch
+
+
+def _state(*paths: str, current_step: str | None = None) -> dict:
+    return {
+        "todos": [],
+        "mcp_status": [],
+        "workspace_state": {
+            "file_changes": [{"path": p, "status": "added"} for p in paths],
+            "last_change": "2026-01-01T00:00:00Z",
+        },
+        "current_step": current_step,
+    }
+
+
+def _callback(**kwargs) -> AgentCallbackRequest:
+    return AgentCallbackRequest(
+        session_id="s1", status="running", progress=10, **kwargs
+    )
+
+
+class TestCallbackStateDelta(unittest.TestCase):
+    def test_delta_is_reencoded_against_filtered_state(self) -> None:
+        service = CallbackService()
+        snapshot, _ = service._resolve_state(
+            _callback(state_patch=_state("a.py", "node_modules/x"), state_version=1)
+        )
+        forwarded = snapshot.state_patch.model_dump(mode="json")
+        self.assertEqual(
+            [fc["path"] for fc in forwarded["workspace_state"]["file_changes"]],
+            ["a.py"],
+        )
+
+        raw = service._states["s1"].raw
+        updated = apply_patch(
+            raw,
+            [
+                {"op": "replace", "path": "/current_step", "value": "editing"},
+                {
+                    "op": "add",
+                    "path": "/workspace_state/file_changes/-",
+                    "value": {"path": "node_modules/y", "status": "added"},
+                },
+            ],
+        )
+        result, resync = service._resolve_state(
+            _callback(state_delta=make_patch(raw, updated), state_version=2)
+        )
+
+        self.assertFalse(resync)
+        self.assertEqual(result.state_version, 2)
+        # Ignored paths never reach backend, only the visible change does.
+        self.assertEqual(
+            result.state_delta,
+            [{"op": "replace", "path": "/current_step", "value": "editing"}],
+        )
+
+    def test_delta_without_base_requests_resync(self) -> None:
+        service = CallbackService()
+        service._resolve_state(_callback(state_patch=_state("a.py"), state_version=1))
+
+        result, resync = service._resolve_state(
+            _callback(
+                state_delta=[{"op": "replace", "path": "/current_step", "value": "x"}],
+                state_version=3,
+            )
+        )
+
+        self.assertTrue(resync)
+        self.assertIsNone(result.state_delta)
+        self.assertIsNone(result.state_version)
+        self.assertNotIn("s1", service._states)
+
+
+if __name__ == "__main__":
+    unittest.main()
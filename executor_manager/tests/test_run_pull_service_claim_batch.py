@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from app.services.run_pull_service import RunPullService
+
+
+def _make_service() -> RunPullService:
+    with patch(
+        "app.services.run_pull_service.TaskDispatcher.get_container_pool",
+        return_value=MagicMock(),
+    ):
+        return RunPullService()
+
+
+class TestRunPullServiceClaimBatch(unittest.IsolatedAsyncioTestCase):
+    async def test_poll_requests_exactly_free_capacity(self) -> None:
+        service = _make_service()
+        service._semaphore = asyncio.Semaphore(5)
+
+        requested: list[int] = []
+
+        async def fake_claim_runs(**kwargs: Any) -> list[dict]:
+            requested.append(kwargs["max_runs"])
+            return [{"run": {"run_id": f"r{i}"}} for i in range(2)]
+
+        handled: list[dict] = []
+        release = asyncio.Event()
+
+        async def fake_handle_claim(claim: dict[str, Any]) -> None:
+            handled.append(claim)
+            await release.wait()
+
+        service.backend_client.claim_runs = fake_claim_runs  # type: ignore[method-assign]
+        service._handle_claim = fake_handle_claim  # type: ignore[method-assign]
+
+        await service.poll(schedule_modes=["immediate"])
+        await asyncio.sleep(0)
+
+        # One round trip for all five free slots; the short batch ends the poll.
+        self.assertEqual(requested, [5])
+        self.assertEqual(len(handled), 2)
+        self.assertEqual(service._semaphore._value, 3)  # type: ignore[attr-defined]
+
+        # Next poll only asks for the remaining capacity.
+        await service.poll(schedule_modes=["immediate"])
+        self.assertEqual(requested, [5, 3])
+
+        release.set()
+        await service.shutdown()
+
+    async def test_poll_releases_slots_on_claim_error(self) -> None:
+        service = _make_service()
+        service._semaphore = asyncio.Semaphore(3)
+
+        async def failing_claim_runs(**kwargs: Any) -> list[dict]:
+            raise RuntimeError("backend down")
+
+        service.backend_client.claim_runs = failing_claim_runs  # type: ignore[method-assign]
+
+        await service.poll(schedule_modes=["immediate"])
+
+        self.assertEqual(service._semaphore._value, 3)  # type: ignore[attr-defined]
+
+    async def test_long_poll_waits_on_backend_with_free_capacity(self) -> None:
+        service = _make_service()
+        service._semaphore = asyncio.Semaphore(4)
+        service.settings = service.settings.model_copy(
+            update={"task_pull_long_poll_wait_seconds": 7}
+        )
+        service.get_active_schedule_modes = lambda: ["immediate"]  # type: ignore[method-assign]
+
+        calls: list[dict[str, Any]] = []
+        done = asyncio.Event()
+
+        async def fake_claim_runs(**kwargs: Any) -> list[dict]:
+            calls.append(kwargs)
+            if len(calls) >= 2:
+                done.set()
+                await asyncio.sleep(3600)
+            return []
+
+        service.backend_client.claim_runs = fake_claim_runs  # type: ignore[method-assign]
+
+        service.start_long_poll()
+        await asyncio.wait_for(done.wait(), timeout=1)
+        await service.shutdown()
+
+        self.assertEqual(calls[0]["max_runs"], 4)
+        self.assertEqual(calls[0]["wait_seconds"], 7)
+        self.assertEqual(calls[0]["schedule_modes"], ["immediate"])
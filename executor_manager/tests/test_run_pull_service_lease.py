@@ -0,0 +1,111 @@
+import asyncio
+import time
+import unittest
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+
+from app.services.run_pull_service import RunPullService, _ClaimLease
+
+
+def _make_service() -> RunPullService:
+    with patch(
+        "app.services.run_pull_service.TaskDispatcher.get_container_pool",
+        return_value=MagicMock(),
+    ):
+        service = RunPullService()
+    service.container_pool.cancel_task = AsyncMock()
+    service.container_pool.get_or_create_container = AsyncMock(
+        return_value=("http://executor", "container-1")
+    )
+    service.config_resolver.resolve = AsyncMock(return_value={})  # type: ignore[method-assign]
+    service.skill_stager.stage_skills = MagicMock(return_value={})  # type: ignore[method-assign]
+    service.attachment_stager.stage_inputs = MagicMock(return_value=[])  # type: ignore[method-assign]
+    service.slash_command_stager.stage_commands = MagicMock(return_value={})  # type: ignore[method-assign]
+    service.backend_client.resolve_slash_commands = AsyncMock(return_value={})  # type: ignore[method-assign]
+    service.backend_client.start_run = AsyncMock()  # type: ignore[method-assign]
+    service.backend_client.fail_run = AsyncMock()  # type: ignore[method-assign]
+    service.backend_client.heartbeat_run = AsyncMock()  # type: ignore[method-assign]
+    service.executor_client.execute_task = AsyncMock()  # type: ignore[method-assign]
+    return service
+
+
+def _claim() -> dict[str, Any]:
+    return {
+        "run": {"run_id": "run-1", "session_id": "session-1"},
+        "user_id": "user-1",
+        "prompt": "hello",
+        "config_snapshot": {},
+    }
+
+
+def _heartbeat_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://backend/heartbeat")
+    return httpx.HTTPStatusError(
+        "heartbeat failed",
+        request=request,
+        response=httpx.Response(status_code, request=request),
+    )
+
+
+class TestRunPullServiceLease(unittest.IsolatedAsyncioTestCase):
+    async def test_expired_lease_aborts_before_execute_task(self) -> None:
+        service = _make_service()
+        lease = _ClaimLease(15)
+        lease.renewed_at = time.monotonic() - 15
+
+        await service._dispatch_claim(_claim(), lease=lease)
+
+        service.executor_client.execute_task.assert_not_awaited()
+        service.backend_client.fail_run.assert_not_awaited()
+        service.container_pool.cancel_task.assert_awaited_once_with("session-1")
+
+    async def test_started_run_releases_the_lease(self) -> None:
+        service = _make_service()
+        lease = _ClaimLease(15)
+
+        await service._dispatch_claim(_claim(), lease=lease)
+
+        service.executor_client.execute_task.assert_awaited_once()
+        self.assertTrue(lease.executing)
+        self.assertTrue(lease.released.is_set())
+
+    async def test_lost_lease_cancels_staging_dispatch(self) -> None:
+        service = _make_service()
+        service._lease_seconds = lambda: 1  # type: ignore[method-assign]
+        service.backend_client.heartbeat_run = AsyncMock(  # type: ignore[method-assign]
+            side_effect=_heartbeat_error(403)
+        )
+
+        async def slow_resolve(*args: Any, **kwargs: Any) -> dict:
+            await asyncio.sleep(3600)
+            return {}
+
+        service.config_resolver.resolve = slow_resolve  # type: ignore[method-assign]
+
+        await asyncio.wait_for(service._handle_claim(_claim()), timeout=5)
+
+        service.executor_client.execute_task.assert_not_awaited()
+        service.backend_client.fail_run.assert_not_awaited()
+        service.container_pool.cancel_task.assert_awaited_once_with("session-1")
+
+    async def test_transient_heartbeat_error_keeps_dispatching(self) -> None:
+        service = _make_service()
+        service._lease_seconds = lambda: 3  # type: ignore[method-assign]
+        service.backend_client.heartbeat_run = AsyncMock(  # type: ignore[method-assign]
+            side_effect=[_heartbeat_error(503), {}, {}]
+        )
+
+        async def slow_resolve(*args: Any, **kwargs: Any) -> dict:
+            # Outlasts the failed heartbeat (t=1s) and the renewal after it (t=2s).
+            await asyncio.sleep(2.5)
+            return {}
+
+        service.config_resolver.resolve = slow_resolve  # type: ignore[method-assign]
+
+        await asyncio.wait_for(service._handle_claim(_claim()), timeout=10)
+
+        self.assertEqual(service.backend_client.heartbeat_run.await_count, 2)
+        service.executor_client.execute_task.assert_awaited_once()
+        service.container_pool.cancel_task.assert_not_awaited()
@@ -56,7 +56,7 @@ export async function getFilesAction(input: GetFilesInput) {
 
 export async function getRunsBySessionAction(input: GetRunsBySessionInput) {
   const { sessionId } = sessionIdSchema.parse(input);
-  return chatService.getRunsBySession(sessionId, { limit: 1000, offset: 0 });
+  return chatService.getRunsBySession(sessionId);
 }
 
 export async function getMessagesSinceAction(input: GetMessagesSinceInput) {
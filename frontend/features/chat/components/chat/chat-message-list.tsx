@@ -22,6 +22,8 @@ export interface ChatMessageListProps {
   isInitialLoad?: boolean;
   /** File changes to display on the last assistant message */
   fileChanges?: FileChange[];
+  /** Session the messages belong to */
+  sessionId?: string;
 }
 
 export function ChatMessageList({
@@ -31,6 +33,7 @@ export function ChatMessageList({
   runUsageByUserMessageId,
   isInitialLoad = false,
   fileChanges,
+  sessionId,
 }: ChatMessageListProps) {
   const { t } = useT("translation");
   const scrollRef = React.useRef<HTMLDivElement>(null);
@@ -293,6 +296,7 @@ export function ChatMessageList({
                 fileChanges={
                   index === lastAssistantMessageIndex ? fileChanges : undefined
                 }
+                sessionId={sessionId}
               />
             );
           })}
@@ -21,6 +21,7 @@ interface AssistantMessageProps {
   /** Whether to animate the message entrance. Defaults to true. */
   animate?: boolean;
   fileChanges?: FileChange[];
+  sessionId?: string;
 }
 
 function pickNumber(value: unknown): number | null {
@@ -77,6 +78,7 @@ const AssistantMessageComponent = ({
   runUsage,
   animate = true,
   fileChanges,
+  sessionId,
 }: AssistantMessageProps) => {
   const { t } = useT("translation");
   const [isCopied, setIsCopied] = React.useState(false);
@@ -186,7 +188,7 @@ const AssistantMessageComponent = ({
         </div>
 
         <div className="text-foreground text-base break-words w-full min-w-0">
-          <MessageContent content={message.content} />
+          <MessageContent content={message.content} sessionId={sessionId} />
           {message.status === "streaming" && <TypingIndicator />}
           {fileChanges && fileChanges.length > 0 && (
             <FileChangesSummaryCard fileChanges={fileChanges} />
@@ -253,7 +255,8 @@ export const AssistantMessage = React.memo(
       prev.message.status === next.message.status &&
       prev.runUsage === next.runUsage &&
       prev.animate === next.animate &&
-      prev.fileChanges === next.fileChanges
+      prev.fileChanges === next.fileChanges &&
+      prev.sessionId === next.sessionId
     );
   },
 );
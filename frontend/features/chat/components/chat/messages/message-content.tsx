@@ -145,9 +145,14 @@ const groupBlocks = (
 
 interface MessageContentProps {
   content: string | MessageBlock[];
+  /** Session the message belongs to; needed to load offloaded tool output. */
+  sessionId?: string;
 }
 
-const MessageContentComponent = ({ content }: MessageContentProps) => {
+const MessageContentComponent = ({
+  content,
+  sessionId,
+}: MessageContentProps) => {
   const { t } = useT("translation");
 
   const textContent = getTextContent(content);
@@ -177,6 +182,7 @@ const MessageContentComponent = ({ content }: MessageContentProps) => {
             <ToolChain
               key={index}
               blocks={group.blocks as (ToolUseBlock | ToolResultBlock)[]}
+              sessionId={sessionId}
             />
           );
         } else if (group.type === "thinking") {
@@ -227,5 +233,6 @@ const MessageContentComponent = ({ content }: MessageContentProps) => {
 
 export const MessageContent = React.memo(
   MessageContentComponent,
-  (prev, next) => prev.content === next.content,
+  (prev, next) =>
+    prev.content === next.content && prev.sessionId === next.sessionId,
 );
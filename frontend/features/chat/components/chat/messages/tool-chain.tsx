@@ -12,6 +12,7 @@ import {
 import { cn } from "@/lib/utils";
 import type { ToolUseBlock, ToolResultBlock } from "@/features/chat/types";
 import { useT } from "@/lib/i18n/client";
+import { chatService } from "@/features/chat/services/chat-service";
 import {
   Collapsible,
   CollapsibleContent,
@@ -21,16 +22,24 @@ import { Badge } from "@/components/ui/badge";
 
 interface ToolChainProps {
   blocks: (ToolUseBlock | ToolResultBlock)[];
+  sessionId?: string;
 }
 
 interface ToolStepProps {
   toolUse: ToolUseBlock;
   toolResult?: ToolResultBlock;
+  sessionId?: string;
   isOpen: boolean;
   onToggle: () => void;
 }
 
-function ToolStep({ toolUse, toolResult, isOpen, onToggle }: ToolStepProps) {
+function ToolStep({
+  toolUse,
+  toolResult,
+  sessionId,
+  isOpen,
+  onToggle,
+}: ToolStepProps) {
   const { t } = useT("translation");
   const isCompleted = !!toolResult;
   const isError = toolResult?.is_error;
@@ -54,11 +63,42 @@ function ToolStep({ toolUse, toolResult, isOpen, onToggle }: ToolStepProps) {
     };
   }, [isTaskTool, toolUse.input]);
 
+  // Large outputs arrive as a preview; the full text is fetched on demand.
+  const [fullOutput, setFullOutput] = React.useState<string | null>(null);
+  const [isLoadingFull, setIsLoadingFull] = React.useState(false);
+  const [loadFullFailed, setLoadFullFailed] = React.useState(false);
+  const truncatedMessageId =
+    fullOutput === null ? toolResult?.truncated_message_id : undefined;
+
+  const handleLoadFull = React.useCallback(async () => {
+    if (!toolResult?.truncated_message_id) return;
+    setIsLoadingFull(true);
+    setLoadFullFailed(false);
+    try {
+      const content = await chatService.getFullToolResult(
+        toolResult.truncated_message_id,
+        toolResult.tool_use_id,
+        sessionId,
+      );
+      if (content === null) {
+        setLoadFullFailed(true);
+      } else {
+        setFullOutput(content);
+      }
+    } catch (error) {
+      console.error("[ToolChain] Failed to load full output:", error);
+      setLoadFullFailed(true);
+    } finally {
+      setIsLoadingFull(false);
+    }
+  }, [toolResult, sessionId]);
+
   const outputText = React.useMemo(() => {
     if (!toolResult) return "";
-    if (!isTaskTool) return toolResult.content;
+    const content = fullOutput ?? toolResult.content;
+    if (!isTaskTool) return content;
     try {
-      const parsed = JSON.parse(toolResult.content);
+      const parsed = JSON.parse(content);
       if (
         parsed &&
         typeof parsed === "object" &&
@@ -71,8 +111,8 @@ function ToolStep({ toolUse, toolResult, isOpen, onToggle }: ToolStepProps) {
     } catch {
       // fall back to raw content
     }
-    return toolResult.content;
-  }, [isTaskTool, toolResult]);
+    return content;
+  }, [fullOutput, isTaskTool, toolResult]);
 
   return (
     <div className="border border-border/50 rounded-md bg-muted/30 overflow-hidden mb-2 last:mb-0">
@@ -149,6 +189,27 @@ function ToolStep({ toolUse, toolResult, isOpen, onToggle }: ToolStepProps) {
                     {outputText}
                   </pre>
                 </div>
+                {truncatedMessageId ? (
+                  <div className="mt-1 flex items-center gap-2">
+                    <button
+                      type="button"
+                      className="text-[11px] text-primary hover:underline disabled:opacity-50"
+                      disabled={isLoadingFull}
+                      onClick={handleLoadFull}
+                    >
+                      {isLoadingFull ? (
+                        <Loader2 className="inline size-3 animate-spin" />
+                      ) : (
+                        t("chat.loadFullOutput")
+                      )}
+                    </button>
+                    {loadFullFailed ? (
+                      <span className="text-[11px] text-destructive">
+                        {t("chat.loadFullOutputFailed")}
+                      </span>
+                    ) : null}
+                  </div>
+                ) : null}
               </div>
             )}
 
@@ -172,7 +233,7 @@ function ToolStep({ toolUse, toolResult, isOpen, onToggle }: ToolStepProps) {
   );
 }
 
-export function ToolChain({ blocks }: ToolChainProps) {
+export function ToolChain({ blocks, sessionId }: ToolChainProps) {
   const { t } = useT("translation");
   const [openStepId, setOpenStepId] = React.useState<string | null>(null);
 
@@ -258,6 +319,7 @@ export function ToolChain({ blocks }: ToolChainProps) {
                 key={step.use.id}
                 toolUse={step.use}
                 toolResult={step.result}
+                sessionId={sessionId}
                 isOpen={openStepId === step.use.id}
                 onToggle={() =>
                   setOpenStepId(openStepId === step.use.id ? null : step.use.id)
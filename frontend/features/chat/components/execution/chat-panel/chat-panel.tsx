@@ -244,6 +244,7 @@ export function ChatPanel({
             runUsageByUserMessageId={runUsageByUserMessageId}
             isInitialLoad
             fileChanges={fileChanges}
+            sessionId={session?.session_id}
           />
         )}
       </div>
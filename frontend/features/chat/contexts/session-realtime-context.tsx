@@ -17,6 +17,7 @@ import type {
   WSMessageData,
 } from "@/features/chat/types";
 import { userInputService } from "@/features/chat/services/user-input-service";
+import { applyJsonPatch } from "@/lib/utils/json-patch/apply-json-patch";
 import { useT } from "@/lib/i18n/client";
 
 type RealtimeContextValue = {
@@ -147,6 +148,10 @@ export function SessionRealtimeProvider({
       Array<{ resolve: (url: string | null) => void; timeoutId: number }>
     >
   >(new Map());
+  // Version of the local state_patch; null until a versioned snapshot arrives.
+  const stateVersionRef = React.useRef<number | null>(null);
+  const resyncPendingRef = React.useRef(false);
+  const resyncRef = React.useRef<() => void>(() => {});
 
   const updateSession = React.useCallback((updates: Partial<ExecutionSession>) => {
     setSession((prev) => (prev ? { ...prev, ...updates } : prev));
@@ -154,6 +159,9 @@ export function SessionRealtimeProvider({
 
   const handleSnapshot = React.useCallback(
     (data: SessionSnapshotData) => {
+      stateVersionRef.current =
+        typeof data.state_version === "number" ? data.state_version : null;
+      resyncPendingRef.current = false;
       setSession({
         session_id: sessionId,
         time: data.updated_at ?? new Date().toISOString(),
@@ -206,14 +214,55 @@ export function SessionRealtimeProvider({
 
   const handleStatePatch = React.useCallback(
     (data: SessionPatchData) => {
+      const version =
+        typeof data.state_version === "number" ? data.state_version : null;
+
+      if (data.state_delta && version !== null) {
+        const baseVersion =
+          typeof data.base_version === "number"
+            ? data.base_version
+            : version - 1;
+        if (stateVersionRef.current !== baseVersion) {
+          // A version was missed; resync from a snapshot instead of patching stale state.
+          resyncRef.current();
+          return;
+        }
+        const delta = data.state_delta;
+        stateVersionRef.current = version;
+        setSession((prev) => {
+          if (!prev) return prev;
+          try {
+            return {
+              ...prev,
+              state_patch: applyJsonPatch(
+                prev.state_patch ?? {},
+                delta,
+              ) as ExecutionSession["state_patch"],
+            };
+          } catch (err) {
+            console.warn("[SessionRealtime] Failed to apply state delta", err);
+            window.setTimeout(() => resyncRef.current(), 0);
+            return prev;
+          }
+        });
+        return;
+      }
+
+      if (!data.state_patch) return;
+      const statePatch = data.state_patch;
+      if (version !== null) {
+        stateVersionRef.current = version;
+      }
       setSession((prev) => {
         if (!prev) return prev;
         return {
           ...prev,
-          state_patch: {
-            ...(prev.state_patch ?? {}),
-            ...(data.state_patch as Record<string, unknown>),
-          } as ExecutionSession["state_patch"],
+          state_patch: (version !== null
+            ? statePatch
+            : {
+                ...(prev.state_patch ?? {}),
+                ...statePatch,
+              }) as ExecutionSession["state_patch"],
         };
       });
     },
@@ -293,6 +342,15 @@ export function SessionRealtimeProvider({
     sendJson({ type: "session.snapshot.request" });
   }, [sendJson]);
 
+  React.useEffect(() => {
+    resyncRef.current = () => {
+      stateVersionRef.current = null;
+      if (resyncPendingRef.current) return;
+      resyncPendingRef.current = true;
+      requestSessionSnapshot();
+    };
+  }, [requestSessionSnapshot]);
+
   React.useEffect(() => {
     if (!userInputRequests.length) return;
 
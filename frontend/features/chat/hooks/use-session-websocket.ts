@@ -3,6 +3,7 @@ import { useCallback, useEffect, useRef, useState } from "react";
 import type {
   ConnectionState,
   SessionPatchData,
+  SessionResumedData,
   SessionSnapshotData,
   SessionStatusData,
   TodoUpdateData,
@@ -52,7 +53,10 @@ interface UseSessionWebSocketOptions {
   onMessage?: (message: Record<string, unknown>) => void;
   /** Called when a new message is received via WebSocket */
   onNewMessage?: (message: WSMessageData) => void;
-  /** Called after successful reconnection - use to fetch missed messages */
+  /**
+   * Called after a reconnection that could not resume the event stream (the server
+   * sent a snapshot) - use to fetch missed messages
+   */
   onReconnect?: () => void;
   enabled?: boolean;
 }
@@ -107,6 +111,9 @@ export function useSessionWebSocket({
   const reconnectTimeoutRef = useRef<NodeJS.Timeout | null>(null);
   const connectDebounceRef = useRef<NodeJS.Timeout | null>(null);
   const hadPreviousConnectionRef = useRef(false);
+  // Last event received, so a reconnect can ask for only the missed events.
+  const streamRef = useRef<{ epoch: string; seq: number } | null>(null);
+  const pendingReconnectRef = useRef(false);
 
   // [Optimization 4] Consolidated callbacks ref - single object instead of 11 separate refs
   const callbacksRef = useRef<CallbacksRef>({
@@ -144,6 +151,7 @@ export function useSessionWebSocket({
   // This fixes the bug where switching sessions would incorrectly trigger onReconnect
   useEffect(() => {
     hadPreviousConnectionRef.current = false;
+    streamRef.current = null;
   }, [sessionId]);
 
   const sendJson = useCallback((payload: Record<string, unknown>) => {
@@ -173,6 +181,13 @@ export function useSessionWebSocket({
     }
   }, []);
 
+  const trackStreamPosition = useCallback((epoch: string, seq: number) => {
+    const current = streamRef.current;
+    if (!current || current.epoch !== epoch || seq > current.seq) {
+      streamRef.current = { epoch, seq };
+    }
+  }, []);
+
   const connect = useCallback(() => {
     if (!sessionId || !enabled) return;
 
@@ -198,7 +213,14 @@ export function useSessionWebSocket({
 
     setConnectionState("connecting");
 
-    const url = `${WS_BASE_URL}/api/v1/ws/sessions/${sessionId}`;
+    const baseUrl = `${WS_BASE_URL}/api/v1/ws/sessions/${sessionId}`;
+    const stream = hadPreviousConnectionRef.current ? streamRef.current : null;
+    const url = stream
+      ? `${baseUrl}?${new URLSearchParams({
+          epoch: stream.epoch,
+          since_seq: String(stream.seq),
+        })}`
+      : baseUrl;
     const ws = new WebSocket(url);
     wsRef.current = ws;
 
@@ -208,13 +230,9 @@ export function useSessionWebSocket({
       console.log(`[WS] Connected to session ${sessionId}`);
       setConnectionState("connected");
 
-      // Call onReconnect only if this is a reconnection (not first connection for this session)
-      if (hadPreviousConnectionRef.current) {
-        console.log(
-          `[WS] Reconnected to session ${sessionId}, fetching missed messages`,
-        );
-        callbacksRef.current.onReconnect?.();
-      }
+      // On a reconnection, wait for the server's answer: session.resumed replays the
+      // missed events, a snapshot means they are gone and onReconnect must refetch.
+      pendingReconnectRef.current = hadPreviousConnectionRef.current;
       hadPreviousConnectionRef.current = true;
 
       setReconnectAttempts(0);
@@ -237,13 +255,34 @@ export function useSessionWebSocket({
 
         // [Optimization 3] Update ref instead of setState
         lastEventRef.current = data;
+        if (typeof data.seq === "number" && data.epoch) {
+          trackStreamPosition(data.epoch, data.seq);
+        }
 
         switch (data.type) {
-          case "session.snapshot":
-            callbacksRef.current.onSnapshot?.(
-              data.data as unknown as SessionSnapshotData,
+          case "session.snapshot": {
+            const snapshot = data.data as unknown as SessionSnapshotData;
+            if (typeof snapshot.seq === "number" && snapshot.epoch) {
+              trackStreamPosition(snapshot.epoch, snapshot.seq);
+            }
+            callbacksRef.current.onSnapshot?.(snapshot);
+            if (pendingReconnectRef.current) {
+              pendingReconnectRef.current = false;
+              console.log(
+                `[WS] Reconnected to session ${sessionId}, fetching missed messages`,
+              );
+              callbacksRef.current.onReconnect?.();
+            }
+            break;
+          }
+          case "session.resumed": {
+            const resumed = data.data as unknown as SessionResumedData;
+            pendingReconnectRef.current = false;
+            console.log(
+              `[WS] Resumed session ${sessionId}, replaying ${resumed.replayed} events`,
             );
             break;
+          }
           case "session.status":
             callbacksRef.current.onStatusChange?.(
               data.data as unknown as SessionStatusData,
@@ -335,7 +374,7 @@ export function useSessionWebSocket({
         }, RECONNECT_DELAY);
       }
     };
-  }, [sessionId, enabled]);
+  }, [sessionId, enabled, trackStreamPosition]);
 
   // Keep connectRef in sync with connect function
   useEffect(() => {
@@ -18,6 +18,9 @@ import type {
   InputFile,
   ConfigSnapshot,
   RunResponse,
+  CursorPage,
+  WorkspaceEntry,
+  WorkspaceFileUrlsResponse,
 } from "@/features/chat/types";
 
 interface MessageContentBlock {
@@ -26,9 +29,9 @@ interface MessageContentBlock {
   id?: string;
   name?: string;
   input?: Record<string, unknown>;
-  // ToolResultBlock fields
+  // ToolResultBlock fields (content is a BlobRef when the output was offloaded)
   tool_use_id?: string;
-  content?: string;
+  content?: string | BlobRef;
   is_error?: boolean;
   // TextBlock fields
   text?: string;
@@ -55,6 +58,27 @@ function typeIncludes(typeValue: unknown, needle: string): boolean {
   return typeValue === needle || typeValue.includes(needle);
 }
 
+interface BlobRef {
+  _type: "BlobRef";
+  key: string;
+  sha256: string;
+  size: number;
+  preview: string;
+}
+
+function isBlobRef(value: unknown): value is BlobRef {
+  return (
+    !!value &&
+    typeof value === "object" &&
+    (value as { _type?: unknown })._type === "BlobRef"
+  );
+}
+
+function toolResultText(content: unknown): string {
+  if (isBlobRef(content)) return content.preview;
+  return typeof content === "string" ? content : (JSON.stringify(content) ?? "");
+}
+
 /**
  * Removes the Unicode replacement character ( / \uFFFD) from text.
  */
@@ -132,6 +156,22 @@ function buildQuery(params?: Record<string, string | number | undefined>) {
   return query ? `?${query}` : "";
 }
 
+// Session-scoped listings are keyset paginated; each page costs the same on the backend.
+const SESSION_PAGE_SIZE = 500;
+
+async function fetchAllPages<T>(path: string): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | undefined;
+  do {
+    const page = await apiClient.get<CursorPage<T>>(
+      `${path}${buildQuery({ limit: SESSION_PAGE_SIZE, cursor })}`,
+    );
+    items.push(...page.items);
+    cursor = page.next_cursor ?? undefined;
+  } while (cursor);
+  return items;
+}
+
 export const chatService = {
   listSessions: async (params?: {
     user_id?: string;
@@ -237,17 +277,8 @@ export const chatService = {
     );
   },
 
-  getRunsBySession: async (
-    sessionId: string,
-    params?: { limit?: number; offset?: number },
-  ): Promise<RunResponse[]> => {
-    const query = buildQuery({
-      limit: params?.limit,
-      offset: params?.offset,
-    });
-    return apiClient.get<RunResponse[]>(
-      `${API_ENDPOINTS.runsBySession(sessionId)}${query}`,
-    );
+  getRunsBySession: async (sessionId: string): Promise<RunResponse[]> => {
+    return fetchAllPages<RunResponse>(API_ENDPOINTS.runsBySession(sessionId));
   },
 
   getMessages: async (
@@ -263,16 +294,14 @@ export const chatService = {
       // fall back to showing all user messages and do not build internal contexts.
       const canClassifyUserMessages = realUserMessageIdSet.size > 0;
 
-      const messages = await apiClient.get<
-        {
-          id: number;
-          role: string;
-          content: Record<string, unknown>;
-          attachments?: InputFile[];
-          created_at: string;
-          updated_at: string;
-        }[]
-      >(API_ENDPOINTS.sessionMessagesWithFiles(sessionId));
+      const messages = await fetchAllPages<{
+        id: number;
+        role: string;
+        content: Record<string, unknown>;
+        attachments?: InputFile[];
+        created_at: string;
+        updated_at: string;
+      }>(API_ENDPOINTS.sessionMessagesWithFiles(sessionId));
 
       const processedMessages: ChatMessage[] = [];
       const internalContextsByUserMessageId: Record<string, string[]> = {};
@@ -386,12 +415,9 @@ export const chatService = {
                 typeof b.tool_use_id === "string"
                   ? b.tool_use_id
                   : String(b.tool_use_id ?? ""),
-              content: cleanText(
-                typeof b.content === "string"
-                  ? b.content
-                  : (JSON.stringify(b.content) ?? ""),
-              ),
+              content: cleanText(toolResultText(b.content)),
               is_error: !!b.is_error,
+              ...(isBlobRef(b.content) ? { truncated_message_id: msg.id } : {}),
             }));
             const existingBlocks =
               currentAssistantMessage.content as MessageBlock[];
@@ -678,6 +704,64 @@ export const chatService = {
     }
   },
 
+  /**
+   * One page of a workspace directory ("/" for the root), without URLs.
+   * Pass next_cursor back to get the following page.
+   */
+  getWorkspaceChildren: async (
+    sessionId: string,
+    path: string = "/",
+    cursor?: string,
+  ): Promise<CursorPage<WorkspaceEntry>> => {
+    return apiClient.get<CursorPage<WorkspaceEntry>>(
+      `${API_ENDPOINTS.sessionWorkspaceChildren(sessionId)}${buildQuery({
+        path,
+        cursor,
+      })}`,
+    );
+  },
+
+  /**
+   * Presigned URLs for the workspace files about to be opened or previewed
+   * (at most 100 paths per call).
+   */
+  getWorkspaceFileUrls: async (
+    sessionId: string,
+    paths: string[],
+  ): Promise<Record<string, string | null>> => {
+    const result = await apiClient.post<WorkspaceFileUrlsResponse>(
+      API_ENDPOINTS.sessionWorkspaceFileUrls(sessionId),
+      { paths },
+    );
+    return result.urls;
+  },
+
+  /**
+   * Load the full output of a tool result that was offloaded to blob storage.
+   * Pass the message's session id so an archived session is restored first.
+   */
+  getFullToolResult: async (
+    messageId: number,
+    toolUseId: string,
+    sessionId?: string,
+  ): Promise<string | null> => {
+    const message = await apiClient.get<{ content: MessageContentShape }>(
+      `${API_ENDPOINTS.message(messageId)}${buildQuery({
+        full: 1,
+        session_id: sessionId,
+      })}`,
+    );
+    const blocks = Array.isArray(message.content?.content)
+      ? message.content.content
+      : [];
+    const block = blocks.find(
+      (b) =>
+        typeIncludes(b?._type, "ToolResultBlock") &&
+        b.tool_use_id === toolUseId,
+    );
+    return block ? cleanText(toolResultText(block.content)) : null;
+  },
+
   /**
    * Get raw messages created after a specific message ID (for incremental fetch on reconnection).
    * Returns raw message data matching the WebSocket WSMessageData format.
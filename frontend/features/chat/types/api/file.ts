@@ -13,3 +13,21 @@ export interface FileNode {
   oss_status?: string | null;
   oss_meta?: Record<string, unknown> | null;
 }
+
+/** One entry of a workspace directory page; carries no URL. */
+export interface WorkspaceEntry {
+  id: string;
+  name: string;
+  type: "file" | "folder";
+  path: string;
+  mimeType?: string | null;
+  oss_status?: string | null;
+  oss_meta?: Record<string, unknown> | null;
+  /** Folders only: number of direct children. */
+  child_count?: number | null;
+}
+
+export interface WorkspaceFileUrlsResponse {
+  /** Presigned URL by normalized path; null when the file is not in the workspace. */
+  urls: Record<string, string | null>;
+}
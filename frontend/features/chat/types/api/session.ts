@@ -46,6 +46,14 @@ export interface SessionResponse {
   workspace_manifest_key?: string | null;
   workspace_archive_key?: string | null;
   status: string;
+  // Summary fields kept on the session row, so the list needs no per-session calls.
+  message_count?: number;
+  last_message_preview?: string | null;
+  last_message_at?: string | null; // ISO datetime
+  latest_run_id?: string | null; // UUID
+  latest_run_status?: string | null;
+  latest_run_progress?: number;
+  total_cost_usd?: number;
   created_at: string; // ISO datetime
   updated_at: string; // ISO datetime
 }
@@ -58,6 +66,12 @@ export interface SessionStateResponse {
   updated_at: string;
 }
 
+/** One page of a keyset-paginated listing; next_cursor is null on the last page. */
+export interface CursorPage<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
 export interface MessageResponse {
   id: number;
   role: string;
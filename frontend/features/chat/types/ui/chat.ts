@@ -38,6 +38,9 @@ export type ToolResultBlock = {
   tool_use_id: string;
   content: string;
   is_error: boolean;
+  // Set when the output was offloaded to blob storage: content is only a preview and
+  // the full output is loaded from this message on demand.
+  truncated_message_id?: number;
 };
 
 export type MessageBlock =
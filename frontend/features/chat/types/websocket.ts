@@ -1,7 +1,10 @@
 // frontend/features/chat/types/websocket.ts
 
+import type { JsonPatchOperation } from "@/lib/utils/json-patch/apply-json-patch";
+
 export type WSEventType =
   | "session.snapshot"
+  | "session.resumed"
   | "session.status"
   | "session.progress"
   | "session.patch"
@@ -13,6 +16,8 @@ export type WSEventType =
   | "workspace.export"
   | "workspace.files"
   | "workspace.file.url"
+  | "workspace.children"
+  | "workspace.file.urls"
   | "skill_import.job";
 
 export interface WSEvent<T = Record<string, unknown>> {
@@ -20,6 +25,9 @@ export interface WSEvent<T = Record<string, unknown>> {
   session_id: string;
   data: T;
   timestamp: string;
+  // Position in the session's event stream (absent on direct replies).
+  seq?: number;
+  epoch?: string;
 }
 
 export interface SessionStatusData {
@@ -32,16 +40,32 @@ export interface SessionSnapshotData {
   status: string;
   progress: number;
   state_patch?: Record<string, unknown>;
+  state_version?: number | null;
   config_snapshot?: Record<string, unknown> | null;
   workspace_export_status?: string | null;
   workspace_manifest_key?: string | null;
   workspace_files_prefix?: string | null;
   title?: string | null;
   updated_at?: string | null;
+  // Stream position at the snapshot; reconnect with ?epoch=&since_seq= to resume.
+  epoch?: string;
+  seq?: number;
+}
+
+export interface SessionResumedData {
+  epoch: string;
+  seq: number;
+  replayed: number;
 }
 
 export interface SessionPatchData {
-  state_patch: Record<string, unknown>;
+  // Full state (replaces the local one) or a delta against base_version, which
+  // defaults to state_version - 1 (merged deltas span several versions).
+  state_patch?: Record<string, unknown>;
+  state_delta?: JsonPatchOperation[];
+  base_version?: number | null;
+  // Absent for legacy partial patches, which are merged.
+  state_version?: number | null;
 }
 
 export interface TodoUpdateData {
@@ -78,6 +102,20 @@ export interface WorkspaceFileUrlData {
   url: string | null;
 }
 
+/** Reply to workspace.children.request: one page of a directory, without URLs. */
+export interface WorkspaceChildrenData {
+  path: string;
+  cursor: string | null;
+  items: Array<Record<string, unknown>>;
+  next_cursor: string | null;
+  error?: string | null;
+}
+
+/** Reply to workspace.file.urls.request: presigned URL by normalized path. */
+export interface WorkspaceFileUrlsData {
+  urls: Record<string, string | null>;
+}
+
 export interface WSMessageData {
   id: number;
   role: string;
@@ -57,6 +57,10 @@ function mapSessionToTask(session: SessionResponse): TaskHistoryItem {
     timestamp: session.updated_at || session.created_at,
     status,
     projectId: session.project_id || undefined,
+    lastMessagePreview: session.last_message_preview || undefined,
+    messageCount: session.message_count,
+    progress: session.latest_run_progress,
+    totalCostUsd: session.total_cost_usd,
   };
 }
 
@@ -16,4 +16,8 @@ export interface TaskHistoryItem {
   timestamp: string;
   status: "pending" | "running" | "completed" | "failed" | "canceled";
   projectId?: string;
+  lastMessagePreview?: string;
+  messageCount?: number;
+  progress?: number;
+  totalCostUsd?: number;
 }
@@ -36,23 +36,15 @@ export function GlobalSearchDialog({
     return Array.isArray(value) ? value[0] : value;
   }, [params]);
   const [searchQuery, setSearchQuery] = React.useState("");
-  const { tasks, projects, messages, isLoading } = useSearchData();
+  const { tasks, projects, messages, isLoading } = useSearchData(searchQuery);
   const [mounted, setMounted] = React.useState(false);
 
   React.useEffect(() => {
     setMounted(true);
   }, []);
 
-  // Filter tasks by search query
-  const filteredTasks = React.useMemo(
-    () =>
-      tasks.filter(
-        (task) =>
-          searchQuery === "" ||
-          task.title.toLowerCase().includes(searchQuery.toLowerCase()),
-      ),
-    [tasks, searchQuery],
-  );
+  // Tasks and messages are already matched and ranked by the search API
+  const filteredTasks = tasks;
 
   // Filter projects by search query
   const filteredProjects = React.useMemo(
@@ -65,16 +57,7 @@ export function GlobalSearchDialog({
     [projects, searchQuery],
   );
 
-  // Filter messages by search query
-  const filteredMessages = React.useMemo(
-    () =>
-      messages.filter(
-        (message) =>
-          searchQuery === "" ||
-          message.content.toLowerCase().includes(searchQuery.toLowerCase()),
-      ),
-    [messages, searchQuery],
-  );
+  const filteredMessages = messages;
 
   const hasResults =
     filteredTasks.length > 0 ||
@@ -102,7 +85,11 @@ export function GlobalSearchDialog({
   if (!mounted) return null;
 
   return (
-    <CommandDialog open={open} onOpenChange={onOpenChange}>
+    <CommandDialog
+      open={open}
+      onOpenChange={onOpenChange}
+      shouldFilter={false}
+    >
       <CommandInput
         placeholder={t("search.placeholder")}
         value={searchQuery}
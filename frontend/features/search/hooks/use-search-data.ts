@@ -6,25 +6,72 @@ import type {
   SearchResultProject,
   SearchResultMessage,
 } from "@/features/search/types";
-// import { listSessionsAction } from "@/features/chat/actions/query-actions";
+import { searchService } from "@/features/search/services/search-service";
+
+const SEARCH_DEBOUNCE_MS = 250;
 
 /**
- * Hook for fetching and aggregating search data
- * TODO: Search API temporarily disabled
+ * Hook for fetching ranked search hits for a query
+ * Session titles and message text are searched server-side
  */
-export function useSearchData() {
-  const [tasks] = React.useState<SearchResultTask[]>([]);
-  const [isLoading] = React.useState(false);
-  const [error] = React.useState<Error | null>(null);
-
-  // TODO: Search API temporarily disabled
-  const fetchData = React.useCallback(async () => {
-    // API fetch disabled - return empty data
-    return;
+export function useSearchData(query: string) {
+  const [tasks, setTasks] = React.useState<SearchResultTask[]>([]);
+  const [messages, setMessages] = React.useState<SearchResultMessage[]>([]);
+  const [isLoading, setIsLoading] = React.useState(false);
+  const [error, setError] = React.useState<Error | null>(null);
+  const requestIdRef = React.useRef(0);
+
+  const fetchData = React.useCallback(async (value: string) => {
+    const requestId = ++requestIdRef.current;
+    const trimmed = value.trim();
+    if (!trimmed) {
+      setTasks([]);
+      setMessages([]);
+      setIsLoading(false);
+      return;
+    }
+
+    setIsLoading(true);
+    try {
+      const result = await searchService.search(trimmed);
+      // Ignore responses for queries the user has already typed past.
+      if (requestId !== requestIdRef.current) return;
+      setTasks(
+        result.sessions.map((session) => ({
+          id: session.session_id,
+          title: session.title || session.last_message_preview || "",
+          status: session.status,
+          timestamp: session.updated_at,
+          type: "task",
+        })),
+      );
+      setMessages(
+        result.messages.map((message) => ({
+          id: message.message_id,
+          content: message.text_preview || "",
+          chatId: message.session_id,
+          timestamp: message.created_at,
+          type: "message",
+        })),
+      );
+      setError(null);
+    } catch (err) {
+      if (requestId !== requestIdRef.current) return;
+      console.error("[Search] Failed to search:", err);
+      setError(err instanceof Error ? err : new Error(String(err)));
+    } finally {
+      if (requestId === requestIdRef.current) setIsLoading(false);
+    }
   }, []);
 
+  React.useEffect(() => {
+    const timer = window.setTimeout(() => {
+      void fetchData(query);
+    }, SEARCH_DEBOUNCE_MS);
+    return () => window.clearTimeout(timer);
+  }, [query, fetchData]);
+
   const projects = React.useMemo<SearchResultProject[]>(() => [], []);
-  const messages = React.useMemo<SearchResultMessage[]>(() => [], []);
 
   return {
     tasks,
@@ -32,7 +79,6 @@ export function useSearchData() {
     messages,
     isLoading,
     error,
-    refetch: fetchData,
-    disabled: true, // Flag to indicate search is disabled
+    refetch: () => fetchData(query),
   };
 }
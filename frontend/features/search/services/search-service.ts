@@ -0,0 +1,11 @@
+import { apiClient, API_ENDPOINTS } from "@/lib/api-client";
+import type { SearchResponse } from "@/features/search/types";
+
+export const searchService = {
+  search: async (query: string, limit = 20): Promise<SearchResponse> => {
+    const params = new URLSearchParams({ q: query, limit: String(limit) });
+    return apiClient.get<SearchResponse>(
+      `${API_ENDPOINTS.search}?${params.toString()}`,
+    );
+  },
+};
@@ -25,3 +25,26 @@ export type SearchResult =
   | SearchResultTask
   | SearchResultProject
   | SearchResultMessage;
+
+export interface SessionSearchHitResponse {
+  session_id: string;
+  title: string | null;
+  status: string;
+  last_message_preview: string | null;
+  updated_at: string;
+}
+
+export interface MessageSearchHitResponse {
+  message_id: number;
+  session_id: string;
+  session_title: string | null;
+  role: string;
+  text_preview: string | null;
+  created_at: string;
+  rank: number;
+}
+
+export interface SearchResponse {
+  sessions: SessionSearchHitResponse[];
+  messages: MessageSearchHitResponse[];
+}
@@ -18,6 +18,10 @@ export const API_ENDPOINTS = {
   sessionUsage: (sessionId: string) => `/sessions/${sessionId}/usage`,
   sessionWorkspaceFiles: (sessionId: string) =>
     `/sessions/${sessionId}/workspace/files`,
+  sessionWorkspaceChildren: (sessionId: string) =>
+    `/sessions/${sessionId}/workspace/children`,
+  sessionWorkspaceFileUrls: (sessionId: string) =>
+    `/sessions/${sessionId}/workspace/file-urls`,
   sessionWorkspaceArchive: (sessionId: string) =>
     `/sessions/${sessionId}/workspace/archive`,
 
@@ -80,6 +84,9 @@ export const API_ENDPOINTS = {
   // Messages
   message: (messageId: number) => `/messages/${messageId}`,
 
+  // Search
+  search: "/search",
+
   // Tool Executions
   toolExecution: (executionId: string) => `/tool-executions/${executionId}`,
 
@@ -0,0 +1,99 @@
+/**
+ * JSON Patch operation (RFC 6902 subset used for session state deltas)
+ */
+export interface JsonPatchOperation {
+  op: "add" | "remove" | "replace";
+  path: string;
+  value?: unknown;
+}
+
+function unescapeToken(token: string): string {
+  return token.replace(/~1/g, "/").replace(/~0/g, "~");
+}
+
+function parseIndex(token: string, path: string): number {
+  if (!/^\d+$/.test(token)) {
+    throw new Error(`Invalid list index in patch path: ${path}`);
+  }
+  return Number(token);
+}
+
+/**
+ * Apply a JSON Patch to a document without mutating it.
+ * Only the containers along each patched path are copied.
+ * Throws when an operation does not apply, so callers can fall back to a full snapshot.
+ */
+export function applyJsonPatch<T>(document: T, patch: JsonPatchOperation[]): T {
+  let result: unknown = document;
+  for (const operation of patch) {
+    result = applyOperation(result, operation);
+  }
+  return result as T;
+}
+
+function applyOperation(document: unknown, operation: JsonPatchOperation): unknown {
+  const { op, path } = operation;
+  if (path === "") {
+    if (op === "remove") throw new Error("Cannot remove the document root");
+    return operation.value;
+  }
+  if (!path.startsWith("/")) {
+    throw new Error(`Invalid patch path: ${path}`);
+  }
+  const tokens = path.slice(1).split("/").map(unescapeToken);
+  return applyAt(document, tokens, operation);
+}
+
+function applyAt(
+  node: unknown,
+  tokens: string[],
+  operation: JsonPatchOperation,
+): unknown {
+  const [token, ...rest] = tokens;
+
+  if (Array.isArray(node)) {
+    const copy = [...node];
+    if (rest.length > 0) {
+      const index = parseIndex(token, operation.path);
+      if (index >= copy.length) {
+        throw new Error(`Patch path not found: ${operation.path}`);
+      }
+      copy[index] = applyAt(copy[index], rest, operation);
+      return copy;
+    }
+    if (operation.op === "add" && token === "-") {
+      copy.push(operation.value);
+      return copy;
+    }
+    const index = parseIndex(token, operation.path);
+    const upper = operation.op === "add" ? copy.length : copy.length - 1;
+    if (index > upper) {
+      throw new Error(`Patch index out of range: ${operation.path}`);
+    }
+    if (operation.op === "add") copy.splice(index, 0, operation.value);
+    else if (operation.op === "remove") copy.splice(index, 1);
+    else copy[index] = operation.value;
+    return copy;
+  }
+
+  if (node !== null && typeof node === "object") {
+    const copy: Record<string, unknown> = {
+      ...(node as Record<string, unknown>),
+    };
+    if (rest.length > 0) {
+      if (!(token in copy)) {
+        throw new Error(`Patch path not found: ${operation.path}`);
+      }
+      copy[token] = applyAt(copy[token], rest, operation);
+      return copy;
+    }
+    if (operation.op !== "add" && !(token in copy)) {
+      throw new Error(`Patch path not found: ${operation.path}`);
+    }
+    if (operation.op === "remove") delete copy[token];
+    else copy[token] = operation.value;
+    return copy;
+  }
+
+  throw new Error(`Patch path not found: ${operation.path}`);
+}